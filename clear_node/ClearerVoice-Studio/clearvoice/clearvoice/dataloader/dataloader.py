@@ -18,6 +18,10 @@ import random
 EPS = 1e-6
 MAX_WAV_VALUE_16B = 32768.0
 MAX_WAV_VALUE_32B = 2147483648.0
+# Stereo channels whose correlation and level difference are within these bounds
+# are treated as dual-mono and downmixed before inference
+STEREO_DOWNMIX_MIN_CORR = 0.999
+STEREO_DOWNMIX_MAX_LEVEL_DB = 1.0
    
 def audioread_archieved(path, sampling_rate):
     """
@@ -101,10 +105,18 @@ def audioread(path, sampling_rate, use_norm):
         audio_np = data_array / MAX_WAV_VALUE_16B
 
     audios = []
+    audio_info['downmixed'] = False
     # Check if the audio is stereo
     if audio_info['channels'] == 2:
-        audios.append(audio_np[::2])  # Even indices (left channel)
-        audios.append(audio_np[1::2])  # Odd indices (right channel)
+        left, right = audio_np[::2], audio_np[1::2]  # Even indices (left), odd indices (right)
+        if is_redundant_stereo(left, right):
+            # Near-identical channels: run the model once on the mono downmix,
+            # the output is duplicated back to both channels after decoding
+            audios.append((left + right) * 0.5)
+            audio_info['downmixed'] = True
+        else:
+            audios.append(left)
+            audios.append(right)
     else:
         audios.append(audio_np)
     
@@ -129,6 +141,37 @@ def audioread(path, sampling_rate, use_norm):
     # Return the processed audio data.
     return audios_normed, scalars, audio_info
 
+def channel_similarity(left, right):
+    """
+    Computes the Pearson correlation and the RMS level difference (dB) between two channels.
+
+    Parameters:
+    left (numpy.ndarray): Left channel samples.
+    right (numpy.ndarray): Right channel samples.
+
+    Returns:
+    tuple: (correlation, level difference in dB). Correlation is 1.0 when both channels are silent.
+    """
+    x = np.asarray(left, dtype=np.float64)
+    y = np.asarray(right, dtype=np.float64)
+    x = x - x.mean()
+    y = y - y.mean()
+    energy_x = np.dot(x, x)
+    energy_y = np.dot(y, y)
+    if energy_x < EPS and energy_y < EPS:
+        return 1.0, 0.0
+    corr = np.dot(x, y) / (np.sqrt(energy_x * energy_y) + EPS)
+    level_db = 10 * np.log10((energy_x + EPS) / (energy_y + EPS))
+    return float(corr), float(abs(level_db))
+
+def is_redundant_stereo(left, right, min_corr=STEREO_DOWNMIX_MIN_CORR, max_level_db=STEREO_DOWNMIX_MAX_LEVEL_DB):
+    """
+    Checks whether a stereo pair is effectively dual-mono, so that a single
+    inference on the downmix gives the same result as processing each channel.
+    """
+    corr, level_db = channel_similarity(left, right)
+    return corr >= min_corr and level_db <= max_level_db
+
 def audio_norm(x):
     """
     Normalizes the input audio signal to a target Root Mean Square (RMS) level, 
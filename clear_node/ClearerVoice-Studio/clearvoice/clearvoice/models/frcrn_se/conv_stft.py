@@ -61,7 +61,7 @@ class ConvSTFT(nn.Module):
         dim (int): The FFT length, determining the number of output features.
     """
 
-    def __init__(self, win_len, win_inc, fft_len=None, win_type='hamming', feature_type='real', fix=True):
+    def __init__(self, win_len, win_inc, fft_len=None, win_type='hamming', feature_type='real', fix=True, use_fft=True):
         """
         Initializes the ConvSTFT layer.
 
@@ -72,20 +72,39 @@ class ConvSTFT(nn.Module):
             win_type (str, optional): Type of window to use (default is 'hamming').
             feature_type (str, optional): Specifies the output feature type ('real' or 'complex'). Default is 'real'.
             fix (bool, optional): If True, the kernel weights are fixed and not learnable. Default is True.
+            use_fft (bool, optional): If True, use the FFT fast path whenever it is equivalent to the convolution. Default is True.
         """
         super(ConvSTFT, self).__init__()
 
         if fft_len is None:
-            self.fft_len = np.int(2**np.ceil(np.log2(win_len)))  # Calculate fft_len based on win_len
+            self.fft_len = int(2**np.ceil(np.log2(win_len)))  # Calculate fft_len based on win_len
         else:
             self.fft_len = fft_len
         
-        kernel, _ = init_kernels(win_len, win_inc, self.fft_len, win_type)  # Initialize STFT kernel
+        kernel, window = init_kernels(win_len, win_inc, self.fft_len, win_type)  # Initialize STFT kernel
         self.weight = nn.Parameter(kernel, requires_grad=(not fix))  # Create a learnable parameter for the kernel
         self.feature_type = feature_type
         self.stride = win_inc
         self.win_len = win_len
         self.dim = self.fft_len
+        self.use_fft = use_fft
+        # Analysis window for the FFT path; not part of the state dict so existing checkpoints load unchanged
+        self.register_buffer('fft_window', window.reshape(-1), persistent=False)
+
+    def fft_available(self):
+        """
+        The FFT path is equivalent to the convolution only for the fixed DFT kernel
+        with the window filling the whole FFT length.
+        """
+        return self.use_fft and not self.weight.requires_grad and self.win_len == self.fft_len
+
+    def _fft_stft(self, inputs):
+        """
+        Computes the same [B, N+2, T] output as the convolution using framing and rfft.
+        """
+        frames = inputs[:, 0, :].unfold(-1, self.win_len, self.stride)  # [B, T, win_len]
+        spec = torch.fft.rfft(frames * self.fft_window, n=self.fft_len)  # [B, T, N//2+1]
+        return torch.cat([spec.real, spec.imag], -1).transpose(1, 2).contiguous()
 
     def forward(self, inputs):
         """
@@ -102,7 +121,10 @@ class ConvSTFT(nn.Module):
         if inputs.dim() == 2:
             inputs = torch.unsqueeze(inputs, 1)  # Add channel dimension if not present
 
-        outputs = F.conv1d(inputs, self.weight, stride=self.stride)  # Perform convolution to compute STFT
+        if self.fft_available():
+            outputs = self._fft_stft(inputs)  # O(N log N) per frame
+        else:
+            outputs = F.conv1d(inputs, self.weight, stride=self.stride)  # Perform convolution to compute STFT
          
         if self.feature_type == 'complex':
             return outputs
@@ -134,7 +156,7 @@ class ConviSTFT(nn.Module):
         enframe (torch.Tensor): Buffer for the framing matrix.
     """
 
-    def __init__(self, win_len, win_inc, fft_len=None, win_type='hamming', feature_type='real', fix=True):
+    def __init__(self, win_len, win_inc, fft_len=None, win_type='hamming', feature_type='real', fix=True, use_fft=True):
         """
         Initializes the ConviSTFT layer.
 
@@ -145,13 +167,15 @@ class ConviSTFT(nn.Module):
             win_type (str, optional): Type of window to use (default is 'hamming').
             feature_type (str, optional): Specifies the output feature type ('real' or 'complex'). Default is 'real'.
             fix (bool, optional): If True, the kernel weights are fixed and not learnable. Default is True.
+            use_fft (bool, optional): If True, use the inverse FFT fast path whenever it is equivalent to the convolution. Default is True.
         """
         super(ConviSTFT, self).__init__()
 
         if fft_len is None:
-            self.fft_len = np.int(2**np.ceil(np.log2(win_len)))  # Calculate fft_len based on win_len
+            self.fft_len = int(2**np.ceil(np.log2(win_len)))  # Calculate fft_len based on win_len
         else:
             self.fft_len = fft_len
+        self.use_fft = use_fft
 
         kernel, window = init_kernels(win_len, win_inc, self.fft_len, win_type, invers=True)  # Initialize iSTFT kernel
         self.weight = nn.Parameter(kernel, requires_grad=(not fix))  # Create a learnable parameter for the kernel
@@ -182,6 +206,9 @@ class ConviSTFT(nn.Module):
             imag = inputs * torch.sin(phase)  # Imaginary part
             inputs = torch.cat([real, imag], 1)  # Concatenate to form complex input
 
+        if self.fft_available():
+            return self._fft_istft(inputs)  # O(N log N) per frame
+
         outputs = F.conv_transpose1d(inputs, self.weight, stride=self.stride)  # Perform transposed convolution for iSTFT
 
         # Compute the overlap-add normalization
@@ -190,6 +217,29 @@ class ConviSTFT(nn.Module):
         outputs = outputs / (coff + 1e-8)  # Normalize the output to prevent division by zero
         return outputs
 
+    def fft_available(self):
+        """
+        With win_len == fft_len the pseudo-inverse DFT kernel equals irfft (the imaginary
+        parts of the DC and Nyquist bins are ignored by both), so the FFT path is exact.
+        """
+        return self.use_fft and not self.weight.requires_grad and self.win_len == self.fft_len
+
+    def _fft_istft(self, inputs):
+        """
+        Computes the same [B, 1, L] output as the transposed convolution using irfft and overlap-add.
+        """
+        dim = self.fft_len // 2 + 1
+        spec = torch.complex(inputs[:, :dim, :], inputs[:, dim:, :]).transpose(1, 2)  # [B, T, N//2+1]
+        window = self.window.reshape(1, -1, 1)
+        frames = torch.fft.irfft(spec, n=self.fft_len).transpose(1, 2) * window  # [B, win_len, T]
+
+        num_frames = inputs.size(-1)
+        length = (num_frames - 1) * self.stride + self.win_len
+        fold_args = dict(output_size=(1, length), kernel_size=(1, self.win_len), stride=(1, self.stride))
+        outputs = F.fold(frames, **fold_args)  # Overlap-add, [B, 1, 1, L]
+        coff = F.fold((window**2).expand(1, -1, num_frames), **fold_args)
+        return (outputs / (coff + 1e-8)).squeeze(2)
+
 
 def test_fft():
     """
@@ -161,7 +161,7 @@ class DCCRN(nn.Module):
         out_list.append(est_mask)
         return out_list
 
-    def inference(self, inputs):
+    def inference(self, inputs, return_batch=False):
         """
         Inference method for the FRCRN model.
 
@@ -170,6 +170,8 @@ class DCCRN(nn.Module):
 
         Args:
             inputs (torch.Tensor): Input tensor representing audio signals.
+            return_batch (bool): If True, return the waveforms of the whole batch [B, T]
+                                 instead of only the first one.
 
         Returns:
             torch.Tensor: Estimated waveform after processing.
@@ -197,6 +199,8 @@ class DCCRN(nn.Module):
 
         # Apply the estimated mask to compute the estimated waveform
         _, est_wav, _ = self.apply_mask(cmp_spec, cmp_mask2)
+        if return_batch:
+            return est_wav
         return est_wav[0]  # Return the estimated waveform
 
     def apply_mask(self, cmp_spec, cmp_mask):
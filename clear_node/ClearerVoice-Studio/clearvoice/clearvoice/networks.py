@@ -25,6 +25,9 @@ from pydub import AudioSegment
 from .utils.decode import decode_one_audio
 from .dataloader.dataloader import DataReader
 
+# Networks whose decoding supports a [channels, T] batch in a single forward pass
+BATCHED_DECODE_NETWORKS = ['FRCRN_SE_16K', 'MossFormerGAN_SE_16K']
+
 MAX_WAV_VALUE = 32768.0
 
 class SpeechModel:
@@ -194,17 +197,28 @@ class SpeechModel:
         """
         # Decode the audio using the loaded model on the given device (e.g., CPU or GPU)
         output_audios = []
-        for i in range(len(self.data['audio'])):
-            output_audio = decode_one_audio(self.model, self.device, self.data['audio'][i], self.args)
-            # Ensure the decoded output matches the length of the input audio
-            if isinstance(output_audio, list):
-                # If multi-speaker audio (a list of outputs), truncate each speaker's audio to input length
-                for spk in range(self.args.num_spks):
-                    output_audio[spk] = output_audio[spk][:self.data['audio_len']]
-            else:
-                # Single output, truncate to input audio length
-                output_audio = output_audio[:self.data['audio_len']]
-            output_audios.append(output_audio)
+        input_audios = self.data['audio']
+        if len(input_audios) > 1 and self.args.network in BATCHED_DECODE_NETWORKS:
+            # Process all channels as one batch in a single forward pass
+            batch_output = decode_one_audio(self.model, self.device, np.concatenate(input_audios, axis=0), self.args)
+            for i in range(len(input_audios)):
+                output_audios.append(batch_output[i][:self.data['audio_len']])
+        else:
+            for i in range(len(input_audios)):
+                output_audio = decode_one_audio(self.model, self.device, input_audios[i], self.args)
+                # Ensure the decoded output matches the length of the input audio
+                if isinstance(output_audio, list):
+                    # If multi-speaker audio (a list of outputs), truncate each speaker's audio to input length
+                    for spk in range(self.args.num_spks):
+                        output_audio[spk] = output_audio[spk][:self.data['audio_len']]
+                else:
+                    # Single output, truncate to input audio length
+                    output_audio = output_audio[:self.data['audio_len']]
+                output_audios.append(output_audio)
+
+        if self.data.get('downmixed', False):
+            # Dual-mono input was decoded once on the downmix, restore the channel layout
+            output_audios = output_audios * self.data['channels']
             
         if isinstance(output_audios[0], list):
             output_audios_np = []
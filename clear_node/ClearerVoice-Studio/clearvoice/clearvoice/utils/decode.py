@@ -170,27 +170,28 @@ def decode_one_audio_frcrn_se_16k(model, device, inputs, args):
 
     # Process the inputs in segments if necessary
     if decode_do_segment:
-        outputs = np.zeros(t)  # Initialize the output array
+        outputs = np.zeros((b, t))  # Initialize the output array
         give_up_length = (window - stride) // 2  # Calculate length to give up at each segment
         current_idx = 0  # Initialize current index for segmentation
 
         while current_idx + window <= t:
             tmp_input = inputs[:, current_idx:current_idx + window]  # Get segment input
-            tmp_output = model.inference(tmp_input).detach().cpu().numpy()  # Inference on segment
+            tmp_output = model.inference(tmp_input, return_batch=True).detach().cpu().numpy()  # Inference on segment
 
             # For the first segment, use the whole segment minus the give-up length
             if current_idx == 0:
-                outputs[current_idx:current_idx + window - give_up_length] = tmp_output[:-give_up_length]
+                outputs[:, current_idx:current_idx + window - give_up_length] = tmp_output[:, :-give_up_length]
             else:
                 # For subsequent segments, account for the give-up length
-                outputs[current_idx + give_up_length:current_idx + window - give_up_length] = tmp_output[give_up_length:-give_up_length]
+                outputs[:, current_idx + give_up_length:current_idx + window - give_up_length] = tmp_output[:, give_up_length:-give_up_length]
 
             current_idx += stride  # Move to the next segment
     else:
         # If no segmentation is required, process the entire input
-        outputs = model.inference(inputs).detach().cpu().numpy()  # Inference on full input
+        outputs = model.inference(inputs, return_batch=True).detach().cpu().numpy()  # Inference on full input
 
-    return outputs  # Return the decoded audio output
+    # A single input returns a 1-D waveform, a batch of channels returns [B, T]
+    return outputs[0] if b == 1 else outputs
 
 def decode_one_audio_mossformergan_se_16k(model, device, inputs, args):
     """Decodes audio using the MossFormerGAN model for speech enhancement at 16kHz.
@@ -228,7 +229,7 @@ def decode_one_audio_mossformergan_se_16k(model, device, inputs, args):
 
     # Process the inputs in segments if necessary
     if decode_do_segment:
-        outputs = np.zeros(t)  # Initialize the output array
+        outputs = np.zeros((b, t)) if b > 1 else np.zeros(t)  # Initialize the output array
         give_up_length = (window - stride) // 2  # Calculate length to give up at each segment
         current_idx = 0  # Initialize current index for segmentation
 
@@ -238,10 +239,10 @@ def decode_one_audio_mossformergan_se_16k(model, device, inputs, args):
 
             # For the first segment, use the whole segment minus the give-up length
             if current_idx == 0:
-                outputs[current_idx:current_idx + window - give_up_length] = tmp_output[:-give_up_length]
+                outputs[..., current_idx:current_idx + window - give_up_length] = tmp_output[..., :-give_up_length]
             else:
                 # For subsequent segments, account for the give-up length
-                outputs[current_idx + give_up_length:current_idx + window - give_up_length] = tmp_output[give_up_length:-give_up_length]
+                outputs[..., current_idx + give_up_length:current_idx + window - give_up_length] = tmp_output[..., give_up_length:-give_up_length]
 
             current_idx += stride  # Move to the next segment
 
@@ -301,10 +302,10 @@ def _decode_one_audio_mossformergan_se_16k(model, device, inputs, norm_factor, a
     # Perform Inverse STFT (iSTFT) to convert back to time domain audio
     outputs = istft(pred_spec_uncompress, args, center=True, periodic=True, onesided=True)
 
-    # Normalize the output audio by dividing by the normalization factor
-    outputs = outputs.squeeze(0) / norm_factor
+    # Normalize the output audio by dividing by the per-channel normalization factor
+    outputs = (outputs / norm_factor.unsqueeze(-1)).squeeze(0)
 
-    return outputs[:input_len].detach().cpu().numpy()  # Return the output as a numpy array
+    return outputs[..., :input_len].detach().cpu().numpy()  # Return the output as a numpy array
 
 def decode_one_audio_mossformer2_se_48k(model, device, inputs, args):
     """Processes audio inputs through the MossFormer2 model for speech enhancement at 48kHz.
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Clear Node 降噪模型基准测试脚本
+在本地合成的 纯净语音+噪声 参考集上运行各个ClearVoice语音增强模型，
+统计实时率(RTF)、峰值内存(RSS)、不同线程数下的吞吐量，
+并使用内置的 speechscore 计算 PESQ / STOI / SI-SDR / DNSMOS 指标。
+
+输出:
+    <output-dir>/report.json   机器可读的完整报告
+    <output-dir>/summary.md    汇总表格（同时打印到日志）
+
+用法:
+    python benchmark.py
+    python benchmark.py --models FRCRN_SE_16K,MossFormerGAN_SE_16K --threads 1,2,4
+    python benchmark.py --clean-dir /data/clean_speech --snrs 0,5,10,20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目录到路径
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from config import Config
+from logger import logger
+
+# 默认参与测试的语音增强模型
+DEFAULT_MODELS = ['FRCRN_SE_16K', 'MossFormerGAN_SE_16K', 'MossFormer2_SE_48K']
+# 默认评测指标（speechscore中的名称）
+DEFAULT_METRICS = ['PESQ', 'STOI', 'SISDR', 'DNSMOS']
+# 参考集采样率（PESQ宽带模式要求16kHz）
+REFERENCE_SAMPLE_RATE = 16000
+SPEECHSCORE_PATH = os.path.join(current_dir, 'ClearerVoice-Studio', 'speechscore')
+
+
+def _get_peak_rss_mb() -> float:
+    """获取当前进程的峰值常驻内存(MB)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux单位为KB，macOS单位为字节
+        if platform.system().lower() == 'darwin':
+            return peak / (1024 * 1024)
+        return peak / 1024
+    except ImportError:
+        # Windows没有resource模块，使用psutil的峰值工作集
+        import psutil
+        mem = psutil.Process().memory_info()
+        return getattr(mem, 'peak_wset', mem.rss) / (1024 * 1024)
+
+
+def _synthesize_speech(duration: float, sr: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    合成类语音信号（在没有提供纯净语音目录时使用）
+    由带基频抖动的谐波浊音段和停顿组成，包络模拟音节节奏
+    """
+    n = int(duration * sr)
+    t = np.arange(n) / sr
+    signal = np.zeros(n)
+
+    # 随机生成音节段：0.15-0.4秒的发声，间隔0.05-0.3秒的停顿
+    pos = 0
+    while pos < n:
+        seg_len = int(rng.uniform(0.15, 0.4) * sr)
+        gap_len = int(rng.uniform(0.05, 0.3) * sr)
+        end = min(pos + seg_len, n)
+        seg_t = t[pos:end] - t[pos]
+
+        f0 = rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(2, 6) * seg_t))
+        phase = 2 * np.pi * np.cumsum(f0) / sr
+        voiced = np.zeros(end - pos)
+        for k in range(1, 16):
+            voiced += np.sin(k * phase) / k ** 1.2
+
+        envelope = np.sin(np.pi * np.linspace(0, 1, end - pos)) ** 2
+        signal[pos:end] = voiced * envelope
+        pos = end + gap_len
+
+    return signal / (np.max(np.abs(signal)) + 1e-8) * 0.5
+
+
+def _make_noise(kind: str, n: int, sr: int, rng: np.random.Generator) -> np.ndarray:
+    """生成指定类型的噪声"""
+    if kind == 'white':
+        return rng.standard_normal(n)
+    if kind == 'pink':
+        # 频域 1/f 成形
+        spectrum = np.fft.rfft(rng.standard_normal(n))
+        freqs = np.fft.rfftfreq(n, 1 / sr)
+        freqs[0] = freqs[1]
+        return np.fft.irfft(spectrum / np.sqrt(freqs), n)
+    if kind == 'babble':
+        # 多个合成说话人叠加
+        babble = sum(_synthesize_speech(n / sr, sr, rng) for _ in range(6))
+        return np.pad(babble, (0, max(0, n - len(babble))))[:n]
+    if kind == 'hum':
+        # 电源哼声 + 宽带底噪
+        t = np.arange(n) / sr
+        hum = sum(np.sin(2 * np.pi * 50 * k * t) / k for k in range(1, 6))
+        return hum + 0.1 * rng.standard_normal(n)
+    raise ValueError(f"不支持的噪声类型: {kind}")
+
+
+def _mix_at_snr(clean: np.ndarray, noise: np.ndarray, snr_db: float) -> np.ndarray:
+    """按指定信噪比混合纯净语音与噪声，并避免削波"""
+    clean_power = np.mean(clean ** 2) + 1e-12
+    noise_power = np.mean(noise ** 2) + 1e-12
+    scale = np.sqrt(clean_power / (noise_power * 10 ** (snr_db / 10)))
+    mixture = clean + noise * scale
+    peak = np.max(np.abs(mixture))
+    if peak > 0.99:
+        mixture = mixture / peak * 0.99
+    return mixture
+
+
+def build_reference_set(output_dir: str, clean_dir: str = None, num_clean: int = 4,
+                        duration: float = 10.0, snrs: list = None, noise_kinds: list = None,
+                        seed: int = 2024) -> dict:
+    """
+    生成参考集：clean/ 与 noisy/ 目录下同名的16kHz wav文件
+
+    Args:
+        output_dir (str): 参考集输出目录
+        clean_dir (str, optional): 纯净语音目录，为空时使用合成语音
+        num_clean (int): 使用的纯净语音条数
+        duration (float): 每条语音时长（秒）
+        snrs (list): 混合信噪比列表(dB)
+        noise_kinds (list): 噪声类型列表
+        seed (int): 随机种子，保证多次运行的参考集一致
+
+    Returns:
+        dict: 参考集清单
+    """
+    import soundfile as sf
+    import librosa
+
+    snrs = snrs if snrs is not None else [0, 5, 10]
+    noise_kinds = noise_kinds or ['white', 'pink', 'babble', 'hum']
+    rng = np.random.default_rng(seed)
+    sr = REFERENCE_SAMPLE_RATE
+
+    clean_out = os.path.join(output_dir, 'clean')
+    noisy_out = os.path.join(output_dir, 'noisy')
+    os.makedirs(clean_out, exist_ok=True)
+    os.makedirs(noisy_out, exist_ok=True)
+
+    # 准备纯净语音
+    clean_signals = []
+    if clean_dir:
+        clean_files = sorted(p for p in Path(clean_dir).rglob('*') if p.suffix.lower() in ('.wav', '.flac'))
+        for path in clean_files[:num_clean]:
+            y, _ = librosa.load(str(path), sr=sr, mono=True)
+            clean_signals.append((path.stem, y[:int(duration * sr)]))
+        logger.info(f"使用纯净语音目录: {clean_dir}, 共 {len(clean_signals)} 条")
+    if not clean_signals:
+        logger.info("未提供纯净语音，使用合成语音构建参考集")
+        clean_signals = [(f"synth{i}", _synthesize_speech(duration, sr, rng)) for i in range(num_clean)]
+
+    items = []
+    for clean_id, clean in clean_signals:
+        for kind in noise_kinds:
+            noise = _make_noise(kind, len(clean), sr, rng)
+            for snr in snrs:
+                name = f"{clean_id}_{kind}_snr{snr:g}.wav"
+                mixture = _mix_at_snr(clean, noise, snr)
+                sf.write(os.path.join(clean_out, name), clean.astype(np.float32), sr, subtype='PCM_16')
+                sf.write(os.path.join(noisy_out, name), mixture.astype(np.float32), sr, subtype='PCM_16')
+                items.append({'name': name, 'noise': kind, 'snr': snr, 'duration': round(len(clean) / sr, 3)})
+
+    manifest = {
+        'sample_rate': sr,
+        'clean_dir': clean_out,
+        'noisy_dir': noisy_out,
+        'source': clean_dir or 'synthetic',
+        'seed': seed,
+        'items': items,
+        'total_duration': round(sum(item['duration'] for item in items), 3)
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"参考集生成完成: {len(items)} 条混合音频, 总时长 {manifest['total_duration']:.1f}秒")
+    return manifest
+
+
+def run_model_worker(model_name: str, threads: int, manifest_path: str, enhanced_dir: str,
+                     result_path: str):
+    """
+    子进程入口：在独立进程中加载单个模型并处理整个参考集
+    每个(模型, 线程数)组合使用独立进程，保证峰值内存统计互不干扰
+    """
+    import torch
+
+    torch.set_num_threads(threads)
+
+    config = Config()
+    clearvoice_path = os.path.abspath(config.CLEARVOICE_PATH)
+    if clearvoice_path not in sys.path:
+        sys.path.insert(0, clearvoice_path)
+    from clearvoice import ClearVoice
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    rss_before_load = _get_peak_rss_mb()
+    load_start = time.time()
+    clear_voice = ClearVoice(task='speech_enhancement', model_names=[model_name])
+    load_time = time.time() - load_start
+
+    if enhanced_dir:
+        os.makedirs(enhanced_dir, exist_ok=True)
+
+    per_file = []
+    total_process_time = 0.0
+    for item in manifest['items']:
+        input_path = os.path.join(manifest['noisy_dir'], item['name'])
+        start = time.time()
+        output_wav = clear_voice(input_path=input_path, online_write=False)
+        elapsed = time.time() - start
+        total_process_time += elapsed
+
+        if enhanced_dir:
+            # 与AudioCleaner一致，经write重采样回输入采样率
+            clear_voice.write(output_wav, output_path=os.path.join(enhanced_dir, item['name']))
+
+        per_file.append({
+            'name': item['name'],
+            'duration': item['duration'],
+            'process_time': round(elapsed, 4),
+            'rtf': round(elapsed / item['duration'], 4) if item['duration'] > 0 else None
+        })
+
+    total_duration = manifest['total_duration']
+    result = {
+        'model': model_name,
+        'threads': threads,
+        'device': str(clear_voice.models[0].device),
+        'load_time': round(load_time, 3),
+        'process_time': round(total_process_time, 3),
+        'audio_duration': total_duration,
+        'rtf': round(total_process_time / total_duration, 4) if total_duration > 0 else None,
+        'throughput': round(total_duration / total_process_time, 3) if total_process_time > 0 else None,
+        'peak_rss_mb': round(_get_peak_rss_mb(), 1),
+        'peak_rss_before_load_mb': round(rss_before_load, 1),
+        'files': per_file
+    }
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+def _launch_worker(model_name: str, threads: int, manifest_path: str, enhanced_dir: str,
+                   result_path: str, timeout: int) -> dict:
+    """启动子进程运行单个(模型, 线程数)组合"""
+    env = os.environ.copy()
+    # 同时限制OpenMP/MKL线程，避免torch以外的算子抢占CPU
+    env['OMP_NUM_THREADS'] = str(threads)
+    env['MKL_NUM_THREADS'] = str(threads)
+
+    cmd = [
+        sys.executable, os.path.abspath(__file__), '--worker',
+        '--models', model_name,
+        '--threads', str(threads),
+        '--manifest', manifest_path,
+        '--result', result_path,
+    ]
+    if enhanced_dir:
+        cmd += ['--enhanced-dir', enhanced_dir]
+
+    logger.info(f"运行模型 {model_name} (线程数={threads})...")
+    proc = subprocess.run(cmd, env=env, timeout=timeout)
+    if proc.returncode != 0 or not os.path.exists(result_path):
+        raise RuntimeError(f"模型 {model_name} (线程数={threads}) 运行失败，退出码: {proc.returncode}")
+
+    with open(result_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def score_outputs(test_dir: str, reference_dir: str, metrics: list) -> dict:
+    """
+    使用speechscore对目录中的增强结果打分
+
+    Returns:
+        dict: 各指标的平均分，如 {'PESQ': 2.1, 'DNSMOS': {'OVRL': 2.9, ...}}
+    """
+    if SPEECHSCORE_PATH not in sys.path:
+        sys.path.insert(0, SPEECHSCORE_PATH)
+    from speechscore import SpeechScore
+
+    # DNSMOS的ONNX模型路径相对于speechscore目录
+    cwd = os.getcwd()
+    os.chdir(SPEECHSCORE_PATH)
+    try:
+        scorer = SpeechScore(metrics)
+        scores = scorer(
+            test_path=os.path.abspath(os.path.join(cwd, test_dir)),
+            reference_path=os.path.abspath(os.path.join(cwd, reference_dir)),
+            window=None,
+            score_rate=REFERENCE_SAMPLE_RATE,
+            return_mean=True
+        )
+    finally:
+        os.chdir(cwd)
+
+    return _to_builtin(scores.get('Mean_Score', {}))
+
+
+def _to_builtin(value):
+    """将numpy标量转换为可JSON序列化的Python类型"""
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if isinstance(value, np.generic):
+        return round(value.item(), 4)
+    if isinstance(value, float):
+        return round(value, 4)
+    return value
+
+
+def _format_metric(scores: dict, name: str, key: str = None) -> str:
+    """从得分字典中取出指标并格式化"""
+    value = scores.get(name) if scores else None
+    if isinstance(value, dict):
+        value = value.get(key or 'OVRL')
+    return f"{value:.3f}" if isinstance(value, (int, float)) else '-'
+
+
+def build_summary_table(report: dict) -> str:
+    """生成Markdown格式的汇总表"""
+    lines = [
+        '| 模型 | 线程数 | RTF | 吞吐(x实时) | 峰值RSS(MB) | 加载(s) | PESQ | STOI | SI-SDR | DNSMOS OVRL |',
+        '|------|--------|-----|-------------|-------------|---------|------|------|--------|-------------|',
+    ]
+    noisy_scores = report['scores'].get('noisy', {})
+    lines.append(
+        f"| noisy(输入) | - | - | - | - | - | {_format_metric(noisy_scores, 'PESQ')} | "
+        f"{_format_metric(noisy_scores, 'STOI')} | {_format_metric(noisy_scores, 'SISDR')} | "
+        f"{_format_metric(noisy_scores, 'DNSMOS')} |"
+    )
+    for run in report['runs']:
+        scores = report['scores'].get(run['model'], {})
+        if run.get('error'):
+            lines.append(f"| {run['model']} | {run['threads']} | 失败: {run['error']} | | | | | | | |")
+            continue
+        lines.append(
+            f"| {run['model']} | {run['threads']} | {run['rtf']:.3f} | {run['throughput']:.1f} | "
+            f"{run['peak_rss_mb']:.0f} | {run['load_time']:.1f} | {_format_metric(scores, 'PESQ')} | "
+            f"{_format_metric(scores, 'STOI')} | {_format_metric(scores, 'SISDR')} | "
+            f"{_format_metric(scores, 'DNSMOS')} |"
+        )
+    return '\n'.join(lines)
+
+
+def run_benchmark(args) -> dict:
+    """执行完整的基准测试流程"""
+    output_dir = os.path.abspath(args.output_dir)
+    reference_dir = os.path.join(output_dir, 'reference')
+    runs_dir = os.path.join(output_dir, 'runs')
+    os.makedirs(runs_dir, exist_ok=True)
+
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    threads_list = [int(t) for t in args.threads.split(',') if t.strip()]
+    metrics = [m.strip() for m in args.metrics.split(',') if m.strip()]
+
+    manifest = build_reference_set(
+        reference_dir,
+        clean_dir=args.clean_dir,
+        num_clean=args.num_clean,
+        duration=args.duration,
+        snrs=[float(s) for s in args.snrs.split(',')],
+        seed=args.seed
+    )
+    manifest_path = os.path.join(reference_dir, 'manifest.json')
+
+    runs = []
+    scores = {}
+    for model_name in models:
+        for index, threads in enumerate(threads_list):
+            # 增强结果与线程数无关，只在第一个线程配置下保存用于打分
+            enhanced_dir = os.path.join(output_dir, 'enhanced', model_name) if index == 0 else None
+            result_path = os.path.join(runs_dir, f"{model_name}_t{threads}.json")
+            try:
+                run = _launch_worker(model_name, threads, manifest_path, enhanced_dir,
+                                     result_path, args.timeout)
+                if not args.keep_file_details:
+                    run.pop('files', None)
+                runs.append(run)
+                logger.info(f"{model_name} (线程数={threads}): RTF={run['rtf']}, "
+                            f"吞吐={run['throughput']}x, 峰值RSS={run['peak_rss_mb']}MB")
+            except Exception as e:
+                logger.error(f"{model_name} (线程数={threads}) 测试失败: {e}")
+                runs.append({'model': model_name, 'threads': threads, 'error': str(e)})
+
+        enhanced_model_dir = os.path.join(output_dir, 'enhanced', model_name)
+        if metrics and os.path.isdir(enhanced_model_dir):
+            try:
+                logger.info(f"计算 {model_name} 的质量指标: {', '.join(metrics)}")
+                scores[model_name] = score_outputs(enhanced_model_dir, manifest['clean_dir'], metrics)
+            except Exception as e:
+                logger.error(f"{model_name} 质量评估失败: {e}")
+                scores[model_name] = {'error': str(e)}
+
+    if metrics:
+        try:
+            scores['noisy'] = score_outputs(manifest['noisy_dir'], manifest['clean_dir'], metrics)
+        except Exception as e:
+            logger.error(f"输入音频质量评估失败: {e}")
+            scores['noisy'] = {'error': str(e)}
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+        },
+        'dataset': dict({k: v for k, v in manifest.items() if k != 'items'}, num_items=len(manifest['items'])),
+        'metrics': metrics,
+        'runs': runs,
+        'scores': scores
+    }
+
+    summary = build_summary_table(report)
+    with open(os.path.join(output_dir, 'report.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(output_dir, 'summary.md'), 'w', encoding='utf-8') as f:
+        f.write(summary + '\n')
+
+    logger.info("基准测试汇总:\n" + summary)
+    logger.info(f"完整报告: {os.path.join(output_dir, 'report.json')}")
+    return report
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='ClearVoice语音增强模型基准测试')
+    parser.add_argument('--models', default=','.join(DEFAULT_MODELS), help='逗号分隔的模型列表')
+    parser.add_argument('--threads', default='1,2,4', help='逗号分隔的CPU线程数列表')
+    parser.add_argument('--metrics', default=','.join(DEFAULT_METRICS), help='逗号分隔的speechscore指标，为空则不打分')
+    parser.add_argument('--clean-dir', default=None, help='纯净语音目录（wav/flac），为空时使用合成语音')
+    parser.add_argument('--num-clean', type=int, default=4, help='使用的纯净语音条数')
+    parser.add_argument('--duration', type=float, default=10.0, help='每条参考语音时长（秒）')
+    parser.add_argument('--snrs', default='0,5,10', help='逗号分隔的混合信噪比(dB)')
+    parser.add_argument('--seed', type=int, default=2024, help='随机种子')
+    parser.add_argument('--output-dir', default='benchmark_output', help='报告输出目录')
+    parser.add_argument('--timeout', type=int, default=3600, help='单个模型运行超时（秒）')
+    parser.add_argument('--keep-file-details', action='store_true', help='在报告中保留逐文件耗时')
+    # 子进程内部参数
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--manifest', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    parser.add_argument('--enhanced-dir', default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+
+    if args.worker:
+        run_model_worker(args.models, int(args.threads), args.manifest, args.enhanced_dir, args.result)
+        return True
+
+    logger.info("开始ClearVoice模型基准测试")
+    logger.info("=" * 50)
+    report = run_benchmark(args)
+    return all('error' not in run for run in report['runs'])
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
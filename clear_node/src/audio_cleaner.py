@@ -5,16 +5,25 @@
 
 import os
 import sys
+import threading
 from pathlib import Path
 from config import Config
 from logger import logger
+from snr_estimator import SNREstimator
+from model_pool import ModelPool
 
 class AudioCleaner:
     """音频清理器"""
     
     def __init__(self):
         self.config = Config()
-        self.clear_voice = None
+        self.model_pool = None
+        self._metrics_lock = threading.Lock()
+        self.model_metrics = {}
+        self.snr_estimator = SNREstimator(
+            num_blocks=self.config.SNR_SAMPLE_BLOCKS,
+            block_duration=self.config.SNR_BLOCK_DURATION
+        )
         self._init_clearvoice()
         
     def _init_clearvoice(self):
@@ -29,20 +38,22 @@ class AudioCleaner:
             device_info = self._detect_compute_device()
             logger.info(f"计算设备检测: {device_info}")
             
-            # 导入ClearVoice
-            from clearvoice import ClearVoice
-            
-            # 初始化ClearVoice实例
-            self.clear_voice = ClearVoice(
+            # 初始化模型常驻池，并预加载默认模型
+            self.model_pool = ModelPool(
                 task=self.config.CLEAR_TASK,
-                model_names=[self.config.CLEAR_MODEL]
+                memory_budget_mb=self.config.MODEL_MEMORY_BUDGET_MB
             )
+            self.model_pool.get(self.config.CLEAR_MODEL)
             
             # 获取模型实际使用的设备
             actual_device = self._get_model_device()
             
             logger.info(f"ClearVoice初始化成功 - 模型: {self.config.CLEAR_MODEL}, 任务: {self.config.CLEAR_TASK}")
             logger.info(f"模型运行设备: {actual_device}")
+            if self.config.CLEAR_MODEL_ROUTING:
+                logger.info(f"模型路由已启用 - 轻度噪声: {self.config.CLEAR_MODEL_LIGHT}, "
+                           f"重度噪声: {self.config.CLEAR_MODEL_HEAVY}, 超长音频: {self.config.CLEAR_MODEL_LONG}, "
+                           f"内存预算: {self.config.MODEL_MEMORY_BUDGET_MB}MB")
             
         except Exception as e:
             logger.error(f"ClearVoice初始化失败: {e}")
@@ -78,8 +89,11 @@ class AudioCleaner:
         """获取模型实际使用的设备"""
         try:
             # 尝试从ClearVoice模型中获取设备信息
-            if hasattr(self.clear_voice, 'model'):
-                model = self.clear_voice.model
+            # 常驻池中的模型不持有额外引用，避免LRU卸载后内存无法释放
+            clear_voice = self.model_pool.get(self.config.CLEAR_MODEL) if self.model_pool else None
+            speech_models = getattr(clear_voice, 'models', [])
+            if speech_models and hasattr(speech_models[0], 'model'):
+                model = speech_models[0].model
                 if hasattr(model, 'device'):
                     return f"模型设备: {model.device}"
                 elif hasattr(model, 'parameters'):
@@ -136,7 +150,7 @@ class AudioCleaner:
         except Exception as e:
             return f"获取设备使用情况失败: {str(e)}"
     
-    def clean_audio(self, input_path: str, output_path: str = None, timeout: int = 3600) -> str:
+    def clean_audio(self, input_path: str, output_path: str = None, timeout: int = 3600, model_name: str = None) -> str:
         """
         清理音频文件
         
@@ -144,6 +158,7 @@ class AudioCleaner:
             input_path (str): 输入音频文件路径
             output_path (str, optional): 输出音频文件路径
             timeout (int): 处理超时时间（秒），默认1小时
+            model_name (str, optional): 使用的降噪模型，默认为 CLEAR_MODEL
             
         Returns:
             str: 清理后的音频文件路径
@@ -179,7 +194,10 @@ class AudioCleaner:
             # 确保输出目录存在
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            logger.info(f"开始降噪音频: {input_path} -> {output_path}")
+            model_name = model_name or self.config.CLEAR_MODEL
+            clear_voice = self.model_pool.get(model_name)
+            
+            logger.info(f"开始降噪音频: {input_path} -> {output_path} (模型: {model_name})")
             logger.info(f"设置处理超时: {timeout}秒")
             
             # 获取音频信息用于估算处理时间
@@ -226,14 +244,14 @@ class AudioCleaner:
                     # Windows系统的处理方式
                     import concurrent.futures
                     with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(self.clear_voice, input_path=input_path, online_write=False)
+                        future = executor.submit(clear_voice, input_path=input_path, online_write=False)
                         try:
                             output_wav = future.result(timeout=timeout)
                         except concurrent.futures.TimeoutError:
                             raise TimeoutError(f"音频处理超时（超过{timeout}秒）")
                 else:
                     # Unix/Linux系统的处理方式
-                    output_wav = self.clear_voice(input_path=input_path, online_write=False)
+                    output_wav = clear_voice(input_path=input_path, online_write=False)
                 
                 # 记录处理时间
                 process_time = time.time() - start_time
@@ -252,7 +270,7 @@ class AudioCleaner:
                     timer.cancel()
             
             # 写入输出文件
-            self.clear_voice.write(output_wav, output_path=output_path)
+            clear_voice.write(output_wav, output_path=output_path)
             
             # 验证输出文件是否创建成功
             if not os.path.exists(output_path):
@@ -364,6 +382,127 @@ class AudioCleaner:
             logger.error(f"获取音频信息失败: {e}")
             return {}
     
+    def estimate_quality(self, audio_path: str) -> dict:
+        """
+        估计音频质量（无参考信噪比），用于判断是否可以跳过降噪
+        
+        Args:
+            audio_path (str): 音频文件路径
+            
+        Returns:
+            dict: 质量估计结果，包含 snr_db、is_clean 等字段
+        """
+        try:
+            quality = self.snr_estimator.estimate_file(audio_path)
+        except Exception as e:
+            logger.warning(f"音频信噪比估计失败，按需降噪处理: {e}")
+            quality = {'snr_db': None, 'method': 'wada_snr', 'blocks': 0, 'sampled_duration': 0.0}
+        
+        snr_db = quality.get('snr_db')
+        quality['threshold'] = self.config.SKIP_CLEAN_SNR_THRESHOLD
+        quality['is_clean'] = snr_db is not None and snr_db >= self.config.SKIP_CLEAN_SNR_THRESHOLD
+        return quality
+    
+    def select_model(self, snr_db: float = None, duration: float = 0) -> tuple:
+        """
+        根据估计噪声水平和音频时长选择降噪模型
+        
+        Args:
+            snr_db (float, optional): 估计信噪比（dB），无法估计时为None
+            duration (float): 音频时长（秒）
+            
+        Returns:
+            tuple: (模型名称, 选择原因)
+        """
+        if not self.config.CLEAR_MODEL_ROUTING:
+            return self.config.CLEAR_MODEL, 'default'
+        
+        # 超长音频优先考虑处理开销
+        if duration >= self.config.LONG_AUDIO_DURATION:
+            return self.config.CLEAR_MODEL_LONG, 'long_audio'
+        if snr_db is None:
+            return self.config.CLEAR_MODEL, 'unknown_snr'
+        if snr_db < self.config.HEAVY_NOISE_SNR_THRESHOLD:
+            return self.config.CLEAR_MODEL_HEAVY, 'heavy_noise'
+        return self.config.CLEAR_MODEL_LIGHT, 'mild_noise'
+    
+    def record_model_usage(self, model_name: str, route: str, audio_duration: float, processing_time: float) -> dict:
+        """
+        记录模型使用情况，用于跟踪各模型的处理开销
+        
+        Args:
+            model_name (str): 使用的模型（跳过降噪时为 passthrough）
+            route (str): 模型选择原因
+            audio_duration (float): 音频时长（秒）
+            processing_time (float): 处理耗时（秒）
+            
+        Returns:
+            dict: 该模型的累计指标
+        """
+        with self._metrics_lock:
+            metrics = self.model_metrics.setdefault(model_name, {
+                'tasks': 0,
+                'audio_seconds': 0.0,
+                'processing_seconds': 0.0,
+                'routes': {}
+            })
+            metrics['tasks'] += 1
+            metrics['audio_seconds'] += audio_duration
+            metrics['processing_seconds'] += processing_time
+            metrics['routes'][route] = metrics['routes'].get(route, 0) + 1
+            return dict(metrics, routes=dict(metrics['routes']))
+    
+    def get_model_metrics(self) -> dict:
+        """
+        获取模型路由和常驻池的累计指标
+        
+        Returns:
+            dict: 各模型的任务数、音频时长、处理耗时、实时率，以及常驻池状态
+        """
+        with self._metrics_lock:
+            models = {}
+            for name, metrics in self.model_metrics.items():
+                audio_seconds = metrics['audio_seconds']
+                models[name] = {
+                    'tasks': metrics['tasks'],
+                    'audio_seconds': round(audio_seconds, 2),
+                    'processing_seconds': round(metrics['processing_seconds'], 2),
+                    'rtf': round(metrics['processing_seconds'] / audio_seconds, 4) if audio_seconds > 0 else None,
+                    'routes': dict(metrics['routes'])
+                }
+        
+        return {
+            'models': models,
+            'resident_models': self.model_pool.loaded_models() if self.model_pool else {},
+            'pool_stats': dict(self.model_pool.stats) if self.model_pool else {}
+        }
+    
+    def passthrough_audio(self, input_path: str, output_path: str) -> str:
+        """
+        跳过降噪直接输出音频：格式一致时直接复制，否则仅做格式转换
+        
+        Args:
+            input_path (str): 输入音频文件路径
+            output_path (str): 输出音频文件路径
+            
+        Returns:
+            str: 输出音频文件路径
+        """
+        import shutil
+        
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        input_ext = Path(input_path).suffix.lower().lstrip('.')
+        
+        if input_ext == self.config.OUTPUT_FORMAT.lower():
+            shutil.copyfile(input_path, output_path)
+            logger.info(f"音频已足够纯净，直接复制: {input_path} -> {output_path}")
+        else:
+            from pydub import AudioSegment
+            AudioSegment.from_file(input_path).export(output_path, format=self.config.OUTPUT_FORMAT)
+            logger.info(f"音频已足够纯净，仅转换格式: {input_path} -> {output_path}")
+        
+        return output_path
+    
     def _format_size(self, size_bytes: int) -> str:
         """
         格式化文件大小
@@ -383,7 +522,8 @@ class AudioCleaner:
         else:
             return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
     
-    def clean_audio_with_chunking(self, input_path: str, output_path: str = None, chunk_duration: int = None) -> str:
+    def clean_audio_with_chunking(self, input_path: str, output_path: str = None, chunk_duration: int = None,
+                                  model_name: str = None) -> str:
         """
         分块处理大音频文件
         
@@ -391,6 +531,7 @@ class AudioCleaner:
             input_path (str): 输入音频文件路径
             output_path (str, optional): 输出音频文件路径
             chunk_duration (int, optional): 分块时长（秒）
+            model_name (str, optional): 使用的降噪模型，默认为 CLEAR_MODEL
             
         Returns:
             str: 清理后的音频文件路径
@@ -439,7 +580,8 @@ class AudioCleaner:
                 
                 # 为分块设置较短的超时时间（分块时长 * 10）
                 chunk_timeout = max(chunk_duration * 10, 300)  # 最少5分钟
-                cleaned_chunk_path = self.clean_audio(chunk_temp_path, chunk_output_path, timeout=chunk_timeout)
+                cleaned_chunk_path = self.clean_audio(chunk_temp_path, chunk_output_path, timeout=chunk_timeout,
+                                                      model_name=model_name)
                 
                 # 加载处理后的块
                 cleaned_chunk, _ = librosa.load(cleaned_chunk_path, sr=sr)
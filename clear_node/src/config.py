@@ -41,6 +41,21 @@ class Config:
     OUTPUT_FORMAT = os.getenv('OUTPUT_FORMAT', 'wav')  # 输出格式
     SAMPLE_RATE = int(os.getenv('SAMPLE_RATE', 16000))  # 采样率
     
+    # 分级模型路由配置（按估计噪声水平和音频时长为每个任务选择模型）
+    CLEAR_MODEL_ROUTING = os.getenv('CLEAR_MODEL_ROUTING', 'true').lower() == 'true'
+    CLEAR_MODEL_LIGHT = os.getenv('CLEAR_MODEL_LIGHT', 'FRCRN_SE_16K')  # 轻度噪声使用的快速模型
+    CLEAR_MODEL_HEAVY = os.getenv('CLEAR_MODEL_HEAVY', 'MossFormerGAN_SE_16K')  # 重度噪声使用的高质量模型
+    CLEAR_MODEL_LONG = os.getenv('CLEAR_MODEL_LONG', 'FRCRN_SE_16K')  # 超长音频使用的低开销模型
+    HEAVY_NOISE_SNR_THRESHOLD = float(os.getenv('HEAVY_NOISE_SNR_THRESHOLD', 10.0))  # 估计信噪比(dB)低于该值视为重度噪声
+    LONG_AUDIO_DURATION = int(os.getenv('LONG_AUDIO_DURATION', 1200))  # 超过该时长（秒）视为超长音频
+    MODEL_MEMORY_BUDGET_MB = int(os.getenv('MODEL_MEMORY_BUDGET_MB', 2048))  # 常驻模型内存预算（MB），超出时按LRU卸载
+
+    # 纯净音频跳过降噪配置
+    SKIP_CLEAN_ENABLED = os.getenv('SKIP_CLEAN_ENABLED', 'true').lower() == 'true'
+    SKIP_CLEAN_SNR_THRESHOLD = float(os.getenv('SKIP_CLEAN_SNR_THRESHOLD', 30.0))  # 估计信噪比(dB)不低于该值时跳过降噪
+    SNR_SAMPLE_BLOCKS = int(os.getenv('SNR_SAMPLE_BLOCKS', 20))  # 信噪比估计抽样块数
+    SNR_BLOCK_DURATION = float(os.getenv('SNR_BLOCK_DURATION', 3.0))  # 每个抽样块时长（秒）
+
     # 处理限制配置
     MAX_AUDIO_DURATION = int(os.getenv('MAX_AUDIO_DURATION', 1800))  # 最大音频时长（秒），默认30分钟
     PROCESSING_TIMEOUT = int(os.getenv('PROCESSING_TIMEOUT', 3600))  # 处理超时（秒），默认1小时
@@ -68,6 +83,7 @@ class Config:
         工作目录: {self.WORK_DIR}
         临时目录: {self.TEMP_DIR}
         清理模型: {self.CLEAR_MODEL}
+        模型路由: {self.CLEAR_MODEL_ROUTING}
         清理任务: {self.CLEAR_TASK}
         输出格式: {self.OUTPUT_FORMAT}
         采样率: {self.SAMPLE_RATE}
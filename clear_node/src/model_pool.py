@@ -0,0 +1,122 @@
+"""
+模型常驻池模块
+按内存预算同时常驻多个ClearVoice降噪模型，超出预算时按LRU顺序卸载
+"""
+
+import gc
+import threading
+from collections import OrderedDict
+from logger import logger
+
+
+class ModelPool:
+    """ClearVoice模型常驻池"""
+
+    def __init__(self, task: str, memory_budget_mb: int):
+        """
+        Args:
+            task (str): ClearVoice任务类型
+            memory_budget_mb (int): 常驻模型的内存预算（MB），按模型参数和缓冲区大小计算
+        """
+        self.task = task
+        self.memory_budget_mb = memory_budget_mb
+        self._models = OrderedDict()  # 模型名 -> (ClearVoice实例, 占用MB)，按最近使用排序
+        self._known_sizes = {}  # 卸载过的模型的占用，用于加载前预先腾出空间
+        self._lock = threading.RLock()
+        self.stats = {
+            'hits': 0,
+            'loads': 0,
+            'evictions': 0
+        }
+
+    def get(self, model_name: str):
+        """
+        获取模型实例，未加载时按需加载
+
+        Args:
+            model_name (str): 模型名称，如 FRCRN_SE_16K
+
+        Returns:
+            ClearVoice: 只包含该模型的ClearVoice实例
+        """
+        with self._lock:
+            if model_name in self._models:
+                self._models.move_to_end(model_name)
+                self.stats['hits'] += 1
+                return self._models[model_name][0]
+
+            # 已知占用的模型先腾出空间，避免加载时内存峰值超出预算
+            if model_name in self._known_sizes:
+                self._evict_to_fit(self._known_sizes[model_name])
+
+            clear_voice = self._load(model_name)
+            size_mb = self._estimate_size_mb(clear_voice)
+            self._models[model_name] = (clear_voice, size_mb)
+            self._known_sizes[model_name] = size_mb
+            self.stats['loads'] += 1
+            logger.info(f"模型已加载: {model_name} (约{size_mb:.1f}MB), 常驻占用: {self.resident_mb:.1f}/{self.memory_budget_mb}MB")
+
+            self._evict_to_fit(0, keep=model_name)
+            return clear_voice
+
+    def unload(self, model_name: str):
+        """卸载指定模型并释放内存"""
+        with self._lock:
+            entry = self._models.pop(model_name, None)
+            if entry is None:
+                return
+            del entry
+            self._release_memory()
+            logger.info(f"模型已卸载: {model_name}, 常驻占用: {self.resident_mb:.1f}/{self.memory_budget_mb}MB")
+
+    @property
+    def resident_mb(self) -> float:
+        """当前常驻模型的总占用（MB）"""
+        return sum(size for _, size in self._models.values())
+
+    def loaded_models(self) -> dict:
+        """当前常驻的模型及其占用，按最近使用从旧到新排列"""
+        with self._lock:
+            return {name: round(size, 1) for name, (_, size) in self._models.items()}
+
+    def _evict_to_fit(self, needed_mb: float, keep: str = None):
+        """按LRU顺序卸载模型，直到腾出 needed_mb 空间；keep 指定的模型不会被卸载"""
+        while self._models and self.resident_mb + needed_mb > self.memory_budget_mb:
+            victim = next((name for name in self._models if name != keep), None)
+            if victim is None:
+                if needed_mb == 0:
+                    logger.warning(f"模型 {keep} 单独占用已超过内存预算 {self.memory_budget_mb}MB")
+                break
+            self.stats['evictions'] += 1
+            logger.info(f"超出模型内存预算，按LRU卸载: {victim}")
+            self.unload(victim)
+
+    def _load(self, model_name: str):
+        """加载ClearVoice模型"""
+        from clearvoice import ClearVoice
+
+        logger.info(f"正在加载模型: {model_name}")
+        return ClearVoice(task=self.task, model_names=[model_name])
+
+    @staticmethod
+    def _estimate_size_mb(clear_voice) -> float:
+        """按参数和缓冲区估算模型占用（不含推理时的中间激活）"""
+        total_bytes = 0
+        for speech_model in getattr(clear_voice, 'models', []):
+            module = getattr(speech_model, 'model', None)
+            if module is None or not hasattr(module, 'parameters'):
+                continue
+            for tensor in list(module.parameters()) + list(module.buffers()):
+                total_bytes += tensor.numel() * tensor.element_size()
+        return total_bytes / (1024 * 1024)
+
+    @staticmethod
+    def _release_memory():
+        """回收被卸载模型占用的内存"""
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
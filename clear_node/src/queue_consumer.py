@@ -165,22 +165,27 @@ class QueueConsumer:
                 'file_name': result.get('output_filename', ''),
                 'duration': result.get('output_duration', 0),
                 'processing_time': result.get('processing_time', 0),
-                'model_used': self.config.CLEAR_MODEL,
+                'model_used': result.get('model_used', self.config.CLEAR_MODEL),
+                'model_route': result.get('model_route', 'default'),
+                'rtf': result.get('rtf'),
                 'input_size': result.get('input_size', 0),
-                'quality_improvement': result.get('quality_improvement', 'N/A')
+                'quality_improvement': result.get('quality_improvement', 'N/A'),
+                'skipped_clean': result.get('skipped_clean', False),
+                'estimated_snr': result.get('estimated_snr')
             }
             
             self.api_client.send_callback(
                 task_id=task_id,
                 task_type=2,  # 音频降噪任务类型
                 status='success',
-                message='音频降噪处理完成',
+                message='音频已足够纯净，跳过降噪' if callback_data['skipped_clean'] else '音频降噪处理完成',
                 data=callback_data
             )
             
             # 确认消息
             channel.basic_ack(delivery_tag=method.delivery_tag)
             logger.info(f"任务 {task_id}: 处理完成")
+            logger.info(f"模型路由指标: {json.dumps(self.audio_cleaner.get_model_metrics(), ensure_ascii=False)}")
             
         except json.JSONDecodeError as e:
             logger.error(f"消息格式错误: {e}")
@@ -261,30 +266,50 @@ class QueueConsumer:
             audio_duration = input_info.get('duration', 0)
             use_chunking = audio_duration > self.config.MAX_AUDIO_DURATION
             
-            if use_chunking:
-                logger.warning(f"任务 {task_id}: 音频时长 {audio_duration:.2f}秒 超过限制 {self.config.MAX_AUDIO_DURATION}秒")
-                logger.info(f"任务 {task_id}: 将使用分块处理模式 (分块时长: {self.config.CHUNK_DURATION}秒)")
-            
-            # 执行音频降噪
-            logger.info(f"任务 {task_id}: 开始音频降噪处理: {input_path} -> {output_path}")
-            logger.info(f"任务 {task_id}: 使用模型: {self.config.CLEAR_MODEL}")
-            logger.info(f"任务 {task_id}: 处理模式: {'分块处理' if use_chunking else '整体处理'}")
-            logger.info(f"任务 {task_id}: 处理超时设置: {self.config.PROCESSING_TIMEOUT}秒")
-            
-            if use_chunking:
-                # 使用分块处理
-                cleaned_path = self.audio_cleaner.clean_audio_with_chunking(
-                    input_path, 
-                    output_path, 
-                    chunk_duration=self.config.CHUNK_DURATION
-                )
+            # 估计输入音频质量，已足够纯净时跳过降噪，否则按噪声水平和时长选择模型
+            quality = {'snr_db': None, 'is_clean': False}
+            if self.config.SKIP_CLEAN_ENABLED or self.config.CLEAR_MODEL_ROUTING:
+                quality = self.audio_cleaner.estimate_quality(input_path)
+                logger.info(f"任务 {task_id}: 估计信噪比: {quality.get('snr_db')} dB "
+                           f"(阈值: {self.config.SKIP_CLEAN_SNR_THRESHOLD} dB, 抽样块数: {quality.get('blocks', 0)})")
+            skipped_clean = self.config.SKIP_CLEAN_ENABLED and quality.get('is_clean', False)
+            
+            if skipped_clean:
+                model_used, model_route = 'passthrough', 'clean_audio'
             else:
-                # 使用整体处理
-                cleaned_path = self.audio_cleaner.clean_audio(
-                    input_path, 
-                    output_path, 
-                    timeout=self.config.PROCESSING_TIMEOUT
-                )
+                model_used, model_route = self.audio_cleaner.select_model(quality.get('snr_db'), audio_duration)
+            logger.info(f"任务 {task_id}: 选择模型: {model_used} (原因: {model_route})")
+            
+            if skipped_clean:
+                logger.info(f"任务 {task_id}: 音频已足够纯净，跳过降噪")
+                cleaned_path = self.audio_cleaner.passthrough_audio(input_path, output_path)
+            else:
+                if use_chunking:
+                    logger.warning(f"任务 {task_id}: 音频时长 {audio_duration:.2f}秒 超过限制 {self.config.MAX_AUDIO_DURATION}秒")
+                    logger.info(f"任务 {task_id}: 将使用分块处理模式 (分块时长: {self.config.CHUNK_DURATION}秒)")
+                
+                # 执行音频降噪
+                logger.info(f"任务 {task_id}: 开始音频降噪处理: {input_path} -> {output_path}")
+                logger.info(f"任务 {task_id}: 使用模型: {model_used}")
+                logger.info(f"任务 {task_id}: 处理模式: {'分块处理' if use_chunking else '整体处理'}")
+                logger.info(f"任务 {task_id}: 处理超时设置: {self.config.PROCESSING_TIMEOUT}秒")
+                
+                if use_chunking:
+                    # 使用分块处理
+                    cleaned_path = self.audio_cleaner.clean_audio_with_chunking(
+                        input_path, 
+                        output_path, 
+                        chunk_duration=self.config.CHUNK_DURATION,
+                        model_name=model_used
+                    )
+                else:
+                    # 使用整体处理
+                    cleaned_path = self.audio_cleaner.clean_audio(
+                        input_path, 
+                        output_path, 
+                        timeout=self.config.PROCESSING_TIMEOUT,
+                        model_name=model_used
+                    )
             
             # 验证输出文件
             if not os.path.exists(cleaned_path) or os.path.getsize(cleaned_path) == 0:
@@ -307,6 +332,11 @@ class QueueConsumer:
             
             # 计算处理时间和质量改进指标
             processing_time = time.time() - start_time
+            model_metrics = self.audio_cleaner.record_model_usage(
+                model_used, model_route, input_info.get('duration', 0), processing_time
+            )
+            logger.info(f"任务 {task_id}: 模型累计指标 {model_used}: 任务数={model_metrics['tasks']}, "
+                       f"音频时长={model_metrics['audio_seconds']:.1f}秒, 处理耗时={model_metrics['processing_seconds']:.1f}秒")
             
             # 简单的质量改进评估（基于文件大小变化）
             input_size = input_info.get('file_size', 0)
@@ -325,8 +355,12 @@ class QueueConsumer:
                 'output_size': output_size,
                 'input_duration': input_info.get('duration', 0),
                 'output_duration': output_info.get('duration', 0),
-                'model_used': self.config.CLEAR_MODEL,
+                'model_used': model_used,
+                'model_route': model_route,
+                'rtf': round(processing_time / audio_duration, 4) if audio_duration > 0 else None,
                 'task_type': self.config.CLEAR_TASK,
+                'skipped_clean': skipped_clean,
+                'estimated_snr': quality.get('snr_db'),
                 'quality_improvement': f"文件大小变化: {size_change_percent:+.1f}%",
                 'upload_info': {
                     'file_name': file_info.get('origin_name', ''),
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+FRCRN STFT/iSTFT 快速路径测试脚本
+验证基于FFT的实现与原卷积实现数值一致
+"""
+
+import os
+import sys
+import time
+
+import torch
+
+# 添加ClearVoice路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'ClearerVoice-Studio', 'clearvoice'))
+
+from clearvoice.models.frcrn_se.conv_stft import ConvSTFT, ConviSTFT
+from clearvoice.models.frcrn_se.frcrn import DCCRN
+
+# FRCRN_SE_16K 推理配置：win_len=640, win_inc=320, fft_len=640, hanning窗
+WIN_LEN = 640
+WIN_INC = 320
+FFT_LEN = 640
+RTOL = 1e-5
+
+
+def _relative_error(a: torch.Tensor, b: torch.Tensor) -> float:
+    """以参考输出的峰值为基准的最大相对误差"""
+    return ((a - b).abs().max() / b.abs().max()).item()
+
+
+def test_stft_equivalence():
+    """测试ConvSTFT的FFT路径与卷积路径输出一致"""
+    torch.manual_seed(0)
+    stft = ConvSTFT(WIN_LEN, WIN_INC, FFT_LEN, 'hanning', feature_type='complex')
+    assert stft.fft_available(), "FRCRN配置下应启用FFT路径"
+
+    inputs = torch.randn(2, 1, 16000 * 5)
+    fft_out = stft(inputs)
+    stft.use_fft = False
+    conv_out = stft(inputs)
+
+    assert fft_out.shape == conv_out.shape, f"形状不一致: {fft_out.shape} vs {conv_out.shape}"
+    error = _relative_error(fft_out, conv_out)
+    assert error < RTOL, f"STFT相对误差过大: {error}"
+    print(f"STFT 相对误差: {error:.2e}")
+
+
+def test_istft_equivalence():
+    """测试ConviSTFT的FFT路径与转置卷积路径输出一致（包括任意复数谱输入）"""
+    torch.manual_seed(0)
+    istft = ConviSTFT(WIN_LEN, WIN_INC, FFT_LEN, 'hanning', feature_type='complex')
+    assert istft.fft_available(), "FRCRN配置下应启用FFT路径"
+
+    # 模型输出的谱不一定满足共轭对称，直流和奈奎斯特分量的虚部也要覆盖
+    spec = torch.randn(2, FFT_LEN + 2, 250)
+    fft_out = istft(spec)
+    istft.use_fft = False
+    conv_out = istft(spec)
+
+    assert fft_out.shape == conv_out.shape, f"形状不一致: {fft_out.shape} vs {conv_out.shape}"
+    error = _relative_error(fft_out, conv_out)
+    assert error < RTOL, f"iSTFT相对误差过大: {error}"
+    print(f"iSTFT 相对误差: {error:.2e}")
+
+
+def test_fallback_when_not_equivalent():
+    """测试窗长小于FFT长度或卷积核可训练时回退到卷积实现"""
+    assert not ConvSTFT(320, 160, 512, 'hanning', feature_type='complex').fft_available()
+    assert not ConviSTFT(320, 160, 512, 'hanning', feature_type='complex').fft_available()
+    assert not ConvSTFT(WIN_LEN, WIN_INC, FFT_LEN, 'hanning', feature_type='complex', fix=False).fft_available()
+
+
+def test_frcrn_inference_equivalence():
+    """测试完整FRCRN前向在两种实现下输出一致（随机权重）"""
+    torch.manual_seed(0)
+    model = DCCRN(complex=True, model_complexity=45, model_depth=14, log_amp=False, padding_mode="zeros",
+                  win_len=WIN_LEN, win_inc=WIN_INC, fft_len=FFT_LEN, win_type='hanning').eval()
+    inputs = torch.randn(2, 16000 * 2) * 0.1
+
+    with torch.no_grad():
+        start = time.time()
+        fft_out = model.inference(inputs, return_batch=True)
+        fft_time = time.time() - start
+
+        model.stft.use_fft = model.istft.use_fft = False
+        start = time.time()
+        conv_out = model.inference(inputs, return_batch=True)
+        conv_time = time.time() - start
+
+    error = _relative_error(fft_out, conv_out)
+    assert error < 1e-4, f"FRCRN输出相对误差过大: {error}"
+    print(f"FRCRN 相对误差: {error:.2e}, 耗时 FFT: {fft_time:.3f}秒, 卷积: {conv_time:.3f}秒")
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("STFT等价性", test_stft_equivalence),
+        ("iSTFT等价性", test_istft_equivalence),
+        ("回退条件", test_fallback_when_not_equivalent),
+        ("FRCRN前向等价性", test_frcrn_inference_equivalence),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+信噪比估计测试脚本
+验证短于一个抽样块的文件按实际长度估计（与 estimate_array 一致，不因补零被推到100dB），
+以及数字静音（恰好为0的采样点）不影响WADA-SNR的估计值
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# 添加src路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from snr_estimator import SNREstimator, wada_snr
+
+SAMPLE_RATE = 16000
+
+
+def _noisy_speech(duration: float, noise_std: float = 0.1, seed: int = 0) -> np.ndarray:
+    """语音状的调幅谐波叠加高斯噪声"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = np.abs(np.sin(2 * np.pi * 3 * t))
+    speech = 0.1 * envelope * sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+    return (speech + rng.normal(0, noise_std, len(t))).astype(np.float32)
+
+
+def test_short_file_matches_array():
+    """测试短于一个块（1.5秒）的含噪文件，estimate_file 与 estimate_array 的结果一致且不为100dB"""
+    estimator = SNREstimator(num_blocks=20, block_duration=3.0)
+    audio = _noisy_speech(1.5)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'short.wav')
+        sf.write(path, audio, SAMPLE_RATE, subtype='FLOAT')
+        from_file = estimator.estimate_file(path)
+    from_array = estimator.estimate_array(audio, SAMPLE_RATE)
+
+    assert from_file['snr_db'] is not None and from_file['snr_db'] < 20, from_file
+    assert abs(from_file['snr_db'] - from_array['snr_db']) < 0.01, (from_file, from_array)
+    assert from_file['sampled_duration'] == from_array['sampled_duration'] == 1.5
+
+
+def test_long_file_matches_array():
+    """测试多个抽样块的文件，按位置读取与数组抽样的估计结果一致"""
+    estimator = SNREstimator(num_blocks=5, block_duration=3.0)
+    audio = _noisy_speech(40.0, noise_std=0.02, seed=1)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'long.wav')
+        sf.write(path, audio, SAMPLE_RATE, subtype='FLOAT')
+        from_file = estimator.estimate_file(path)
+    from_array = estimator.estimate_array(audio, SAMPLE_RATE)
+
+    assert from_file['blocks'] == from_array['blocks'] == 5
+    assert abs(from_file['snr_db'] - from_array['snr_db']) < 0.01, (from_file, from_array)
+
+
+def test_digital_silence_ignored():
+    """测试块内插入数字静音后估计值基本不变，全零块仍为最低值"""
+    audio = _noisy_speech(3.0)
+    with_silence = np.concatenate([np.zeros(SAMPLE_RATE, dtype=np.float32), audio, np.zeros(SAMPLE_RATE, dtype=np.float32)])
+
+    original, padded = wada_snr(audio)[0], wada_snr(with_silence)[0]
+    assert abs(original - padded) < 0.01, (original, padded)
+    assert padded < 20, padded
+    assert wada_snr(np.zeros(SAMPLE_RATE))[0] == -20
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("短文件与数组估计一致", test_short_file_matches_array),
+        ("长文件与数组估计一致", test_long_file_matches_array),
+        ("忽略数字静音", test_digital_silence_ignored),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
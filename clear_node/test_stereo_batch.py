@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+立体声降噪处理测试脚本
+验证双声道相同（dual-mono）的音频降为单声道处理、真立体声仍逐声道处理，
+FRCRN按 [2, T] 批量解码与逐声道解码一致，以及处理后的输出形状和声道数不变
+"""
+
+import os
+import sys
+import tempfile
+from argparse import Namespace
+
+import numpy as np
+import soundfile as sf
+import torch
+
+# 添加ClearVoice路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'ClearerVoice-Studio', 'clearvoice'))
+
+from clearvoice.dataloader.dataloader import audioread, is_redundant_stereo
+from clearvoice.models.frcrn_se.frcrn import DCCRN
+from clearvoice.networks import SpeechModel
+from clearvoice.utils.decode import decode_one_audio
+
+SAMPLE_RATE = 16000
+# 批量与逐声道解码的最大允许相对误差（以逐声道输出峰值为基准，float32随机权重下实测约6e-6）
+RTOL = 1e-4
+
+
+def _make_args(one_time_decode_length: float = 120.0) -> Namespace:
+    """FRCRN_SE_16K 推理配置"""
+    return Namespace(task='speech_enhancement', network='FRCRN_SE_16K', sampling_rate=SAMPLE_RATE,
+                     one_time_decode_length=one_time_decode_length, decode_window=1.0,
+                     win_type='hanning', win_len=640, win_inc=320, fft_len=640, use_cuda=0)
+
+
+def _make_model() -> DCCRN:
+    """随机权重的FRCRN"""
+    torch.manual_seed(0)
+    return DCCRN(complex=True, model_complexity=45, model_depth=14, log_amp=False, padding_mode="zeros",
+                 win_len=640, win_inc=320, fft_len=640, win_type='hanning').eval()
+
+
+def _make_channels(seconds: float, seed: int = 0) -> tuple:
+    """两路不相关的带噪“语音”信号"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    left = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t)) + 0.05 * rng.standard_normal(len(t))
+    right = 0.3 * np.sin(2 * np.pi * 330 * t) * (1 + np.cos(2 * np.pi * 2 * t)) + 0.05 * rng.standard_normal(len(t))
+    return left, right
+
+
+def _write_stereo(path: str, left: np.ndarray, right: np.ndarray):
+    sf.write(path, np.stack([left, right], axis=1), SAMPLE_RATE, subtype='PCM_16')
+
+
+def test_dual_mono_detection():
+    """测试双声道相同（含极小差异）时判定为dual-mono并降为单声道，真立体声和声道电平差大时不降混"""
+    left, right = _make_channels(2.0)
+    rng = np.random.default_rng(1)
+    assert is_redundant_stereo(left, left)
+    assert is_redundant_stereo(left, left + 1e-4 * rng.standard_normal(len(left)))
+    assert not is_redundant_stereo(left, right)
+    assert not is_redundant_stereo(left, left * 0.5)  # 相关但电平差约6dB
+    assert is_redundant_stereo(np.zeros(1000), np.zeros(1000))  # 全静音
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'dual_mono.wav')
+        _write_stereo(path, left, left)
+        audios, scalars, info = audioread(path, SAMPLE_RATE, True)
+        assert info['downmixed'] and info['channels'] == 2
+        assert len(audios) == 1 and len(scalars) == 1
+
+        path = os.path.join(tmp_dir, 'stereo.wav')
+        _write_stereo(path, left, right)
+        audios, scalars, info = audioread(path, SAMPLE_RATE, True)
+        assert not info['downmixed'] and len(audios) == 2 and len(scalars) == 2
+
+
+def test_batched_decode_matches_per_channel():
+    """测试FRCRN按 [2, T] 批量解码与逐声道解码一致（一次解码和分段解码两种路径）"""
+    model = _make_model()
+    left, right = _make_channels(5.0)
+    channels = [left[np.newaxis, :].astype(np.float32), right[np.newaxis, :].astype(np.float32)]
+
+    # 5秒音频：one_time_decode_length=120 为一次解码，=2 为分段解码
+    for one_time_decode_length in (120.0, 2.0):
+        args = _make_args(one_time_decode_length)
+        with torch.no_grad():
+            batched = decode_one_audio(model, 'cpu', np.concatenate(channels, axis=0), args)
+            single = [decode_one_audio(model, 'cpu', channel, args) for channel in channels]
+        assert batched.shape[0] == 2 and batched.shape[1] == single[0].shape[0], (batched.shape, single[0].shape)
+        error = max(np.abs(batched[i] - single[i]).max() / np.abs(single[i]).max() for i in range(2))
+        assert error < RTOL, f"批量与逐声道解码相对误差过大: {error}"
+        print(f"  one_time_decode_length={one_time_decode_length:g}: 最大相对误差 {error:.2e}")
+
+
+def test_output_layout_preserved():
+    """测试dual-mono和真立体声处理后都输出 [2, T]，长度与输入相同，dual-mono两声道相同"""
+    left, right = _make_channels(3.0)
+    speech_model = SpeechModel(_make_args())
+    speech_model.model = _make_model()
+    speech_model.name = 'FRCRN_SE_16K'
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, right_channel in (('dual_mono.wav', left), ('stereo.wav', right)):
+            path = os.path.join(tmp_dir, name)
+            _write_stereo(path, left, right_channel)
+            output = speech_model.process(path)
+            assert output.shape == (2, len(left)), (name, output.shape)
+            assert np.isfinite(output).all()
+            if right_channel is left:
+                assert speech_model.data['downmixed'] and np.array_equal(output[0], output[1])
+            else:
+                assert not speech_model.data['downmixed'] and not np.allclose(output[0], output[1])
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("dual-mono检测与降混", test_dual_mono_detection),
+        ("批量解码与逐声道一致", test_batched_decode_matches_per_channel),
+        ("输出形状和声道数", test_output_layout_preserved),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
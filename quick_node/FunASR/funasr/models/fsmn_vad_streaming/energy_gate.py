@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+# Copyright FunASR (https://github.com/alibaba-damo-academy/FunASR). All Rights Reserved.
+#  MIT License  (https://opensource.org/licenses/MIT)
+
+"""
+Energy pre-gate for FSMN-VAD scoring.
+
+Long stretches of digital silence do not need the NN encoder: a frame whose
+whole receptive field (the causal FSMN memory plus the LFR context on both
+sides) is below an energy floor is marked silence directly, and the encoder
+only runs on the remaining windows. Each window is scored from a fresh
+encoder cache after `receptive_field` frames of left context, which gives the
+same scores as one pass over the whole utterance, because the FSMN memory is
+a finite causal filter.
+"""
+
+import numpy as np
+
+# silence posterior given to gated frames; kept below 1 so log(1 - p) stays finite
+GATED_SILENCE_PROB = 1.0 - 1e-6
+
+
+def gated_frame_mask(
+    decibel: np.ndarray,
+    start: int,
+    num_frames: int,
+    gate_db: float,
+    left_context: int,
+    right_context: int,
+    min_gate_frames: int,
+) -> np.ndarray:
+    """
+    Frames that can skip the encoder.
+
+    Args:
+        decibel: frame energies in dB, decibel[i] belongs to frame i.
+        start: index of the first frame to decide.
+        num_frames: number of frames to decide.
+        gate_db: energy floor in dB.
+        left_context: frames before a frame that influence its score.
+        right_context: frames after a frame that influence its score.
+        min_gate_frames: gated runs shorter than this are scored anyway.
+
+    Returns:
+        [num_frames] bool array, True for frames marked silence without scoring.
+    """
+    # energy of frames [start - left_context, start + num_frames + right_context);
+    # frames before the utterance count as quiet, frames without energy yet as loud
+    idx = np.arange(start - left_context, start + num_frames + right_context)
+    loud = np.ones(len(idx), dtype=bool)
+    known = (idx >= 0) & (idx < len(decibel))
+    loud[known] = decibel[idx[known]] >= gate_db
+    loud[idx < 0] = False
+
+    window = left_context + right_context + 1
+    prefix = np.concatenate(([0], np.cumsum(loud)))
+    k = np.arange(num_frames)
+    gated = prefix[k + window] - prefix[k] == 0
+
+    # splitting the encoder input only pays off for long runs
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], gated.astype(np.int8), [0]))))
+    for run_start, run_end in zip(edges[::2], edges[1::2]):
+        if run_end - run_start < min_gate_frames:
+            gated[run_start:run_end] = False
+    return gated
+
+
+def active_windows(gated: np.ndarray) -> list:
+    """[start, end) ranges of frames that still need the encoder."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], gated.astype(np.int8), [1]))))
+    return [(int(s), int(e)) for s, e in zip(edges[::2], edges[1::2])]
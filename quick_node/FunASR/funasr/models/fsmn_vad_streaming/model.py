@@ -17,6 +17,12 @@ from typing import List, Tuple, Dict, Any, Optional
 
 from funasr.utils.datadir_writer import DatadirWriter
 from funasr.utils.load_utils import load_audio_text_image_video, extract_fbank
+from funasr.models.fsmn_vad_streaming.offline_detector import detect_segments_offline
+from funasr.models.fsmn_vad_streaming.energy_gate import (
+    GATED_SILENCE_PROB,
+    active_windows,
+    gated_frame_mask,
+)
 
 
 class VadStateMachine(Enum):
@@ -347,8 +353,11 @@ class FsmnVADStreaming(nn.Module):
         cache["stats"].decibel.extend(decibel_numpy)
 
 
-    def ComputeScores(self, feats: torch.Tensor, cache: dict = {}) -> None:
-        scores = self.encoder(feats, cache=cache["encoder"]).to("cpu")  # return B * T * D
+    def ComputeScores(self, feats: torch.Tensor, cache: dict = {}, energy_gate: dict = None) -> None:
+        if energy_gate is None:
+            scores = self.encoder(feats, cache=cache["encoder"]).to("cpu")  # return B * T * D
+        else:
+            scores = self.ComputeGatedScores(feats, cache=cache, **energy_gate)
         assert (
             scores.shape[1] == feats.shape[1]
         ), "The shape between feats and scores does not match"
@@ -359,6 +368,95 @@ class FsmnVADStreaming(nn.Module):
         else:
             cache["stats"].scores = torch.cat((cache["stats"].scores, scores), dim=1)
 
+    def EnergyGateConf(self, frontend, **kwargs) -> Optional[dict]:
+        """Energy pre-gate settings from the inference kwargs, None when disabled."""
+        gate_db = kwargs.get("energy_gate_db")
+        if gate_db is None:
+            return None
+        blocks = [m for m in self.encoder.modules() if getattr(m, "lorder", None) is not None]
+        # the window scoring relies on a causal encoder
+        if any(m.rorder for m in blocks):
+            return None
+        return {
+            "gate_db": float(gate_db),
+            "min_gate_frames": int(kwargs.get("energy_gate_min_frames", 100)),
+            "receptive_field": sum((m.lorder - 1) * m.lstride for m in blocks),
+            "lfr_context": (getattr(frontend, "lfr_m", 1) - 1) // 2,
+        }
+
+    def UpdateGateDecibel(self, samples: torch.Tensor, cache: dict = {}) -> None:
+        """
+        Frame energies for the energy gate, computed from the raw input stream.
+
+        Stats.decibel is computed over the frontend waveforms, which repeat the reserved
+        samples at every chunk start, so its index drifts away from the feature frame index
+        on multi-chunk inputs. The gate keeps its own energies, where entry t covers the
+        samples of feature frame t.
+        """
+        gate = cache.setdefault("energy_gate", {})
+        buffer = np.concatenate((gate.get("samples", np.zeros(0, dtype=np.float32)), samples.numpy()))
+        frame_length = int(self.vad_opts.frame_length_ms * self.vad_opts.sample_rate / 1000)
+        frame_shift = int(self.vad_opts.frame_in_ms * self.vad_opts.sample_rate / 1000)
+        num_frames = (len(buffer) - frame_length) // frame_shift + 1 if len(buffer) >= frame_length else 0
+        if num_frames > 0:
+            offsets = np.arange(num_frames) * frame_shift
+            frames = buffer[offsets[:, np.newaxis] + np.arange(frame_length)]
+            decibel = 10 * np.log10(np.sum(np.square(frames), axis=1) + 0.000001)
+            gate["decibel"] = np.concatenate((gate.get("decibel", np.zeros(0)), decibel))
+        gate["samples"] = buffer[num_frames * frame_shift :]
+
+    def ComputeGatedScores(
+        self,
+        feats: torch.Tensor,
+        cache: dict = {},
+        gate_db: float = -55.0,
+        min_gate_frames: int = 100,
+        receptive_field: int = 0,
+        lfr_context: int = 0,
+    ) -> torch.Tensor:
+        """
+        Encoder scores of one chunk (batch size 1), skipping frames whose whole receptive
+        field is below gate_db. Skipped frames get a fixed silence posterior, the other
+        frames are scored window by window with receptive_field frames of left context.
+        """
+        gate = cache.setdefault("energy_gate", {})
+        gate.setdefault("frames", 0)
+        gate.setdefault("tail", feats.new_zeros((0, feats.shape[2])))
+        gate.setdefault("gated", 0)
+        num_frames = feats.shape[1]
+        gated = gated_frame_mask(
+            gate.get("decibel", np.zeros(0)),
+            gate["frames"],
+            num_frames,
+            gate_db,
+            receptive_field + lfr_context,
+            lfr_context,
+            min_gate_frames,
+        )
+
+        # features of the previous chunk provide the left context of the first window
+        context = torch.cat((gate["tail"], feats[0]))
+        offset = context.shape[0] - num_frames
+        scores = None
+        for start, end in active_windows(gated):
+            window = context[max(0, start + offset - receptive_field) : end + offset]
+            window_scores = self.encoder(window[None], cache={}).to("cpu")
+            if scores is None:
+                scores = window_scores.new_zeros((1, num_frames, window_scores.shape[2]))
+            scores[0, start:end] = window_scores[0, -(end - start) :]
+        if scores is None:
+            scores = torch.zeros((1, num_frames, self.encoder.output_dim))
+        if gated.any():
+            silence = torch.zeros(scores.shape[2])
+            silence[self.vad_opts.sil_pdf_ids[0]] = GATED_SILENCE_PROB
+            silence[0 if self.vad_opts.sil_pdf_ids[0] != 0 else 1] = 1.0 - GATED_SILENCE_PROB
+            scores[0, torch.from_numpy(gated)] = silence
+
+        gate["tail"] = context[max(0, context.shape[0] - receptive_field) :]
+        gate["frames"] += num_frames
+        gate["gated"] += int(gated.sum())
+        return scores
+
     def PopDataBufTillFrame(self, frame_idx: int, cache: dict = {}) -> None:  # need check again
         while cache["stats"].data_buf_start_frame < frame_idx:
             if len(cache["stats"].data_buf) >= int(
@@ -559,7 +657,7 @@ class FsmnVADStreaming(nn.Module):
         cache["stats"].waveform = waveform
         is_streaming_input = kwargs.get("is_streaming_input", True)
         self.ComputeDecibel(cache=cache)
-        self.ComputeScores(feats, cache=cache)
+        self.ComputeScores(feats, cache=cache, energy_gate=kwargs.get("energy_gate"))
         if not is_final:
             self.DetectCommonFrames(cache=cache)
         else:
@@ -622,6 +720,7 @@ class FsmnVADStreaming(nn.Module):
         cache["frontend"] = {}
         cache["prev_samples"] = torch.empty(0)
         cache["encoder"] = {}
+        cache.pop("energy_gate", None)
 
         if kwargs.get("max_end_silence_time") is not None:
             # update the max_end_silence_time
@@ -685,12 +784,27 @@ class FsmnVADStreaming(nn.Module):
         is_streaming_input = cfg["is_streaming_input"]
         time2 = time.perf_counter()
         meta_data["load_data"] = f"{time2 - time1:0.3f}"
+        if len(audio_sample_list) > 1:
+            assert (
+                _is_final and not is_streaming_input
+            ), "batch_size > 1 is only supported for complete (non-streaming) inputs"
+            return self.inference_batch(
+                audio_sample_list, key, frontend, chunk_stride_samples, meta_data, **kwargs
+            )
         assert len(audio_sample_list) == 1, "batch_size must be set 1"
 
         audio_sample = torch.cat((cache["prev_samples"], audio_sample_list[0]))
+        energy_gate = self.EnergyGateConf(frontend, **kwargs)
 
         n = int(len(audio_sample) // chunk_stride_samples + int(_is_final))
         m = int(len(audio_sample) % chunk_stride_samples * (1 - int(_is_final)))
+        # the whole utterance is available: score all chunks, then run the vectorized post-processing once
+        offline = (
+            kwargs.get("vectorized_post_process", True)
+            and not is_streaming_input
+            and _is_final
+            and cache["stats"].frm_cnt == 0
+        )
         segments = []
         for i in range(n):
             kwargs["is_final"] = _is_final and i == n - 1
@@ -711,6 +825,14 @@ class FsmnVADStreaming(nn.Module):
             )
             speech = speech.to(device=kwargs["device"])
             speech_lengths = speech_lengths.to(device=kwargs["device"])
+            if energy_gate is not None:
+                self.UpdateGateDecibel(audio_sample_i, cache=cache)
+
+            if offline:
+                cache["stats"].waveform = cache["frontend"]["waveforms"]
+                self.ComputeDecibel(cache=cache)
+                self.ComputeScores(speech, cache=cache, energy_gate=energy_gate)
+                continue
 
             batch = {
                 "feats": speech,
@@ -718,11 +840,17 @@ class FsmnVADStreaming(nn.Module):
                 "is_final": kwargs["is_final"],
                 "cache": cache,
                 "is_streaming_input": is_streaming_input,
+                "energy_gate": energy_gate,
             }
             segments_i = self.forward(**batch)
             if len(segments_i) > 0:
                 segments.extend(*segments_i)
 
+        if offline and cache["stats"].scores is not None:
+            time4 = time.perf_counter()
+            segments = self.DetectOfflineSegments(cache=cache)
+            meta_data["post_process"] = f"{time.perf_counter() - time4:0.3f}"
+
         cache["prev_samples"] = audio_sample[:-m]
         if _is_final:
             self.init_cache(cache)
@@ -745,6 +873,99 @@ class FsmnVADStreaming(nn.Module):
 
         return results, meta_data
 
+    def inference_batch(
+        self,
+        audio_sample_list: list,
+        key: list,
+        frontend,
+        chunk_stride_samples: int,
+        meta_data: dict,
+        **kwargs,
+    ):
+        """
+        Offline inference over several complete utterances.
+
+        Every utterance keeps its own frontend cache and stats, the encoder runs once per
+        chunk on the zero-padded features of all utterances that still have audio, with a
+        batched encoder cache. The encoder is causal, so padding at the end of the last
+        chunk of a shorter utterance does not change its scores. Post-processing is the
+        vectorized offline detector applied to each utterance.
+        """
+        batch_size = len(audio_sample_list)
+        caches = [self.init_cache({}, **kwargs) for _ in range(batch_size)]
+        energy_gate = self.EnergyGateConf(frontend, **kwargs)
+        num_chunks = [int(len(audio) // chunk_stride_samples + 1) for audio in audio_sample_list]
+        encoder_cache = {}
+        scores_list = [[] for _ in range(batch_size)]
+        batch_data_time = 0.0
+        extract_time = forward_time = 0.0
+
+        for i in range(max(num_chunks)):
+            time1 = time.perf_counter()
+            active, feats = [], []
+            for b in range(batch_size):
+                if i >= num_chunks[b]:
+                    continue
+                speech, speech_lengths = extract_fbank(
+                    [audio_sample_list[b][i * chunk_stride_samples : (i + 1) * chunk_stride_samples]],
+                    data_type=kwargs.get("data_type", "sound"),
+                    frontend=frontend,
+                    cache=caches[b]["frontend"],
+                    is_final=i == num_chunks[b] - 1,
+                )
+                batch_data_time += (
+                    speech_lengths.sum().item() * frontend.frame_shift * frontend.lfr_n / 1000
+                )
+                caches[b]["stats"].waveform = caches[b]["frontend"]["waveforms"]
+                self.ComputeDecibel(cache=caches[b])
+                if energy_gate is not None:
+                    self.UpdateGateDecibel(
+                        audio_sample_list[b][i * chunk_stride_samples : (i + 1) * chunk_stride_samples],
+                        cache=caches[b],
+                    )
+                if speech.shape[1] > 0:
+                    active.append(b)
+                    feats.append(speech[0])
+            time2 = time.perf_counter()
+            extract_time += time2 - time1
+            if not active:
+                continue
+
+            if energy_gate is not None:
+                # gated windows differ per utterance, score each one on its own
+                for b, feat in zip(active, feats):
+                    scores_list[b].append(self.ComputeGatedScores(feat[None], cache=caches[b], **energy_gate))
+                forward_time += time.perf_counter() - time2
+                continue
+
+            lengths = [feat.shape[0] for feat in feats]
+            feats = torch.nn.utils.rnn.pad_sequence(feats, batch_first=True).to(device=kwargs["device"])
+            rows = torch.tensor(active)
+            active_cache = {name: layer_cache[rows] for name, layer_cache in encoder_cache.items()}
+            scores = self.encoder(feats, cache=active_cache).to("cpu")
+            for name, layer_cache in active_cache.items():
+                if name not in encoder_cache:
+                    encoder_cache[name] = layer_cache.new_zeros((batch_size,) + layer_cache.shape[1:])
+                encoder_cache[name][rows] = layer_cache
+            for row, b in enumerate(active):
+                scores_list[b].append(scores[row : row + 1, : lengths[row]])
+            forward_time += time.perf_counter() - time2
+
+        results = []
+        for b in range(batch_size):
+            stats = caches[b]["stats"]
+            segments = []
+            if scores_list[b]:
+                stats.scores = torch.cat(scores_list[b], dim=1)
+                stats.frm_cnt = stats.scores.shape[1]
+                segments = self.DetectOfflineSegments(cache=caches[b])
+            results.append({"key": key[b], "value": segments})
+
+        meta_data["extract_feat"] = f"{extract_time:0.3f}"
+        meta_data["forward"] = f"{forward_time:0.3f}"
+        meta_data["batch_data_time"] = batch_data_time
+        return results, meta_data
+
     def export(self, **kwargs):
 
         from .export_meta import export_rebuild_model
@@ -752,6 +973,21 @@ class FsmnVADStreaming(nn.Module):
         models = export_rebuild_model(model=self, **kwargs)
         return models
 
+    def DetectOfflineSegments(self, cache: dict = {}) -> List[List[int]]:
+        """Post-process all scored frames at once, equivalent to DetectLastFrames over the whole utterance."""
+        segments = detect_segments_offline(
+            cache["stats"].scores[0].numpy(),
+            np.asarray(cache["stats"].decibel[: cache["stats"].frm_cnt]),
+            self.vad_opts,
+        )
+        if segments is not None:
+            return segments
+
+        # unsupported configuration, fall back to the frame-by-frame state machine
+        self.vad_opts.nn_eval_block_size = cache["stats"].frm_cnt
+        self.DetectLastFrames(cache=cache)
+        return [[seg.start_ms, seg.end_ms] for seg in cache["stats"].output_data_buf]
+
     def DetectCommonFrames(self, cache: dict = {}) -> int:
         if cache["stats"].vad_state_machine == VadStateMachine.kVadInStateEndPointDetected:
             return 0
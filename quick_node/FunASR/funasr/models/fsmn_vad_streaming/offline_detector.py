@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+# Copyright FunASR (https://github.com/alibaba-damo-academy/FunASR). All Rights Reserved.
+#  MIT License  (https://opensource.org/licenses/MIT)
+
+"""
+Vectorized offline post-processing for FSMN-VAD.
+
+When the whole utterance is available, the per-frame state machine of
+`FsmnVADStreaming` (GetFrameState -> WindowDetector.DetectOneFrame ->
+DetectOneFrame -> PopDataToOutputBuf) can be replaced by array operations:
+
+- frame states are a threshold over the silence posterior, with the running
+  noise level computed by a linear filter over the noise frames;
+- the sliding-window hysteresis is a window sum plus a forward fill of the
+  last decisive frame (frames hitting both thresholds toggle the state);
+- start/end points are found per segment with run-length counts, since the
+  window detector is only reset when a segment ends.
+
+The result is identical to the streaming path run with is_final=True.
+`detect_segments_offline` returns None for configurations where this does
+not hold; callers then fall back to the streaming state machine.
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+# mirrors VadDetectMode.kVadSingleUtteranceDetectMode
+SINGLE_UTTERANCE_DETECT_MODE = 0
+
+# initial frame block searched for the next start/end point, doubled when not found
+SEARCH_BLOCK_FRAMES = 4096
+
+
+def compute_frame_states(scores: np.ndarray, decibel: np.ndarray, vad_opts) -> np.ndarray:
+    """
+    Vectorized GetFrameState for all frames.
+
+    Args:
+        scores: [T, D] posteriors of one utterance.
+        decibel: [T] frame energies in dB.
+        vad_opts: VADXOptions.
+
+    Returns:
+        [T] int8 array, 1 for speech and 0 for silence, or None if unsupported.
+    """
+    if len(vad_opts.sil_pdf_ids) == 0 or len(vad_opts.sil_pdf_ids) != vad_opts.silence_pdf_num:
+        return None
+    # the streaming path re-enters the window detector for frames below decibel_thres
+    if np.any(decibel < vad_opts.decibel_thres):
+        return None
+
+    sil_score = scores[:, vad_opts.sil_pdf_ids[0]].astype(np.float64)
+    for sil_pdf_id in vad_opts.sil_pdf_ids[1:]:
+        sil_score = sil_score + scores[:, sil_pdf_id].astype(np.float64)
+    with np.errstate(divide="ignore"):
+        noise_prob = np.log(sil_score) * vad_opts.speech_2_noise_ratio
+        speech_prob = np.log(1.0 - sil_score)
+    nn_speech = np.exp(speech_prob) >= np.exp(noise_prob) + vad_opts.speech_noise_thres
+
+    noise_idx = np.flatnonzero(~nn_speech)
+    noise_decibel = decibel[noise_idx].astype(np.float64)
+    # noise_average_decibel starts at -100 and is re-initialised while below -99.9
+    if np.any(noise_decibel < -99.9):
+        return None
+
+    # the snr check can only reject a frame if the noise level may exceed decibel - snr_thres
+    max_noise = max(noise_decibel.max(), -100.0) if len(noise_decibel) else -100.0
+    if len(decibel) == 0 or decibel.min() - max_noise >= vad_opts.snr_thres:
+        return nn_speech.astype(np.int8)
+
+    # running noise level after each noise frame: avg = (db + avg * (N - 1)) / N
+    n = vad_opts.noise_frame_num_used_for_snr
+    noise_avg = np.empty(len(noise_decibel))
+    if len(noise_decibel):
+        noise_avg[0] = noise_decibel[0]
+        noise_avg[1:] = lfilter(
+            [1.0 / n], [1.0, -(n - 1) / n], noise_decibel[1:], zi=[noise_avg[0] * (n - 1) / n]
+        )[0]
+    # noise level seen by frame t is the one after the last noise frame before t
+    prev_noise = np.searchsorted(noise_idx, np.arange(len(decibel))) - 1
+    noise_level = np.where(prev_noise >= 0, noise_avg[np.maximum(prev_noise, 0)], -100.0)
+    snr_ok = decibel - noise_level >= vad_opts.snr_thres
+    return (nn_speech & snr_ok).astype(np.int8)
+
+
+def _window_states(frame_states: np.ndarray, win_size: int, sil2speech: int, speech2sil: int):
+    """
+    WindowDetector states for frames processed right after a Reset().
+
+    Returns:
+        (prev, cur): window state before and after each frame, 1 for speech.
+    """
+    prefix = np.concatenate(([0], np.cumsum(frame_states, dtype=np.int64)))
+    idx = np.arange(len(frame_states))
+    win_sum = prefix[idx + 1] - prefix[np.maximum(idx - win_size + 1, 0)]
+
+    up = win_sum >= sil2speech
+    down = win_sum <= speech2sil
+    toggle = up & down
+    decisive = up ^ down
+    toggles = np.cumsum(toggle)
+    last = np.maximum.accumulate(np.where(decisive, idx, -1))
+    has_last = last >= 0
+    last = np.maximum(last, 0)
+    value = np.where(has_last, up[last], False).astype(np.int64)
+    since = toggles - np.where(has_last, toggles[last], 0)
+    cur = value ^ (since & 1)
+    prev = np.concatenate(([0], cur[:-1]))
+    return prev, cur
+
+
+def detect_segments_offline(scores: np.ndarray, decibel: np.ndarray, vad_opts) -> list:
+    """
+    Offline equivalent of running FsmnVADStreaming's state machine over all frames.
+
+    Args:
+        scores: [T, D] posteriors of one utterance.
+        decibel: [T] frame energies in dB.
+        vad_opts: VADXOptions.
+
+    Returns:
+        list of [start_ms, end_ms], or None if the configuration is unsupported.
+    """
+    frame_states = compute_frame_states(scores, decibel, vad_opts)
+    if frame_states is None:
+        return None
+
+    frame_ms = vad_opts.frame_in_ms
+    win_size = int(vad_opts.window_size_ms / frame_ms)
+    sil2speech = int(vad_opts.sil_to_speech_time_thres / frame_ms)
+    speech2sil = int(vad_opts.speech_to_sil_time_thres / frame_ms)
+    start_latency = win_size
+    if vad_opts.do_extend:
+        start_latency += int(vad_opts.lookback_time_start_point / frame_ms)
+    max_end_sil_ms = vad_opts.max_end_silence_time - vad_opts.speech_to_sil_time_thres
+    end_lookback = int(max_end_sil_ms / frame_ms)
+    lookahead = int(vad_opts.lookahead_time_end_point / frame_ms)
+    if vad_opts.do_extend:
+        end_lookback = max(0, end_lookback - lookahead - 1)
+    max_single_frames = vad_opts.max_single_segment_time / frame_ms
+    single_mode = vad_opts.detect_mode == SINGLE_UTTERANCE_DETECT_MODE
+
+    num_frames = len(frame_states)
+    segments = []
+    seg_begin = 0  # first frame after the last window detector reset
+    data_buf_start = 0  # Stats.data_buf_start_frame
+    block = SEARCH_BLOCK_FRAMES
+    while seg_begin < num_frames:
+        hi = min(num_frames, seg_begin + block)
+        prev, cur = _window_states(frame_states[seg_begin:hi], win_size, sil2speech, speech2sil)
+        idx = np.arange(hi - seg_begin)
+
+        # start point: first Sil2Speech, every earlier frame is Sil2Sil
+        speech = np.flatnonzero(cur)
+        if single_mode:
+            timeout = np.flatnonzero((idx + 1) * frame_ms > vad_opts.max_start_silence_time)
+            if len(timeout) and (not len(speech) or timeout[0] < speech[0]):
+                break
+        if not len(speech):
+            if hi == num_frames:
+                break
+            block *= 2
+            continue
+        t0 = speech[0]
+        start = int(max(data_buf_start, seg_begin + t0 - start_latency))
+        if seg_begin + t0 == num_frames - 1:
+            segments.append([start * frame_ms, num_frames * frame_ms])
+            break
+
+        # end point: first frame ending the segment after the start point
+        sil2sil = (prev == 0) & (cur == 0) & (idx > t0)
+        last_other = np.maximum.accumulate(np.where(sil2sil, 0, idx))
+        sil_count = idx - last_other
+        global_idx = seg_begin + idx
+        end_by_sil = sil2sil & (sil_count * frame_ms >= max_end_sil_ms)
+        end_by_len = global_idx - start + 1 > max_single_frames
+        ended = (end_by_sil | end_by_len | (global_idx == num_frames - 1)) & (idx > t0)
+        end_candidates = np.flatnonzero(ended)
+        if not len(end_candidates):
+            block *= 2
+            continue
+        j = end_candidates[0]
+        t = int(seg_begin + j)
+        end = t - end_lookback if end_by_sil[j] else t
+
+        # last frame passed to OnVoiceDetected before the end point
+        if sil2sil[j]:
+            extended = min(int(sil_count[j]) - 1, lookahead) if vad_opts.do_extend else 0
+            last_speech = t - int(sil_count[j]) + extended
+        else:
+            last_speech = t - 1
+        data_buf_start = max(last_speech + 1, end) + 1
+
+        segments.append([start * frame_ms, (end + 1) * frame_ms])
+        if single_mode:
+            break
+        seg_begin = t + 1
+        block = SEARCH_BLOCK_FRAMES
+
+    return segments
@@ -611,9 +611,6 @@ class OpenAIWhisperLIDModel(nn.Module):
         **kwargs,
     ):
 
-        if kwargs.get("batch_size", 1) > 1:
-            raise NotImplementedError("batch decoding is not implemented")
-
         meta_data = {}
         if (
             isinstance(data_in, torch.Tensor) and kwargs.get("data_type", "sound") == "fbank"
@@ -688,15 +685,23 @@ class OpenAIWhisperLIDModel(nn.Module):
         lid_output = self.lid_predictor(reduced_enc, enc_out_lens)  # (B, D)
         lid_logits = self.output_layer(lid_output)  # (B, num_classes)
 
-        _, predicted_lid_index = torch.max(lid_logits, 1)
-        predicted_lid = tokenizer.ids2tokens([predicted_lid_index[0].cpu()])[0]
+        lid_probs = torch.softmax(lid_logits.float(), dim=-1)
+        predicted_lid_prob, predicted_lid_index = torch.max(lid_probs, 1)
+        predicted_lids = tokenizer.ids2tokens(predicted_lid_index.cpu().tolist())
 
         if kwargs.get("output_dir") is not None:
             if not hasattr(self, "writer"):
                 self.writer = DatadirWriter(kwargs.get("output_dir"))
             lid_writer = self.writer["lid"]
-            lid_writer[key[0]] = predicted_lid
+            for i, predicted_lid in enumerate(predicted_lids):
+                lid_writer[key[i]] = predicted_lid
 
-        results = [{"key": key[0], "lid": predicted_lid}]
+        results = []
+        for i, predicted_lid in enumerate(predicted_lids):
+            result_i = {"key": key[i], "lid": predicted_lid, "lid_prob": predicted_lid_prob[i].item()}
+            if kwargs.get("output_lid_probs", False):
+                # full distribution over the lid vocabulary, e.g. for averaging over several clips
+                result_i["lid_probs"] = lid_probs[i].cpu().numpy()
+            results.append(result_i)
 
         return results, meta_data
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Quick Node 批量VAD基准测试脚本
+在CPU上对同一组音频分别以不同的批大小运行 VADAnalyzer.batch_analyze，
+统计吞吐量（每秒处理的音频时长）和实时率(RTF)，并检查各批大小的语音段结果一致。
+
+用法:
+    python benchmark_vad_batch.py
+    python benchmark_vad_batch.py --audio-dir /data/audio --batch-sizes 1,2,4,8 --threads 4
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+# 添加src目录到路径
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from config import Config
+from loguru import logger
+from vad_analyzer import VADAnalyzer, VAD_SAMPLE_RATE
+
+
+def _synthetic_files(output_dir: str, count: int, duration: float) -> list:
+    """生成语音/静音交替的合成音频文件"""
+    import soundfile as sf
+
+    rng = np.random.default_rng(0)
+    files = []
+    for i in range(count):
+        parts = []
+        total = 0.0
+        while total < duration:
+            speech_sec, silence_sec = rng.uniform(0.5, 6.0), rng.uniform(0.3, 3.0)
+            t = np.arange(int(speech_sec * VAD_SAMPLE_RATE)) / VAD_SAMPLE_RATE
+            phase = 2 * np.pi * np.cumsum(140 + 30 * np.sin(2 * np.pi * 3 * t)) / VAD_SAMPLE_RATE
+            parts.append(0.2 * sum(np.sin(k * phase) / k for k in range(1, 8)))
+            parts.append(rng.normal(0, 1e-3, int(silence_sec * VAD_SAMPLE_RATE)))
+            total += speech_sec + silence_sec
+        path = os.path.join(output_dir, f'synthetic_{i}.wav')
+        sf.write(path, np.concatenate(parts).astype(np.float32), VAD_SAMPLE_RATE)
+        files.append(path)
+    return files
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='批量VAD基准测试')
+    parser.add_argument('--audio-dir', default='', help='测试音频目录，为空时使用合成音频')
+    parser.add_argument('--files', type=int, default=16, help='合成音频数量')
+    parser.add_argument('--duration', type=float, default=300.0, help='每个合成音频的时长（秒）')
+    parser.add_argument('--batch-sizes', default='1,2,4,8', help='逗号分隔的批大小')
+    parser.add_argument('--threads', type=int, default=0, help='torch CPU线程数，0表示使用默认值')
+    args = parser.parse_args()
+
+    import torch
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.audio_dir:
+            files = sorted(
+                os.path.join(args.audio_dir, name) for name in os.listdir(args.audio_dir)
+                if os.path.splitext(name)[1].lower() in Config.SUPPORTED_AUDIO_FORMATS
+            )
+        else:
+            files = _synthetic_files(temp_dir, args.files, args.duration)
+
+        analyzer = VADAnalyzer(backend='torch')
+        # 预热，避免首次推理的初始化开销计入结果
+        analyzer.batch_analyze(files[:1])
+
+        rows = []
+        reference = None
+        for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+            analyzer.config.VAD_BATCH_SIZE = batch_size
+            start = time.time()
+            results = analyzer.batch_analyze(files)
+            elapsed = time.time() - start
+
+            audio_seconds = sum(r['total_duration'] for r in results if r['status'] == 'success')
+            segments = [r.get('speech_segments') for r in results]
+            if reference is None:
+                reference = segments
+            rows.append((batch_size, elapsed, audio_seconds / elapsed, elapsed / audio_seconds,
+                         segments == reference))
+
+    print(f"\n文件数: {len(files)}, torch线程数: {torch.get_num_threads()}")
+    print("| 批大小 | 耗时(秒) | 吞吐量(音频秒/秒) | RTF | 结果与批大小1一致 |")
+    print("|---|---|---|---|---|")
+    for batch_size, elapsed, throughput, rtf, same in rows:
+        print(f"| {batch_size} | {elapsed:.2f} | {throughput:.1f} | {rtf:.4f} | {'是' if same else '否'} |")
+
+    if not all(row[-1] for row in rows):
+        logger.error("不同批大小的语音段结果不一致")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
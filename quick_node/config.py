@@ -27,6 +27,12 @@ class Config:
     API_UPLOAD_ENDPOINT = os.getenv('API_UPLOAD_ENDPOINT', '/queue/upload')
     API_CALLBACK_ENDPOINT = os.getenv('API_CALLBACK_ENDPOINT', '/queue/callback')
     API_CALLBACK_URL = f"{API_BASE_URL}{API_CALLBACK_ENDPOINT}"
+    API_UPLOAD_URL = f"{API_BASE_URL}{API_UPLOAD_ENDPOINT}"
+    
+    # 回调结果格式: legacy（语音段字典列表，默认）、compact（列式紧凑编码）、both（两者都发送）
+    CALLBACK_RESULT_FORMAT = os.getenv('CALLBACK_RESULT_FORMAT', 'legacy').lower()
+    CALLBACK_COMPACT_ENCODING = os.getenv('CALLBACK_COMPACT_ENCODING', 'gzip-json').lower()  # gzip-json / msgpack
+    CALLBACK_INLINE_MAX_BYTES = int(os.getenv('CALLBACK_INLINE_MAX_BYTES', 262144))  # 紧凑结果超过该大小时上传为文件，回调中只带URL
     
     # ==================== 模型配置 ====================
     # 离线模式配置
@@ -40,6 +46,35 @@ class Config:
     # VAD_MODEL = os.getenv('VAD_MODEL', './models/speech_fsmn_vad_zh-cn-16k-common-pytorch')
     VAD_MODEL_REVISION = os.getenv('VAD_MODEL_REVISION', 'v2.0.4')
     
+    # 推理后端: torch(FunASR AutoModel) 或 onnx(funasr_onnx + ONNX Runtime，不需要安装torch)
+    VAD_BACKEND = os.getenv('VAD_BACKEND', 'torch').lower()
+    VAD_ONNX_MODEL_DIR = os.getenv('VAD_ONNX_MODEL_DIR', '')  # 已导出的ONNX模型目录，为空时在模型缓存目录中查找
+    VAD_ONNX_QUANTIZE = os.getenv('VAD_ONNX_QUANTIZE', 'false').lower() == 'true'  # 使用量化模型 model_quant.onnx
+    VAD_ONNX_THREADS = int(os.getenv('VAD_ONNX_THREADS', 4))  # ONNX Runtime 线程数
+    VAD_BATCH_SIZE = int(os.getenv('VAD_BATCH_SIZE', 4))  # 批量分析时每次合并推理的文件数（torch后端）
+    VAD_ENERGY_GATE = os.getenv('VAD_ENERGY_GATE', 'true').lower() == 'true'  # 数字静音段跳过FSMN编码器（torch后端）
+    VAD_ENERGY_GATE_DB = float(os.getenv('VAD_ENERGY_GATE_DB', -55.0))  # 能量门限(dB)，静音帧为-60dB
+    VAD_ENERGY_GATE_MIN_FRAMES = int(os.getenv('VAD_ENERGY_GATE_MIN_FRAMES', 100))  # 跳过编码器的最短静音帧数(10ms/帧)
+    VAD_STREAMING = os.getenv('VAD_STREAMING', 'true').lower() == 'true'  # 边下载边解码边VAD（torch后端，需要ffmpeg）
+    VAD_STREAM_CHUNK_MS = int(os.getenv('VAD_STREAM_CHUNK_MS', 60000))  # 流式VAD每块音频时长(ms)
+    VAD_SEGMENTS_ARTIFACT = os.getenv('VAD_SEGMENTS_ARTIFACT', 'true').lower() == 'true'  # 上传语音段文件供转写节点复用
+    VAD_PARALLEL_WORKERS = int(os.getenv('VAD_PARALLEL_WORKERS', 0))  # 长音频分片并行VAD的进程数（分片数），0或1表示不分片
+    VAD_PARALLEL_MIN_DURATION = float(os.getenv('VAD_PARALLEL_MIN_DURATION', 1800))  # 超过该时长(秒)的音频才分片
+    VAD_PARALLEL_OVERLAP_MS = int(os.getenv('VAD_PARALLEL_OVERLAP_MS', 30000))  # 分片两侧的重叠时长(ms)
+    VAD_PARALLEL_SEARCH_MS = int(os.getenv('VAD_PARALLEL_SEARCH_MS', 60000))  # 在等分点两侧搜索静音切分点的范围(ms)
+    AUDIO_HEALTH = os.getenv('AUDIO_HEALTH', 'true').lower() == 'true'  # 随VAD统计响度、削波、信噪比、直流分量
+    AUDIO_HEALTH_CLEAN_SNR_DB = float(os.getenv('AUDIO_HEALTH_CLEAN_SNR_DB', 25.0))  # 判定为干净音频的最低信噪比(dB)
+    AUDIO_HEALTH_MAX_CLIPPING_RATIO = float(os.getenv('AUDIO_HEALTH_MAX_CLIPPING_RATIO', 0.001))  # 干净音频的最大削波采样点占比
+    AUDIO_HEALTH_MAX_DC_OFFSET = float(os.getenv('AUDIO_HEALTH_MAX_DC_OFFSET', 0.01))  # 干净音频的最大直流分量(满量程为1)
+    LANGUAGE_ID = os.getenv('LANGUAGE_ID', 'false').lower() == 'true'  # 对抽取的语音段做语种识别（需要openai-whisper包，建议GPU）
+    LANGUAGE_ID_MODEL = os.getenv('LANGUAGE_ID_MODEL', 'iic/speech_whisper-large_lid_multilingual_pytorch')  # 语种识别模型
+    LANGUAGE_ID_MODEL_DIR = os.getenv('LANGUAGE_ID_MODEL_DIR', '')  # 本地语种识别模型目录，非空时优先使用
+    LANGUAGE_ID_CLIPS = int(os.getenv('LANGUAGE_ID_CLIPS', 5))  # 每个音频抽取的片段数（一次批量推理）
+    LANGUAGE_ID_CLIP_MS = int(os.getenv('LANGUAGE_ID_CLIP_MS', 5000))  # 每个片段的最大时长(ms)
+    LANGUAGE_ID_MIN_SEGMENT_MS = int(os.getenv('LANGUAGE_ID_MIN_SEGMENT_MS', 1500))  # 候选语音段的最短时长(ms)
+    COMPACT_AUDIO = os.getenv('COMPACT_AUDIO', 'false').lower() == 'true'  # 生成只含语音段的压缩音频和偏移表供转写
+    COMPACT_AUDIO_PADDING_MS = int(os.getenv('COMPACT_AUDIO_PADDING_MS', 300))  # 压缩音频中语音片段之间的静音时长(ms)
+    
     # 模型参数
     VAD_MAX_END_SILENCE_TIME = int(os.getenv('VAD_MAX_END_SILENCE_TIME', 800))  # 最大结束静音时间(ms)
     VAD_MAX_START_SILENCE_TIME = int(os.getenv('VAD_MAX_START_SILENCE_TIME', 3000))  # 最大开始静音时间(ms)
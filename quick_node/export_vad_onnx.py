@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+FSMN-VAD ONNX导出脚本
+在安装了funasr和torch的环境中运行一次，导出的模型目录可直接用于 VAD_BACKEND=onnx 的部署（部署环境不需要torch）
+"""
+
+import os
+import sys
+import argparse
+
+# 添加本地FunASR路径
+current_dir = os.path.dirname(__file__)
+funasr_path = os.path.join(current_dir, 'FunASR')
+if os.path.exists(funasr_path):
+    sys.path.insert(0, funasr_path)
+
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+
+def export_vad_onnx(model: str, quantize: bool) -> str:
+    """
+    导出FSMN-VAD为ONNX模型
+
+    Args:
+        model (str): 模型名称、modelscope模型ID或本地模型目录
+        quantize (bool): 是否同时导出量化模型 model_quant.onnx
+
+    Returns:
+        str: 导出后的模型目录（包含 model.onnx、config.yaml、am.mvn）
+    """
+    from funasr import AutoModel
+
+    vad_model = AutoModel(model=model, disable_update=True)
+    model_dir = vad_model.export(type='onnx', quantize=quantize)
+
+    for required in ('model_quant.onnx' if quantize else 'model.onnx', 'config.yaml', 'am.mvn'):
+        if not os.path.exists(os.path.join(model_dir, required)):
+            raise FileNotFoundError(f"导出目录缺少文件: {os.path.join(model_dir, required)}")
+    return model_dir
+
+
+def main():
+    """主函数"""
+    from vad_analyzer import ONNX_VAD_MODEL_ID
+
+    parser = argparse.ArgumentParser(description='导出FSMN-VAD ONNX模型')
+    parser.add_argument('--model', default=ONNX_VAD_MODEL_ID, help='模型名称、modelscope模型ID或本地模型目录')
+    parser.add_argument('--quantize', action='store_true', help='导出量化模型 model_quant.onnx')
+    args = parser.parse_args()
+
+    model_dir = export_vad_onnx(args.model, args.quantize)
+    print(f"✅ ONNX模型导出完成: {model_dir}")
+    print(f"部署时设置: VAD_BACKEND=onnx VAD_ONNX_MODEL_DIR={model_dir}"
+          + (" VAD_ONNX_QUANTIZE=true" if args.quantize else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,15 @@
 
 import requests
 import json
+import tempfile
 from loguru import logger
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import Config
+from result_codec import (
+    SCHEMA_SPEECH_SEGMENTS, build_envelope, encode_columns, resolve_encoding, speech_segments_to_columns
+)
 
 class APIClient:
     """API客户端 - 处理与后端API的通信"""
@@ -83,6 +87,9 @@ class APIClient:
             task_id (int): 任务ID
             analysis_result (dict): VAD分析结果
         """
+        speech_segments = analysis_result.get('speech_segments', [])
+        result_format = self.config.CALLBACK_RESULT_FORMAT
+        
         # 准备回调数据
         callback_data = {
             'total_voice': analysis_result.get('total_duration', 0),      # 音频总时长
@@ -91,13 +98,85 @@ class APIClient:
             'speech_segments_count': analysis_result.get('speech_segments_count', 0),  # 语音段落数
             'analysis_details': {
                 'silence_duration': analysis_result.get('silence_duration', 0),
-                'file_info': analysis_result.get('file_info', {}),
-                'speech_segments': analysis_result.get('speech_segments', [])
+                'file_info': analysis_result.get('file_info', {})
             }
         }
         
+        # 旧格式：逐条字典列表；紧凑格式：列式毫秒数组的编码信封
+        if result_format != 'compact':
+            callback_data['analysis_details']['speech_segments'] = speech_segments
+        if result_format in ('compact', 'both'):
+            callback_data['analysis_details']['speech_segments_compact'] = self.build_compact_result(
+                task_id, SCHEMA_SPEECH_SEGMENTS, speech_segments_to_columns(speech_segments), len(speech_segments)
+            )
+        
+        # 音频健康度（响度、削波、信噪比、直流分量），后端据此决定是否需要降噪
+        if analysis_result.get('audio_health'):
+            callback_data['audio_health'] = analysis_result['audio_health']
+        
+        # 语种识别结果，后端可据此为转写任务指定语种（task_info.language）
+        if analysis_result.get('language_detection'):
+            callback_data['language_detection'] = analysis_result['language_detection']
+        
+        # 语音段文件（转写节点通过task_info.vad_segments_url复用，跳过重复VAD）
+        if analysis_result.get('vad_segments_url'):
+            callback_data['vad_segments_url'] = analysis_result['vad_segments_url']
+            callback_data['vad_segments_format'] = analysis_result.get('vad_segments_format', '')
+        
+        # 压缩音频（只含语音段）及偏移表，转写节点转写压缩音频后按偏移表还原原始时间戳
+        if analysis_result.get('compacted_audio_url'):
+            callback_data['compacted_audio_url'] = analysis_result['compacted_audio_url']
+            callback_data['compacted_offset_map_url'] = analysis_result['compacted_offset_map_url']
+            callback_data['compacted_offset_map_format'] = analysis_result['compacted_offset_map_format']
+            callback_data['compacted_duration'] = analysis_result['compacted_duration']
+        
         return self.send_callback(task_id, 3, 'success', callback_data)
     
+    def build_compact_result(self, task_id: int, schema: str, columns: dict, count: int) -> dict:
+        """
+        编码列式结果，超过 CALLBACK_INLINE_MAX_BYTES 时上传为文件并在信封中引用URL
+        
+        Args:
+            task_id (int): 任务ID
+            schema (str): 列式结构名称
+            columns (dict): 列式数据
+            count (int): 记录条数
+            
+        Returns:
+            dict: 紧凑结果信封（见 result_codec.build_envelope）
+        """
+        encoding = resolve_encoding(self.config.CALLBACK_COMPACT_ENCODING)
+        if encoding != self.config.CALLBACK_COMPACT_ENCODING:
+            logger.warning(f"紧凑结果编码 {self.config.CALLBACK_COMPACT_ENCODING} 不可用，改用 {encoding}")
+        payload = encode_columns(columns, encoding)
+        
+        url = None
+        if len(payload) > self.config.CALLBACK_INLINE_MAX_BYTES:
+            url = self._upload_compact_payload(task_id, schema, payload, encoding)
+        
+        logger.info(f"任务 {task_id}: 紧凑结果 {schema} 共 {count} 条, 编码后 {self.get_file_size_str(len(payload))}"
+                   f"{', 已上传为文件' if url else ', 内联发送'}")
+        return build_envelope(schema, count, payload, encoding, url)
+    
+    def _upload_compact_payload(self, task_id: int, schema: str, payload: bytes, encoding: str) -> str:
+        """上传紧凑结果文件，返回文件URL，失败时返回None（改为内联发送）"""
+        suffix = '.msgpack' if encoding == 'msgpack' else '.json.gz'
+        os.makedirs(self.config.TEMP_DIR, exist_ok=True)
+        fd, file_path = tempfile.mkstemp(prefix=f"task_{task_id}_{schema}_", suffix=suffix, dir=self.config.TEMP_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            upload_result = self.upload_file(file_path, task_type=3)
+            url = (upload_result or {}).get('data', {}).get('file_info', {}).get('url')
+            if not url:
+                raise Exception(f"上传响应中缺少文件URL: {upload_result}")
+            return url
+        except Exception as e:
+            logger.warning(f"任务 {task_id}: 紧凑结果文件上传失败，改为内联发送: {e}")
+            return None
+        finally:
+            os.remove(file_path)
+    
     def send_failed_callback(self, task_id: int, error_message: str) -> dict:
         """发送失败回调"""
         callback_data = {
@@ -105,6 +184,69 @@ class APIClient:
         }
         return self.send_callback(task_id, 3, 'failed', callback_data)
     
+    def upload_file(self, file_path: str, task_type: int = 3) -> dict:
+        """
+        上传文件到后端
+        
+        Args:
+            file_path (str): 文件路径
+            task_type (int): 任务类型 (3=快速识别)
+            
+        Returns:
+            dict: 上传结果
+        """
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"文件不存在: {file_path}")
+            
+            with open(file_path, 'rb') as f:
+                files = {
+                    'file': (os.path.basename(file_path), f, 'application/octet-stream')
+                }
+                data = {
+                    'task_type': task_type,
+                    'node_type': 'quick_node'
+                }
+                
+                logger.info(f"开始上传文件: {file_path} -> {self.config.API_UPLOAD_URL}")
+                
+                response = self.session.post(
+                    self.config.API_UPLOAD_URL,
+                    files=files,
+                    data=data,
+                    timeout=30
+                )
+                
+                response.raise_for_status()
+                result = response.json()
+                
+                logger.info(f"文件上传成功: {result}")
+                return result
+                
+        except requests.exceptions.RequestException as e:
+            logger.error(f"上传文件网络错误: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"上传文件失败: {e}")
+            raise
+    
+    def iter_download(self, url: str, chunk_size: int = 65536):
+        """
+        流式下载文件，逐块返回下载到的数据
+        
+        Args:
+            url (str): 文件URL
+            chunk_size (int): 每次读取的字节数
+            
+        Yields:
+            bytes: 文件数据块
+        """
+        with self.session.get(url, stream=True, timeout=self.config.DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+    
     def download_file(self, url: str, local_path: str) -> bool:
         """
         下载文件
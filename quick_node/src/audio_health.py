@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+音频健康度统计
+在VAD使用的同一份16kHz数据上按10ms帧累积能量、削波、直流分量和K加权功率（可逐块输入，流式分析同样适用），
+结合VAD语音段得到整体响度(BS.1770)、各语音段RMS/响度和估计信噪比，供后端判断音频是否需要降噪
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+# 统计帧长（毫秒），与VAD语音段的毫秒时间戳对齐
+FRAME_MS = 10
+# 绝对值达到该值的采样点视为削波（16位满量程为 32767/32768）
+CLIP_THRESHOLD = 0.999
+# 能量下限，数字静音记为 -120dB 而不是 -inf（保证回调可以JSON序列化）
+POWER_FLOOR = 1e-12
+
+# BS.1770 响度：400ms块、75%重叠（100ms步长），绝对门限-70LUFS，相对门限-10LU
+LOUDNESS_STEP_MS = 100
+LOUDNESS_BLOCK_STEPS = 4
+LOUDNESS_ABSOLUTE_GATE = -70.0
+LOUDNESS_RELATIVE_GATE = -10.0
+
+
+def _power_db(power) -> np.ndarray:
+    """功率 -> dB（下限 -120dB）"""
+    return 10 * np.log10(np.maximum(power, POWER_FLOOR))
+
+
+def _loudness(power) -> np.ndarray:
+    """K加权均方功率 -> LUFS"""
+    return -0.691 + _power_db(power)
+
+
+def k_weighting_filter(sample_rate: int) -> tuple:
+    """
+    BS.1770 K加权滤波器（高架预滤波 + RLB高通）在给定采样率下的系数，按 libebur128 的方法由模拟原型换算
+
+    Returns:
+        tuple: 合并后的四阶IIR系数 (b, a)
+    """
+    # 第一级：约+4dB高架滤波
+    f0, gain, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = np.tan(np.pi * f0 / sample_rate)
+    vh = 10 ** (gain / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = np.array([(vh + vb * k / q + k * k), 2 * (k * k - vh), (vh - vb * k / q + k * k)]) / a0
+    shelf_a = np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+
+    # 第二级：约38Hz高通
+    f0, q = 38.13547087602444, 0.5003270373238773
+    k = np.tan(np.pi * f0 / sample_rate)
+    a0 = 1 + k / q + k * k
+    highpass_b = np.array([1.0, -2.0, 1.0])
+    highpass_a = np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+
+    return np.convolve(shelf_b, highpass_b), np.convolve(shelf_a, highpass_a)
+
+
+class AudioHealthAccumulator:
+    """逐块累积音频统计量，全部数据输入后结合语音段计算健康度指标"""
+
+    def __init__(self, sample_rate: int):
+        """
+        初始化统计累积器
+
+        Args:
+            sample_rate (int): 输入音频采样率
+        """
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * FRAME_MS // 1000
+        self._filter_b, self._filter_a = k_weighting_filter(sample_rate)
+        self._filter_state = np.zeros(len(self._filter_a) - 1)
+        self._pending = np.zeros(0, dtype=np.float64)
+        self._pending_weighted = np.zeros(0, dtype=np.float64)
+        self._frame_power = []
+        self._frame_weighted_power = []
+        self.samples = 0
+        self.clipped_samples = 0
+        self.sample_sum = 0.0
+        self.peak = 0.0
+
+    def update(self, audio: np.ndarray):
+        """输入一块单声道float音频（块长度不要求是帧长的整数倍）"""
+        if len(audio) == 0:
+            return
+        audio = np.asarray(audio, dtype=np.float64)
+        weighted, self._filter_state = lfilter(self._filter_b, self._filter_a, audio, zi=self._filter_state)
+
+        magnitude = np.abs(audio)
+        self.samples += len(audio)
+        self.clipped_samples += int(np.count_nonzero(magnitude >= CLIP_THRESHOLD))
+        self.sample_sum += float(audio.sum())
+        self.peak = max(self.peak, float(magnitude.max()))
+
+        # 与上一块剩余的采样点拼成完整的10ms帧，剩余部分留给下一块
+        audio = np.concatenate([self._pending, audio])
+        weighted = np.concatenate([self._pending_weighted, weighted])
+        frames = len(audio) // self.frame_samples
+        used = frames * self.frame_samples
+        self._frame_power.append(np.mean(audio[:used].reshape(frames, -1) ** 2, axis=1))
+        self._frame_weighted_power.append(np.mean(weighted[:used].reshape(frames, -1) ** 2, axis=1))
+        self._pending = audio[used:]
+        self._pending_weighted = weighted[used:]
+
+    def _frames(self) -> tuple:
+        """全部帧的 (均方功率, K加权均方功率)，末尾不足一帧的采样点单独成帧"""
+        frame_power = list(self._frame_power)
+        weighted_power = list(self._frame_weighted_power)
+        if len(self._pending):
+            frame_power.append(np.array([np.mean(self._pending ** 2)]))
+            weighted_power.append(np.array([np.mean(self._pending_weighted ** 2)]))
+        if not frame_power:
+            return np.zeros(0), np.zeros(0)
+        return np.concatenate(frame_power), np.concatenate(weighted_power)
+
+    def integrated_loudness(self, weighted_power: np.ndarray):
+        """BS.1770 门限积分响度（LUFS），不足400ms时按全部数据计算，全部块低于门限时返回None"""
+        step_frames = LOUDNESS_STEP_MS // FRAME_MS
+        steps = len(weighted_power) // step_frames
+        if steps >= LOUDNESS_BLOCK_STEPS:
+            step_power = weighted_power[:steps * step_frames].reshape(steps, step_frames).mean(axis=1)
+            cumulative = np.concatenate([[0.0], np.cumsum(step_power)])
+            block_power = (cumulative[LOUDNESS_BLOCK_STEPS:] - cumulative[:-LOUDNESS_BLOCK_STEPS]) / LOUDNESS_BLOCK_STEPS
+        elif len(weighted_power):
+            block_power = np.array([weighted_power.mean()])
+        else:
+            return None
+
+        block_power = block_power[_loudness(block_power) > LOUDNESS_ABSOLUTE_GATE]
+        if len(block_power) == 0:
+            return None
+        relative_gate = _loudness(block_power.mean()) + LOUDNESS_RELATIVE_GATE
+        block_power = block_power[_loudness(block_power) > relative_gate]
+        return float(_loudness(block_power.mean()))
+
+    def finalize(self, speech_segments: list) -> dict:
+        """
+        计算健康度指标
+
+        Args:
+            speech_segments (list): VAD语音段 [[start_ms, end_ms], ...]
+
+        Returns:
+            dict: {
+                'integrated_loudness_lufs': float | None,  # 整体响度(BS.1770门限积分)
+                'rms_dbfs': float,                # 整体RMS
+                'peak_dbfs': float,               # 峰值
+                'clipped_samples': int,           # 削波采样点数
+                'clipping_ratio': float,          # 削波采样点占比
+                'dc_offset': float,               # 直流分量（采样均值）
+                'speech_rms_dbfs': float | None,  # 语音帧RMS
+                'noise_rms_dbfs': float | None,   # 非语音帧RMS
+                'snr_db': float | None,           # 由语音/非语音帧能量估计的信噪比
+                'segment_rms_dbfs': list,         # 各语音段RMS，与语音段一一对应
+                'segment_loudness_lufs': list     # 各语音段K加权响度（不加门限）
+            }
+        """
+        frame_power, weighted_power = self._frames()
+        frames = len(frame_power)
+
+        # 语音段 -> 帧区间 [start_ms // 10, ceil(end_ms / 10))
+        bounds = np.asarray(speech_segments, dtype=np.int64).reshape(-1, 2)
+        seg_start = np.clip(bounds[:, 0] // FRAME_MS, 0, frames)
+        seg_end = np.clip(-(-bounds[:, 1] // FRAME_MS), seg_start, frames)
+        seg_frames = seg_end - seg_start
+
+        power_sum = np.concatenate([[0.0], np.cumsum(frame_power)])
+        weighted_sum = np.concatenate([[0.0], np.cumsum(weighted_power)])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            seg_power = (power_sum[seg_end] - power_sum[seg_start]) / seg_frames
+            seg_weighted = (weighted_sum[seg_end] - weighted_sum[seg_start]) / seg_frames
+        seg_power = np.nan_to_num(seg_power, nan=0.0)
+        seg_weighted = np.nan_to_num(seg_weighted, nan=0.0)
+
+        # 语音段覆盖的帧（语音段可能相接，用差分计数标记）
+        coverage = np.zeros(frames + 1, dtype=np.int64)
+        np.add.at(coverage, seg_start, 1)
+        np.add.at(coverage, seg_end, -1)
+        speech_mask = np.cumsum(coverage[:-1]) > 0
+
+        speech_power = frame_power[speech_mask].mean() if speech_mask.any() else None
+        noise_power = frame_power[~speech_mask].mean() if (~speech_mask).any() else None
+        snr_db = None
+        if speech_power is not None and noise_power is not None:
+            snr_db = float(_power_db(max(speech_power - noise_power, 0.0)) - _power_db(noise_power))
+
+        loudness = self.integrated_loudness(weighted_power)
+        return {
+            'integrated_loudness_lufs': None if loudness is None else round(loudness, 2),
+            'rms_dbfs': round(float(_power_db(frame_power.mean() if frames else 0.0)), 2),
+            'peak_dbfs': round(float(20 * np.log10(max(self.peak, POWER_FLOOR ** 0.5))), 2),
+            'clipped_samples': self.clipped_samples,
+            'clipping_ratio': round(self.clipped_samples / self.samples, 6) if self.samples else 0.0,
+            'dc_offset': round(self.sample_sum / self.samples, 6) if self.samples else 0.0,
+            'speech_rms_dbfs': None if speech_power is None else round(float(_power_db(speech_power)), 2),
+            'noise_rms_dbfs': None if noise_power is None else round(float(_power_db(noise_power)), 2),
+            'snr_db': None if snr_db is None else round(snr_db, 2),
+            'segment_rms_dbfs': np.round(_power_db(seg_power), 1).tolist(),
+            'segment_loudness_lufs': np.round(_loudness(seg_weighted), 1).tolist()
+        }
+
+
+def compute_audio_health(audio: np.ndarray, sample_rate: int, speech_segments: list) -> dict:
+    """对完整音频计算健康度指标（见 AudioHealthAccumulator.finalize）"""
+    accumulator = AudioHealthAccumulator(sample_rate)
+    accumulator.update(audio)
+    return accumulator.finalize(speech_segments)
+
+
+def is_clean_audio(health: dict, min_snr_db: float, max_clipping_ratio: float, max_dc_offset: float) -> bool:
+    """信噪比足够高、削波和直流分量都在范围内时认为音频干净，可以跳过降噪直接转写"""
+    snr_db = health.get('snr_db')
+    return (
+        snr_db is not None and snr_db >= min_snr_db
+        and health['clipping_ratio'] <= max_clipping_ratio
+        and abs(health['dc_offset']) <= max_dc_offset
+    )
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+语音压缩音频
+把VAD语音段按时间顺序拼接（间隔不超过 padding_ms 的语音段连同中间的停顿一起保留，其余语音段之间插入 padding_ms 的静音），
+生成只含语音的16kHz音频，并输出把压缩后时间映射回原始时间的偏移表，转写节点转写压缩音频后据此还原时间戳
+"""
+
+import json
+import wave
+import numpy as np
+
+# 偏移表格式：JSON，pieces 为 [[compact_start_ms, original_start_ms, duration_ms], ...]
+OFFSET_MAP_FORMAT = 'json-offset-map'
+OFFSET_MAP_VERSION = 1
+
+
+def plan_compaction(speech_segments: list, total_ms: int, padding_ms: int) -> np.ndarray:
+    """
+    计算压缩音频的片段布局
+
+    Args:
+        speech_segments (list): VAD语音段 [[start_ms, end_ms], ...]
+        total_ms (int): 原始音频时长（毫秒），语音段超出部分被截断
+        padding_ms (int): 片段之间插入的静音时长，同时也是合并语音段的最大间隔（毫秒）
+
+    Returns:
+        np.ndarray: int64 [N, 3] 偏移表 (compact_start_ms, original_start_ms, duration_ms)
+    """
+    bounds = np.asarray(speech_segments, dtype=np.int64).reshape(-1, 2)
+    bounds = np.clip(bounds, 0, total_ms)
+    bounds = bounds[bounds[:, 1] > bounds[:, 0]]
+    if len(bounds) == 0:
+        return np.zeros((0, 3), dtype=np.int64)
+    bounds = bounds[np.argsort(bounds[:, 0], kind='stable')]
+
+    # 与前面片段的间隔不超过 padding_ms（或重叠）的语音段并入同一片段
+    running_end = np.maximum.accumulate(bounds[:, 1])
+    new_piece = np.concatenate([[True], bounds[1:, 0] - running_end[:-1] > padding_ms])
+    starts = bounds[new_piece, 0]
+    ends = np.maximum.reduceat(bounds[:, 1], np.flatnonzero(new_piece))
+
+    durations = ends - starts
+    compact_starts = np.concatenate([[0], np.cumsum(durations[:-1] + padding_ms)])
+    return np.stack([compact_starts, starts, durations], axis=1)
+
+
+def render_compacted_audio(audio: np.ndarray, offset_map: np.ndarray, sample_rate: int, padding_ms: int) -> np.ndarray:
+    """按偏移表拼接语音片段，片段之间为 padding_ms 的静音"""
+    if len(offset_map) == 0:
+        return np.zeros(0, dtype=np.float32)
+    pieces = []
+    padding = np.zeros(padding_ms * sample_rate // 1000, dtype=np.float32)
+    for k, (_, original_start, duration) in enumerate(offset_map.tolist()):
+        if k:
+            pieces.append(padding)
+        begin = original_start * sample_rate // 1000
+        pieces.append(audio[begin:begin + duration * sample_rate // 1000].astype(np.float32, copy=False))
+    return np.concatenate(pieces)
+
+
+def build_offset_map(offset_map: np.ndarray, total_ms: int, padding_ms: int) -> dict:
+    """偏移表的JSON结构"""
+    return {
+        'format': OFFSET_MAP_FORMAT,
+        'version': OFFSET_MAP_VERSION,
+        'original_duration_ms': int(total_ms),
+        'compacted_duration_ms': int(offset_map[-1, 0] + offset_map[-1, 2]) if len(offset_map) else 0,
+        'padding_ms': int(padding_ms),
+        'pieces': offset_map.astype(np.int64).tolist()
+    }
+
+
+def write_wav(path: str, audio: np.ndarray, sample_rate: int):
+    """保存为16位PCM单声道WAV"""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype('<i2')
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+
+def save_compacted_rendition(audio: np.ndarray, speech_segments: list, sample_rate: int, padding_ms: int,
+                             audio_path: str, offset_map_path: str) -> dict:
+    """
+    生成并保存压缩音频和偏移表
+
+    Args:
+        audio (np.ndarray): 原始16kHz单声道音频
+        speech_segments (list): VAD语音段 [[start_ms, end_ms], ...]
+        sample_rate (int): 音频采样率
+        padding_ms (int): 片段之间的静音时长（毫秒）
+        audio_path (str): 压缩音频（WAV）保存路径
+        offset_map_path (str): 偏移表（JSON）保存路径
+
+    Returns:
+        dict: 偏移表的JSON结构
+    """
+    total_ms = len(audio) * 1000 // sample_rate
+    offset_map = plan_compaction(speech_segments, total_ms, padding_ms)
+    write_wav(audio_path, render_compacted_audio(audio, offset_map, sample_rate, padding_ms), sample_rate)
+    offset_map_info = build_offset_map(offset_map, total_ms, padding_ms)
+    with open(offset_map_path, 'w', encoding='utf-8') as f:
+        json.dump(offset_map_info, f, separators=(',', ':'))
+    return offset_map_info
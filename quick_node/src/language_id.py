@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+语种识别
+从VAD语音段中均匀抽取若干段（每组取最长的一段，截取中间部分），整批送入FunASR的Whisper-LID模型，
+按片段时长加权平均各片段的语种概率，得到整段音频的语种和置信度
+"""
+
+import shutil
+import subprocess
+import threading
+import numpy as np
+from loguru import logger
+
+
+def normalize_language_label(label: str) -> str:
+    """LID模型输出的标签 -> Whisper语种代码（'<|zh|>'、'zh-CN' -> 'zh'）"""
+    label = label.strip().strip('<|>').strip()
+    return label.replace('_', '-').split('-')[0].lower()
+
+
+def select_lid_clips(speech_segments: list, max_clips: int, clip_ms: int, min_segment_ms: int) -> list:
+    """
+    选择用于语种识别的音频片段
+
+    不短于 min_segment_ms 的语音段按时间顺序分为 max_clips 组，每组取最长的一段（没有足够长的语音段时使用全部语音段），
+    再截取其中间最多 clip_ms 的部分，使片段分布在整个音频中而不只是开头
+
+    Args:
+        speech_segments (list): VAD语音段 [[start_ms, end_ms], ...]
+        max_clips (int): 最多片段数
+        clip_ms (int): 每个片段的最大时长（毫秒）
+        min_segment_ms (int): 候选语音段的最短时长（毫秒）
+
+    Returns:
+        list: 按时间排序的片段 [[start_ms, end_ms], ...]
+    """
+    bounds = np.asarray(speech_segments, dtype=np.int64).reshape(-1, 2)
+    bounds = bounds[bounds[:, 1] > bounds[:, 0]]
+    if len(bounds) == 0 or max_clips <= 0:
+        return []
+    durations = bounds[:, 1] - bounds[:, 0]
+    if (durations >= min_segment_ms).any():
+        bounds, durations = bounds[durations >= min_segment_ms], durations[durations >= min_segment_ms]
+
+    order = np.argsort(bounds[:, 0], kind='stable')
+    clips = []
+    for group in np.array_split(order, min(max_clips, len(order))):
+        index = group[np.argmax(durations[group])]
+        length = min(int(durations[index]), clip_ms)
+        start = int(bounds[index, 0] + (durations[index] - length) // 2)
+        clips.append([start, start + length])
+    return clips
+
+
+def aggregate_lid_predictions(probabilities: np.ndarray, labels: list, clip_ms: list, top_k: int = 3) -> dict:
+    """
+    合并各片段的语种概率
+
+    Args:
+        probabilities (np.ndarray): [片段数, 标签数] 各片段的语种概率
+        labels (list): 标签对应的语种代码
+        clip_ms (list): 各片段时长（毫秒），作为平均时的权重
+        top_k (int): 输出的候选语种数
+
+    Returns:
+        dict: {
+            'language': str,        # 加权平均概率最高的语种
+            'confidence': float,    # 该语种的加权平均概率
+            'clips': int,           # 参与识别的片段数
+            'votes': dict,          # 各语种作为片段最高概率的次数
+            'candidates': list      # 概率最高的 top_k 个语种 [{'language', 'probability'}]
+        }
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    weights = np.asarray(clip_ms, dtype=np.float64)
+    weights = weights / weights.sum() if weights.sum() > 0 else np.full(len(weights), 1.0 / len(weights))
+
+    # 同一语种可能对应多个标签（如 zh-CN / zh-TW），先按语种代码合并
+    languages = sorted(set(labels))
+    label_index = np.array([languages.index(label) for label in labels])
+    merged = np.zeros((len(probabilities), len(languages)))
+    np.add.at(merged, (slice(None), label_index), probabilities)
+
+    mean = weights @ merged
+    ranked = np.argsort(-mean, kind='stable')
+    votes = {}
+    for best in merged.argmax(axis=1):
+        votes[languages[best]] = votes.get(languages[best], 0) + 1
+    return {
+        'language': languages[ranked[0]],
+        'confidence': round(float(mean[ranked[0]]), 4),
+        'clips': len(probabilities),
+        'votes': votes,
+        'candidates': [
+            {'language': languages[i], 'probability': round(float(mean[i]), 4)} for i in ranked[:top_k]
+        ]
+    }
+
+
+def load_clips_from_file(audio_path: str, clips: list, sample_rate: int) -> list:
+    """
+    从音频文件中只解码指定片段（ffmpeg按时间定位，不解码整个文件）
+
+    Args:
+        audio_path (str): 音频文件路径
+        clips (list): 片段 [[start_ms, end_ms], ...]
+        sample_rate (int): 输出采样率
+
+    Returns:
+        list: 各片段的float32单声道音频
+    """
+    if not shutil.which('ffmpeg'):
+        raise RuntimeError("按片段解码音频需要ffmpeg")
+    audios = []
+    for start_ms, end_ms in clips:
+        cmd = [
+            'ffmpeg', '-nostdin', '-v', 'error',
+            '-ss', f"{start_ms / 1000:.3f}", '-t', f"{(end_ms - start_ms) / 1000:.3f}",
+            '-i', audio_path,
+            '-f', 'f32le', '-acodec', 'pcm_f32le',
+            '-ac', '1', '-ar', str(sample_rate),
+            '-'
+        ]
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+        audios.append(np.frombuffer(out, dtype=np.float32))
+    return audios
+
+
+class SpokenLanguageIdentifier:
+    """语种识别器 - 首次使用时加载FunASR的Whisper-LID模型，各片段整批推理"""
+
+    def __init__(self, model: str, model_dir: str, max_clips: int, clip_ms: int, min_segment_ms: int,
+                 sample_rate: int, cache_dir: str = None, disable_update: bool = True):
+        """
+        初始化语种识别器
+
+        Args:
+            model (str): LID模型名称（modelscope）
+            model_dir (str): 本地模型目录，非空时优先使用
+            max_clips (int): 每个音频最多抽取的片段数（一次批量推理）
+            clip_ms (int): 每个片段的最大时长（毫秒）
+            min_segment_ms (int): 候选语音段的最短时长（毫秒）
+            sample_rate (int): 输入音频采样率
+            cache_dir (str): 模型缓存目录
+            disable_update (bool): 是否禁止检查模型更新
+        """
+        self.model_name = model_dir or model
+        self.max_clips = max_clips
+        self.clip_ms = clip_ms
+        self.min_segment_ms = min_segment_ms
+        self.sample_rate = sample_rate
+        self.cache_dir = cache_dir
+        self.disable_update = disable_update
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        """首次使用时加载模型（Whisper-LID依赖openai-whisper包）"""
+        if self._model is None:
+            from funasr import AutoModel
+            logger.info(f"正在加载语种识别模型: {self.model_name}")
+            self._model = AutoModel(
+                model=self.model_name,
+                cache_dir=self.cache_dir,
+                disable_update=self.disable_update,
+                disable_pbar=True
+            )
+        return self._model
+
+    def identify(self, speech_segments: list, audio: np.ndarray = None, audio_path: str = None) -> dict:
+        """
+        识别音频语种
+
+        Args:
+            speech_segments (list): VAD语音段 [[start_ms, end_ms], ...]
+            audio (np.ndarray): 已解码的完整音频；为空时从 audio_path 只解码所选片段
+            audio_path (str): 音频文件路径
+
+        Returns:
+            dict: aggregate_lid_predictions 的结果；没有语音段时返回None
+        """
+        clips = select_lid_clips(speech_segments, self.max_clips, self.clip_ms, self.min_segment_ms)
+        if not clips:
+            return None
+
+        if audio is not None:
+            clip_audios = [
+                audio[start_ms * self.sample_rate // 1000:end_ms * self.sample_rate // 1000] for start_ms, end_ms in clips
+            ]
+        else:
+            clip_audios = load_clips_from_file(audio_path, clips, self.sample_rate)
+
+        with self._lock:
+            model = self._get_model()
+            results = model.generate(
+                input=clip_audios,
+                fs=self.sample_rate,
+                data_type='sound',
+                batch_size=len(clip_audios),
+                inference_clip_length=self.clip_ms // 20,  # Whisper编码器输出帧为20ms
+                output_lid_probs=True
+            )
+
+        labels = [normalize_language_label(token) for token in model.kwargs['tokenizer'].token_list]
+        result = aggregate_lid_predictions(
+            np.stack([r['lid_probs'] for r in results]), labels, [end - start for start, end in clips]
+        )
+        result['clip_ranges_ms'] = clips
+        return result
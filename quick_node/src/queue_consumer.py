@@ -6,6 +6,7 @@ import json
 import time
 import pika
 import shutil
+import threading
 from pathlib import Path
 from loguru import logger
 from concurrent.futures import ThreadPoolExecutor
@@ -20,8 +21,9 @@ if os.path.exists(funasr_path):
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import Config
-from vad_analyzer import VADAnalyzer
+from vad_analyzer import VADAnalyzer, SEGMENTS_ARTIFACT_FORMAT
 from api_client import APIClient
+from stream_analyzer import StreamingVADAnalyzer
 
 class QueueConsumer:
     """快速识别队列消费者"""
@@ -31,9 +33,18 @@ class QueueConsumer:
         self.config = Config()
         self.vad_analyzer = VADAnalyzer()
         self.api_client = APIClient()
+        self.stream_analyzer = StreamingVADAnalyzer(self.vad_analyzer, self.api_client)
         self.connection = None
         self.channel = None
         
+        # 工作线程池：下载、解码在各线程并发进行，VAD模型由VADAnalyzer内部加锁共享
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.MAX_WORKERS,
+            thread_name_prefix='vad_worker'
+        )
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        
         # 验证配置
         self.config.validate_config()
         
@@ -61,6 +72,7 @@ class QueueConsumer:
         logger.info("快速识别节点启动")
         logger.info(f"VAD模型: {self.config.VAD_MODEL}")
         logger.info(f"队列名称: {self.config.QUEUE_NAME}")
+        logger.info(f"并发处理数: {self.config.MAX_WORKERS}")
         logger.info(f"API回调地址: {self.config.API_CALLBACK_URL}")
     
     def _connect_rabbitmq(self):
@@ -97,8 +109,8 @@ class QueueConsumer:
                 arguments=queue_arguments
             )
             
-            # 设置预取数量（一次只处理一个任务）
-            self.channel.basic_qos(prefetch_count=1)
+            # 设置预取数量（每个工作线程同时持有一个未确认的任务）
+            self.channel.basic_qos(prefetch_count=self.config.MAX_WORKERS)
             
             logger.info(f"成功连接到RabbitMQ: {self.config.RABBITMQ_HOST}:{self.config.RABBITMQ_PORT}")
             
@@ -129,15 +141,54 @@ class QueueConsumer:
             raise
     
     def stop_consuming(self):
-        """停止消费队列"""
+        """停止消费队列（等待处理中的任务完成并确认后再关闭连接）"""
         if self.channel:
             self.channel.stop_consuming()
-        if self.connection:
+        self.executor.shutdown(wait=False)
+        if self.connection and self.connection.is_open:
+            # 工作线程的确认需要在连接线程中执行，等待期间继续处理连接事件
+            while self._has_in_flight():
+                self.connection.process_data_events(time_limit=1)
             self.connection.close()
+        self.vad_analyzer.close()
         logger.info("队列消费已停止")
     
     def process_message(self, ch, method, properties, body):
-        """处理队列消息"""
+        """接收队列消息，交给工作线程处理（连接线程不阻塞，心跳照常进行）"""
+        future = self.executor.submit(self._handle_message, ch, method.delivery_tag, body)
+        with self._in_flight_lock:
+            self._in_flight.add(future)
+        future.add_done_callback(self._on_message_done)
+    
+    def _on_message_done(self, future):
+        """工作线程任务结束"""
+        with self._in_flight_lock:
+            self._in_flight.discard(future)
+    
+    def _has_in_flight(self) -> bool:
+        """是否还有处理中的任务"""
+        return self._in_flight_count() > 0
+    
+    def _in_flight_count(self) -> int:
+        """处理中的任务数"""
+        with self._in_flight_lock:
+            return len(self._in_flight)
+    
+    def _confirm_threadsafe(self, ch, delivery_tag: int, ack: bool = True, requeue: bool = False):
+        """在连接线程中确认消息（pika的连接和通道不是线程安全的，不能在工作线程中直接ack）"""
+        def confirm():
+            if not ch.is_open:
+                logger.warning(f"通道已关闭，消息 {delivery_tag} 将由RabbitMQ重新投递")
+                return
+            if ack:
+                ch.basic_ack(delivery_tag=delivery_tag)
+            else:
+                ch.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+        
+        self.connection.add_callback_threadsafe(confirm)
+    
+    def _handle_message(self, ch, delivery_tag: int, body: bytes):
+        """处理队列消息（在工作线程中执行）"""
         try:
             # 解析消息
             message_data = json.loads(body.decode('utf-8'))
@@ -149,7 +200,7 @@ class QueueConsumer:
             
             if not task_id:
                 logger.error("消息中缺少任务ID")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
+                self._confirm_threadsafe(ch, delivery_tag)
                 return
             
             # 处理任务
@@ -157,17 +208,17 @@ class QueueConsumer:
             
             if result['success']:
                 logger.info(f"任务 {task_id}: 快速识别完成")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
+                self._confirm_threadsafe(ch, delivery_tag)
             else:
                 logger.error(f"任务 {task_id}: 快速识别失败 - {result['error']}")
-                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+                self._confirm_threadsafe(ch, delivery_tag, ack=False, requeue=False)
                 
         except json.JSONDecodeError as e:
             logger.error(f"消息格式错误: {e}")
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+            self._confirm_threadsafe(ch, delivery_tag)
         except Exception as e:
             logger.error(f"处理消息异常: {e}")
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            self._confirm_threadsafe(ch, delivery_tag, ack=False, requeue=True)
     
     def _process_vad_task(self, task_info: dict) -> dict:
         """
@@ -204,17 +255,44 @@ class QueueConsumer:
             logger.info(f"任务 {task_id}: 音频URL: {file_url}")
             logger.info(f"任务 {task_id}: 本地路径: {input_path}")
             
-            # 下载音频文件
-            if not self.api_client.download_file(file_url, input_path):
-                raise Exception("音频文件下载失败")
+            # 压缩音频（只含语音段）及偏移表的本地路径
+            compact_output = None
+            if self.config.COMPACT_AUDIO:
+                compact_output = (
+                    os.path.join(temp_dir, f"task_{task_id}_compacted.wav"),
+                    os.path.join(temp_dir, f"task_{task_id}_offset_map.json")
+                )
             
-            # 获取文件信息
-            file_size = os.path.getsize(input_path)
-            logger.info(f"任务 {task_id}: 文件下载完成，大小: {self.api_client.get_file_size_str(file_size)}")
+            analysis_result = None
+            if self.config.VAD_STREAMING and self.stream_analyzer.is_available():
+                # 边下载边解码边VAD，下载完成后只剩最后一块音频的处理时间
+                try:
+                    logger.info(f"任务 {task_id}: 开始流式VAD分析")
+                    analysis_result = self.stream_analyzer.analyze_url(file_url, input_path, compact_output)
+                except Exception as e:
+                    logger.warning(f"任务 {task_id}: 流式下载失败，改为重新下载后分析: {e}")
             
-            # 进行VAD分析
-            logger.info(f"任务 {task_id}: 开始VAD分析")
-            analysis_result = self.vad_analyzer.analyze_audio(input_path)
+            if analysis_result is None:
+                # 下载音频文件
+                if not self.api_client.download_file(file_url, input_path):
+                    raise Exception("音频文件下载失败")
+                
+                # 获取文件信息
+                file_size = os.path.getsize(input_path)
+                logger.info(f"任务 {task_id}: 文件下载完成，大小: {self.api_client.get_file_size_str(file_size)}")
+                
+                # 进行VAD分析
+                logger.info(f"任务 {task_id}: 开始VAD分析")
+                analysis_result = self.vad_analyzer.analyze_audio(input_path, compact_output)
+            
+            # 上传语音段文件，转写节点复用后不再重复执行VAD（未检测到语音时上传空数组，转写节点据此跳过转写；
+            # 解析VAD结果失败时语音段不可信，不上传）
+            if self.config.VAD_SEGMENTS_ARTIFACT and not analysis_result.get('error'):
+                self._upload_segments_artifact(task_id, temp_dir, analysis_result)
+            
+            # 上传压缩音频和偏移表，转写节点转写压缩音频后按偏移表还原时间戳
+            if analysis_result.get('compacted_audio'):
+                self._upload_compacted_audio(task_id, analysis_result)
             
             # 发送成功回调
             self.api_client.send_success_callback(task_id, analysis_result)
@@ -251,6 +329,42 @@ class QueueConsumer:
                 'error': error_msg
             }
     
+    def _upload_segments_artifact(self, task_id, temp_dir: str, analysis_result: dict):
+        """保存并上传语音段文件，成功时把URL写入分析结果（失败不影响任务）"""
+        try:
+            artifact_path = self.vad_analyzer.save_segments_artifact(
+                analysis_result, os.path.join(temp_dir, f"task_{task_id}_vad_segments.npy")
+            )
+            upload_result = self.api_client.upload_file(artifact_path, task_type=3)
+            url = (upload_result or {}).get('data', {}).get('file_info', {}).get('url')
+            if not url:
+                raise Exception(f"上传响应中缺少文件URL: {upload_result}")
+            
+            analysis_result['vad_segments_url'] = url
+            analysis_result['vad_segments_format'] = SEGMENTS_ARTIFACT_FORMAT
+            logger.info(f"任务 {task_id}: 语音段文件上传完成: {url}")
+        except Exception as e:
+            logger.warning(f"任务 {task_id}: 语音段文件上传失败，回调中仅包含语音段列表: {e}")
+    
+    def _upload_compacted_audio(self, task_id, analysis_result: dict):
+        """上传压缩音频和偏移表，两者都成功时把URL写入分析结果（失败不影响任务）"""
+        compacted = analysis_result.pop('compacted_audio')
+        try:
+            urls = []
+            for path in (compacted['audio_path'], compacted['offset_map_path']):
+                upload_result = self.api_client.upload_file(path, task_type=3)
+                url = (upload_result or {}).get('data', {}).get('file_info', {}).get('url')
+                if not url:
+                    raise Exception(f"上传响应中缺少文件URL: {upload_result}")
+                urls.append(url)
+            
+            analysis_result['compacted_audio_url'], analysis_result['compacted_offset_map_url'] = urls
+            analysis_result['compacted_offset_map_format'] = compacted['offset_map_format']
+            analysis_result['compacted_duration'] = compacted['duration_ms'] / 1000
+            logger.info(f"任务 {task_id}: 压缩音频上传完成: {urls[0]}")
+        except Exception as e:
+            logger.warning(f"任务 {task_id}: 压缩音频上传失败，转写节点将使用原始音频: {e}")
+    
     def _cleanup_temp_files(self, temp_dir: str):
         """清理临时文件"""
         try:
@@ -267,6 +381,8 @@ class QueueConsumer:
             'status': 'running',
             'vad_model': self.vad_analyzer.get_model_info(),
             'queue': self.config.QUEUE_NAME,
+            'max_workers': self.config.MAX_WORKERS,
+            'in_flight_tasks': self._in_flight_count(),
             'rabbitmq_host': self.config.RABBITMQ_HOST,
             'api_callback_url': self.config.API_CALLBACK_URL
         }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+回调结果紧凑编码
+把逐条字典的语音段列表转为列式整数数组（毫秒），编码为 gzip(JSON) 或 msgpack，
+外层信封带版本号，后端按 version / schema / encoding 解码
+"""
+
+import base64
+import gzip
+import json
+
+# 紧凑格式版本号，列定义变化时递增
+RESULT_CODEC_VERSION = 1
+
+ENCODING_GZIP_JSON = 'gzip-json'
+ENCODING_MSGPACK = 'msgpack'
+
+# quick_node语音段的列式结构：{'start_ms': [...], 'end_ms': [...]}
+SCHEMA_SPEECH_SEGMENTS = 'speech_segments'
+
+
+def resolve_encoding(encoding: str) -> str:
+    """返回实际使用的编码，msgpack未安装时退回 gzip-json"""
+    if encoding == ENCODING_MSGPACK:
+        try:
+            import msgpack  # noqa: F401
+            return ENCODING_MSGPACK
+        except ImportError:
+            pass
+    return ENCODING_GZIP_JSON
+
+
+def encode_columns(columns: dict, encoding: str) -> bytes:
+    """把列式数据编码为字节串"""
+    if encoding == ENCODING_MSGPACK:
+        import msgpack
+        return msgpack.packb(columns, use_bin_type=True)
+    body = json.dumps(columns, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return gzip.compress(body, mtime=0)
+
+
+def decode_columns(payload: bytes, encoding: str) -> dict:
+    """encode_columns 的逆操作"""
+    if encoding == ENCODING_MSGPACK:
+        import msgpack
+        return msgpack.unpackb(payload, raw=False)
+    if encoding == ENCODING_GZIP_JSON:
+        return json.loads(gzip.decompress(payload).decode('utf-8'))
+    raise ValueError(f"不支持的紧凑结果编码: {encoding}")
+
+
+def build_envelope(schema: str, count: int, payload: bytes, encoding: str, url: str = None) -> dict:
+    """
+    构建回调中的紧凑结果信封
+
+    Args:
+        schema (str): 列式结构名称
+        count (int): 记录条数
+        payload (bytes): encode_columns 的输出
+        encoding (str): 编码方式
+        url (str): 编码数据已上传时的文件URL，为空时数据以base64内联
+
+    Returns:
+        dict: {'version', 'schema', 'encoding', 'count', 'size', 'data' | 'url'}
+    """
+    envelope = {
+        'version': RESULT_CODEC_VERSION,
+        'schema': schema,
+        'encoding': encoding,
+        'count': count,
+        'size': len(payload)
+    }
+    if url:
+        envelope['url'] = url
+    else:
+        envelope['data'] = base64.b64encode(payload).decode('ascii')
+    return envelope
+
+
+def read_envelope(envelope: dict, payload: bytes = None) -> dict:
+    """
+    解码紧凑结果信封
+
+    Args:
+        envelope (dict): build_envelope 的输出
+        payload (bytes): 信封引用URL时，由调用方下载的文件内容
+
+    Returns:
+        dict: 列式数据
+    """
+    if envelope.get('version') != RESULT_CODEC_VERSION:
+        raise ValueError(f"不支持的紧凑结果版本: {envelope.get('version')}")
+    if payload is None:
+        payload = base64.b64decode(envelope['data'])
+    return decode_columns(payload, envelope['encoding'])
+
+
+def speech_segments_to_columns(speech_segments: list) -> dict:
+    """语音段字典列表 -> 列式毫秒数组（start_time/end_time/duration 可由毫秒推出，不再重复）"""
+    return {
+        'start_ms': [int(segment['start_ms']) for segment in speech_segments],
+        'end_ms': [int(segment['end_ms']) for segment in speech_segments]
+    }
+
+
+def speech_segments_from_columns(columns: dict) -> list:
+    """列式毫秒数组 -> 与旧回调相同的语音段字典列表"""
+    speech_segments = []
+    for start_ms, end_ms in zip(columns['start_ms'], columns['end_ms']):
+        start_sec, end_sec = start_ms / 1000.0, end_ms / 1000.0
+        speech_segments.append({
+            'start_time': start_sec,
+            'end_time': end_sec,
+            'duration': end_sec - start_sec,
+            'start_ms': start_ms,
+            'end_ms': end_ms
+        })
+    return speech_segments
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from loguru import logger
+
+from vad_analyzer import VADAnalyzer, VAD_SAMPLE_RATE
+
+# 选择切分点时的能量帧长（10ms）和静音平滑窗口（帧）
+ENERGY_FRAME_SAMPLES = VAD_SAMPLE_RATE // 100
+SILENCE_WINDOW_FRAMES = 30
+
+# 工作进程内预加载的VAD分析器
+_worker_analyzer = None
+
+
+def _init_worker(backend: str, torch_threads: int):
+    """工作进程初始化：加载一次VAD模型，之后的分片都复用它"""
+    global _worker_analyzer
+    if backend == 'torch':
+        import torch
+        torch.set_num_threads(torch_threads)
+    _worker_analyzer = VADAnalyzer(backend=backend)
+
+
+def _run_shard(shard: np.ndarray, key: str) -> list:
+    """在工作进程中对一个分片执行整段VAD，返回相对分片开头的语音段"""
+    result = _worker_analyzer._run_vad(shard, key)
+    return [[int(start), int(end)] for start, end in result[0]['value']] if result else []
+
+
+def plan_shard_cuts(audio: np.ndarray, num_shards: int, search_samples: int) -> list:
+    """
+    选择分片切分点：在等分点附近 ±search_samples 内找平均能量最低的位置（尽量落在静音中）
+
+    Returns:
+        list: 递增的切分点 [0, c1, ..., len(audio)]（采样点，中间的切分点都是10ms帧的整数倍）
+    """
+    total_frames = len(audio) // ENERGY_FRAME_SAMPLES
+    search_frames = search_samples // ENERGY_FRAME_SAMPLES
+    cut_frames = [0]
+    for k in range(1, num_shards):
+        nominal = total_frames * k // num_shards
+        lo = max(cut_frames[-1] + 1, nominal - search_frames)
+        hi = min(total_frames, nominal + search_frames)
+        if hi - lo <= SILENCE_WINDOW_FRAMES:
+            cut_frames.append(max(lo, nominal))
+            continue
+
+        window = audio[lo * ENERGY_FRAME_SAMPLES:hi * ENERGY_FRAME_SAMPLES].astype(np.float64)
+        energy = np.mean(window.reshape(hi - lo, ENERGY_FRAME_SAMPLES) ** 2, axis=1)
+        smoothed = np.convolve(energy, np.ones(SILENCE_WINDOW_FRAMES) / SILENCE_WINDOW_FRAMES, mode='valid')
+        # 能量相同时取离等分点最近的位置，保证结果确定
+        centers = lo + np.arange(len(smoothed)) + SILENCE_WINDOW_FRAMES // 2
+        best = np.lexsort((np.abs(centers - nominal), smoothed))[0]
+        cut_frames.append(int(centers[best]))
+    return [frame * ENERGY_FRAME_SAMPLES for frame in cut_frames] + [len(audio)]
+
+
+def merge_shard_segments(shard_segments: list, cuts: list) -> list:
+    """
+    合并各分片的语音段（毫秒，已换算为相对音频开头）
+
+    每个分片负责 [cuts[k], cuts[k+1]) 内开始的语音段；跨越切分点的语音段由两侧分片共同决定：
+    左侧分片给出开始，右侧分片（开始截到切分点）给出结束，两者重叠时取并集。
+    首尾相接的语音段保持分开（单次VAD对超长语音段按 max_single_segment_time 切分时也是首尾相接）。
+
+    Args:
+        shard_segments (list): 每个分片的语音段 [[start_ms, end_ms], ...]
+        cuts (list): plan_shard_cuts 返回的切分点（采样点）
+
+    Returns:
+        list: 合并后的语音段 [[start_ms, end_ms], ...]
+    """
+    cuts_ms = [cut * 1000 // VAD_SAMPLE_RATE for cut in cuts]
+    kept = []
+    for k, segments in enumerate(shard_segments):
+        own_start, own_end = cuts_ms[k], cuts_ms[k + 1]
+        for start, end in segments:
+            if own_start <= start < own_end:
+                kept.append([start, end])
+            elif start < own_start < end:
+                kept.append([own_start, end])
+
+    merged = []
+    for start, end in sorted(kept):
+        if merged and start < merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class ShardedVADRunner:
+    """多进程分片VAD - 长音频按静音位置切成带重叠的分片，由预加载模型的进程池并行分析后合并"""
+
+    def __init__(self, backend: str, workers: int, overlap_ms: int, search_ms: int):
+        """
+        初始化分片VAD
+
+        Args:
+            backend (str): 工作进程使用的推理后端
+            workers (int): 进程数（同时也是每个音频的分片数）
+            overlap_ms (int): 分片两侧额外包含的重叠时长（毫秒）
+            search_ms (int): 在等分点两侧搜索静音切分点的范围（毫秒）
+        """
+        self.backend = backend
+        self.workers = workers
+        self.overlap_samples = overlap_ms * VAD_SAMPLE_RATE // 1000
+        self.search_samples = search_ms * VAD_SAMPLE_RATE // 1000
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """首次使用时启动进程池（spawn启动，避免在多线程进程中fork）"""
+        with self._pool_lock:
+            if self._pool is None:
+                torch_threads = max(1, (os.cpu_count() or 1) // self.workers)
+                logger.info(f"启动分片VAD进程池: {self.workers} 个进程, 每进程 {torch_threads} 个torch线程")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.backend, torch_threads)
+                )
+            return self._pool
+
+    def run(self, audio: np.ndarray, key: str) -> list:
+        """
+        分片并行执行VAD
+
+        Args:
+            audio (np.ndarray): 16kHz单声道音频
+            key (str): 结果键名
+
+        Returns:
+            list: 与 VADAnalyzer._run_vad 相同格式的结果 [{'key': key, 'value': [[start_ms, end_ms], ...]}]
+        """
+        cuts = plan_shard_cuts(audio, self.workers, self.search_samples)
+        bounds = [
+            (max(0, cuts[k] - self.overlap_samples), min(len(audio), cuts[k + 1] + self.overlap_samples))
+            for k in range(len(cuts) - 1)
+        ]
+        logger.info(f"分片VAD: {len(bounds)} 个分片, 切分点(秒)="
+                   f"{[round(cut / VAD_SAMPLE_RATE, 2) for cut in cuts[1:-1]]}")
+
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_run_shard, audio[start:end], f"{key}#{k}")
+            for k, (start, end) in enumerate(bounds)
+        ]
+
+        shard_segments = []
+        for (start, _), future in zip(bounds, futures):
+            offset_ms = start * 1000 // VAD_SAMPLE_RATE
+            shard_segments.append([[s + offset_ms, e + offset_ms] for s, e in future.result()])
+        return [{'key': key, 'value': merge_shard_segments(shard_segments, cuts)}]
+
+    def close(self):
+        """关闭进程池"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import threading
+import subprocess
+import numpy as np
+from loguru import logger
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import Config
+from vad_analyzer import VAD_SAMPLE_RATE
+
+# float32 PCM每个采样点的字节数
+PCM_SAMPLE_BYTES = 4
+
+
+class StreamingVADAnalyzer:
+    """边下载边分析 - HTTP分块数据写入ffmpeg解码管道，输出的16kHz PCM按定长块送入流式VAD"""
+
+    def __init__(self, vad_analyzer, api_client):
+        """
+        初始化流式分析器
+
+        Args:
+            vad_analyzer (VADAnalyzer): 共享的VAD分析器（提供模型和结果解析）
+            api_client (APIClient): API客户端（提供流式下载）
+        """
+        self.config = Config()
+        self.vad_analyzer = vad_analyzer
+        self.api_client = api_client
+        self.chunk_ms = self.config.VAD_STREAM_CHUNK_MS
+
+    def is_available(self) -> bool:
+        """流式分析需要torch后端（FsmnVADStreaming的cache/is_final接口）和ffmpeg"""
+        return self.vad_analyzer.backend == 'torch' and shutil.which('ffmpeg') is not None
+
+    def analyze_url(self, url: str, local_path: str, compact_output: tuple = None) -> dict:
+        """
+        边下载边分析音频
+
+        Args:
+            url (str): 音频URL
+            local_path (str): 下载数据的本地保存路径（用于读取文件头信息）
+            compact_output (tuple): 压缩音频和偏移表的保存路径 (wav路径, json路径)，为空时不生成
+
+        Returns:
+            dict: 与 VADAnalyzer.analyze_audio 相同格式的分析结果
+
+        下载完成但流式解码或分析失败时（如moov位于文件末尾的MP4/M4A无法从管道解码），
+        改为分析已完整写入 local_path 的文件，不再重新下载；下载失败时抛出异常
+        """
+        os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
+        logger.info(f"开始流式分析: {url} -> {local_path}")
+
+        stderr_file = tempfile.TemporaryFile()
+        decoder = subprocess.Popen(
+            [
+                'ffmpeg', '-nostdin', '-v', 'error',
+                '-i', 'pipe:0',
+                '-f', 'f32le', '-acodec', 'pcm_f32le',
+                '-ac', '1', '-ar', str(VAD_SAMPLE_RATE),
+                'pipe:1'
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        )
+
+        # 下载线程：HTTP数据块同时写入本地文件和解码器输入
+        feed_state = {'bytes': 0, 'error': None}
+        feeder = threading.Thread(
+            target=self._feed_decoder,
+            args=(url, local_path, decoder, feed_state),
+            name='vad_stream_feeder',
+            daemon=True
+        )
+        feeder.start()
+
+        health = self.vad_analyzer.new_audio_health()
+        stream_error = None
+        try:
+            segments, total_samples = self.analyze_pcm_chunks(
+                self._iter_pcm_chunks(decoder.stdout), health
+            )
+        except Exception as e:
+            stream_error = e
+        finally:
+            decoder.stdout.close()
+            feeder.join()
+            return_code = decoder.wait()
+            stderr_file.seek(0)
+            decoder_error = stderr_file.read().decode(errors='ignore').strip()
+            stderr_file.close()
+
+        if feed_state['error'] is not None:
+            raise Exception(f"音频流式下载失败: {feed_state['error']}")
+        if stream_error is not None or return_code != 0:
+            # 下载线程在解码器退出后仍把数据写完，本地文件是完整的
+            reason = stream_error if stream_error is not None else f"ffmpeg流式解码失败: {decoder_error}"
+            logger.warning(f"流式VAD分析失败，改为分析已下载的文件: {reason}")
+            return self.vad_analyzer.analyze_audio(local_path, compact_output)
+
+        header = self.vad_analyzer._probe_audio_header(local_path)
+        file_size = feed_state['bytes']
+        file_info = {
+            'file_path': local_path,
+            'file_name': os.path.basename(local_path),
+            'file_size': file_size,
+            'file_size_mb': round(file_size / (1024 * 1024), 2),
+            'duration': total_samples / VAD_SAMPLE_RATE,
+            'sample_rate': header.get('sample_rate', VAD_SAMPLE_RATE),
+            'channels': header.get('channels', 1),
+            'samples': total_samples,
+            'analysis_sample_rate': VAD_SAMPLE_RATE
+        }
+
+        analysis_result = self.vad_analyzer._parse_vad_result(
+            [{'key': file_info['file_name'], 'value': segments}], file_info['duration'], file_info
+        )
+        self.vad_analyzer.attach_audio_health(analysis_result, health)
+        self.vad_analyzer.attach_language(analysis_result, audio_path=local_path)
+        self.vad_analyzer.attach_compacted_audio(analysis_result, compact_output, audio_path=local_path)
+        logger.info(f"流式VAD分析完成: 总时长={analysis_result['total_duration']:.2f}秒, "
+                   f"有效语音={analysis_result['effective_duration']:.2f}秒, "
+                   f"语音占比={analysis_result['speech_ratio']:.2%}")
+        return analysis_result
+
+    def analyze_pcm_chunks(self, pcm_chunks, health=None) -> tuple:
+        """
+        对连续到达的16kHz PCM块执行流式VAD
+
+        Args:
+            pcm_chunks: 可迭代的float32音频块，除最后一块外长度均为 chunk_ms 对应的采样点数
+            health (AudioHealthAccumulator): 音频健康度统计累积器，为空时不统计
+
+        Returns:
+            tuple: (语音段 [[start_ms, end_ms], ...], 总采样点数)
+        """
+        cache = {}
+        segments = []
+        total_samples = 0
+        pending = None
+        # 保留一块，读到下一块（或数据结束）后才能确定它是否为最后一块
+        for chunk in pcm_chunks:
+            if pending is not None:
+                segments.extend(self.vad_analyzer.run_vad_chunk(pending, cache, False, self.chunk_ms))
+            pending = chunk
+            total_samples += len(chunk)
+            if health is not None:
+                health.update(chunk)
+
+        if pending is not None and len(pending) > 0:
+            segments.extend(self.vad_analyzer.run_vad_chunk(pending, cache, True, self.chunk_ms))
+        return segments, total_samples
+
+    def _iter_pcm_chunks(self, pcm_stream):
+        """从解码器输出中按 chunk_ms 读取定长的float32音频块，最后一块可能较短"""
+        chunk_bytes = int(self.chunk_ms * VAD_SAMPLE_RATE / 1000) * PCM_SAMPLE_BYTES
+        buffer = bytearray()
+        while True:
+            data = pcm_stream.read(chunk_bytes - len(buffer))
+            if not data:
+                break
+            buffer.extend(data)
+            if len(buffer) == chunk_bytes:
+                yield np.frombuffer(bytes(buffer), dtype=np.float32)
+                buffer.clear()
+
+        usable = len(buffer) - len(buffer) % PCM_SAMPLE_BYTES
+        if usable:
+            yield np.frombuffer(bytes(buffer[:usable]), dtype=np.float32)
+
+    def _feed_decoder(self, url: str, local_path: str, decoder: subprocess.Popen, feed_state: dict):
+        """下载线程：把HTTP数据块写入本地文件和ffmpeg标准输入"""
+        try:
+            decoder_open = True
+            with open(local_path, 'wb') as f:
+                for chunk in self.api_client.iter_download(url):
+                    f.write(chunk)
+                    feed_state['bytes'] += len(chunk)
+                    if not decoder_open:
+                        continue
+                    try:
+                        decoder.stdin.write(chunk)
+                    except BrokenPipeError:
+                        # 解码器提前退出，错误信息由ffmpeg的返回码和stderr给出；继续下载完整文件，供改为分析本地文件时使用
+                        decoder_open = False
+        except Exception as e:
+            feed_state['error'] = e
+            decoder.kill()
+        finally:
+            try:
+                decoder.stdin.close()
+            except Exception:
+                pass
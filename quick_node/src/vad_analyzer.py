@@ -2,60 +2,133 @@
 # -*- coding: utf-8 -*-
 
 import os
+import json
+import shutil
+import subprocess
+import threading
 import librosa
 import numpy as np
 from pathlib import Path
 from loguru import logger
-from funasr import AutoModel
 import sys
-import os
 
-# 添加本地FunASR路径
+# 添加本地FunASR路径（funasr在初始化模型时按后端延迟导入，onnx后端不需要torch）
 current_dir = os.path.dirname(__file__)
 funasr_path = os.path.join(os.path.dirname(current_dir), 'FunASR')
 if os.path.exists(funasr_path):
     sys.path.insert(0, funasr_path)
+    funasr_onnx_path = os.path.join(funasr_path, 'runtime', 'python', 'onnxruntime')
+    if os.path.exists(funasr_onnx_path):
+        sys.path.insert(0, funasr_onnx_path)
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import Config
+from audio_health import AudioHealthAccumulator, is_clean_audio
+from compact_audio import save_compacted_rendition, OFFSET_MAP_FORMAT
+
+# FSMN-VAD模型的输入采样率，音频直接解码到该采样率的单声道float32
+VAD_SAMPLE_RATE = 16000
+
+# onnx后端未找到本地模型时使用的modelscope模型ID（funasr_onnx不识别 fsmn-vad 这样的简称）
+ONNX_VAD_MODEL_ID = 'iic/speech_fsmn_vad_zh-cn-16k-common-pytorch'
+
+# 语音段文件格式：int32 [N, 2] 数组（start_ms, end_ms），numpy .npy 保存
+SEGMENTS_ARTIFACT_FORMAT = 'npy-int32-ms'
 
 class VADAnalyzer:
     """语音活动检测分析器 - 基于FunASR的VAD模型"""
     
-    def __init__(self):
-        """初始化VAD分析器"""
+    def __init__(self, backend: str = None):
+        """
+        初始化VAD分析器
+        
+        Args:
+            backend (str): 推理后端 torch 或 onnx，默认使用配置 VAD_BACKEND
+        """
         self.config = Config()
         self.vad_model = None
+        self.backend = (backend or self.config.VAD_BACKEND).lower()
+        # 多个工作线程共享同一个模型；FunASR推理会修改模型内部状态，推理时串行执行（音频解码不加锁，可并发）
+        self._vad_lock = threading.Lock()
+        self._sharded_runner = None
+        self._language_identifier = None
         self._init_vad_model()
     
     def _init_vad_model(self):
-        """初始化VAD模型"""
+        """按配置的后端初始化VAD模型"""
+        if self.backend == 'onnx':
+            self._init_onnx_vad_model()
+        else:
+            self._init_torch_vad_model()
+            if self.config.VAD_ENERGY_GATE:
+                # 能量预门限：整个感受野都低于门限的帧（数字静音）不送入FSMN编码器，直接判为静音
+                self.vad_model.kwargs.update(
+                    energy_gate_db=self.config.VAD_ENERGY_GATE_DB,
+                    energy_gate_min_frames=self.config.VAD_ENERGY_GATE_MIN_FRAMES
+                )
+    
+    def _possible_local_paths(self) -> list:
+        """本地VAD模型可能所在的目录"""
+        return [
+            os.path.join(self.config.MODEL_CACHE_DIR, 'speech_fsmn_vad_zh-cn-16k-common-pytorch'),
+            os.path.join(self.config.MODEL_CACHE_DIR, 'iic', 'speech_fsmn_vad_zh-cn-16k-common-pytorch'),
+            './models/speech_fsmn_vad_zh-cn-16k-common-pytorch',
+            './models/iic/speech_fsmn_vad_zh-cn-16k-common-pytorch',
+            # 兼容其他可能的本地路径
+            '/root/.cache/modelscope/hub/iic/speech_fsmn_vad_zh-cn-16k-common-pytorch',
+            '/home/.cache/modelscope/hub/iic/speech_fsmn_vad_zh-cn-16k-common-pytorch',
+        ]
+    
+    def _find_local_model(self, model_extensions: tuple, required_files: tuple = ()) -> str:
+        """查找包含指定模型文件和配置文件的本地模型目录，找不到时返回None"""
+        for path in self._possible_local_paths():
+            if os.path.exists(path) and os.path.isdir(path):
+                files = os.listdir(path)
+                # 检查是否包含模型文件
+                model_files = [f for f in files if f.endswith(model_extensions)]
+                config_files = [f for f in files if f in ['config.yaml', 'config.json', 'configuration.json']]
+                
+                if model_files and config_files and all(f in files for f in required_files):
+                    logger.info(f"发现本地VAD模型: {path}")
+                    return path
+        return None
+    
+    def _init_onnx_vad_model(self):
+        """初始化ONNX Runtime VAD模型（不依赖torch）"""
+        try:
+            logger.info("正在初始化ONNX Runtime VAD模型...")
+            from funasr_onnx.vad_bin import Fsmn_vad
+            
+            onnx_file = 'model_quant.onnx' if self.config.VAD_ONNX_QUANTIZE else 'model.onnx'
+            model_dir = self.config.VAD_ONNX_MODEL_DIR or self._find_local_model(
+                ('.onnx',), required_files=(onnx_file, 'am.mvn')
+            )
+            if not model_dir:
+                # 未找到已导出的模型时由funasr_onnx导出（导出需要安装funasr和torch，建议先离线运行 export_vad_onnx.py）
+                model_dir = self._find_local_model(('.pt', '.pth', '.bin')) or ONNX_VAD_MODEL_ID
+                logger.warning(f"未找到已导出的ONNX VAD模型，尝试从 {model_dir} 导出")
+            
+            self.vad_model = Fsmn_vad(
+                model_dir=model_dir,
+                quantize=self.config.VAD_ONNX_QUANTIZE,
+                intra_op_num_threads=self.config.VAD_ONNX_THREADS,
+                cache_dir=self.config.MODEL_CACHE_DIR
+            )
+            logger.info(f"ONNX VAD模型初始化成功 - 模型目录: {model_dir}, 量化: {self.config.VAD_ONNX_QUANTIZE}")
+            
+        except Exception as e:
+            logger.error(f"ONNX VAD模型初始化失败: {e}")
+            raise Exception(f"ONNX VAD模型初始化失败: {e}")
+    
+    def _init_torch_vad_model(self):
+        """初始化PyTorch VAD模型"""
+        from funasr import AutoModel
+        
         try:
             logger.info("正在初始化FunASR VAD模型...")
             
             # 检查是否存在本地模型
-            local_model_path = None
-            possible_local_paths = [
-                os.path.join(self.config.MODEL_CACHE_DIR, 'speech_fsmn_vad_zh-cn-16k-common-pytorch'),
-                os.path.join(self.config.MODEL_CACHE_DIR, 'iic', 'speech_fsmn_vad_zh-cn-16k-common-pytorch'),
-                './models/speech_fsmn_vad_zh-cn-16k-common-pytorch',
-                './models/iic/speech_fsmn_vad_zh-cn-16k-common-pytorch',
-                # 兼容其他可能的本地路径
-                '/root/.cache/modelscope/hub/iic/speech_fsmn_vad_zh-cn-16k-common-pytorch',
-                '/home/.cache/modelscope/hub/iic/speech_fsmn_vad_zh-cn-16k-common-pytorch',
-            ]
-            
-            # 查找本地模型
-            for path in possible_local_paths:
-                if os.path.exists(path) and os.path.isdir(path):
-                    # 检查是否包含模型文件
-                    model_files = [f for f in os.listdir(path) if f.endswith(('.bin', '.pt', '.pth', '.onnx'))]
-                    config_files = [f for f in os.listdir(path) if f in ['config.yaml', 'config.json', 'configuration.json']]
-                    
-                    if model_files and config_files:
-                        local_model_path = path
-                        logger.info(f"发现本地VAD模型: {local_model_path}")
-                        break
+            local_model_path = self._find_local_model(('.bin', '.pt', '.pth', '.onnx'))
             
             # 根据是否找到本地模型来配置模型参数
             if local_model_path and (self.config.OFFLINE_MODE or self.config.DISABLE_UPDATE):
@@ -95,12 +168,13 @@ class VADAnalyzer:
                 logger.error(f"备用VAD模型也失败: {e2}")
                 raise Exception(f"VAD模型初始化失败: 主模型错误={e}, 备用模型错误={e2}")
     
-    def analyze_audio(self, audio_path: str) -> dict:
+    def analyze_audio(self, audio_path: str, compact_output: tuple = None) -> dict:
         """
         分析音频文件的语音活动
         
         Args:
             audio_path (str): 音频文件路径
+            compact_output (tuple): 压缩音频和偏移表的保存路径 (wav路径, json路径)，为空时不生成
             
         Returns:
             dict: 分析结果
@@ -110,7 +184,10 @@ class VADAnalyzer:
                 'silence_duration': float,    # 静音时长(秒)
                 'speech_ratio': float,        # 语音占比(0-1)
                 'speech_segments': list,      # 语音段落信息
-                'file_info': dict            # 文件基本信息
+                'file_info': dict,           # 文件基本信息
+                'audio_health': dict,        # 音频健康度（AUDIO_HEALTH=true 时）
+                'language_detection': dict,  # 语种识别结果（LANGUAGE_ID=true 时）
+                'compacted_audio': dict      # 压缩音频信息（COMPACT_AUDIO=true 且传入 compact_output 时）
             }
         """
         try:
@@ -120,20 +197,23 @@ class VADAnalyzer:
             
             logger.info(f"开始分析音频: {audio_path}")
             
-            # 获取音频基本信息
-            file_info = self._get_audio_info(audio_path)
+            # 一次性解码为16kHz单声道，时长等信息和VAD输入都来自同一份数据
+            audio, file_info = self._load_audio(audio_path)
             total_duration = file_info['duration']
             
             logger.info(f"音频基本信息: 时长={total_duration:.2f}秒, 采样率={file_info['sample_rate']}Hz")
             
-            # 使用VAD模型进行语音活动检测
-            vad_result = self.vad_model.generate(
-                input=audio_path,
-                batch_size_s=300  # VAD模型使用batch_size_s参数，单位为秒
-            )
+            # 使用VAD模型进行语音活动检测（直接传入音频数组，避免模型内部重复解码）
+            if self._use_sharded_vad(total_duration):
+                vad_result = self._get_sharded_runner().run(audio, file_info['file_name'])
+            else:
+                vad_result = self._run_vad(audio, file_info['file_name'])
             
             # 解析VAD结果
             analysis_result = self._parse_vad_result(vad_result, total_duration, file_info)
+            self.attach_audio_health(analysis_result, self.new_audio_health(audio))
+            self.attach_language(analysis_result, audio=audio)
+            self.attach_compacted_audio(analysis_result, compact_output, audio=audio)
             
             logger.info(f"VAD分析完成: 总时长={analysis_result['total_duration']:.2f}秒, "
                        f"有效语音={analysis_result['effective_duration']:.2f}秒, "
@@ -145,29 +225,149 @@ class VADAnalyzer:
             logger.error(f"音频分析失败: {e}")
             raise
     
-    def _get_audio_info(self, audio_path: str) -> dict:
-        """获取音频文件基本信息"""
+    def _use_sharded_vad(self, duration: float) -> bool:
+        """长音频是否分片并行执行VAD"""
+        return self.config.VAD_PARALLEL_WORKERS > 1 and duration >= self.config.VAD_PARALLEL_MIN_DURATION
+    
+    def _get_sharded_runner(self):
+        """首次使用时创建分片VAD（进程池在首次分析时启动，各进程各自加载模型）"""
+        with self._vad_lock:
+            if self._sharded_runner is None:
+                from sharded_vad import ShardedVADRunner
+                self._sharded_runner = ShardedVADRunner(
+                    backend=self.backend,
+                    workers=self.config.VAD_PARALLEL_WORKERS,
+                    overlap_ms=self.config.VAD_PARALLEL_OVERLAP_MS,
+                    search_ms=self.config.VAD_PARALLEL_SEARCH_MS
+                )
+            return self._sharded_runner
+    
+    def close(self):
+        """释放分片VAD的进程池"""
+        if self._sharded_runner is not None:
+            self._sharded_runner.close()
+    
+    def _run_vad(self, audio: np.ndarray, key: str) -> list:
+        """
+        对16kHz单声道音频执行VAD
+        
+        Returns:
+            list: 与FunASR一致的结果格式 [{'key': key, 'value': [[start_ms, end_ms], ...]}]
+        """
+        with self._vad_lock:
+            if self.backend == 'onnx':
+                segments = self.vad_model(audio)
+                # 静音或纯噪声时funasr_onnx返回空字符串
+                value = segments[0] if segments else []
+                return [{'key': key, 'value': value}]
+            
+            return self.vad_model.generate(
+                input=audio,
+                fs=VAD_SAMPLE_RATE,
+                batch_size_s=300  # VAD模型使用batch_size_s参数，单位为秒
+            )
+    
+    def run_vad_chunk(self, audio_chunk: np.ndarray, cache: dict, is_final: bool, chunk_ms: int) -> list:
+        """
+        流式VAD：送入一块16kHz单声道音频（torch后端）
+        
+        Args:
+            audio_chunk (np.ndarray): 音频块，除最后一块外长度应为 chunk_ms 对应的采样点数
+            cache (dict): 本次流式分析的模型状态，首次传入空字典，之后原样传回
+            is_final (bool): 是否为最后一块
+            chunk_ms (int): 音频块时长（毫秒）
+            
+        Returns:
+            list: 本块中已确定结束的语音段 [[start_ms, end_ms], ...]（时间相对音频开头）
+        """
+        with self._vad_lock:
+            # 使用配置副本，is_final/chunk_size 等流式参数不写回共享的模型配置，避免影响整文件分析
+            kwargs = dict(self.vad_model.kwargs)
+            result = self.vad_model.inference(
+                audio_chunk,
+                kwargs=kwargs,
+                cache=cache,
+                is_final=is_final,
+                chunk_size=chunk_ms,
+                fs=VAD_SAMPLE_RATE
+            )
+        return result[0]['value'] if result else []
+    
+    def _load_audio(self, audio_path: str) -> tuple:
+        """
+        解码音频为16kHz单声道float32，并生成文件基本信息
+        
+        Args:
+            audio_path (str): 音频文件路径
+            
+        Returns:
+            tuple: (音频数组, 文件信息)
+        """
         try:
-            # 使用librosa获取音频信息
-            y, sr = librosa.load(audio_path, sr=None)
-            duration = len(y) / sr
+            audio = self._decode_audio(audio_path)
+            header = self._probe_audio_header(audio_path)
             file_size = os.path.getsize(audio_path)
             
-            return {
+            file_info = {
                 'file_path': audio_path,
                 'file_name': os.path.basename(audio_path),
                 'file_size': file_size,
                 'file_size_mb': round(file_size / (1024 * 1024), 2),
-                'duration': duration,
-                'sample_rate': sr,
-                'channels': 1 if len(y.shape) == 1 else y.shape[0],
-                'samples': len(y)
+                'duration': len(audio) / VAD_SAMPLE_RATE,
+                'sample_rate': header.get('sample_rate', VAD_SAMPLE_RATE),
+                'channels': header.get('channels', 1),
+                'samples': len(audio),
+                'analysis_sample_rate': VAD_SAMPLE_RATE
             }
+            return audio, file_info
             
         except Exception as e:
             logger.error(f"获取音频信息失败: {e}")
             raise
     
+    def _decode_audio(self, audio_path: str) -> np.ndarray:
+        """解码音频：优先使用ffmpeg直接输出16kHz单声道float32，不可用时使用librosa(soxr)"""
+        if shutil.which('ffmpeg'):
+            cmd = [
+                'ffmpeg', '-nostdin', '-v', 'error',
+                '-i', audio_path,
+                '-f', 'f32le', '-acodec', 'pcm_f32le',
+                '-ac', '1', '-ar', str(VAD_SAMPLE_RATE),
+                '-'
+            ]
+            try:
+                out = subprocess.run(cmd, capture_output=True, check=True).stdout
+                return np.frombuffer(out, dtype=np.float32)
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"ffmpeg解码失败，回退到librosa: {e.stderr.decode(errors='ignore').strip()}")
+        
+        audio, _ = librosa.load(audio_path, sr=VAD_SAMPLE_RATE, mono=True, res_type='soxr_hq')
+        return audio.astype(np.float32, copy=False)
+    
+    def _probe_audio_header(self, audio_path: str) -> dict:
+        """从文件头读取原始采样率和声道数，不解码音频数据"""
+        try:
+            import soundfile as sf
+            info = sf.info(audio_path)
+            return {'sample_rate': info.samplerate, 'channels': info.channels}
+        except Exception:
+            pass
+        
+        if shutil.which('ffprobe'):
+            try:
+                cmd = [
+                    'ffprobe', '-v', 'error', '-select_streams', 'a:0',
+                    '-show_entries', 'stream=sample_rate,channels',
+                    '-of', 'json', audio_path
+                ]
+                out = subprocess.run(cmd, capture_output=True, check=True).stdout
+                stream = json.loads(out).get('streams', [{}])[0]
+                return {'sample_rate': int(stream['sample_rate']), 'channels': int(stream['channels'])}
+            except Exception as e:
+                logger.debug(f"ffprobe读取音频头失败: {e}")
+        
+        return {}
+    
     def _parse_vad_result(self, vad_result, total_duration: float, file_info: dict) -> dict:
         """解析VAD检测结果"""
         try:
@@ -248,31 +448,212 @@ class VADAnalyzer:
             }
     
     def batch_analyze(self, audio_files: list) -> list:
-        """批量分析音频文件"""
+        """
+        批量分析音频文件
+        
+        torch后端每 VAD_BATCH_SIZE 个文件合并为一次批量推理（FSMN编码器对补零后的整批特征一起前向），
+        onnx后端逐个推理。返回结果与输入文件一一对应。
+        """
         results = []
+        batch_size = max(1, self.config.VAD_BATCH_SIZE)
         
-        for audio_file in audio_files:
-            try:
-                result = self.analyze_audio(audio_file)
-                result['status'] = 'success'
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"分析文件失败 {audio_file}: {e}")
-                results.append({
-                    'file_path': audio_file,
-                    'status': 'failed',
-                    'error': str(e)
-                })
+        for begin in range(0, len(audio_files), batch_size):
+            group_files = audio_files[begin:begin + batch_size]
+            group_results = [None] * len(group_files)
+            loaded = []  # (组内序号, 音频, 文件信息)
+            
+            for i, audio_file in enumerate(group_files):
+                try:
+                    if not os.path.exists(audio_file):
+                        raise FileNotFoundError(f"音频文件不存在: {audio_file}")
+                    audio, file_info = self._load_audio(audio_file)
+                    loaded.append((i, audio, file_info))
+                except Exception as e:
+                    logger.error(f"分析文件失败 {audio_file}: {e}")
+                    group_results[i] = {'file_path': audio_file, 'status': 'failed', 'error': str(e)}
+            
+            if loaded:
+                try:
+                    vad_results = self._run_vad_batch(
+                        [audio for _, audio, _ in loaded],
+                        [file_info['file_name'] for _, _, file_info in loaded]
+                    )
+                    for (i, audio, file_info), vad_result in zip(loaded, vad_results):
+                        result = self._parse_vad_result([vad_result], file_info['duration'], file_info)
+                        self.attach_audio_health(result, self.new_audio_health(audio))
+                        result['status'] = 'success'
+                        group_results[i] = result
+                except Exception as e:
+                    logger.error(f"批量VAD分析失败: {e}")
+                    for i, _, _ in loaded:
+                        group_results[i] = {'file_path': group_files[i], 'status': 'failed', 'error': str(e)}
+            
+            results.extend(group_results)
         
         return results
     
+    def _run_vad_batch(self, audios: list, keys: list) -> list:
+        """
+        对多段16kHz单声道音频执行VAD
+        
+        Returns:
+            list: 每段音频一个结果 {'key': key, 'value': [[start_ms, end_ms], ...]}
+        """
+        if self.backend == 'onnx' or len(audios) == 1:
+            return [self._run_vad(audio, key)[0] for audio, key in zip(audios, keys)]
+        
+        with self._vad_lock:
+            # generate() 会把传入的参数合并进共享的模型配置，推理后恢复原批大小，避免影响之后的单文件和流式分析
+            previous_batch_size = self.vad_model.kwargs.get('batch_size', 1)
+            try:
+                vad_results = self.vad_model.generate(
+                    input=audios,
+                    fs=VAD_SAMPLE_RATE,
+                    batch_size=len(audios)
+                )
+            finally:
+                self.vad_model.kwargs['batch_size'] = previous_batch_size
+        for vad_result, key in zip(vad_results, keys):
+            vad_result['key'] = key
+        return vad_results
+    
+    def new_audio_health(self, audio: np.ndarray = None):
+        """
+        创建音频健康度统计累积器（AUDIO_HEALTH=false 时返回None）
+        
+        Args:
+            audio (np.ndarray): 已解码的完整音频；流式分析时为空，由调用方逐块输入
+        """
+        if not self.config.AUDIO_HEALTH:
+            return None
+        accumulator = AudioHealthAccumulator(VAD_SAMPLE_RATE)
+        if audio is not None:
+            accumulator.update(audio)
+        return accumulator
+    
+    def attach_audio_health(self, analysis_result: dict, accumulator):
+        """结合语音段计算音频健康度，写入 analysis_result['audio_health']；统计失败不影响VAD结果"""
+        if accumulator is None:
+            return
+        try:
+            health = accumulator.finalize(
+                [[seg['start_ms'], seg['end_ms']] for seg in analysis_result.get('speech_segments', [])]
+            )
+            health['clean'] = is_clean_audio(
+                health,
+                min_snr_db=self.config.AUDIO_HEALTH_CLEAN_SNR_DB,
+                max_clipping_ratio=self.config.AUDIO_HEALTH_MAX_CLIPPING_RATIO,
+                max_dc_offset=self.config.AUDIO_HEALTH_MAX_DC_OFFSET
+            )
+            analysis_result['audio_health'] = health
+            logger.info(f"音频健康度: 响度={health['integrated_loudness_lufs']}LUFS, 信噪比={health['snr_db']}dB, "
+                       f"削波占比={health['clipping_ratio']:.4%}, 直流分量={health['dc_offset']:.4f}, "
+                       f"干净={health['clean']}")
+        except Exception as e:
+            logger.warning(f"音频健康度统计失败: {e}")
+    
+    def attach_language(self, analysis_result: dict, audio: np.ndarray = None, audio_path: str = None):
+        """
+        对抽取的语音段片段做语种识别，写入 analysis_result['language_detection']；识别失败不影响VAD结果
+        
+        Args:
+            analysis_result (dict): 分析结果
+            audio (np.ndarray): 已解码的完整16kHz音频
+            audio_path (str): 音频文件路径（流式分析时没有完整音频，只解码所选片段）
+        """
+        if not self.config.LANGUAGE_ID or not analysis_result.get('speech_segments'):
+            return
+        try:
+            if self._language_identifier is None:
+                from language_id import SpokenLanguageIdentifier
+                self._language_identifier = SpokenLanguageIdentifier(
+                    model=self.config.LANGUAGE_ID_MODEL,
+                    model_dir=self.config.LANGUAGE_ID_MODEL_DIR,
+                    max_clips=self.config.LANGUAGE_ID_CLIPS,
+                    clip_ms=self.config.LANGUAGE_ID_CLIP_MS,
+                    min_segment_ms=self.config.LANGUAGE_ID_MIN_SEGMENT_MS,
+                    sample_rate=VAD_SAMPLE_RATE,
+                    cache_dir=self.config.MODEL_CACHE_DIR,
+                    disable_update=self.config.DISABLE_UPDATE
+                )
+            detection = self._language_identifier.identify(
+                [[seg['start_ms'], seg['end_ms']] for seg in analysis_result['speech_segments']],
+                audio=audio,
+                audio_path=audio_path
+            )
+            if detection is not None:
+                analysis_result['language_detection'] = detection
+                logger.info(f"语种识别: {detection['language']} (置信度={detection['confidence']:.2f}, "
+                           f"片段数={detection['clips']}, 投票={detection['votes']})")
+        except Exception as e:
+            logger.warning(f"语种识别失败: {e}")
+    
+    def attach_compacted_audio(self, analysis_result: dict, compact_output: tuple, audio: np.ndarray = None,
+                               audio_path: str = None):
+        """
+        生成只含语音的压缩音频和偏移表，写入 analysis_result['compacted_audio']；生成失败不影响VAD结果
+        
+        Args:
+            analysis_result (dict): 分析结果
+            compact_output (tuple): 保存路径 (wav路径, json路径)，为空时不生成
+            audio (np.ndarray): 已解码的完整16kHz音频
+            audio_path (str): 音频文件路径（流式分析时没有完整音频，重新解码）
+        """
+        if not self.config.COMPACT_AUDIO or not compact_output or not analysis_result.get('speech_segments'):
+            return
+        try:
+            if audio is None:
+                audio = self._decode_audio(audio_path)
+            compacted_path, offset_map_path = compact_output
+            os.makedirs(os.path.dirname(compacted_path) or '.', exist_ok=True)
+            offset_map = save_compacted_rendition(
+                audio,
+                [[seg['start_ms'], seg['end_ms']] for seg in analysis_result['speech_segments']],
+                VAD_SAMPLE_RATE,
+                self.config.COMPACT_AUDIO_PADDING_MS,
+                compacted_path,
+                offset_map_path
+            )
+            analysis_result['compacted_audio'] = {
+                'audio_path': compacted_path,
+                'offset_map_path': offset_map_path,
+                'offset_map_format': OFFSET_MAP_FORMAT,
+                'duration_ms': offset_map['compacted_duration_ms'],
+                'pieces': len(offset_map['pieces'])
+            }
+            logger.info(f"压缩音频生成完成: {offset_map['original_duration_ms'] / 1000:.2f}秒 -> "
+                       f"{offset_map['compacted_duration_ms'] / 1000:.2f}秒, 片段数={len(offset_map['pieces'])}")
+        except Exception as e:
+            logger.warning(f"压缩音频生成失败: {e}")
+    
+    def save_segments_artifact(self, analysis_result: dict, output_path: str) -> str:
+        """
+        将语音段保存为紧凑的int32 [N, 2]毫秒数组（.npy），供转写节点跳过VAD直接使用
+        
+        Args:
+            analysis_result (dict): analyze_audio 的分析结果
+            output_path (str): 输出文件路径
+            
+        Returns:
+            str: 输出文件路径
+        """
+        segments = np.array(
+            [[seg['start_ms'], seg['end_ms']] for seg in analysis_result.get('speech_segments', [])],
+            dtype=np.int32
+        ).reshape(-1, 2)
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'wb') as f:
+            np.save(f, segments, allow_pickle=False)
+        return output_path
+    
     def get_model_info(self) -> dict:
         """获取模型信息"""
         return {
+            'backend': self.backend,
             'model_name': self.config.VAD_MODEL,
             'model_revision': self.config.VAD_MODEL_REVISION,
             'max_end_silence_time': self.config.VAD_MAX_END_SILENCE_TIME,
             'max_start_silence_time': self.config.VAD_MAX_START_SILENCE_TIME,
             'min_speech_duration': self.config.VAD_MIN_SPEECH_DURATION,
+            'parallel_workers': self.config.VAD_PARALLEL_WORKERS,
         } 
\ No newline at end of file
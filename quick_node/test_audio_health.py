@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+音频健康度统计测试脚本
+检查响度、削波、直流分量和信噪比估计，逐块输入与整段输入结果一致，并输出1小时音频的统计耗时
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from audio_health import AudioHealthAccumulator, compute_audio_health, is_clean_audio
+
+SAMPLE_RATE = 16000
+
+
+def _speech_with_noise(snr_db: float, seed: int = 0) -> tuple:
+    """生成“语音”（谐波信号）与白噪声底混合的音频，返回 (音频, 语音段[[start_ms, end_ms], ...])"""
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(60 * SAMPLE_RATE)
+    segments = []
+    for start_sec in range(1, 58, 4):
+        start, end = start_sec * SAMPLE_RATE, (start_sec + 2) * SAMPLE_RATE
+        t = np.arange(end - start) / SAMPLE_RATE
+        audio[start:end] = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.15 * np.sin(2 * np.pi * 660 * t)
+        segments.append([start_sec * 1000, (start_sec + 2) * 1000])
+    signal_power = np.mean(audio[1 * SAMPLE_RATE:3 * SAMPLE_RATE] ** 2)
+    noise = rng.normal(0, np.sqrt(signal_power / 10 ** (snr_db / 10)), len(audio))
+    return (audio + noise).astype(np.float32), segments
+
+
+def test_loudness_reference():
+    """测试满量程997Hz正弦的响度约为-3.01LUFS（BS.1770参考值），数字静音不计入响度"""
+    t = np.arange(5 * SAMPLE_RATE) / SAMPLE_RATE
+    sine = np.sin(2 * np.pi * 997 * t)
+    health = compute_audio_health(sine, SAMPLE_RATE, [[0, 5000]])
+    assert abs(health['integrated_loudness_lufs'] + 3.01) < 0.1, health['integrated_loudness_lufs']
+    assert abs(health['segment_rms_dbfs'][0] + 3.01) < 0.1
+
+    # 一半时长为数字静音：门限积分响度基本不变（只有跨越边界的块略拉低），RMS下降约3dB
+    padded = compute_audio_health(np.concatenate([sine, np.zeros_like(sine)]), SAMPLE_RATE, [[0, 5000]])
+    assert abs(padded['integrated_loudness_lufs'] - health['integrated_loudness_lufs']) < 0.2
+    assert abs(padded['rms_dbfs'] - health['rms_dbfs'] + 3.01) < 0.05
+    assert compute_audio_health(np.zeros(SAMPLE_RATE), SAMPLE_RATE, [])['integrated_loudness_lufs'] is None
+
+
+def test_snr_estimate():
+    """测试由语音/非语音帧能量估计的信噪比与合成时的信噪比接近"""
+    for snr_db in (5.0, 20.0, 40.0):
+        audio, segments = _speech_with_noise(snr_db)
+        health = compute_audio_health(audio, SAMPLE_RATE, segments)
+        assert abs(health['snr_db'] - snr_db) < 1.0, f"期望约{snr_db}dB, 实际{health['snr_db']}dB"
+        assert len(health['segment_rms_dbfs']) == len(segments) == len(health['segment_loudness_lufs'])
+        print(f"合成信噪比 {snr_db:.0f}dB: 估计 {health['snr_db']}dB, 响度 {health['integrated_loudness_lufs']}LUFS")
+
+    # 没有非语音帧时无法估计
+    assert compute_audio_health(audio, SAMPLE_RATE, [[0, 60000]])['snr_db'] is None
+
+
+def test_clipping_and_dc():
+    """测试削波占比、直流分量和干净音频判定"""
+    audio, segments = _speech_with_noise(40.0)
+    clean = compute_audio_health(audio, SAMPLE_RATE, segments)
+    assert clean['clipped_samples'] == 0 and abs(clean['dc_offset']) < 1e-3
+    assert is_clean_audio(clean, min_snr_db=25.0, max_clipping_ratio=0.001, max_dc_offset=0.01)
+
+    clipped = np.clip(audio * 4, -1.0, 1.0)
+    health = compute_audio_health(clipped, SAMPLE_RATE, segments)
+    expected_ratio = np.count_nonzero(np.abs(clipped) >= 0.999) / len(clipped)
+    assert health['clipping_ratio'] == round(expected_ratio, 6) and health['clipping_ratio'] > 0.01
+    assert not is_clean_audio(health, min_snr_db=25.0, max_clipping_ratio=0.001, max_dc_offset=0.01)
+
+    shifted = compute_audio_health(audio + 0.05, SAMPLE_RATE, segments)
+    assert abs(shifted['dc_offset'] - 0.05) < 1e-3
+    assert not is_clean_audio(shifted, min_snr_db=0.0, max_clipping_ratio=0.001, max_dc_offset=0.01)
+
+
+def test_chunked_matches_whole():
+    """测试逐块输入（块长不是帧长整数倍）与整段输入的统计结果一致，并输出1小时音频的耗时"""
+    audio, segments = _speech_with_noise(20.0)
+    whole = compute_audio_health(audio, SAMPLE_RATE, segments)
+    accumulator = AudioHealthAccumulator(SAMPLE_RATE)
+    for begin in range(0, len(audio), 12345):
+        accumulator.update(audio[begin:begin + 12345])
+    chunked = accumulator.finalize(segments)
+    for key, value in whole.items():
+        if isinstance(value, float):
+            assert abs(chunked[key] - value) < 0.011, f"{key}: {chunked[key]} vs {value}"
+        else:
+            assert chunked[key] == value or np.allclose(chunked[key], value, atol=0.11), key
+
+    hour = np.tile(audio, 60)
+    hour_segments = [[start + k * 60000, end + k * 60000] for k in range(60) for start, end in segments]
+    start = time.time()
+    compute_audio_health(hour, SAMPLE_RATE, hour_segments)
+    print(f"60分钟音频（{len(hour_segments)}个语音段）统计耗时 {time.time() - start:.2f}秒")
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("响度参考值", test_loudness_reference),
+        ("信噪比估计", test_snr_estimate),
+        ("削波与直流分量", test_clipping_and_dc),
+        ("逐块统计一致性与耗时", test_chunked_matches_whole),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
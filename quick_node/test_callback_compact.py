@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+回调紧凑结果测试脚本
+检查语音段列式编码可无损还原为旧格式、对比编码前后的大小，以及超过内联上限时上传为文件
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from api_client import APIClient
+from result_codec import (
+    ENCODING_GZIP_JSON, ENCODING_MSGPACK, SCHEMA_SPEECH_SEGMENTS, build_envelope, encode_columns,
+    read_envelope, resolve_encoding, speech_segments_from_columns, speech_segments_to_columns
+)
+
+
+class _RecordingAPIClient(APIClient):
+    """记录回调和上传内容、不访问网络的API客户端"""
+
+    def __init__(self, upload_url=None):
+        super().__init__()
+        self.upload_url = upload_url
+        self.uploads = []
+        self.callbacks = []
+
+    def send_callback(self, task_id, task_type, status, data=None):
+        self.callbacks.append(data)
+        return {'code': 200}
+
+    def upload_file(self, file_path, task_type=3):
+        with open(file_path, 'rb') as f:
+            self.uploads.append(f.read())
+        if self.upload_url is None:
+            raise Exception("上传失败")
+        return {'code': 200, 'data': {'file_info': {'url': self.upload_url}}}
+
+
+def _analysis_result(segment_count: int) -> dict:
+    """构造与 VADAnalyzer._parse_vad_result 相同格式的分析结果"""
+    rng = np.random.default_rng(0)
+    bounds = np.cumsum(rng.integers(200, 5000, size=segment_count * 2))
+    speech_segments = []
+    for start_ms, end_ms in bounds.reshape(-1, 2).tolist():
+        speech_segments.append({
+            'start_time': start_ms / 1000.0,
+            'end_time': end_ms / 1000.0,
+            'duration': end_ms / 1000.0 - start_ms / 1000.0,
+            'start_ms': start_ms,
+            'end_ms': end_ms
+        })
+    return {
+        'total_duration': bounds[-1] / 1000.0,
+        'effective_duration': sum(s['duration'] for s in speech_segments),
+        'speech_ratio': 0.5,
+        'speech_segments_count': len(speech_segments),
+        'silence_duration': 0.0,
+        'file_info': {},
+        'speech_segments': speech_segments
+    }
+
+
+def test_roundtrip_and_size():
+    """测试列式编码还原出与旧格式完全相同的语音段，并输出大小对比"""
+    speech_segments = _analysis_result(1500)['speech_segments']
+    legacy_size = len(json.dumps(speech_segments).encode('utf-8'))
+
+    for encoding in (ENCODING_GZIP_JSON, resolve_encoding(ENCODING_MSGPACK)):
+        payload = encode_columns(speech_segments_to_columns(speech_segments), encoding)
+        envelope = build_envelope(SCHEMA_SPEECH_SEGMENTS, len(speech_segments), payload, encoding)
+        restored = speech_segments_from_columns(read_envelope(json.loads(json.dumps(envelope))))
+
+        assert restored == speech_segments, f"{encoding} 还原结果与原始语音段不一致"
+        print(f"{len(speech_segments)}个语音段: 旧格式JSON {legacy_size / 1024:.1f}KB, "
+              f"{encoding} {len(payload) / 1024:.1f}KB, 信封JSON {len(json.dumps(envelope)) / 1024:.1f}KB")
+
+
+def test_callback_formats():
+    """测试三种回调格式的字段"""
+    analysis_result = _analysis_result(20)
+    client = _RecordingAPIClient()
+
+    for result_format, has_legacy, has_compact in (('legacy', True, False), ('compact', False, True), ('both', True, True)):
+        client.config.CALLBACK_RESULT_FORMAT = result_format
+        client.send_success_callback(1, analysis_result)
+        details = client.callbacks[-1]['analysis_details']
+        assert ('speech_segments' in details) == has_legacy, result_format
+        assert ('speech_segments_compact' in details) == has_compact, result_format
+        if has_compact:
+            envelope = details['speech_segments_compact']
+            assert envelope['count'] == 20 and 'data' in envelope
+            assert speech_segments_from_columns(read_envelope(envelope)) == analysis_result['speech_segments']
+    assert not client.uploads
+
+
+def test_large_payload_uploaded():
+    """测试超过内联上限的紧凑结果上传为文件，上传失败时改为内联"""
+    analysis_result = _analysis_result(500)
+    for upload_url in ('http://example.com/segments.json.gz', None):
+        client = _RecordingAPIClient(upload_url)
+        client.config.CALLBACK_RESULT_FORMAT = 'compact'
+        client.config.CALLBACK_COMPACT_ENCODING = ENCODING_GZIP_JSON
+        client.config.CALLBACK_INLINE_MAX_BYTES = 1024
+        client.send_success_callback(1, analysis_result)
+
+        envelope = client.callbacks[-1]['analysis_details']['speech_segments_compact']
+        assert len(client.uploads) == 1 and envelope['size'] == len(client.uploads[0])
+        if upload_url:
+            assert envelope['url'] == upload_url and 'data' not in envelope
+            columns = read_envelope(envelope, client.uploads[0])
+        else:
+            assert 'url' not in envelope
+            columns = read_envelope(envelope)
+        assert speech_segments_from_columns(columns) == analysis_result['speech_segments']
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("列式编码无损还原", test_roundtrip_and_size),
+        ("回调格式字段", test_callback_formats),
+        ("大结果上传为文件", test_large_payload_uploaded),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
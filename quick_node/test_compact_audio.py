@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+压缩音频测试脚本
+检查语音段合并与片段布局、压缩音频内容与偏移表一致，以及保存的WAV和偏移表文件
+"""
+
+import json
+import os
+import sys
+import tempfile
+import wave
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from compact_audio import plan_compaction, render_compacted_audio, save_compacted_rendition
+
+SAMPLE_RATE = 16000
+
+
+def test_plan_layout():
+    """测试间隔不超过padding的语音段合并、重叠和越界语音段的处理、片段之间插入padding"""
+    segments = [[5000, 6000], [1000, 2000], [2100, 3000], [5500, 7000], [9990, 20000], [8000, 8000]]
+    pieces = plan_compaction(segments, total_ms=10000, padding_ms=300)
+    assert pieces.tolist() == [[0, 1000, 2000], [2300, 5000, 2000], [4600, 9990, 10]], pieces.tolist()
+    assert plan_compaction([], total_ms=10000, padding_ms=300).shape == (0, 3)
+
+
+def test_render_matches_offset_map():
+    """测试压缩音频中每个片段的采样与原始音频中对应位置一致，片段之间为静音"""
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, 30 * SAMPLE_RATE).astype(np.float32)
+    pieces = plan_compaction([[1000, 4000], [10000, 12500], [12600, 13000], [25000, 29000]], 30000, 200)
+    compacted = render_compacted_audio(audio, pieces, SAMPLE_RATE, 200)
+
+    compacted_ms = pieces[-1, 0] + pieces[-1, 2]
+    assert len(compacted) == compacted_ms * SAMPLE_RATE // 1000
+    for compact_start, original_start, duration in pieces.tolist():
+        c, o, n = (v * SAMPLE_RATE // 1000 for v in (compact_start, original_start, duration))
+        assert np.array_equal(compacted[c:c + n], audio[o:o + n])
+    for (c0, _, d0), (c1, _, _) in zip(pieces.tolist(), pieces[1:].tolist()):
+        assert not compacted[(c0 + d0) * SAMPLE_RATE // 1000:c1 * SAMPLE_RATE // 1000].any()
+    print(f"原始 {len(audio) / SAMPLE_RATE:.1f}秒 -> 压缩 {len(compacted) / SAMPLE_RATE:.1f}秒")
+
+
+def test_saved_files():
+    """测试保存的16位WAV和偏移表JSON"""
+    t = np.arange(10 * SAMPLE_RATE) / SAMPLE_RATE
+    audio = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        wav_path = os.path.join(temp_dir, 'compacted.wav')
+        map_path = os.path.join(temp_dir, 'offset_map.json')
+        info = save_compacted_rendition(audio, [[1000, 3000], [6000, 7000]], SAMPLE_RATE, 300, wav_path, map_path)
+
+        with open(map_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        assert saved == info
+        assert saved['format'] == 'json-offset-map' and saved['version'] == 1
+        assert saved['pieces'] == [[0, 1000, 2000], [2300, 6000, 1000]]
+        assert saved['original_duration_ms'] == 10000 and saved['compacted_duration_ms'] == 3300
+
+        with wave.open(wav_path, 'rb') as f:
+            assert (f.getnchannels(), f.getsampwidth(), f.getframerate()) == (1, 2, SAMPLE_RATE)
+            pcm = np.frombuffer(f.readframes(f.getnframes()), dtype='<i2').astype(np.float32) / 32767
+        assert len(pcm) == 3300 * SAMPLE_RATE // 1000
+        assert np.abs(pcm[:2000 * SAMPLE_RATE // 1000] - audio[SAMPLE_RATE:3 * SAMPLE_RATE]).max() < 1e-4
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("片段布局", test_plan_layout),
+        ("压缩音频与偏移表一致", test_render_matches_offset_map),
+        ("保存WAV和偏移表", test_saved_files),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
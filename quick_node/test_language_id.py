@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+语种识别测试脚本
+检查片段选择和概率合并规则，并对比Whisper-LID模型整批推理与逐个推理的结果和耗时
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加本地FunASR和src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'FunASR'))
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from config import Config
+from language_id import (
+    SpokenLanguageIdentifier, aggregate_lid_predictions, normalize_language_label, select_lid_clips
+)
+
+SAMPLE_RATE = 16000
+
+
+def test_select_clips():
+    """测试片段均匀分布在整个音频中、每组取最长的语音段并截取中间部分"""
+    segments = [[0, 800], [1000, 4000], [5000, 15000], [20000, 21000], [30000, 36000], [40000, 42000], [50000, 50500]]
+    clips = select_lid_clips(segments, max_clips=3, clip_ms=5000, min_segment_ms=1500)
+    # 候选段 [1000,4000] [5000,15000] [30000,36000] [40000,42000] 分为3组
+    assert clips == [[7500, 12500], [30500, 35500], [40000, 42000]], clips
+    assert all(end - start <= 5000 for start, end in clips)
+
+    # 语音段都很短时使用全部语音段，片段数不超过语音段数
+    assert select_lid_clips([[0, 300], [1000, 1200]], max_clips=5, clip_ms=5000, min_segment_ms=1500) == [[0, 300], [1000, 1200]]
+    assert select_lid_clips([], max_clips=5, clip_ms=5000, min_segment_ms=1500) == []
+
+
+def test_aggregate():
+    """测试按片段时长加权平均、同一语种的多个标签合并、投票计数"""
+    assert normalize_language_label('<|zh|>') == 'zh'
+    assert normalize_language_label('zh-CN') == 'zh' and normalize_language_label('en_US') == 'en'
+
+    labels = ['zh', 'zh', 'en', 'ja']  # zh-CN / zh-TW 两个标签
+    probabilities = np.array([
+        [0.5, 0.2, 0.2, 0.1],   # 5秒片段：zh
+        [0.1, 0.0, 0.8, 0.1],   # 1秒片段：en
+        [0.3, 0.3, 0.3, 0.1],   # 4秒片段：zh
+    ])
+    result = aggregate_lid_predictions(probabilities, labels, [5000, 1000, 4000])
+    assert result['language'] == 'zh'
+    assert abs(result['confidence'] - (0.7 * 0.5 + 0.1 * 0.1 + 0.6 * 0.4)) < 1e-4
+    assert result['votes'] == {'zh': 2, 'en': 1} and result['clips'] == 3
+    assert [c['language'] for c in result['candidates']] == ['zh', 'en', 'ja']
+
+
+def test_batched_lid():
+    """测试Whisper-LID整批推理与逐个推理的语种概率一致，并输出耗时（需要模型和openai-whisper）"""
+    config = Config()
+    identifier = SpokenLanguageIdentifier(
+        model=config.LANGUAGE_ID_MODEL,
+        model_dir=config.LANGUAGE_ID_MODEL_DIR,
+        max_clips=5,
+        clip_ms=5000,
+        min_segment_ms=1500,
+        sample_rate=SAMPLE_RATE,
+        cache_dir=config.MODEL_CACHE_DIR
+    )
+    model = identifier._get_model()
+    rng = np.random.default_rng(0)
+    clips = []
+    for seconds in (5.0, 3.0, 5.0, 2.0, 4.0):
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        clips.append((0.2 * np.sin(2 * np.pi * rng.uniform(100, 300) * t) + 0.01 * rng.normal(size=len(t))).astype(np.float32))
+
+    kwargs = {'fs': SAMPLE_RATE, 'data_type': 'sound', 'inference_clip_length': 250, 'output_lid_probs': True}
+    start = time.time()
+    single = [model.generate(input=clip, batch_size=1, **kwargs)[0] for clip in clips]
+    single_time = time.time() - start
+    start = time.time()
+    batched = model.generate(input=clips, batch_size=len(clips), **kwargs)
+    batched_time = time.time() - start
+
+    print(f"{len(clips)}个片段: 逐个推理 {single_time:.2f}秒, 整批推理 {batched_time:.2f}秒")
+    for s, b in zip(single, batched):
+        assert s['lid'] == b['lid']
+        assert np.allclose(s['lid_probs'], b['lid_probs'], atol=1e-4)
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("片段选择", test_select_clips),
+        ("概率合并", test_aggregate),
+        ("整批推理一致性与耗时", test_batched_lid),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+队列消费者并发测试脚本
+用记录调用线程的模拟连接和通道（不连接RabbitMQ）检查：多个任务在工作线程中并发处理，
+所有 ack/nack 都在连接线程中执行，stop_consuming 等待处理中的任务完成并确认后才关闭连接
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from queue_consumer import QueueConsumer, Config
+
+WORKERS = 4
+TASK_SECONDS = 0.3
+
+
+class _FakeConnection:
+    """pika BlockingConnection 的模拟：add_callback_threadsafe 排队，process_data_events 在调用线程中执行"""
+
+    def __init__(self):
+        self.is_open = True
+        self._callbacks = queue.Queue()
+
+    def add_callback_threadsafe(self, callback):
+        self._callbacks.put(callback)
+
+    def process_data_events(self, time_limit=0):
+        deadline = time.time() + time_limit
+        while True:
+            try:
+                self._callbacks.get(timeout=max(0.0, min(0.02, deadline - time.time())))()
+            except queue.Empty:
+                if time.time() >= deadline:
+                    return
+
+    def close(self):
+        self.is_open = False
+
+
+class _FakeChannel:
+    """记录确认结果和执行确认的线程"""
+
+    def __init__(self, connection: _FakeConnection):
+        self.is_open = True
+        self.connection = connection
+        self.confirms = {}  # delivery_tag -> ('ack',) / ('nack', requeue)
+        self.threads = set()
+        self.confirmed_after_close = []
+
+    def _record(self, delivery_tag, result):
+        self.threads.add(threading.get_ident())
+        if not self.connection.is_open:
+            self.confirmed_after_close.append(delivery_tag)
+        self.confirms[delivery_tag] = result
+
+    def basic_ack(self, delivery_tag):
+        self._record(delivery_tag, ('ack',))
+
+    def basic_nack(self, delivery_tag, requeue):
+        self._record(delivery_tag, ('nack', requeue))
+
+    def stop_consuming(self):
+        pass
+
+
+class _FakeVADAnalyzer:
+    def close(self):
+        pass
+
+    def get_model_info(self):
+        return {}
+
+
+class _Method:
+    def __init__(self, delivery_tag):
+        self.delivery_tag = delivery_tag
+
+
+def _make_consumer() -> tuple:
+    """不连接RabbitMQ、任务处理为固定耗时的消费者"""
+    consumer = QueueConsumer.__new__(QueueConsumer)
+    consumer.config = Config()
+    consumer.vad_analyzer = _FakeVADAnalyzer()
+    consumer.executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='vad_worker')
+    consumer._in_flight = set()
+    consumer._in_flight_lock = threading.Lock()
+    consumer.connection = _FakeConnection()
+    consumer.channel = _FakeChannel(consumer.connection)
+
+    active = {'now': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def process_vad_task(task_info):
+        with lock:
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+        time.sleep(TASK_SECONDS)
+        with lock:
+            active['now'] -= 1
+        if task_info['id'] == 'raise':
+            raise RuntimeError("模拟处理异常")
+        return {'success': task_info['id'] != 'fail', 'error': '模拟失败'}
+
+    consumer._process_vad_task = process_vad_task
+    return consumer, active
+
+
+def _submit(consumer: QueueConsumer, task_ids: list) -> dict:
+    """在当前线程（连接线程）中投递消息，返回 delivery_tag -> 预期确认结果"""
+    expected = {}
+    for delivery_tag, task_id in enumerate(task_ids, start=1):
+        body = json.dumps({'task_info': {'id': task_id}}).encode('utf-8')
+        consumer.process_message(consumer.channel, _Method(delivery_tag), None, body)
+        if task_id == 'fail':
+            expected[delivery_tag] = ('nack', False)
+        elif task_id == 'raise':
+            expected[delivery_tag] = ('nack', True)
+        else:
+            expected[delivery_tag] = ('ack',)
+    return expected
+
+
+def test_concurrent_confirm_on_connection_thread():
+    """测试任务并发处理，ack/nack 结果正确且全部在连接线程中执行"""
+    consumer, active = _make_consumer()
+    task_ids = [f'task_{i}' for i in range(2 * WORKERS)] + ['fail', 'raise']
+    start = time.time()
+    expected = _submit(consumer, task_ids)
+    consumer.process_message(consumer.channel, _Method(100), None, b'not json')
+    consumer.process_message(consumer.channel, _Method(101), None, json.dumps({'task_info': {}}).encode('utf-8'))
+    expected.update({100: ('ack',), 101: ('ack',)})
+
+    while consumer._has_in_flight() or len(consumer.channel.confirms) < len(expected):
+        consumer.connection.process_data_events(time_limit=0.1)
+        assert time.time() - start < 10, "任务未在预期时间内完成"
+    elapsed = time.time() - start
+
+    assert consumer.channel.confirms == expected
+    assert consumer.channel.threads == {threading.get_ident()}, "确认应只在连接线程中执行"
+    assert active['max'] == WORKERS, active
+    assert elapsed < len(task_ids) * TASK_SECONDS / 2, f"未并发处理: {elapsed:.2f}秒"
+    consumer.executor.shutdown()
+
+
+def test_stop_consuming_drains():
+    """测试 stop_consuming 等待处理中和排队中的任务完成、确认后再关闭连接"""
+    consumer, _ = _make_consumer()
+    expected = _submit(consumer, [f'task_{i}' for i in range(WORKERS + 2)])
+    assert consumer.get_status()['in_flight_tasks'] == len(expected)
+
+    consumer.stop_consuming()
+    assert consumer.channel.confirms == expected
+    assert consumer.channel.confirmed_after_close == []
+    assert not consumer.connection.is_open and not consumer._has_in_flight()
+    assert consumer.get_status()['in_flight_tasks'] == 0
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("并发处理与连接线程确认", test_concurrent_confirm_on_connection_thread),
+        ("停止时等待处理中的任务", test_stop_consuming_drains),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+VAD语音段文件测试脚本
+检查 save_segments_artifact 保存的int32 [N, 2]毫秒数组（.npy）可以不经pickle读回且与语音段一致，
+没有语音段时保存为 [0, 2] 的空数组
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from vad_analyzer import VADAnalyzer
+
+
+def _analysis_result(segments_ms: list) -> dict:
+    """与 analyze_audio 结果格式相同的语音段"""
+    return {
+        'speech_segments': [
+            {'start_time': start / 1000, 'end_time': end / 1000, 'duration': (end - start) / 1000,
+             'start_ms': start, 'end_ms': end}
+            for start, end in segments_ms
+        ]
+    }
+
+
+def test_round_trip():
+    """测试语音段保存后按转写节点的方式（allow_pickle=False）读回，数值和顺序不变"""
+    analyzer = VADAnalyzer.__new__(VADAnalyzer)
+    segments_ms = [[0, 1500], [2250, 61000], [3600000, 3600480], [7199000, 7200000]]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'nested', 'segments.npy')
+        assert analyzer.save_segments_artifact(_analysis_result(segments_ms), path) == path
+        loaded = np.load(path, allow_pickle=False)
+    assert loaded.dtype == np.int32 and loaded.shape == (len(segments_ms), 2)
+    assert loaded.tolist() == segments_ms
+
+
+def test_empty_segments():
+    """测试没有语音段时保存 [0, 2] 的空数组（转写节点据此跳过转写，而不是重新执行VAD）"""
+    analyzer = VADAnalyzer.__new__(VADAnalyzer)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'empty.npy')
+        analyzer.save_segments_artifact({'speech_segments': []}, path)
+        loaded = np.load(path, allow_pickle=False)
+    assert loaded.dtype == np.int32 and loaded.shape == (0, 2)
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("保存与读回", test_round_trip),
+        ("空语音段", test_empty_segments),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
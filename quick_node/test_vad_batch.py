@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量VAD测试脚本
+检查 batch_analyze（补零后整批推理）与逐个 analyze_audio 的语音段完全相同，
+以及批量推理不改变共享模型配置中的批大小（之后的单文件和流式分析不受影响）
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from vad_analyzer import VADAnalyzer, VAD_SAMPLE_RATE
+
+
+def _write_files(output_dir: str) -> list:
+    """生成时长各异（短于/长于一批中最长的文件）、静音段为数字静音或弱噪声的合成音频"""
+    rng = np.random.default_rng(0)
+    files = []
+    for i, duration in enumerate((20, 75, 130, 9, 45)):
+        audio = np.zeros(duration * VAD_SAMPLE_RATE, dtype=np.float32)
+        for start in range(0, duration - 3, 7):
+            begin, end = (start + 1) * VAD_SAMPLE_RATE, (start + 4) * VAD_SAMPLE_RATE
+            t = np.arange(end - begin) / VAD_SAMPLE_RATE
+            audio[begin:end] = 0.3 * np.sin(2 * np.pi * 220 * t) * rng.uniform(0.5, 1.0, end - begin)
+        if i % 2:
+            audio += rng.normal(0, 1e-3, len(audio)).astype(np.float32)
+        path = os.path.join(output_dir, f'batch_{i}.wav')
+        sf.write(path, audio, VAD_SAMPLE_RATE)
+        files.append(path)
+    return files
+
+
+def check_batch_matches_single(analyzer: VADAnalyzer, files: list):
+    """测试批量分析与逐个分析的语音段和时长完全相同，结果顺序与输入一致"""
+    single = [analyzer.analyze_audio(path) for path in files]
+    batch = analyzer.batch_analyze(files)
+    assert len(batch) == len(files)
+    for path, expected, actual in zip(files, single, batch):
+        assert actual['status'] == 'success', actual
+        assert actual['file_info']['file_path'] == path
+        assert actual['total_duration'] == expected['total_duration']
+        assert actual['speech_segments'] == expected['speech_segments'], os.path.basename(path)
+
+
+def check_batch_size_not_leaked(analyzer: VADAnalyzer, files: list):
+    """测试批量推理后共享模型配置的批大小恢复原值，之后的单文件分析结果不变"""
+    analyzer.vad_model.kwargs['batch_size'] = 1  # 模型加载后的默认值
+    before = [analyzer.analyze_audio(path)['speech_segments'] for path in files]
+    analyzer.batch_analyze(files)
+    assert analyzer.vad_model.kwargs['batch_size'] == 1, f"批大小被改为 {analyzer.vad_model.kwargs['batch_size']}"
+    after = [analyzer.analyze_audio(path)['speech_segments'] for path in files]
+    assert after == before
+
+
+def check_failed_file_in_batch(analyzer: VADAnalyzer, files: list):
+    """测试批中有不存在的文件时只有该文件失败，其余文件结果不变"""
+    missing = os.path.join(os.path.dirname(files[0]), 'missing.wav')
+    batch = analyzer.batch_analyze([files[0], missing, files[1]])
+    assert batch[1]['status'] == 'failed' and batch[1]['file_path'] == missing
+    assert batch[0]['speech_segments'] == analyzer.analyze_audio(files[0])['speech_segments']
+    assert batch[2]['speech_segments'] == analyzer.analyze_audio(files[1])['speech_segments']
+
+
+def main():
+    """主测试函数"""
+    analyzer = VADAnalyzer(backend='torch')
+    tests = [
+        ("批量与逐个分析一致", check_batch_matches_single),
+        ("批大小不写回模型配置", check_batch_size_not_leaked),
+        ("批中文件失败", check_failed_file_in_batch),
+    ]
+
+    passed = 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = _write_files(temp_dir)
+        for test_name, test_func in tests:
+            try:
+                test_func(analyzer, files)
+                passed += 1
+                print(f"✓ {test_name}")
+            except AssertionError as e:
+                print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+VAD能量预门限测试脚本
+检查门限帧的判定规则，并在静音占比高的合成音频上对比开启/关闭门限的语音段和耗时
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加本地FunASR和src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'FunASR'))
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from funasr.models.fsmn_vad_streaming.energy_gate import active_windows, gated_frame_mask
+from vad_analyzer import VADAnalyzer, VAD_SAMPLE_RATE
+
+
+def _silence_heavy_audio(duration: float, speech_ratio: float = 0.2) -> np.ndarray:
+    """生成以数字静音为主、夹杂短语音段的合成音频"""
+    rng = np.random.default_rng(0)
+    parts = []
+    total = 0.0
+    while total < duration:
+        speech_sec = rng.uniform(1.0, 5.0)
+        silence_sec = speech_sec * (1 - speech_ratio) / speech_ratio * rng.uniform(0.5, 1.5)
+        t = np.arange(int(speech_sec * VAD_SAMPLE_RATE)) / VAD_SAMPLE_RATE
+        phase = 2 * np.pi * np.cumsum(140 + 30 * np.sin(2 * np.pi * 3 * t)) / VAD_SAMPLE_RATE
+        parts.append(0.2 * sum(np.sin(k * phase) / k for k in range(1, 8)))
+        parts.append(np.zeros(int(silence_sec * VAD_SAMPLE_RATE)))
+        total += speech_sec + silence_sec
+    return np.concatenate(parts).astype(np.float32)
+
+
+def test_gate_mask():
+    """测试只有整个感受野都低于门限、且足够长的静音帧才跳过编码器"""
+    decibel = np.full(1000, -60.0)
+    decibel[100:200] = 40.0  # 语音
+    decibel[600:620] = 40.0
+    gated = gated_frame_mask(decibel, 0, 1000, -55.0, left_context=80, right_context=2, min_gate_frames=50)
+
+    assert not gated[98:200 + 80].any(), "语音帧及其后续感受野内的帧不应跳过"
+    assert gated[:98].all(), "开头的长静音应跳过"
+    assert gated[280:598].all() and not gated[598:700].any()
+    # 末尾的帧缺少右侧能量，按有声处理
+    assert gated[700:998].all() and not gated[998:].any()
+
+    short = gated_frame_mask(decibel, 0, 1000, -55.0, left_context=80, right_context=2, min_gate_frames=400)
+    assert not short[280:598].any(), "短于 min_gate_frames 的静音段应照常计算"
+    assert active_windows(gated) == [(98, 280), (598, 700), (998, 1000)]
+
+
+def test_gate_segments_and_speed():
+    """测试静音占比高的音频开启门限后语音段不变，并输出耗时对比"""
+    analyzer = VADAnalyzer(backend='torch')
+    audio = _silence_heavy_audio(1800.0)
+    gate_kwargs = {
+        'energy_gate_db': analyzer.config.VAD_ENERGY_GATE_DB,
+        'energy_gate_min_frames': analyzer.config.VAD_ENERGY_GATE_MIN_FRAMES,
+    }
+
+    results = {}
+    for enabled in (False, True):
+        analyzer.vad_model.kwargs['energy_gate_db'] = gate_kwargs['energy_gate_db'] if enabled else None
+        analyzer.vad_model.kwargs['energy_gate_min_frames'] = gate_kwargs['energy_gate_min_frames']
+        analyzer._run_vad(audio[:VAD_SAMPLE_RATE], 'warmup')
+        start = time.time()
+        segments = analyzer._run_vad(audio, 'test')[0]['value']
+        results[enabled] = (segments, time.time() - start)
+
+    (off_segments, off_time), (on_segments, on_time) = results[False], results[True]
+    print(f"{len(audio) / VAD_SAMPLE_RATE / 60:.0f}分钟音频（约80%数字静音）: "
+          f"关闭门限 {off_time:.2f}秒, 开启门限 {on_time:.2f}秒, 加速 {off_time / on_time:.2f}x, "
+          f"语音段 {len(on_segments)} 个")
+    assert on_segments == off_segments, f"开启门限后语音段不一致:\n关闭: {off_segments}\n开启: {on_segments}"
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("门限帧判定", test_gate_mask),
+        ("门限语音段一致性与耗时", test_gate_segments_and_speed),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+FSMN-VAD 离线向量化后处理测试脚本
+用随机生成的帧后验和能量，对比向量化后处理与流式状态机输出的语音段是否完全一致
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+# 添加本地FunASR路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'FunASR'))
+
+from funasr.models.fsmn_vad_streaming.model import FsmnVADStreaming, VADXOptions
+from funasr.models.fsmn_vad_streaming.offline_detector import detect_segments_offline
+
+# 模拟一次流式推理时每次送入的帧数（60秒一块）
+STREAMING_CHUNK_FRAMES = 6000
+
+
+def _streaming_segments(scores: np.ndarray, decibel: np.ndarray, vad_opts: VADXOptions) -> list:
+    """用原有的逐帧状态机按块处理所有帧，返回语音段"""
+    model = FsmnVADStreaming.__new__(FsmnVADStreaming)
+    torch.nn.Module.__init__(model)
+    model.vad_opts = vad_opts
+    cache = model.init_cache({})
+    stats = cache["stats"]
+    stats.data_buf_all = torch.zeros((len(scores) + 3) * 160)
+    stats.data_buf = stats.data_buf_all
+    stats.scores = torch.from_numpy(scores[None].astype(np.float32))
+    stats.decibel = decibel.tolist()
+
+    num_frames = len(scores)
+    for begin in range(0, num_frames, STREAMING_CHUNK_FRAMES):
+        end = min(num_frames, begin + STREAMING_CHUNK_FRAMES)
+        stats.frm_cnt = end
+        model.vad_opts.nn_eval_block_size = end - begin
+        if end == num_frames:
+            model.DetectLastFrames(cache=cache)
+        else:
+            model.DetectCommonFrames(cache=cache)
+    return [[seg.start_ms, seg.end_ms] for seg in stats.output_data_buf]
+
+
+def _random_utterance(rng: np.random.Generator, num_frames: int, flicker: float = 0.1) -> tuple:
+    """生成语音/静音交替的帧后验（第0维为静音概率）和帧能量"""
+    sil_prob = np.empty(num_frames)
+    pos = 0
+    speaking = bool(rng.integers(2))
+    while pos < num_frames:
+        length = int(rng.integers(5, 400 if speaking else 150))
+        low, high = (0.0, 0.25) if speaking else (0.75, 1.0)
+        sil_prob[pos:pos + length] = rng.uniform(low, high, min(length, num_frames - pos))
+        pos += length
+        speaking = not speaking
+    # 随机翻转部分帧，覆盖窗口迟滞的各种切换情况
+    flip = rng.random(num_frames) < flicker
+    sil_prob[flip] = 1.0 - sil_prob[flip]
+    scores = np.stack([sil_prob, 1.0 - sil_prob], axis=1).astype(np.float32)
+    decibel = np.where(sil_prob < 0.5, rng.uniform(40, 80, num_frames), rng.uniform(-60, 50, num_frames))
+    return scores, decibel
+
+
+def _assert_equivalent(vad_opts_kwargs: dict, seeds: range, num_frames: int, flicker: float = 0.1):
+    """在多组随机数据上对比两种实现"""
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        scores, decibel = _random_utterance(rng, num_frames, flicker)
+        expected = _streaming_segments(scores, decibel, VADXOptions(**vad_opts_kwargs))
+        actual = detect_segments_offline(scores, decibel, VADXOptions(**vad_opts_kwargs))
+        assert actual is not None, f"配置不应回退: {vad_opts_kwargs}"
+        assert actual == expected, f"seed={seed} {vad_opts_kwargs}\n流式: {expected}\n向量化: {actual}"
+
+
+def test_default_options():
+    """测试默认配置（多句检测、前后扩展）"""
+    _assert_equivalent({}, range(20), 20000)
+
+
+def test_max_single_segment():
+    """测试超过最大单段时长时强制切分"""
+    _assert_equivalent({"max_single_segment_time": 3000}, range(10), 20000, flicker=0.02)
+
+
+def test_no_extend_and_hysteresis():
+    """测试关闭扩展以及不同的静音/语音切换阈值"""
+    _assert_equivalent({"do_extend": 0}, range(10), 10000)
+    _assert_equivalent({"sil_to_speech_time_thres": 100, "speech_to_sil_time_thres": 60}, range(10), 10000)
+    _assert_equivalent({"sil_to_speech_time_thres": 60, "speech_to_sil_time_thres": 120,
+                        "max_end_silence_time": 300}, range(10), 10000)
+
+
+def test_single_utterance_mode():
+    """测试单句检测模式（只输出第一段，开头静音超时时不输出）"""
+    _assert_equivalent({"detect_mode": 0}, range(10), 5000)
+    _assert_equivalent({"detect_mode": 0, "max_start_silence_time": 200}, range(10), 5000)
+
+
+def test_snr_threshold():
+    """测试启用信噪比门限时的噪声能量跟踪"""
+    _assert_equivalent({"snr_thres": 10.0}, range(10), 10000)
+
+
+def test_edge_cases():
+    """测试全静音、全语音和极短输入"""
+    vad_opts = VADXOptions()
+    for sil_prob in (0.999, 0.001):
+        for num_frames in (1, 30, 5000):
+            scores = np.tile(np.array([[sil_prob, 1.0 - sil_prob]], dtype=np.float32), (num_frames, 1))
+            decibel = np.full(num_frames, 60.0)
+            expected = _streaming_segments(scores, decibel, vad_opts)
+            assert detect_segments_offline(scores, decibel, vad_opts) == expected
+
+
+def test_speed():
+    """输出一小时音频的后处理耗时对比"""
+    rng = np.random.default_rng(0)
+    scores, decibel = _random_utterance(rng, 360000)
+
+    start = time.time()
+    expected = _streaming_segments(scores, decibel, VADXOptions())
+    streaming_time = time.time() - start
+
+    start = time.time()
+    actual = detect_segments_offline(scores, decibel, VADXOptions())
+    offline_time = time.time() - start
+
+    assert actual == expected
+    print(f"1小时音频后处理耗时: 流式状态机 {streaming_time:.2f}秒, 向量化 {offline_time:.3f}秒, "
+          f"语音段 {len(actual)} 个")
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("默认配置", test_default_options),
+        ("最大单段时长", test_max_single_segment),
+        ("扩展与迟滞阈值", test_no_extend_and_hysteresis),
+        ("单句检测模式", test_single_utterance_mode),
+        ("信噪比门限", test_snr_threshold),
+        ("边界情况", test_edge_cases),
+        ("性能对比", test_speed),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ONNX VAD后端测试脚本
+对比torch与onnx两种后端的语音段边界，并输出启动耗时和实时率(RTF)
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from vad_analyzer import VADAnalyzer, VAD_SAMPLE_RATE
+
+# 两种后端特征提取实现不同（torchaudio / kaldi-native-fbank），允许边界有少量帧的偏差
+BOUNDARY_TOLERANCE_MS = 50
+
+# 测试音频（可通过 TEST_AUDIO 环境变量指定），均不存在时使用合成音频
+TEST_FILES = [
+    os.getenv('TEST_AUDIO', ''),
+    './temp/test.wav',
+    './temp/test.mp3',
+]
+
+
+def _load_test_audio() -> tuple:
+    """加载测试音频，返回 (16kHz音频, 来源说明)"""
+    for test_file in TEST_FILES:
+        if test_file and os.path.exists(test_file):
+            analyzer = VADAnalyzer.__new__(VADAnalyzer)
+            audio, _ = analyzer._load_audio(test_file)
+            return audio, test_file
+
+    # 合成音频：静音与带谐波的调制音交替，模拟语音段
+    rng = np.random.default_rng(0)
+    parts = []
+    for speech_sec, silence_sec in [(2.0, 1.5), (3.5, 2.0), (1.2, 3.0), (4.0, 1.0)]:
+        t = np.arange(int(speech_sec * VAD_SAMPLE_RATE)) / VAD_SAMPLE_RATE
+        f0 = 140 + 30 * np.sin(2 * np.pi * 3 * t)
+        phase = 2 * np.pi * np.cumsum(f0) / VAD_SAMPLE_RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+        parts.append(0.2 * voiced * envelope)
+        parts.append(rng.normal(0, 1e-3, int(silence_sec * VAD_SAMPLE_RATE)))
+    return np.concatenate(parts).astype(np.float32), '合成音频'
+
+
+def _run_backend(backend: str, audio: np.ndarray) -> dict:
+    """初始化指定后端并执行VAD，返回语音段和耗时"""
+    start = time.time()
+    analyzer = VADAnalyzer(backend=backend)
+    startup_time = time.time() - start
+
+    # 预热一次，避免首次推理的初始化开销计入RTF
+    analyzer._run_vad(audio[:VAD_SAMPLE_RATE], 'warmup')
+
+    start = time.time()
+    result = analyzer._run_vad(audio, 'test')
+    infer_time = time.time() - start
+
+    segments = result[0]['value'] if result else []
+    duration = len(audio) / VAD_SAMPLE_RATE
+    return {
+        'segments': [[int(s), int(e)] for s, e in segments],
+        'startup_time': startup_time,
+        'rtf': infer_time / duration,
+    }
+
+
+def test_onnx_parity():
+    """测试onnx后端与torch后端的语音段一致（边界允许少量偏差）"""
+    audio, source = _load_test_audio()
+    print(f"测试音频: {source}, 时长: {len(audio) / VAD_SAMPLE_RATE:.2f}秒")
+
+    torch_result = _run_backend('torch', audio)
+    onnx_result = _run_backend('onnx', audio)
+
+    for name, result in [('torch', torch_result), ('onnx', onnx_result)]:
+        print(f"{name:>5}: 启动耗时 {result['startup_time']:.2f}秒, RTF {result['rtf']:.4f}, "
+              f"语音段 {len(result['segments'])} 个")
+
+    torch_segments = torch_result['segments']
+    onnx_segments = onnx_result['segments']
+    assert len(torch_segments) == len(onnx_segments), \
+        f"语音段数量不一致: torch={torch_segments}, onnx={onnx_segments}"
+
+    max_diff = 0
+    for (ts, te), (os_, oe) in zip(torch_segments, onnx_segments):
+        max_diff = max(max_diff, abs(ts - os_), abs(te - oe))
+    assert max_diff <= BOUNDARY_TOLERANCE_MS, f"语音段边界偏差过大: {max_diff}ms"
+    print(f"最大边界偏差: {max_diff}ms")
+
+
+# 在新的解释器中执行，结果不受本进程中已导入的模块（其他测试加载的torch）影响
+_ONNX_WITHOUT_TORCH_SCRIPT = """
+import sys
+import vad_analyzer
+vad_analyzer.VADAnalyzer(backend='onnx')
+assert 'torch' not in sys.modules, 'onnx后端不应导入torch'
+"""
+
+
+def test_onnx_without_torch():
+    """测试导入vad_analyzer并初始化onnx后端不会导入torch"""
+    result = subprocess.run(
+        [sys.executable, '-c', _ONNX_WITHOUT_TORCH_SCRIPT],
+        cwd=os.path.join(os.path.abspath(current_dir), 'src'),
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("onnx后端不依赖torch", test_onnx_without_torch),
+        ("torch/onnx语音段一致性", test_onnx_parity),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分片并行VAD测试脚本
+检查切分点落在静音中、分片语音段的合并规则，并在长合成音频上对比分片与单次VAD的语音段和耗时
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from sharded_vad import ENERGY_FRAME_SAMPLES, ShardedVADRunner, merge_shard_segments, plan_shard_cuts
+from vad_analyzer import VADAnalyzer, VAD_SAMPLE_RATE
+
+# 分片与单次VAD的语音段边界允许的误差（毫秒）
+BOUNDARY_TOLERANCE_MS = 300
+
+
+def _speech_audio(duration: float, seed: int = 0) -> tuple:
+    """生成语音段与静音交替的合成音频，返回 (音频, 语音段[[start_ms, end_ms], ...])"""
+    rng = np.random.default_rng(seed)
+    parts = []
+    segments = []
+    total = 0
+    while total < duration * VAD_SAMPLE_RATE:
+        speech = int(rng.uniform(1.0, 15.0) * VAD_SAMPLE_RATE)
+        silence = int(rng.uniform(0.5, 4.0) * VAD_SAMPLE_RATE)
+        t = np.arange(speech) / VAD_SAMPLE_RATE
+        phase = 2 * np.pi * np.cumsum(140 + 30 * np.sin(2 * np.pi * 3 * t)) / VAD_SAMPLE_RATE
+        parts.append(0.2 * sum(np.sin(k * phase) / k for k in range(1, 8)))
+        parts.append(np.zeros(silence))
+        segments.append([total * 1000 // VAD_SAMPLE_RATE, (total + speech) * 1000 // VAD_SAMPLE_RATE])
+        total += speech + silence
+    return np.concatenate(parts).astype(np.float32), segments
+
+
+def test_plan_cuts_in_silence():
+    """测试切分点落在等分点附近的静音中，且为10ms帧的整数倍"""
+    audio, segments = _speech_audio(600.0)
+    search_samples = 30 * VAD_SAMPLE_RATE
+    cuts = plan_shard_cuts(audio, 4, search_samples)
+
+    assert len(cuts) == 5 and cuts[0] == 0 and cuts[-1] == len(audio)
+    assert cuts == sorted(cuts)
+    for k, cut in enumerate(cuts[1:-1], start=1):
+        assert cut % ENERGY_FRAME_SAMPLES == 0
+        assert abs(cut - len(audio) * k // 4) <= search_samples + ENERGY_FRAME_SAMPLES
+        cut_ms = cut * 1000 // VAD_SAMPLE_RATE
+        assert not any(start <= cut_ms < end for start, end in segments), f"切分点 {cut_ms}ms 落在语音段内"
+    assert plan_shard_cuts(audio, 4, search_samples) == cuts, "相同输入的切分点应一致"
+
+
+def test_merge_segments():
+    """测试各分片只保留自己范围内开始的语音段，跨切分点的语音段取并集，首尾相接的保持分开"""
+    cuts = [0, 100 * VAD_SAMPLE_RATE, 200 * VAD_SAMPLE_RATE]
+    shard_segments = [
+        # 左侧分片（含右侧重叠）：最后一段跨越100秒切分点，结束位置因截断偏早；130秒处的语音段以右侧分片为准
+        [[1000, 30000], [30000, 50000], [95000, 101000], [130000, 131000]],
+        # 右侧分片（含左侧重叠）：跨越切分点的语音段从重叠区开始
+        [[96000, 104000], [130000, 131500], [150000, 160000]],
+    ]
+    merged = merge_shard_segments(shard_segments, cuts)
+    assert merged == [[1000, 30000], [30000, 50000], [95000, 104000], [130000, 131500], [150000, 160000]], merged
+
+    assert merge_shard_segments([[[0, 5000]], []], [0, 160000, 320000]) == [[0, 5000]]
+    assert merge_shard_segments([[], []], [0, 160000, 320000]) == []
+
+
+def _matched_segments(reference: list, candidate: list, tolerance_ms: int) -> int:
+    """统计两侧边界都在误差范围内的语音段数"""
+    candidate_set = list(candidate)
+    matched = 0
+    for start, end in reference:
+        for i, (c_start, c_end) in enumerate(candidate_set):
+            if abs(c_start - start) <= tolerance_ms and abs(c_end - end) <= tolerance_ms:
+                matched += 1
+                del candidate_set[i]
+                break
+    return matched
+
+
+def test_sharded_matches_single_pass():
+    """测试分片并行VAD的语音段与单次VAD在边界误差内一致，并输出耗时对比"""
+    analyzer = VADAnalyzer(backend='torch')
+    audio, _ = _speech_audio(1800.0, seed=1)
+    runner = ShardedVADRunner(
+        backend='torch',
+        workers=4,
+        overlap_ms=analyzer.config.VAD_PARALLEL_OVERLAP_MS,
+        search_ms=analyzer.config.VAD_PARALLEL_SEARCH_MS
+    )
+    try:
+        # 预热：启动进程池并在各进程中加载模型
+        runner.run(audio[:600 * VAD_SAMPLE_RATE], 'warmup')
+
+        start = time.time()
+        single = analyzer._run_vad(audio, 'single')[0]['value']
+        single_time = time.time() - start
+
+        start = time.time()
+        sharded = runner.run(audio, 'sharded')[0]['value']
+        sharded_time = time.time() - start
+    finally:
+        runner.close()
+
+    matched = _matched_segments(single, sharded, BOUNDARY_TOLERANCE_MS)
+    single_speech = sum(end - start for start, end in single)
+    sharded_speech = sum(end - start for start, end in sharded)
+    print(f"{len(audio) / VAD_SAMPLE_RATE / 60:.0f}分钟音频: 单次VAD {single_time:.2f}秒, "
+          f"分片VAD(4进程) {sharded_time:.2f}秒, 加速 {single_time / sharded_time:.2f}x, "
+          f"语音段 {len(single)}/{len(sharded)} 个, 边界误差内一致 {matched} 个")
+    assert abs(len(sharded) - len(single)) <= 1, f"语音段数量差异过大: {len(single)} vs {len(sharded)}"
+    assert matched >= len(single) - 1, f"分片结果与单次VAD不一致:\n单次: {single}\n分片: {sharded}"
+    assert abs(sharded_speech - single_speech) <= 2 * BOUNDARY_TOLERANCE_MS
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("静音切分点", test_plan_cuts_in_silence),
+        ("分片语音段合并", test_merge_segments),
+        ("分片与单次VAD一致性与耗时", test_sharded_matches_single_pass),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+流式VAD测试脚本
+对比按块送入的流式VAD与整文件VAD的语音段，检查PCM定长分块的正确性，
+以及流式解码失败时改为分析已下载的本地文件（不再重新下载）
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+import stream_analyzer
+from vad_analyzer import VADAnalyzer, VAD_SAMPLE_RATE
+from stream_analyzer import StreamingVADAnalyzer
+
+# 模拟无法从管道解码的ffmpeg：读完全部输入后失败（moov位于文件末尾的MP4/M4A）或读取少量数据后提前退出
+_DECODER_READ_ALL = "import sys; sys.stdin.buffer.read(); sys.stderr.write('moov atom not found'); sys.exit(1)"
+_DECODER_EXIT_EARLY = "import sys; sys.stdin.buffer.read(10); sys.stderr.write('Invalid data'); sys.exit(1)"
+
+
+class _SlowStream(io.BytesIO):
+    """模拟管道：每次read最多返回少量字节"""
+
+    def read(self, size=-1):
+        return super().read(min(size, 7777) if size and size > 0 else 7777)
+
+
+class _ChunkedAPIClient:
+    """按块返回下载数据的API客户端，可在指定块处模拟下载中断；不支持重新下载"""
+
+    def __init__(self, data: bytes, fail_at: int = None):
+        self.data = data
+        self.fail_at = fail_at
+
+    def iter_download(self, url):
+        for index, start in enumerate(range(0, len(self.data), 65536)):
+            if index == self.fail_at:
+                raise ConnectionError("模拟下载中断")
+            yield self.data[start:start + 65536]
+
+    def download_file(self, url, local_path):
+        raise AssertionError("不应重新下载")
+
+
+class _FileVADAnalyzer:
+    """记录下载后分析的文件内容"""
+
+    backend = 'torch'
+
+    def __init__(self):
+        self.analyzed = []
+
+    def new_audio_health(self):
+        return None
+
+    def run_vad_chunk(self, *args):
+        raise AssertionError("解码失败时不应有PCM数据")
+
+    def analyze_audio(self, audio_path, compact_output=None):
+        with open(audio_path, 'rb') as f:
+            self.analyzed.append((f.read(), compact_output))
+        return {'speech_segments': [], 'file_info': {'file_path': audio_path}}
+
+
+def _analyze_with_decoder(decoder_script: str, api_client: _ChunkedAPIClient, local_path: str) -> tuple:
+    """用模拟的解码器替换ffmpeg执行流式分析"""
+    vad_analyzer = _FileVADAnalyzer()
+    analyzer = StreamingVADAnalyzer(vad_analyzer, api_client)
+    real_popen = subprocess.Popen
+    stream_analyzer.subprocess.Popen = lambda args, **kwargs: real_popen([sys.executable, '-c', decoder_script], **kwargs)
+    try:
+        return analyzer.analyze_url('http://example.com/audio.m4a', local_path, ('compact.wav', 'map.json')), vad_analyzer
+    finally:
+        stream_analyzer.subprocess.Popen = real_popen
+
+
+def _synthetic_audio(duration: float) -> np.ndarray:
+    """生成语音/静音交替的合成音频"""
+    rng = np.random.default_rng(0)
+    parts = []
+    total = 0.0
+    while total < duration:
+        speech_sec, silence_sec = rng.uniform(0.5, 6.0), rng.uniform(0.3, 3.0)
+        t = np.arange(int(speech_sec * VAD_SAMPLE_RATE)) / VAD_SAMPLE_RATE
+        phase = 2 * np.pi * np.cumsum(140 + 30 * np.sin(2 * np.pi * 3 * t)) / VAD_SAMPLE_RATE
+        parts.append(0.2 * sum(np.sin(k * phase) / k for k in range(1, 8)))
+        parts.append(rng.normal(0, 1e-3, int(silence_sec * VAD_SAMPLE_RATE)))
+        total += speech_sec + silence_sec
+    return np.concatenate(parts).astype(np.float32)
+
+
+def test_pcm_chunking():
+    """测试解码器输出按定长分块，最后一块较短且丢弃不完整的采样点"""
+    analyzer = StreamingVADAnalyzer.__new__(StreamingVADAnalyzer)
+    analyzer.chunk_ms = 1000
+    samples = np.arange(100003, dtype=np.float32)
+    chunks = list(analyzer._iter_pcm_chunks(_SlowStream(samples.tobytes() + b'\x01\x02')))
+
+    assert [len(c) for c in chunks[:-1]] == [VAD_SAMPLE_RATE] * 6, [len(c) for c in chunks]
+    assert len(chunks[-1]) == 100003 - 6 * VAD_SAMPLE_RATE
+    assert np.array_equal(np.concatenate(chunks), samples)
+
+
+def test_streaming_matches_whole_file():
+    """测试流式VAD与整文件VAD的语音段一致（包括时长恰好为整块的情况）"""
+    vad_analyzer = VADAnalyzer(backend='torch')
+    analyzer = StreamingVADAnalyzer(vad_analyzer, api_client=None)
+    chunk_samples = analyzer.chunk_ms * VAD_SAMPLE_RATE // 1000
+
+    audio = _synthetic_audio(300.0)
+    for audio in (audio, audio[:len(audio) // chunk_samples * chunk_samples]):
+        expected = vad_analyzer._run_vad(audio, 'whole')[0]['value']
+
+        start = time.time()
+        chunks = (audio[i:i + chunk_samples] for i in range(0, len(audio), chunk_samples))
+        segments, total_samples = analyzer.analyze_pcm_chunks(chunks)
+        elapsed = time.time() - start
+
+        assert total_samples == len(audio)
+        assert [list(s) for s in segments] == [list(s) for s in expected], \
+            f"流式: {segments}\n整文件: {expected}"
+        print(f"{len(audio) / VAD_SAMPLE_RATE:.1f}秒音频: 语音段 {len(segments)} 个, 流式耗时 {elapsed:.2f}秒")
+
+
+def test_decode_failure_uses_downloaded_file():
+    """测试解码器失败（读完全部数据后或提前退出）时分析完整的本地文件，下载中断时仍抛出异常"""
+    data = np.random.default_rng(0).integers(0, 256, 1024 * 1024, dtype=np.uint8).tobytes()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_path = os.path.join(temp_dir, 'audio.m4a')
+        for script in (_DECODER_READ_ALL, _DECODER_EXIT_EARLY):
+            result, vad_analyzer = _analyze_with_decoder(script, _ChunkedAPIClient(data), local_path)
+            assert result['file_info']['file_path'] == local_path
+            assert len(vad_analyzer.analyzed) == 1
+            analyzed, compact_output = vad_analyzer.analyzed[0]
+            assert analyzed == data, f"本地文件不完整: {len(analyzed)}/{len(data)} 字节"
+            assert compact_output == ('compact.wav', 'map.json')
+
+        try:
+            _analyze_with_decoder(_DECODER_READ_ALL, _ChunkedAPIClient(data, fail_at=3), local_path)
+        except Exception as e:
+            assert "流式下载失败" in str(e), e
+        else:
+            raise AssertionError("下载中断时应抛出异常")
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("PCM定长分块", test_pcm_chunking),
+        ("流式与整文件语音段一致", test_streaming_matches_whole_file),
+        ("解码失败时分析已下载的文件", test_decode_failure_uses_downloaded_file),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -53,6 +53,8 @@ class Config:
     VAD_THRESHOLD = float(os.getenv('VAD_THRESHOLD', 0.5))
     VAD_MIN_SPEECH_DURATION = float(os.getenv('VAD_MIN_SPEECH_DURATION', 0.5))
     VAD_MAX_SPEECH_DURATION = float(os.getenv('VAD_MAX_SPEECH_DURATION', 30.0))
+    # task_info携带quick_node的语音段（vad_segments / vad_segments_url）时跳过faster-whisper的vad_filter
+    USE_PRECOMPUTED_VAD = os.getenv('USE_PRECOMPUTED_VAD', 'true').lower() == 'true'
     
     # TitaNet嵌入配置
     ENABLE_TITANET = os.getenv('ENABLE_TITANET', 'true').lower() == 'true'
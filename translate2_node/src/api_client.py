@@ -92,6 +92,47 @@ class APIClient:
                     pass
             return False
     
+    def fetch_vad_segments(self, task_info: dict, local_path: str) -> list:
+        """
+        获取上游quick_node已检测的VAD语音段
+        
+        优先使用task_info中内联的 vad_segments（[[start_ms, end_ms], ...] 或
+        quick_node回调中的 speech_segments 字典列表），其次下载 vad_segments_url
+        指向的int32 [N, 2]毫秒数组（.npy）。
+        
+        Args:
+            task_info (dict): 任务信息
+            local_path (str): 语音段文件的本地保存路径
+            
+        Returns:
+            list: [[start_sec, end_sec], ...]；上游未检测到语音时为空列表，没有可用的语音段时返回None
+        """
+        import numpy as np
+        
+        try:
+            inline_segments = task_info.get('vad_segments')
+            if inline_segments is not None:
+                segments_ms = [
+                    [item['start_ms'], item['end_ms']] if isinstance(item, dict) else item[:2]
+                    for item in inline_segments
+                ]
+                segments = np.asarray(segments_ms, dtype=np.int64).reshape(-1, 2)
+            elif task_info.get('vad_segments_url'):
+                if not self.download_file(task_info['vad_segments_url'], local_path):
+                    return None
+                try:
+                    segments = np.load(local_path, allow_pickle=False).reshape(-1, 2)
+                finally:
+                    os.remove(local_path)
+            else:
+                return None
+            
+            return (segments.astype(np.float64) / 1000.0).tolist()
+            
+        except Exception as e:
+            logger.warning(f"解析VAD语音段失败，转写阶段将重新执行VAD: {e}")
+            return None
+    
     def upload_file(self, file_path: str, task_id: int) -> bool:
         """
         上传文件到后端
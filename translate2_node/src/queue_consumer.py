@@ -144,12 +144,21 @@ class QueueConsumer:
             # 下载音频文件
             audio_file_path = self._download_audio(voice_url, task_id)
             
+            # 获取quick_node预计算的VAD语音段（可选）
+            speech_segments = None
+            if self.config.USE_PRECOMPUTED_VAD:
+                speech_segments = self.api_client.fetch_vad_segments(
+                    task_info,
+                    os.path.join(self.config.TEMP_DIR, f"task_{task_id}_vad_segments.npy")
+                )
+            
             try:
                 # 执行音频转写
                 logger.info(f"开始转写任务: {task_id}")
                 transcribe_result = self.transcriber.transcribe_audio(
                     audio_file_path,
-                    timeout=self.config.PROCESSING_TIMEOUT
+                    timeout=self.config.PROCESSING_TIMEOUT,
+                    speech_segments=speech_segments
                 )
                 
                 # 格式化回调数据以匹配后端期望的格式
@@ -183,13 +183,16 @@ class WhisperDiarizationTranscriber:
         except Exception as e:
             logger.warning(f"Windows 兼容性修复失败: {e}")
     
-    def transcribe_audio(self, audio_path: str, timeout: int = None) -> Dict:
+    def transcribe_audio(self, audio_path: str, timeout: int = None,
+                         speech_segments: Optional[List] = None) -> Dict:
         """
         转写音频文件
         
         Args:
             audio_path (str): 音频文件路径
             timeout (int, optional): 超时时间（秒）
+            speech_segments (list, optional): 上游VAD已检测的语音段 [[start_sec, end_sec], ...]，
+                提供时不再使用faster-whisper的vad_filter；为空列表时音频中没有语音，直接返回空结果
             
         Returns:
             Dict: 转写结果
@@ -211,8 +214,12 @@ class WhisperDiarizationTranscriber:
             logger.info(f"音频文件大小: {self._format_size(file_size)}")
             
             # 执行转写 - 必须使用高级功能
-            if hasattr(self, 'diarization_available') and self.config.ENABLE_DIARIZATION:
-                result = self._transcribe_with_diarization_module(audio_path, timeout)
+            if speech_segments is not None and not speech_segments:
+                # 上游VAD未检测到语音，不加载模型，直接返回空结果
+                logger.info("上游VAD未检测到语音，跳过转写")
+                result = self._empty_result(audio_path)
+            elif hasattr(self, 'diarization_available') and self.config.ENABLE_DIARIZATION:
+                result = self._transcribe_with_diarization_module(audio_path, timeout, speech_segments)
             else:
                 raise Exception("高级功能不可用，无法进行转写")
             
@@ -229,6 +236,7 @@ class WhisperDiarizationTranscriber:
                 'device': self.device,
                 'diarization_enabled': hasattr(self, 'diarization_available') and self.config.ENABLE_DIARIZATION,
                 'vad_enabled': self.config.ENABLE_VAD,
+                'precomputed_vad': speech_segments is not None,
                 'titanet_enabled': self.config.ENABLE_TITANET,
                 'whisper_diarization_available': hasattr(self, 'diarization_available')
             }
@@ -239,7 +247,62 @@ class WhisperDiarizationTranscriber:
             logger.error(f"音频转写失败: {e}")
             raise
     
-    def _transcribe_with_diarization_module(self, audio_path: str, timeout: int = None) -> Dict:
+    def _empty_result(self, audio_path: str) -> Dict:
+        """没有语音的音频的转写结果"""
+        import faster_whisper
+        
+        language = self.config.WHISPER_LANGUAGE
+        if not language or language.lower() in ['auto', 'none', 'null']:
+            language = 'unknown'
+        return {
+            'text': '',
+            'language': language,
+            'segments': [],
+            'speakers': {},
+            'summary': {
+                'total_duration': len(faster_whisper.decode_audio(audio_path)) / 16000,
+                'total_segments': 0,
+                'total_speakers': 0
+            }
+        }
+    
+    def _build_clip_timestamps(self, speech_segments: List, chunk_length: int = 30,
+                               sampling_rate: int = 16000) -> List[Dict]:
+        """
+        把预计算的语音段合并为批量转写使用的clip_timestamps（每块不超过chunk_length秒）
+        
+        faster-whisper 1.1.x 直接使用 merge_segments 的结果（采样点，含各块的语音段）；
+        1.2 起移除了 merge_segments，clip_timestamps 改为每块一个 {'start', 'end'}（秒）
+        """
+        from faster_whisper import vad
+        
+        max_samples = chunk_length * sampling_rate
+        segments = []
+        for start, end in sorted(speech_segments):
+            start, end = int(start * sampling_rate), int(end * sampling_rate)
+            # 超长语音段先按chunk_length切开，保证合并后每块都能放入模型输入窗口
+            while end - start > max_samples:
+                segments.append({'start': start, 'end': start + max_samples})
+                start += max_samples
+            if end > start:
+                segments.append({'start': start, 'end': end})
+        
+        if hasattr(vad, 'merge_segments'):
+            return vad.merge_segments(
+                segments, vad.VadOptions(max_speech_duration_s=chunk_length, speech_pad_ms=0), sampling_rate
+            )
+        
+        # 相邻语音段（连同其间的静音）合并，直到整块超过chunk_length
+        chunks = []
+        for segment in segments:
+            if chunks and segment['end'] - chunks[-1]['start'] <= max_samples:
+                chunks[-1]['end'] = max(chunks[-1]['end'], segment['end'])
+            else:
+                chunks.append(dict(segment))
+        return [{'start': chunk['start'] / sampling_rate, 'end': chunk['end'] / sampling_rate} for chunk in chunks]
+    
+    def _transcribe_with_diarization_module(self, audio_path: str, timeout: int = None,
+                                            speech_segments: Optional[List] = None) -> Dict:
         """使用 whisper-diarization 功能进行转写（基于官方 Jupyter Notebook）"""
         try:
             # 检查 HF_TOKEN
@@ -321,6 +384,21 @@ class WhisperDiarizationTranscriber:
                 else [-1]
             )
             
+            # 有预计算语音段时直接作为clip_timestamps，跳过faster-whisper自带的VAD
+            if speech_segments:
+                logger.info(f"使用预计算的VAD语音段: {len(speech_segments)}个，跳过vad_filter")
+                if self.config.WHISPER_BATCH_SIZE > 0:
+                    vad_kwargs = dict(vad_filter=False,
+                                      clip_timestamps=self._build_clip_timestamps(speech_segments))
+                else:
+                    vad_kwargs = dict(vad_filter=False,
+                                      clip_timestamps=[t for seg in sorted(speech_segments) for t in seg])
+            elif self.config.WHISPER_BATCH_SIZE > 0:
+                vad_kwargs = dict(vad_filter=True,
+                                  vad_parameters=dict(min_silence_duration_ms=500, max_speech_duration_s=float('inf')))
+            else:
+                vad_kwargs = dict(vad_filter=True)
+            
             # 修改转写参数，提高检测精度
             if self.config.WHISPER_BATCH_SIZE > 0:
                 transcript_segments, info = whisper_pipeline.transcribe(
@@ -329,8 +407,7 @@ class WhisperDiarizationTranscriber:
                     suppress_tokens=suppress_tokens,
                     batch_size=self.config.WHISPER_BATCH_SIZE,
                     # 添加更多参数提高转写质量
-                    vad_filter=True,
-                    vad_parameters=dict(min_silence_duration_ms=500, max_speech_duration_s=float('inf')),
+                    **vad_kwargs,
                     word_timestamps=True,
                     temperature=0.0,  # 降低温度以提高一致性
                 )
@@ -339,7 +416,7 @@ class WhisperDiarizationTranscriber:
                     audio_waveform,
                     language,
                     suppress_tokens=suppress_tokens,
-                    vad_filter=True,
+                    **vad_kwargs,
                     word_timestamps=True,
                     temperature=0.0,
                     # 添加更多参数
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+预计算VAD语音段测试脚本
+检查quick_node语音段（int32 [N, 2]毫秒 .npy）的读取、合并为批量转写的clip_timestamps（超长语音段切开、
+每块不超过30秒），以及上游未检测到语音时不再加载模型转写
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from faster_whisper import vad
+from api_client import APIClient
+from config import Config
+from transcriber import WhisperDiarizationTranscriber
+
+SAMPLE_RATE = 16000
+CHUNK_LENGTH = 30
+
+
+class _LocalAPIClient(APIClient):
+    """从本地路径“下载”文件的API客户端"""
+
+    def download_file(self, url: str, local_path: str) -> bool:
+        if not os.path.exists(url):
+            return False
+        shutil.copyfile(url, local_path)
+        return True
+
+
+def _chunk_bounds(clip_timestamps: list) -> list:
+    """clip_timestamps 各块的 (start_sec, end_sec)，兼容faster-whisper 1.1.x（采样点）和1.2+（秒）的格式"""
+    if hasattr(vad, 'merge_segments'):
+        return [(chunk['start'] / SAMPLE_RATE, chunk['end'] / SAMPLE_RATE) for chunk in clip_timestamps]
+    return [(chunk['start'], chunk['end']) for chunk in clip_timestamps]
+
+
+def test_fetch_vad_segments():
+    """测试 .npy 往返，上游没有语音时返回空列表，缺失时返回None"""
+    client = _LocalAPIClient()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_path = os.path.join(temp_dir, 'downloaded.npy')
+        artifact = os.path.join(temp_dir, 'segments.npy')
+
+        np.save(artifact, np.array([[250, 1750], [60000, 125500]], dtype=np.int32), allow_pickle=False)
+        assert client.fetch_vad_segments({'vad_segments_url': artifact}, local_path) == [[0.25, 1.75], [60.0, 125.5]]
+
+        np.save(artifact, np.zeros((0, 2), dtype=np.int32), allow_pickle=False)
+        assert client.fetch_vad_segments({'vad_segments_url': artifact}, local_path) == []
+        assert client.fetch_vad_segments({'vad_segments': []}, local_path) == []
+        assert client.fetch_vad_segments({}, local_path) is None
+
+
+def test_build_clip_timestamps():
+    """测试超长语音段按30秒切开，相邻语音段合并后每块不超过30秒，且覆盖全部语音"""
+    transcriber = WhisperDiarizationTranscriber.__new__(WhisperDiarizationTranscriber)
+    speech = [[100.0, 175.5], [0.5, 3.0], [3.2, 10.0], [12.0, 29.0], [40.0, 41.0], [200.0, 229.9]]
+    chunks = _chunk_bounds(transcriber._build_clip_timestamps(speech))
+
+    assert chunks == sorted(chunks)
+    assert all(end - start <= CHUNK_LENGTH + 1e-9 for start, end in chunks), chunks
+    for start, end in speech:
+        # 每个采样点都落在某一块内
+        for t in np.arange(start, end, 0.25):
+            assert any(chunk_start <= t < chunk_end for chunk_start, chunk_end in chunks), (t, chunks)
+    # [0.5, 29.0] 内的语音段合并为一块，[100, 175.5] 切为 30 + 30 + 15.5 秒
+    assert chunks[0] == (0.5, 29.0)
+    assert [round(end - start, 3) for start, end in chunks if 100.0 <= start < 175.5] == [30.0, 30.0, 15.5]
+
+
+def test_empty_segments_skip_transcription():
+    """测试上游未检测到语音（空列表）时不加载模型，直接返回空结果"""
+    transcriber = WhisperDiarizationTranscriber.__new__(WhisperDiarizationTranscriber)
+    transcriber.config = Config()
+    transcriber.device = 'cpu'
+
+    def fail(*args, **kwargs):
+        raise AssertionError("不应执行转写")
+
+    transcriber._transcribe_with_diarization_module = fail
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_path = os.path.join(temp_dir, 'silence.wav')
+        sf.write(audio_path, np.zeros(SAMPLE_RATE * 2, dtype=np.float32), SAMPLE_RATE)
+        result = transcriber.transcribe_audio(audio_path, speech_segments=[])
+
+    assert result['text'] == '' and result['segments'] == [] and result['speakers'] == {}
+    assert abs(result['summary']['total_duration'] - 2.0) < 1e-6
+    assert result['metadata']['precomputed_vad'] is True
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("读取预计算语音段", test_fetch_vad_segments),
+        ("合并为clip_timestamps", test_build_clip_timestamps),
+        ("无语音时跳过转写", test_empty_segments_skip_transcription),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
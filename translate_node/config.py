@@ -27,6 +27,11 @@ class Config:
     API_UPLOAD_ENDPOINT = os.getenv('API_UPLOAD_ENDPOINT', '/queue/upload')
     API_CALLBACK_ENDPOINT = os.getenv('API_CALLBACK_ENDPOINT', '/queue/callback')
     
+    # 回调结果格式: legacy（段落/词字典列表，默认）、compact（列式紧凑编码）、both（两者都发送）
+    CALLBACK_RESULT_FORMAT = os.getenv('CALLBACK_RESULT_FORMAT', 'legacy').lower()
+    CALLBACK_COMPACT_ENCODING = os.getenv('CALLBACK_COMPACT_ENCODING', 'gzip-json').lower()  # gzip-json / msgpack
+    CALLBACK_INLINE_MAX_BYTES = int(os.getenv('CALLBACK_INLINE_MAX_BYTES', 262144))  # 紧凑结果超过该大小时上传为文件，回调中只带URL
+    
     # 工作目录配置
     default_work_dir = './work' if not os.path.exists('/app') else '/app/work'
     default_temp_dir = './temp' if not os.path.exists('/app') else '/app/temp'
@@ -56,16 +61,39 @@ class Config:
     
     # 高级说话人分离配置
     SPEAKER_SIMILARITY_THRESHOLD = float(os.getenv('SPEAKER_SIMILARITY_THRESHOLD', 0.5))  # 说话人相似度阈值
+    # 分块转写时的说话人分离方式：global 为各块提取说话人嵌入后在整个音频范围内统一聚类（跨块标签一致），
+    # chunk 为各块独立分离后按出现顺序编号
+    DIARIZATION_MODE = os.getenv('DIARIZATION_MODE', 'global').lower()
+    # global 模式合并块内说话人的余弦距离阈值，默认与pyannote speaker-diarization-3.1 质心聚类的阈值相同
+    GLOBAL_SPEAKER_DISTANCE_THRESHOLD = float(os.getenv('GLOBAL_SPEAKER_DISTANCE_THRESHOLD', 0.7045654963945799))
     MINIMUM_SEGMENT_DURATION = float(os.getenv('MINIMUM_SEGMENT_DURATION', 0.5))  # 最小段落时长(秒)
     
+    # 预计算VAD配置：task_info携带quick_node的语音段（vad_segments / vad_segments_url）时跳过转写阶段的VAD
+    USE_PRECOMPUTED_VAD = os.getenv('USE_PRECOMPUTED_VAD', 'true').lower() == 'true'
+    
+    # 上游语种配置：task_info携带quick_node语种识别的结果（language / language_confidence）且 WHISPER_LANGUAGE=auto 时，
+    # 直接以该语种转写（跳过Whisper只看前30秒的语种检测），并在转写的同时预加载对应的对齐模型
+    USE_LANGUAGE_HINT = os.getenv('USE_LANGUAGE_HINT', 'true').lower() == 'true'
+    LANGUAGE_HINT_MIN_CONFIDENCE = float(os.getenv('LANGUAGE_HINT_MIN_CONFIDENCE', 0.6))  # 低于该置信度时仍自动检测
+    
+    # 压缩音频配置：task_info携带quick_node的压缩音频（compacted_audio_url / compacted_offset_map_url）时转写压缩音频，
+    # 段落和逐词时间戳按偏移表还原到原始音频时间
+    USE_COMPACTED_AUDIO = os.getenv('USE_COMPACTED_AUDIO', 'true').lower() == 'true'
+    
     # 语言对齐配置
     ENABLE_ALIGNMENT = os.getenv('ENABLE_ALIGNMENT', 'true').lower() == 'true'
     ALIGNMENT_MODEL = os.getenv('ALIGNMENT_MODEL', 'WAV2VEC2_ASR_LARGE_LV60K_960H')
+    ALIGN_BATCH_SIZE = int(os.getenv('ALIGN_BATCH_SIZE', 8))  # GPU上每次对齐模型推理的段落数（CPU上逐段推理）
+    # 对齐模型按语种缓存（LRU），语种提前已知时后台预加载；超出内存预算或模型数时淘汰最久未使用的模型，0为不限制
+    ALIGN_CACHE_MEMORY_MB = float(os.getenv('ALIGN_CACHE_MEMORY_MB', 4096))
+    ALIGN_CACHE_MAX_MODELS = int(os.getenv('ALIGN_CACHE_MAX_MODELS', 4))
     
     # 处理限制配置
     MAX_AUDIO_DURATION = int(os.getenv('MAX_AUDIO_DURATION', 3600))  # 最大音频时长（秒），默认1小时
     PROCESSING_TIMEOUT = int(os.getenv('PROCESSING_TIMEOUT', 7200))  # 处理超时（秒），默认2小时
     CHUNK_DURATION = int(os.getenv('CHUNK_DURATION', 600))  # 分块处理时长（秒），默认10分钟
+    CHUNK_SEARCH_WINDOW = float(os.getenv('CHUNK_SEARCH_WINDOW', 60))  # 在目标分块位置前后多少秒内寻找VAD静音作为切分点
+    CHUNK_FORCED_OVERLAP = float(os.getenv('CHUNK_FORCED_OVERLAP', 2.0))  # 找不到静音强制切分时两侧块的重叠转写时长（秒）
     
     # 输出格式配置
     OUTPUT_FORMAT = os.getenv('OUTPUT_FORMAT', 'json')  # 输出格式: json, srt, vtt, txt
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+对齐模型缓存
+按语种缓存wav2vec2对齐模型，按显存/内存预算和模型数量做LRU淘汰；语种提前已知时在后台线程预加载，
+同一语种的加载只进行一次（预加载中的请求等待该次加载），并统计命中、等待、未命中和加载耗时
+"""
+
+import gc
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from logger import logger
+
+
+def model_memory_mb(model) -> float:
+    """模型参数和缓冲区占用的内存（MB），无法统计时为0"""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors) / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+class AlignModelCache:
+    """按语种缓存的对齐模型（LRU）"""
+
+    def __init__(self, loader, memory_budget_mb: float = 0, max_models: int = 0):
+        """
+        Args:
+            loader: 加载函数 loader(language) -> (align_model, align_metadata)，失败时抛出异常
+            memory_budget_mb (float): 缓存模型的总内存预算（MB），超出时淘汰最久未使用的模型，0为不限制
+            max_models (int): 最多缓存的模型数，0为不限制
+        """
+        self._loader = loader
+        self.memory_budget_mb = memory_budget_mb
+        self.max_models = max_models
+        self._models = OrderedDict()  # language -> (align_model, align_metadata, memory_mb)，最近使用的在末尾
+        self._loading = {}  # language -> Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='align_prefetch')
+        self._stats = {
+            'hits': 0,           # 请求时模型已在缓存中
+            'waits': 0,          # 请求时模型正在（预）加载，等待该次加载
+            'misses': 0,         # 请求时才开始加载
+            'prefetches': 0,     # 发起的后台预加载
+            'loads': 0,
+            'load_failures': 0,
+            'evictions': 0,
+            'load_seconds': 0.0,
+        }
+
+    def get(self, language: str):
+        """
+        获取语种的对齐模型，未缓存时加载（正在预加载时等待）
+
+        Returns:
+            tuple: (align_model, align_metadata)
+        """
+        with self._lock:
+            entry = self._models.get(language)
+            if entry is not None:
+                self._models.move_to_end(language)
+                self._stats['hits'] += 1
+                return entry[0], entry[1]
+            future = self._loading.get(language)
+            self._stats['waits' if future is not None else 'misses'] += 1
+            owner = future is None
+            if owner:
+                future = self._loading[language] = Future()
+        if owner:
+            self._load(language, future)
+        return future.result()
+
+    def prefetch(self, language: str):
+        """在后台线程中加载语种的对齐模型（已缓存或正在加载时不做任何事）"""
+        with self._lock:
+            if not language or language in self._models or language in self._loading:
+                return
+            future = self._loading[language] = Future()
+            self._stats['prefetches'] += 1
+        logger.info(f"后台预加载 {language} 对齐模型")
+        self._executor.submit(self._load, language, future)
+
+    def stats(self) -> dict:
+        """命中/未命中等统计和当前缓存的语种（按最近使用排序）"""
+        with self._lock:
+            stats = dict(self._stats)
+            requests = stats['hits'] + stats['waits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+            stats['load_seconds'] = round(stats['load_seconds'], 2)
+            stats['languages'] = list(self._models)
+            stats['memory_mb'] = round(sum(entry[2] for entry in self._models.values()), 1)
+            return stats
+
+    def _load(self, language: str, future: Future):
+        start_time = time.time()
+        try:
+            align_model, align_metadata = self._loader(language)
+        except Exception as e:
+            with self._lock:
+                self._loading.pop(language, None)
+                self._stats['load_failures'] += 1
+            future.set_exception(e)
+            return
+
+        memory_mb = model_memory_mb(align_model)
+        elapsed = time.time() - start_time
+        with self._lock:
+            self._models[language] = (align_model, align_metadata, memory_mb)
+            self._loading.pop(language, None)
+            self._stats['loads'] += 1
+            self._stats['load_seconds'] += elapsed
+            evicted = self._evict()
+        logger.info(f"{language} 对齐模型加载完成: 耗时 {elapsed:.1f}秒, 约 {memory_mb:.0f}MB")
+        future.set_result((align_model, align_metadata))
+
+        if evicted:
+            logger.info(f"淘汰对齐模型: {', '.join(evicted)}")
+            self._release_memory()
+
+    def _evict(self) -> list:
+        """超出预算时淘汰最久未使用的模型（至少保留最近加载的一个），需持有锁"""
+        evicted = []
+        while len(self._models) > 1:
+            over_count = self.max_models and len(self._models) > self.max_models
+            total_mb = sum(entry[2] for entry in self._models.values())
+            over_budget = self.memory_budget_mb and total_mb > self.memory_budget_mb
+            if not over_count and not over_budget:
+                break
+            language, _ = self._models.popitem(last=False)
+            self._stats['evictions'] += 1
+            evicted.append(language)
+        return evicted
+
+    @staticmethod
+    def _release_memory():
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
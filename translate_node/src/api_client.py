@@ -5,8 +5,12 @@ import requests
 import json
 import os
 import sys
+import tempfile
 from pathlib import Path
 from logger import logger
+from result_codec import (
+    SCHEMA_TRANSCRIPT_SEGMENTS, build_envelope, encode_columns, resolve_encoding, transcript_segments_to_columns
+)
 
 # 添加项目路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -188,6 +192,15 @@ class APIClient:
             }
         }
         
+        # 紧凑格式：段落和词以列式数组的编码信封发送（compact模式不再发送逐条字典列表）
+        result_format = self.config.CALLBACK_RESULT_FORMAT
+        if result_format in ('compact', 'both'):
+            transcribe_details['segments_compact'] = self.build_compact_result(
+                task_id, SCHEMA_TRANSCRIPT_SEGMENTS, transcript_segments_to_columns(segments, speakers), len(segments)
+            )
+            if result_format == 'compact':
+                del transcribe_details['segments']
+        
         # 准备回调数据
         callback_data = {
             'text_info': transcribe_details,
@@ -204,6 +217,51 @@ class APIClient:
         
         return self.send_callback(task_id, 4, 'success', callback_data)
     
+    def build_compact_result(self, task_id: int, schema: str, columns: dict, count: int) -> dict:
+        """
+        编码列式结果，超过 CALLBACK_INLINE_MAX_BYTES 时上传为文件并在信封中引用URL
+        
+        Args:
+            task_id (int): 任务ID
+            schema (str): 列式结构名称
+            columns (dict): 列式数据
+            count (int): 记录条数
+            
+        Returns:
+            dict: 紧凑结果信封（见 result_codec.build_envelope）
+        """
+        encoding = resolve_encoding(self.config.CALLBACK_COMPACT_ENCODING)
+        if encoding != self.config.CALLBACK_COMPACT_ENCODING:
+            logger.warning(f"紧凑结果编码 {self.config.CALLBACK_COMPACT_ENCODING} 不可用，改用 {encoding}")
+        payload = encode_columns(columns, encoding)
+        
+        url = None
+        if len(payload) > self.config.CALLBACK_INLINE_MAX_BYTES:
+            url = self._upload_compact_payload(task_id, schema, payload, encoding)
+        
+        logger.info(f"任务 {task_id}: 紧凑结果 {schema} 共 {count} 条, 编码后 {self.get_file_size_str(len(payload))}"
+                   f"{', 已上传为文件' if url else ', 内联发送'}")
+        return build_envelope(schema, count, payload, encoding, url)
+    
+    def _upload_compact_payload(self, task_id: int, schema: str, payload: bytes, encoding: str) -> str:
+        """上传紧凑结果文件，返回文件URL，失败时返回None（改为内联发送）"""
+        suffix = '.msgpack' if encoding == 'msgpack' else '.json.gz'
+        os.makedirs(self.config.TEMP_DIR, exist_ok=True)
+        fd, file_path = tempfile.mkstemp(prefix=f"task_{task_id}_{schema}_", suffix=suffix, dir=self.config.TEMP_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            upload_result = self.upload_file(file_path)
+            url = (upload_result or {}).get('data', {}).get('file_info', {}).get('url')
+            if not url:
+                raise Exception(f"上传响应中缺少文件URL: {upload_result}")
+            return url
+        except Exception as e:
+            logger.warning(f"任务 {task_id}: 紧凑结果文件上传失败，改为内联发送: {e}")
+            return None
+        finally:
+            os.remove(file_path)
+    
     def send_failed_callback(self, task_id: int, error_message: str) -> dict:
         """发送失败回调"""
         callback_data = {
@@ -247,6 +305,71 @@ class APIClient:
             logger.error(f"文件下载失败: {e}")
             return False
     
+    def fetch_vad_segments(self, task_info: dict, local_path: str) -> list:
+        """
+        获取上游quick_node已检测的VAD语音段
+        
+        优先使用task_info中内联的 vad_segments（[[start_ms, end_ms], ...] 或
+        quick_node回调中的 speech_segments 字典列表），其次下载 vad_segments_url
+        指向的int32 [N, 2]毫秒数组（.npy）。
+        
+        Args:
+            task_info (dict): 任务信息
+            local_path (str): 语音段文件的本地保存路径
+            
+        Returns:
+            list: [[start_sec, end_sec], ...]；上游未检测到语音时为空列表，没有可用的语音段时返回None
+        """
+        import numpy as np
+        
+        try:
+            inline_segments = task_info.get('vad_segments')
+            if inline_segments is not None:
+                segments_ms = [
+                    [item['start_ms'], item['end_ms']] if isinstance(item, dict) else item[:2]
+                    for item in inline_segments
+                ]
+                segments = np.asarray(segments_ms, dtype=np.int64).reshape(-1, 2)
+            elif task_info.get('vad_segments_url'):
+                if not self.download_file(task_info['vad_segments_url'], local_path):
+                    return None
+                try:
+                    segments = np.load(local_path, allow_pickle=False).reshape(-1, 2)
+                finally:
+                    os.remove(local_path)
+            else:
+                return None
+            
+            return (segments.astype(np.float64) / 1000.0).tolist()
+            
+        except Exception as e:
+            logger.warning(f"解析VAD语音段失败，转写阶段将重新执行VAD: {e}")
+            return None
+    
+    def fetch_offset_map(self, task_info: dict, local_path: str):
+        """
+        下载quick_node压缩音频的偏移表（task_info.compacted_offset_map_url）
+        
+        Args:
+            task_info (dict): 任务信息
+            local_path (str): 偏移表的本地保存路径
+            
+        Returns:
+            OffsetMap: 偏移表，不可用时返回None（转写原始音频）
+        """
+        from compacted_timeline import OffsetMap
+        
+        try:
+            if not self.download_file(task_info['compacted_offset_map_url'], local_path):
+                return None
+            try:
+                return OffsetMap.load(local_path)
+            finally:
+                os.remove(local_path)
+        except Exception as e:
+            logger.warning(f"解析压缩音频偏移表失败，将转写原始音频: {e}")
+            return None
+    
     def upload_file(self, file_path: str, task_type: int = 4) -> dict:
         """
         上传文件到服务器
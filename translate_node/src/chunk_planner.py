@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+长音频分块规划
+在目标块长附近的VAD静音中切分音频（切分点取最长静音的中点，对齐到16kHz采样点），避免把词切断；
+搜索范围内没有静音时在目标位置强制切分，两侧各多转写一小段重叠音频，合并时按词的中点归属去重
+"""
+
+import numpy as np
+
+from decoded_audio import SAMPLE_RATE
+
+
+def find_silences(speech_segments: list, total_duration: float) -> np.ndarray:
+    """
+    语音段之间（以及开头、结尾）的静音区间
+
+    Args:
+        speech_segments (list): 语音段 [[start_sec, end_sec], ...]
+        total_duration (float): 音频时长（秒）
+
+    Returns:
+        np.ndarray: [G, 2] 静音区间（秒），按时间排序，长度都大于0
+    """
+    bounds = np.asarray(speech_segments, dtype=np.float64).reshape(-1, 2)
+    bounds = np.clip(bounds[bounds[:, 1] > bounds[:, 0]], 0.0, total_duration)
+    bounds = bounds[np.argsort(bounds[:, 0], kind='stable')]
+    # 重叠或相接的语音段之间没有静音：用累计最大结束时间计算间隔
+    speech_end = np.maximum.accumulate(bounds[:, 1]) if len(bounds) else np.zeros(0)
+    starts = np.concatenate([[0.0], speech_end])
+    ends = np.concatenate([bounds[:, 0], [total_duration]])
+    silences = np.stack([starts, ends], axis=1)
+    return silences[silences[:, 1] > silences[:, 0]]
+
+
+def plan_chunks(speech_segments: list, total_duration: float, target_duration: float, search_window: float,
+                overlap: float, sample_rate: int = SAMPLE_RATE) -> list:
+    """
+    规划分块
+
+    Args:
+        speech_segments (list): 整个音频的语音段 [[start_sec, end_sec], ...]
+        total_duration (float): 音频时长（秒）
+        target_duration (float): 目标块长（秒）
+        search_window (float): 在目标位置前后多少秒内寻找静音
+        overlap (float): 强制切分（不在静音中）时两侧块多转写的音频时长（秒）
+        sample_rate (int): 音频数组的采样率
+
+    Returns:
+        list: 按时间排序的块 [{
+            'start_sample', 'end_sample',  # 该块转写的音频范围（采样点）
+            'start', 'end',                # 同一范围（秒）
+            'keep_start', 'keep_end',      # 该块负责的时间范围（秒），相邻块首尾相接
+            'forced_cut': bool             # 块结尾是否为强制切分
+        }, ...]
+    """
+    total_samples = int(round(total_duration * sample_rate))
+    silences = find_silences(speech_segments, total_duration)
+    midpoints = silences.mean(axis=1)
+    lengths = silences[:, 1] - silences[:, 0]
+
+    cuts, forced = [0], [False]
+    position = 0.0
+    while total_duration - position > target_duration + search_window:
+        target = position + target_duration
+        candidates = np.flatnonzero(
+            (midpoints > position) & (midpoints >= target - search_window) & (midpoints <= target + search_window)
+        )
+        if len(candidates):
+            # 最长的静音优先，长度相同时取离目标位置最近的
+            best = candidates[np.lexsort((np.abs(midpoints[candidates] - target), -lengths[candidates]))[0]]
+            cut, is_forced = midpoints[best], False
+        else:
+            cut, is_forced = target, True
+        cut_sample = int(round(cut * sample_rate))
+        if cut_sample <= cuts[-1]:
+            cut_sample, is_forced = int(round(target * sample_rate)), True
+        cuts.append(cut_sample)
+        forced.append(is_forced)
+        position = cut_sample / sample_rate
+    cuts.append(total_samples)
+    forced.append(False)
+
+    overlap_samples = int(round(overlap * sample_rate))
+    chunks = []
+    for k in range(len(cuts) - 1):
+        start_sample = max(0, cuts[k] - (overlap_samples if forced[k] else 0))
+        end_sample = min(total_samples, cuts[k + 1] + (overlap_samples if forced[k + 1] else 0))
+        chunks.append({
+            'start_sample': start_sample,
+            'end_sample': end_sample,
+            'start': start_sample / sample_rate,
+            'end': end_sample / sample_rate,
+            'keep_start': cuts[k] / sample_rate,
+            'keep_end': cuts[k + 1] / sample_rate,
+            'forced_cut': forced[k + 1]
+        })
+    return chunks
+
+
+def _has_time(item: dict) -> bool:
+    return isinstance(item.get('start'), (int, float)) and isinstance(item.get('end'), (int, float))
+
+
+def keep_owned_segments(segments: list, keep_start: float, keep_end: float, word_separator: str = ' ') -> list:
+    """
+    只保留中点落在 [keep_start, keep_end) 内的词和段落（时间已换算为整个音频的时间），
+    相邻块在强制切分处重叠转写的内容因此只保留一份
+
+    没有时间戳的词（如对齐失败的数字）跟随前一个词的归属；段落中只保留部分词时按保留的词重建文本和起止时间
+
+    Args:
+        segments (list): 一个块的转写段落
+        keep_start (float): 该块负责的开始时间（秒）
+        keep_end (float): 该块负责的结束时间（秒）
+        word_separator (str): 重建文本时词之间的分隔符（中文、日文为空字符串）
+
+    Returns:
+        list: 保留的段落
+    """
+    def owned(item: dict) -> bool:
+        return keep_start <= (item['start'] + item['end']) / 2 < keep_end
+
+    kept_segments = []
+    for segment in segments:
+        segment_owned = owned(segment) if _has_time(segment) else True
+        words = segment.get('words') or []
+        if not any(_has_time(word) for word in words):
+            if segment_owned:
+                kept_segments.append(segment)
+            continue
+
+        kept_words = []
+        previous_owned = segment_owned
+        for word in words:
+            previous_owned = owned(word) if _has_time(word) else previous_owned
+            if previous_owned:
+                kept_words.append(word)
+        if len(kept_words) == len(words):
+            kept_segments.append(segment)
+            continue
+        timed = [word for word in kept_words if _has_time(word)]
+        if not timed:
+            continue
+        segment['words'] = kept_words
+        segment['text'] = word_separator.join(word.get('word', '').strip() for word in kept_words)
+        segment['start'] = timed[0]['start']
+        segment['end'] = timed[-1]['end']
+        kept_segments.append(segment)
+    return kept_segments
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+压缩音频时间轴
+quick_node把语音段拼接成只含语音的压缩音频（片段之间插入固定静音），并给出偏移表
+[[compact_start_ms, original_start_ms, duration_ms], ...]；转写压缩音频后用偏移表把段落和逐词时间戳还原到原始音频时间
+"""
+
+import json
+import numpy as np
+
+# quick_node偏移表格式（compact_audio.OFFSET_MAP_FORMAT）
+OFFSET_MAP_FORMAT = 'json-offset-map'
+
+
+class OffsetMap:
+    """压缩音频时间 <-> 原始音频时间的分段线性映射"""
+
+    def __init__(self, pieces: list, original_duration_ms: int = None):
+        """
+        初始化偏移表
+
+        Args:
+            pieces (list): 按时间排序的片段 [[compact_start_ms, original_start_ms, duration_ms], ...]
+            original_duration_ms (int): 原始音频时长（毫秒），为空时取最后一个片段的结束时间
+        """
+        pieces = np.asarray(pieces, dtype=np.float64).reshape(-1, 3)
+        if len(pieces) == 0:
+            raise ValueError("偏移表中没有片段")
+        # 统一使用秒，与转写结果的时间戳一致
+        self.compact_start = pieces[:, 0] / 1000.0
+        self.original_start = pieces[:, 1] / 1000.0
+        self.duration = pieces[:, 2] / 1000.0
+        self.compact_end = self.compact_start + self.duration
+        self.original_end = self.original_start + self.duration
+        if original_duration_ms is None:
+            self.original_duration = float(self.original_end[-1])
+        else:
+            self.original_duration = original_duration_ms / 1000.0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'OffsetMap':
+        """由quick_node上传的偏移表JSON结构创建"""
+        if data.get('format', OFFSET_MAP_FORMAT) != OFFSET_MAP_FORMAT or data.get('version', 1) != 1:
+            raise ValueError(f"不支持的偏移表格式: {data.get('format')} v{data.get('version')}")
+        return cls(data['pieces'], data.get('original_duration_ms'))
+
+    @classmethod
+    def load(cls, path: str) -> 'OffsetMap':
+        """从JSON文件加载偏移表"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    @property
+    def compacted_duration(self) -> float:
+        """压缩音频中最后一个片段的结束时间（秒）"""
+        return float(self.compact_end[-1])
+
+    @staticmethod
+    def _map(times, src_start, src_end, dst_start, dst_end, kind: str) -> np.ndarray:
+        """
+        按片段做分段平移；落在片段之间（源时间轴的间隔）的时间，开始时间映射到下一片段的开始，
+        结束时间映射到上一片段的结束，使跨越拼接处的词/段落在目标时间轴上覆盖两侧片段而不是落入间隔
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if kind == 'start':
+            index = np.searchsorted(src_start, times, side='right') - 1
+        elif kind == 'end':
+            index = np.searchsorted(src_start, times, side='left') - 1
+        else:
+            raise ValueError(f"未知的时间类型: {kind}")
+        index = np.clip(index, 0, len(src_start) - 1)
+
+        offset = np.clip(times - src_start[index], 0.0, None)
+        inside = offset < src_end[index] - src_start[index]
+        mapped = dst_start[index] + offset
+        if kind == 'start':
+            # 间隔中的开始时间 -> 下一片段的开始（已是最后一个片段时为其结束）
+            following = np.minimum(index + 1, len(src_start) - 1)
+            gap_target = np.where(index + 1 < len(src_start), dst_start[following], dst_end[index])
+        else:
+            gap_target = dst_end[index]
+        return np.where(inside, mapped, gap_target)
+
+    def to_original(self, times, kind: str = 'start') -> np.ndarray:
+        """
+        压缩音频时间 -> 原始音频时间（秒）
+
+        Args:
+            times: 时间（秒），标量或数组
+            kind (str): 'start'（开始时间）或 'end'（结束时间），决定落在片段间静音中的时间映射到哪一侧
+        """
+        return self._map(times, self.compact_start, self.compact_end, self.original_start, self.original_end, kind)
+
+    def to_compact(self, times, kind: str = 'start') -> np.ndarray:
+        """原始音频时间 -> 压缩音频时间（秒），落在被去除的静音中的时间按 kind 映射到相邻片段的边界"""
+        return self._map(times, self.original_start, self.original_end, self.compact_start, self.compact_end, kind)
+
+    def compact_segments(self, speech_segments: list) -> list:
+        """原始时间的语音段 [[start_sec, end_sec], ...] -> 压缩音频时间，去除映射后长度为0的语音段"""
+        bounds = np.asarray(speech_segments, dtype=np.float64).reshape(-1, 2)
+        starts = self.to_compact(bounds[:, 0], 'start')
+        ends = self.to_compact(bounds[:, 1], 'end')
+        keep = ends > starts
+        return np.stack([starts[keep], ends[keep]], axis=1).tolist()
+
+    def _remap_items(self, items: list):
+        """就地把一组带 start/end 的字典映射到原始时间，缺少时间戳的项保持不变"""
+        timed = [
+            item for item in items
+            if isinstance(item.get('start'), (int, float)) and isinstance(item.get('end'), (int, float))
+        ]
+        if not timed:
+            return
+        starts = self.to_original([item['start'] for item in timed], 'start')
+        ends = self.to_original([item['end'] for item in timed], 'end')
+        # 整个落在片段间静音中的项（开始映射到下一片段、结束映射到上一片段）收缩为下一片段开始处的零长度
+        ends = np.maximum(ends, starts)
+        for item, start, end in zip(timed, starts.tolist(), ends.tolist()):
+            item['start'] = round(start, 3)
+            item['end'] = round(end, 3)
+
+    def remap_transcript(self, transcribe_result: dict) -> dict:
+        """
+        就地把转写结果中的段落和逐词时间戳还原到原始音频时间
+
+        Args:
+            transcribe_result (dict): transcribe_audio 的转写结果（时间基于压缩音频）
+
+        Returns:
+            dict: 同一个转写结果，total_voice 改为原始音频时长，并记录 compacted_voice
+        """
+        segments = transcribe_result.get('segments') or []
+        self._remap_items(segments)
+        for segment in segments:
+            if isinstance(segment.get('words'), list):
+                self._remap_items(segment['words'])
+        transcribe_result['compacted_voice'] = transcribe_result.get('total_voice', self.compacted_duration)
+        transcribe_result['total_voice'] = self.original_duration
+        return transcribe_result
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+解码后的音频
+每个转写任务只解码一次：16kHz单声道float32数组及文件信息，语音识别、对齐和说话人分离共用同一个数组
+"""
+
+import os
+import shutil
+import numpy as np
+from logger import logger
+
+# Whisper / wav2vec2对齐 / pyannote 共同的输入采样率（与 whisperx.audio.SAMPLE_RATE 一致）
+SAMPLE_RATE = 16000
+
+
+class DecodedAudio:
+    """一个转写任务的16kHz单声道音频和文件信息"""
+
+    def __init__(self, audio: np.ndarray, file_path: str, source_sample_rate: int = None, channels: int = 1):
+        """
+        Args:
+            audio (np.ndarray): 16kHz单声道float32音频
+            file_path (str): 音频文件路径
+            source_sample_rate (int): 文件的原始采样率（未知时为16000）
+            channels (int): 文件的原始声道数
+        """
+        self.audio = audio
+        self.file_path = file_path
+        self.sample_rate = SAMPLE_RATE
+        self.source_sample_rate = source_sample_rate or SAMPLE_RATE
+        self.channels = channels
+
+    @classmethod
+    def load(cls, audio_path: str) -> 'DecodedAudio':
+        """
+        解码音频文件：有ffmpeg时使用 whisperx.load_audio（与whisperX自身解码结果一致），否则使用librosa(soxr)
+
+        Args:
+            audio_path (str): 音频文件路径
+
+        Returns:
+            DecodedAudio: 解码后的音频
+        """
+        if shutil.which('ffmpeg'):
+            from whisperx.audio import load_audio
+            audio = load_audio(audio_path, SAMPLE_RATE)
+        else:
+            import librosa
+            audio, _ = librosa.load(audio_path, sr=SAMPLE_RATE, mono=True, res_type='soxr_hq')
+            audio = audio.astype(np.float32, copy=False)
+
+        source_sample_rate, channels = None, 1
+        try:
+            import soundfile as sf
+            info = sf.info(audio_path)
+            source_sample_rate, channels = info.samplerate, info.channels
+        except Exception as e:
+            logger.debug(f"读取音频文件头失败，原始采样率按{SAMPLE_RATE}Hz记录: {e}")
+
+        return cls(audio, audio_path, source_sample_rate, channels)
+
+    @property
+    def duration(self) -> float:
+        """音频时长（秒）"""
+        return len(self.audio) / self.sample_rate
+
+    @property
+    def file_info(self) -> dict:
+        """文件基本信息（随回调返回）"""
+        file_size = os.path.getsize(self.file_path)
+        return {
+            'file_path': self.file_path,
+            'file_name': os.path.basename(self.file_path),
+            'file_size': file_size,
+            'file_size_mb': round(file_size / (1024 * 1024), 2),
+            'duration': self.duration,
+            'sample_rate': self.source_sample_rate,
+            'channels': self.channels,
+            'samples': len(self.audio),
+            'analysis_sample_rate': self.sample_rate
+        }
@@ -141,17 +141,52 @@ class QueueConsumer:
             # 初始化转写器（延迟初始化）
             self._init_transcriber()
             
+            # 上游已识别语种时，在下载音频期间后台预加载该语种的对齐模型
+            language = self._language_hint(task_info)
+            self.transcriber.prefetch_align_model(language)
+            
+            # quick_node生成的压缩音频（只含语音段）及偏移表（可选），可用时转写压缩音频；
+            # 压缩音频由原始音频（voice_url）生成，转写降噪音频（clear_url）时不使用
+            offset_map = None
+            if self.config.USE_COMPACTED_AUDIO and url_type == 'voice_url' and task_info.get('compacted_audio_url') \
+                    and task_info.get('compacted_offset_map_url'):
+                offset_map = self.api_client.fetch_offset_map(
+                    task_info,
+                    os.path.join(self.config.TEMP_DIR, f"task_{task_id}_offset_map.json")
+                )
+            if offset_map is not None:
+                voice_url = task_info['compacted_audio_url']
+                logger.info(f"使用压缩音频转写: {voice_url}, 时长={offset_map.compacted_duration:.1f}秒 "
+                           f"(原始{offset_map.original_duration:.1f}秒)")
+            
             # 下载音频文件
             audio_file_path = self._download_audio(voice_url, task_id)
             
+            # 获取quick_node预计算的VAD语音段（可选）
+            speech_segments = None
+            if self.config.USE_PRECOMPUTED_VAD:
+                speech_segments = self.api_client.fetch_vad_segments(
+                    task_info,
+                    os.path.join(self.config.TEMP_DIR, f"task_{task_id}_vad_segments.npy")
+                )
+                # 语音段为原始音频时间，转写压缩音频时换算到压缩音频时间
+                if speech_segments is not None and offset_map is not None:
+                    speech_segments = offset_map.compact_segments(speech_segments)
+            
             try:
                 # 执行音频转写
                 logger.info(f"开始转写任务: {task_id}")
                 transcribe_result = self.transcriber.transcribe_audio(
                     audio_file_path,
-                    timeout=self.config.PROCESSING_TIMEOUT
+                    timeout=self.config.PROCESSING_TIMEOUT,
+                    speech_segments=speech_segments,
+                    language=language
                 )
                 
+                # 时间戳还原到原始音频时间
+                if offset_map is not None:
+                    offset_map.remap_transcript(transcribe_result)
+                
                 # 发送成功回调
                 self.api_client.send_success_callback(task_id, transcribe_result)
                 
@@ -178,6 +213,17 @@ class QueueConsumer:
             # 确认消息（避免重复处理）
             channel.basic_ack(delivery_tag=method.delivery_tag)
     
+    def _language_hint(self, task_info: dict):
+        """quick_node语种识别的结果（后端写入 task_info.language），置信度低于 LANGUAGE_HINT_MIN_CONFIDENCE 时忽略"""
+        language = task_info.get('language')
+        if not self.config.USE_LANGUAGE_HINT or not isinstance(language, str) or language in ('', 'auto', 'unknown'):
+            return None
+        confidence = task_info.get('language_confidence')
+        if confidence is not None and float(confidence) < self.config.LANGUAGE_HINT_MIN_CONFIDENCE:
+            logger.info(f"上游语种识别置信度过低({confidence})，忽略语种 {language}")
+            return None
+        return language.lower()
+    
     def _download_audio(self, voice_url: str, task_id: int) -> str:
         """下载音频文件"""
         try:
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+回调结果紧凑编码
+把逐条字典的转写段落/词列表转为列式数组（时间为整数毫秒），编码为 gzip(JSON) 或 msgpack，
+外层信封带版本号，后端按 version / schema / encoding 解码
+"""
+
+import base64
+import gzip
+import json
+
+# 紧凑格式版本号，列定义变化时递增
+RESULT_CODEC_VERSION = 1
+
+ENCODING_GZIP_JSON = 'gzip-json'
+ENCODING_MSGPACK = 'msgpack'
+
+# 转写段落的列式结构：
+#   speakers: 说话人名称表
+#   start_ms / end_ms / text / speaker: 每个段落一项，speaker 为说话人表下标（-1表示无）
+#   word_offsets: 长度为段落数+1，第i段的词为 words[word_offsets[i]:word_offsets[i+1]]
+#   word / word_start_ms / word_end_ms / word_score: 每个词一项，word_score 为千分制整数
+SCHEMA_TRANSCRIPT_SEGMENTS = 'transcript_segments'
+
+
+def resolve_encoding(encoding: str) -> str:
+    """返回实际使用的编码，msgpack未安装时退回 gzip-json"""
+    if encoding == ENCODING_MSGPACK:
+        try:
+            import msgpack  # noqa: F401
+            return ENCODING_MSGPACK
+        except ImportError:
+            pass
+    return ENCODING_GZIP_JSON
+
+
+def encode_columns(columns: dict, encoding: str) -> bytes:
+    """把列式数据编码为字节串"""
+    if encoding == ENCODING_MSGPACK:
+        import msgpack
+        return msgpack.packb(columns, use_bin_type=True)
+    body = json.dumps(columns, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return gzip.compress(body, mtime=0)
+
+
+def decode_columns(payload: bytes, encoding: str) -> dict:
+    """encode_columns 的逆操作"""
+    if encoding == ENCODING_MSGPACK:
+        import msgpack
+        return msgpack.unpackb(payload, raw=False)
+    if encoding == ENCODING_GZIP_JSON:
+        return json.loads(gzip.decompress(payload).decode('utf-8'))
+    raise ValueError(f"不支持的紧凑结果编码: {encoding}")
+
+
+def build_envelope(schema: str, count: int, payload: bytes, encoding: str, url: str = None) -> dict:
+    """
+    构建回调中的紧凑结果信封
+
+    Args:
+        schema (str): 列式结构名称
+        count (int): 记录条数
+        payload (bytes): encode_columns 的输出
+        encoding (str): 编码方式
+        url (str): 编码数据已上传时的文件URL，为空时数据以base64内联
+
+    Returns:
+        dict: {'version', 'schema', 'encoding', 'count', 'size', 'data' | 'url'}
+    """
+    envelope = {
+        'version': RESULT_CODEC_VERSION,
+        'schema': schema,
+        'encoding': encoding,
+        'count': count,
+        'size': len(payload)
+    }
+    if url:
+        envelope['url'] = url
+    else:
+        envelope['data'] = base64.b64encode(payload).decode('ascii')
+    return envelope
+
+
+def read_envelope(envelope: dict, payload: bytes = None) -> dict:
+    """
+    解码紧凑结果信封
+
+    Args:
+        envelope (dict): build_envelope 的输出
+        payload (bytes): 信封引用URL时，由调用方下载的文件内容
+
+    Returns:
+        dict: 列式数据
+    """
+    if envelope.get('version') != RESULT_CODEC_VERSION:
+        raise ValueError(f"不支持的紧凑结果版本: {envelope.get('version')}")
+    if payload is None:
+        payload = base64.b64decode(envelope['data'])
+    return decode_columns(payload, envelope['encoding'])
+
+
+def _ms(seconds) -> int:
+    """秒 -> 整数毫秒"""
+    return int(round(float(seconds) * 1000))
+
+
+def transcript_segments_to_columns(segments: list, speakers: list) -> dict:
+    """
+    段落字典列表 -> 列式数组
+
+    Args:
+        segments (list): api_client清理后的段落，{'text', 'start', 'end', 'words'?, 'speaker'?}
+        speakers (list): 说话人名称列表
+
+    Returns:
+        dict: SCHEMA_TRANSCRIPT_SEGMENTS 结构的列式数据
+    """
+    speaker_table = list(speakers)
+    speaker_index = {name: i for i, name in enumerate(speaker_table)}
+    columns = {
+        'speakers': speaker_table,
+        'start_ms': [], 'end_ms': [], 'text': [], 'speaker': [],
+        'word_offsets': [0],
+        'word': [], 'word_start_ms': [], 'word_end_ms': [], 'word_score': []
+    }
+    for segment in segments:
+        columns['start_ms'].append(_ms(segment['start']))
+        columns['end_ms'].append(_ms(segment['end']))
+        columns['text'].append(segment['text'])
+
+        speaker = segment.get('speaker')
+        if speaker and speaker not in speaker_index:
+            speaker_index[speaker] = len(speaker_table)
+            speaker_table.append(speaker)
+        columns['speaker'].append(speaker_index[speaker] if speaker else -1)
+
+        for word in segment.get('words', []):
+            columns['word'].append(word['word'])
+            columns['word_start_ms'].append(_ms(word['start']))
+            columns['word_end_ms'].append(_ms(word['end']))
+            columns['word_score'].append(int(round(float(word['score']) * 1000)))
+        columns['word_offsets'].append(len(columns['word']))
+    return columns
+
+
+def transcript_segments_from_columns(columns: dict) -> list:
+    """列式数组 -> 与旧回调相同结构的段落字典列表（时间精确到毫秒，分数精确到千分位）"""
+    segments = []
+    offsets = columns['word_offsets']
+    for i, text in enumerate(columns['text']):
+        segment = {
+            'text': text,
+            'start': columns['start_ms'][i] / 1000.0,
+            'end': columns['end_ms'][i] / 1000.0
+        }
+        words = [
+            {
+                'word': columns['word'][j],
+                'start': columns['word_start_ms'][j] / 1000.0,
+                'end': columns['word_end_ms'][j] / 1000.0,
+                'score': columns['word_score'][j] / 1000.0
+            }
+            for j in range(offsets[i], offsets[i + 1])
+        ]
+        if words:
+            segment['words'] = words
+        if columns['speaker'][i] >= 0:
+            segment['speaker'] = columns['speakers'][columns['speaker'][i]]
+        segments.append(segment)
+    return segments
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分块说话人分离的全局聚类
+各块分别做说话人分离后，用每个块内说话人的质心嵌入在整个音频范围内统一聚类（同一块内的不同说话人不会合并），
+得到跨块一致的说话人标签，替代按出现顺序重新编号（块1的SPEAKER_00与块2的SPEAKER_00不一定是同一人）
+"""
+
+import numpy as np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def cluster_chunk_speakers(chunk_speakers: list, distance_threshold: float, min_speakers: int = None,
+                           max_speakers: int = None) -> list:
+    """
+    全局聚类各块的说话人
+
+    质心链接的层次聚类：每次合并余弦距离最近、且不包含同一块说话人的两个类（类质心为按说话时长加权的嵌入均值），
+    最近距离不小于 distance_threshold 时停止；类数多于 max_speakers 时继续合并，等于 min_speakers 时停止合并。
+    没有有效嵌入（pyannote返回NaN或全零质心）的说话人单独成类。
+
+    Args:
+        chunk_speakers (list): 每个块一个字典 {块内标签: {'embedding': list, 'duration': float, 'first_start': float}}，
+            first_start 为该说话人在整个音频中首次出现的时间（秒）
+        distance_threshold (float): 视为同一说话人的最大余弦距离
+        min_speakers (int): 最少说话人数
+        max_speakers (int): 最多说话人数
+
+    Returns:
+        list: 每个块一个字典 {块内标签: 全局标签 'SPEAKER_XX'}，全局标签按首次出现时间编号
+    """
+    items = [(k, label, info) for k, speakers in enumerate(chunk_speakers) for label, info in speakers.items()]
+    if not items:
+        return [{} for _ in chunk_speakers]
+
+    vectors = [np.asarray(info['embedding'], dtype=np.float64).ravel() for _, _, info in items]
+    valid = np.array([bool(np.isfinite(v).all() and np.any(v)) for v in vectors])
+    dim = max((len(v) for v, ok in zip(vectors, valid) if ok), default=1)
+    # 无效嵌入（长度也可能不同）以零向量占位，不参与合并
+    embeddings = _normalize(np.array([v if ok else np.zeros(dim) for v, ok in zip(vectors, valid)]))
+    weights = np.array([max(float(info.get('duration', 0.0)), 1e-3) for _, _, info in items])
+
+    # 每个类：成员下标、成员所在块的集合、加权嵌入和
+    clusters = [
+        {'members': [i], 'chunks': {items[i][0]}, 'sum': embeddings[i] * weights[i], 'valid': bool(valid[i])}
+        for i in range(len(items))
+    ]
+    min_count = max(min_speakers or 1, 1)
+
+    while len(clusters) > min_count:
+        mergeable = [c for c in clusters if c['valid']]
+        best = None
+        if len(mergeable) >= 2:
+            centroids = _normalize(np.array([c['sum'] for c in mergeable]))
+            distances = 1.0 - centroids @ centroids.T
+            for a in range(len(mergeable)):
+                for b in range(a + 1, len(mergeable)):
+                    # 同一块内pyannote已区分的说话人不合并
+                    if mergeable[a]['chunks'] & mergeable[b]['chunks']:
+                        continue
+                    if best is None or distances[a, b] < best[0]:
+                        best = (distances[a, b], a, b)
+        if best is None:
+            break
+        over_limit = max_speakers is not None and len(clusters) > max_speakers
+        if best[0] >= distance_threshold and not over_limit:
+            break
+        _, a, b = best
+        merged, absorbed = mergeable[a], mergeable[b]
+        merged['members'] += absorbed['members']
+        merged['chunks'] |= absorbed['chunks']
+        merged['sum'] = merged['sum'] + absorbed['sum']
+        clusters = [c for c in clusters if c is not absorbed]
+
+    # 全局标签按类中最早出现时间编号
+    first_start = np.array([float(info.get('first_start', 0.0)) for _, _, info in items])
+    clusters.sort(key=lambda c: min(first_start[i] for i in c['members']))
+    mapping = [{} for _ in chunk_speakers]
+    for index, cluster in enumerate(clusters):
+        for i in cluster['members']:
+            chunk, label, _ = items[i]
+            mapping[chunk][label] = f"SPEAKER_{index:02d}"
+    return mapping
+
+
+def summarize_chunk_speakers(diarize_df, speaker_embeddings: dict) -> dict:
+    """
+    由一个块的说话人分离结果（时间已换算为整个音频的时间）和质心嵌入生成 cluster_chunk_speakers 的输入
+
+    Args:
+        diarize_df: DiarizationPipeline 返回的 DataFrame（speaker / start / end 列）
+        speaker_embeddings (dict): {块内标签: 质心嵌入}
+
+    Returns:
+        dict: {块内标签: {'embedding', 'duration', 'first_start'}}
+    """
+    speakers = {}
+    if len(diarize_df):
+        durations = (diarize_df['end'] - diarize_df['start']).groupby(diarize_df['speaker']).sum()
+        first_starts = diarize_df.groupby('speaker')['start'].min()
+        for label in durations.index:
+            embedding = speaker_embeddings.get(label)
+            speakers[label] = {
+                'embedding': embedding if embedding is not None else [np.nan],
+                'duration': float(durations[label]),
+                'first_start': float(first_starts[label])
+            }
+    return speakers
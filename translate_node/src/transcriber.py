@@ -7,7 +7,6 @@ import time
 import json
 import signal
 import platform
-import threading
 import concurrent.futures
 from pathlib import Path
 from logger import logger
@@ -16,6 +15,13 @@ import numpy as np
 # 添加项目路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import Config
+from decoded_audio import DecodedAudio
+from chunk_planner import plan_chunks, keep_owned_segments
+from speaker_clustering import cluster_chunk_speakers, summarize_chunk_speakers
+from align_model_cache import AlignModelCache
+
+# 词之间没有空格的语种（与 whisperx.alignment.LANGUAGES_WITHOUT_SPACES 一致）
+LANGUAGES_WITHOUT_SPACES = ('ja', 'zh')
 
 class WhisperXTranscriber:
     """WhisperX文本转写器 - 基于WhisperX的音频转文本功能"""
@@ -24,7 +30,7 @@ class WhisperXTranscriber:
         """初始化转写器"""
         self.config = Config()
         self.model = None
-        self.align_model = None
+        self.align_cache = None
         self.diarize_model = None
         self._init_whisperx()
     
@@ -62,23 +68,24 @@ class WhisperXTranscriber:
                 language=self.config.WHISPER_LANGUAGE if self.config.WHISPER_LANGUAGE != 'auto' else None
             )
             
-            # 初始化对齐模型
+            # 初始化对齐模型（按语种缓存，启动时加载配置语种的模型）
             if self.config.ENABLE_ALIGNMENT:
                 try:
                     logger.info(f"正在加载对齐模型: {self.config.ALIGNMENT_MODEL}")
-                    self.align_model, self.align_metadata = whisperx.load_align_model(
-                        language_code=self.config.WHISPER_LANGUAGE if self.config.WHISPER_LANGUAGE != 'auto' else 'en',
-                        device=device,
-                        model_name=self.config.ALIGNMENT_MODEL
+                    self.align_cache = AlignModelCache(
+                        self._load_align_model,
+                        memory_budget_mb=self.config.ALIGN_CACHE_MEMORY_MB,
+                        max_models=self.config.ALIGN_CACHE_MAX_MODELS
                     )
+                    self.align_cache.get(self._configured_align_language())
                     logger.info("对齐模型加载成功")
                 except Exception as e:
                     logger.warning(f"对齐模型加载失败: {e}")
                     logger.warning("将禁用对齐功能，继续使用其他功能")
-                    self.align_model = None
+                    self.align_cache = None
             else:
                 logger.info("对齐功能已禁用")
-                self.align_model = None
+                self.align_cache = None
             
             # 初始化说话人分离模型
             if self.config.ENABLE_DIARIZATION and self.config.HF_TOKEN:
@@ -110,7 +117,7 @@ class WhisperXTranscriber:
             logger.info(f"转写模型: {self.config.WHISPER_MODEL}")
             logger.info(f"计算精度: {compute_type}")
             logger.info(f"语言设置: {self.config.WHISPER_LANGUAGE}")
-            logger.info(f"对齐模型: {'启用' if self.align_model else '禁用'}")
+            logger.info(f"对齐模型: {'启用' if self.align_cache else '禁用'}")
             logger.info(f"说话人分离: {'启用' if self.diarize_model else '禁用'}")
             logger.info(f"模型运行设备: {actual_device}")
             
@@ -213,13 +220,57 @@ class WhisperXTranscriber:
         except Exception as e:
             return f"获取设备使用情况失败: {str(e)}"
     
-    def transcribe_audio(self, audio_path: str, timeout: int = 7200) -> dict:
+    def _configured_align_language(self) -> str:
+        """启动时加载的对齐模型对应的语种（ALIGNMENT_MODEL 只用于该语种）"""
+        return self.config.WHISPER_LANGUAGE if self.config.WHISPER_LANGUAGE != 'auto' else 'en'
+    
+    def _resolve_language(self, language_hint: str = None):
+        """转写使用的语种：配置了固定语种时以配置为准，否则使用上游语种识别的结果，都没有时为None（自动检测）"""
+        if self.config.WHISPER_LANGUAGE != 'auto':
+            return self.config.WHISPER_LANGUAGE
+        return language_hint or None
+    
+    def _load_align_model(self, language: str) -> tuple:
+        """加载指定语种的对齐模型（启动语种使用 ALIGNMENT_MODEL，其他语种使用whisperX的默认对齐模型）"""
+        import whisperx
+        model_name = self.config.ALIGNMENT_MODEL if language == self._configured_align_language() else None
+        logger.info(f"正在加载 {language} 对齐模型: {model_name or '默认模型'}")
+        return whisperx.load_align_model(
+            language_code=language,
+            device=self._get_device(),
+            model_name=model_name
+        )
+    
+    def prefetch_align_model(self, language: str):
+        """语种已知时在后台线程中加载对应的对齐模型（已缓存时不做任何事），与下载、转写并行"""
+        language = self._resolve_language(language)
+        if self.align_cache and language:
+            self.align_cache.prefetch(language)
+    
+    def _get_align_model(self, language: str):
+        """
+        转写语种的对齐模型（缓存命中时直接返回，正在预加载时等待），
+        该语种没有可用的对齐模型时退回启动语种的模型
+        """
+        configured = self._configured_align_language()
+        if language and language != 'unknown':
+            try:
+                return self.align_cache.get(language)
+            except Exception as e:
+                logger.warning(f"{language} 对齐模型加载失败，使用 {configured} 对齐模型: {e}")
+        return self.align_cache.get(configured)
+    
+    def transcribe_audio(self, audio_path: str, timeout: int = 7200, speech_segments: list = None,
+                         language: str = None) -> dict:
         """
         转写音频文件
         
         Args:
             audio_path (str): 音频文件路径
             timeout (int): 处理超时时间（秒），默认2小时
+            speech_segments (list): 上游VAD已检测的语音段 [[start_sec, end_sec], ...]，
+                提供时跳过转写阶段的VAD；为空列表时音频中没有语音，直接返回空结果
+            language (str): 上游语种识别得到的语种代码，提供时跳过Whisper的语种检测并预加载对应的对齐模型
             
         Returns:
             dict: 转写结果
@@ -231,8 +282,9 @@ class WhisperXTranscriber:
             
             logger.info(f"开始转写音频: {audio_path}")
             
-            # 获取音频基本信息
-            file_info = self._get_audio_info(audio_path)
+            # 解码音频（整个任务只解码这一次，转写、对齐和说话人分离共用）
+            decoded = DecodedAudio.load(audio_path)
+            file_info = decoded.file_info
             total_duration = file_info['duration']
             
             logger.info(f"音频基本信息: 时长={total_duration:.2f}秒 ({total_duration/60:.1f}分钟), "
@@ -248,7 +300,18 @@ class WhisperXTranscriber:
             
             # 设置超时处理
             start_time = time.time()
-            result = self._transcribe_with_timeout(audio_path, timeout)
+            if speech_segments is not None:
+                logger.info(f"使用预计算的VAD语音段: {len(speech_segments)}个，跳过转写阶段VAD")
+            language = self._resolve_language(language)
+            if speech_segments is not None and not speech_segments:
+                # 上游VAD未检测到语音，不再执行转写阶段的VAD和识别
+                logger.info("上游VAD未检测到语音，跳过转写")
+                result = {'language': language or 'unknown', 'segments': [], 'effective_voice': 0}
+            else:
+                if language:
+                    logger.info(f"使用指定语种: {language}，跳过语种检测")
+                    self.prefetch_align_model(language)
+                result = self._transcribe_with_timeout(decoded, timeout, speech_segments, language)
             
             # 记录处理时间
             process_time = time.time() - start_time
@@ -274,8 +337,9 @@ class WhisperXTranscriber:
                 # 添加模型和设备信息
                 'whisper_model': self.config.WHISPER_MODEL,
                 'compute_device': self._get_device(),
-                'alignment_enabled': bool(self.align_model),
-                'diarization_enabled': bool(self.diarize_model)
+                'alignment_enabled': bool(self.align_cache),
+                'diarization_enabled': bool(self.diarize_model),
+                'precomputed_vad': speech_segments is not None
             }
             
             logger.info(f"转写完成: 文本长度={len(transcribe_result['text'])}字符, "
@@ -288,7 +352,8 @@ class WhisperXTranscriber:
             logger.error(f"音频转写失败: {e}")
             raise
     
-    def _transcribe_with_timeout(self, audio_path: str, timeout: int) -> dict:
+    def _transcribe_with_timeout(self, decoded: DecodedAudio, timeout: int, speech_segments: list = None,
+                                 language: str = None) -> dict:
         """带超时的转写处理"""
         # 检查是否为Windows系统
         is_windows = platform.system().lower() == 'windows'
@@ -296,7 +361,7 @@ class WhisperXTranscriber:
         if is_windows or not hasattr(signal, 'SIGALRM'):
             # Windows系统使用线程池
             with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(self._do_transcribe, audio_path)
+                future = executor.submit(self._do_transcribe, decoded, speech_segments, language)
                 try:
                     return future.result(timeout=timeout)
                 except concurrent.futures.TimeoutError:
@@ -310,20 +375,18 @@ class WhisperXTranscriber:
             signal.alarm(timeout)
             
             try:
-                return self._do_transcribe(audio_path)
+                return self._do_transcribe(decoded, speech_segments, language)
             finally:
                 signal.alarm(0)
                 signal.signal(signal.SIGALRM, old_handler)
     
-    def _do_transcribe(self, audio_path: str) -> dict:
+    def _do_transcribe(self, decoded: DecodedAudio, speech_segments: list = None, language: str = None) -> dict:
         """执行实际的转写处理"""
         import whisperx
         
         logger.info("正在进行音频转写...")
         
-        # 获取音频信息
-        file_info = self._get_audio_info(audio_path)
-        audio_duration = file_info['duration']
+        audio_duration = decoded.duration
         
         # 清理GPU内存
         self._clear_gpu_memory()
@@ -338,10 +401,10 @@ class WhisperXTranscriber:
         
         if should_split:
             logger.info(f"音频时长 {audio_duration:.1f}秒，将进行分块处理")
-            return self._transcribe_with_splitting(audio_path, whisperx)
+            return self._transcribe_with_splitting(decoded, whisperx, speech_segments, language)
         else:
             logger.info(f"音频时长 {audio_duration:.1f}秒，进行整体处理")
-            return self._transcribe_whole_audio(audio_path, whisperx)
+            return self._transcribe_whole_audio(decoded, whisperx, speech_segments, language)
     
     def _should_split_audio(self, duration: float, device: str, memory_info: dict) -> bool:
         """判断是否需要拆分音频"""
@@ -365,22 +428,21 @@ class WhisperXTranscriber:
         
         return False
     
-    def _transcribe_whole_audio(self, audio_path: str, whisperx) -> dict:
+    def _transcribe_whole_audio(self, decoded: DecodedAudio, whisperx, speech_segments: list = None,
+                                language: str = None) -> dict:
         """整体转写音频"""
         try:
-            # 加载音频
-            audio = whisperx.load_audio(audio_path)
+            audio = decoded.audio
             
             # 获取设备和批处理大小
             device = self._get_device()
-            file_info = self._get_audio_info(audio_path)
-            batch_size = self._get_optimal_batch_size(device, file_info['duration'])
+            batch_size = self._get_optimal_batch_size(device, decoded.duration)
             
             logger.info(f"使用批处理大小: {batch_size}")
             
             # Step 1: 转写
             logger.info("Step 1: 执行语音识别...")
-            result = self._transcribe_with_fallback(audio, batch_size)
+            result = self._transcribe_with_fallback(audio, batch_size, speech_segments, language)
             
             # 提取文本和语言
             text = ' '.join([segment['text'] for segment in result['segments']])
@@ -390,15 +452,21 @@ class WhisperXTranscriber:
             logger.info(f"转写文本长度: {len(text)}字符")
             
             # Step 2: 语言对齐（可选）
-            if self.align_model:
+            if self.align_cache:
                 try:
                     logger.info("Step 2: 执行语言对齐...")
+                    align_model, align_metadata = self._get_align_model(language)
+                    cache_stats = self.align_cache.stats()
+                    logger.info(f"对齐模型: {align_metadata['language']}（缓存命中 {cache_stats['hits']}, "
+                               f"等待预加载 {cache_stats['waits']}, 未命中 {cache_stats['misses']}）")
+                    align_device = self._get_device()
                     result = whisperx.align(
                         result['segments'], 
-                        self.align_model, 
-                        self.align_metadata, 
+                        align_model, 
+                        align_metadata, 
                         audio, 
-                        self._get_device()
+                        align_device,
+                        batch_size=self.config.ALIGN_BATCH_SIZE if align_device.startswith('cuda') else 1
                     )
                     logger.info("语言对齐完成")
                 except Exception as e:
@@ -461,22 +529,38 @@ class WhisperXTranscriber:
             logger.error(f"整体转写失败: {e}")
             raise
     
-    def _transcribe_with_splitting(self, audio_path: str, whisperx) -> dict:
+    def _transcribe_with_splitting(self, decoded: DecodedAudio, whisperx, speech_segments: list = None,
+                                   language: str = None) -> dict:
         """分块转写音频"""
         try:
             logger.info("开始分块转写处理...")
             
-            # 加载完整音频获取基本信息
-            audio = whisperx.load_audio(audio_path)
-            file_info = self._get_audio_info(audio_path)
+            audio = decoded.audio
+            file_info = decoded.file_info
             total_duration = file_info['duration']
             
             # 计算分块大小
             chunk_duration = min(self.config.CHUNK_DURATION, 300)  # 最大5分钟一块
-            chunk_samples = int(chunk_duration * file_info['sample_rate'])
             
             logger.info(f"音频总时长: {total_duration:.1f}秒")
-            logger.info(f"分块大小: {chunk_duration}秒")
+            logger.info(f"目标分块大小: {chunk_duration}秒")
+            
+            # 整个音频只做一次VAD（有预计算语音段时直接使用），各块使用截取的语音段，切分点落在静音中
+            if speech_segments is None:
+                speech_segments = [list(region) for region in self.model.detect_speech(audio)]
+                logger.info(f"VAD检测到 {len(speech_segments)} 个语音段")
+            chunks = plan_chunks(
+                speech_segments,
+                total_duration,
+                target_duration=chunk_duration,
+                search_window=self.config.CHUNK_SEARCH_WINDOW,
+                overlap=self.config.CHUNK_FORCED_OVERLAP,
+                sample_rate=decoded.sample_rate
+            )
+            
+            # global模式：各块只提取说话人和嵌入，全部块处理完后统一聚类并一次性分配说话人
+            global_diarization = bool(self.diarize_model) and self.config.DIARIZATION_MODE == 'global'
+            chunk_diarizations = []
             
             # 分块处理
             all_segments = []
@@ -485,16 +569,14 @@ class WhisperXTranscriber:
             confidences = []
             detected_language = 'unknown'
             
-            num_chunks = int(np.ceil(len(audio) / chunk_samples))
-            logger.info(f"总共分为 {num_chunks} 块")
+            num_chunks = len(chunks)
+            forced_cuts = sum(chunk['forced_cut'] for chunk in chunks)
+            logger.info(f"总共分为 {num_chunks} 块（静音中切分 {num_chunks - 1 - forced_cuts} 处，强制切分 {forced_cuts} 处）")
             
-            for i in range(num_chunks):
-                start_sample = i * chunk_samples
-                end_sample = min((i + 1) * chunk_samples, len(audio))
-                chunk_audio = audio[start_sample:end_sample]
-                
-                chunk_start_time = start_sample / file_info['sample_rate']
-                chunk_end_time = end_sample / file_info['sample_rate']
+            for i, chunk in enumerate(chunks):
+                chunk_audio = audio[chunk['start_sample']:chunk['end_sample']]
+                chunk_start_time = chunk['start']
+                chunk_end_time = chunk['end']
                 
                 logger.info(f"处理第 {i+1}/{num_chunks} 块 ({chunk_start_time:.1f}s - {chunk_end_time:.1f}s)")
                 
@@ -503,21 +585,52 @@ class WhisperXTranscriber:
                 
                 try:
                     # 转写当前块
-                    chunk_result = self._transcribe_chunk(chunk_audio, chunk_start_time, whisperx)
+                    chunk_segments = self._clip_speech_segments(speech_segments, chunk_start_time, chunk_end_time)
+                    chunk_result = self._transcribe_chunk(
+                        chunk_audio, chunk_start_time, whisperx, chunk_segments, language
+                    )
 
                     # 新增：分块说话人分离
-                    if self.diarize_model:
+                    if global_diarization:
+                        try:
+                            # 最少说话人数对整个音频生效，单个块内不强制
+                            diarize_segments, speaker_embeddings = self.diarize_model(
+                                chunk_audio,
+                                max_speakers=self.config.MAX_SPEAKERS,
+                                return_embeddings=True
+                            )
+                            diarize_segments['start'] += chunk_start_time
+                            diarize_segments['end'] += chunk_start_time
+                            chunk_diarizations.append(
+                                (diarize_segments, summarize_chunk_speakers(diarize_segments, speaker_embeddings))
+                            )
+                        except Exception as e:
+                            logger.warning(f"分块说话人分离失败: {e}")
+                    elif self.diarize_model:
                         try:
                             diarize_segments = self.diarize_model(
                                 chunk_audio,
                                 min_speakers=self.config.MIN_SPEAKERS,
                                 max_speakers=self.config.MAX_SPEAKERS
                             )
+                            # 说话人分离的时间相对块起点，转写结果已换算为整个音频的时间
+                            diarize_segments['start'] += chunk_start_time
+                            diarize_segments['end'] += chunk_start_time
                             chunk_result = whisperx.assign_word_speakers(diarize_segments, chunk_result)
                         except Exception as e:
                             logger.warning(f"分块说话人分离失败: {e}")
                             # 继续后续处理
 
+                    # 强制切分处两侧块重叠转写，只保留本块负责范围内的词和段落
+                    separator = '' if chunk_result.get('language') in LANGUAGES_WITHOUT_SPACES else ' '
+                    chunk_result['segments'] = keep_owned_segments(
+                        chunk_result['segments'], chunk['keep_start'], chunk['keep_end'], separator
+                    )
+                    chunk_result['effective_voice'] = sum(
+                        segment['end'] - segment['start'] for segment in chunk_result['segments']
+                        if 'start' in segment and 'end' in segment
+                    )
+
                     # 合并结果
                     if chunk_result['segments']:
                         all_segments.extend(chunk_result['segments'])
@@ -547,6 +660,9 @@ class WhisperXTranscriber:
                     # 继续处理下一块
                     continue
             
+            if chunk_diarizations:
+                self._assign_global_speakers(chunk_diarizations, all_segments, whisperx)
+            
             # 合并所有文本
             full_text = ' '.join([segment['text'] for segment in all_segments])
             confidence_avg = sum(confidences) / len(confidences) if confidences else 0
@@ -598,8 +714,42 @@ class WhisperXTranscriber:
             logger.error(f"分块转写失败: {e}")
             raise
     
-    def _transcribe_chunk(self, chunk_audio, start_time_offset: float, whisperx) -> dict:
+    def _assign_global_speakers(self, chunk_diarizations: list, segments: list, whisperx):
+        """各块的说话人按嵌入全局聚类后统一改为全局标签，再对所有段落一次性分配说话人"""
+        import pandas as pd
+        
+        mappings = cluster_chunk_speakers(
+            [speakers for _, speakers in chunk_diarizations],
+            distance_threshold=self.config.GLOBAL_SPEAKER_DISTANCE_THRESHOLD,
+            min_speakers=self.config.MIN_SPEAKERS,
+            max_speakers=self.config.MAX_SPEAKERS
+        )
+        frames = []
+        for (diarize_segments, _), mapping in zip(chunk_diarizations, mappings):
+            diarize_segments['speaker'] = diarize_segments['speaker'].map(mapping)
+            frames.append(diarize_segments[['start', 'end', 'speaker']])
+        global_segments = pd.concat(frames, ignore_index=True)
+        
+        local_count = sum(len(mapping) for mapping in mappings)
+        global_count = len(set(label for mapping in mappings for label in mapping.values()))
+        logger.info(f"说话人全局聚类: {len(mappings)} 块共 {local_count} 个块内说话人，合并为 {global_count} 个说话人")
+        whisperx.assign_word_speakers(global_segments, {'segments': segments})
+    
+    def _clip_speech_segments(self, speech_segments: list, chunk_start: float, chunk_end: float) -> list:
+        """截取落在音频块内的语音段，并换算为相对块起点的时间"""
+        clipped = []
+        for start, end in speech_segments:
+            start, end = max(start, chunk_start), min(end, chunk_end)
+            if end > start:
+                clipped.append([start - chunk_start, end - chunk_start])
+        return clipped
+    
+    def _transcribe_chunk(self, chunk_audio, start_time_offset: float, whisperx, speech_segments: list = None,
+                          language: str = None) -> dict:
         """转写单个音频块"""
+        if speech_segments is not None and not speech_segments:
+            # 块内没有语音段，不执行识别
+            return {'segments': [], 'language': language or 'unknown', 'effective_voice': 0, 'speakers': []}
         try:
             # 获取设备和批处理大小
             device = self._get_device()
@@ -607,7 +757,7 @@ class WhisperXTranscriber:
             batch_size = self._get_optimal_batch_size(device, chunk_duration)
             
             # 转写
-            result = self._transcribe_with_fallback(chunk_audio, batch_size)
+            result = self._transcribe_with_fallback(chunk_audio, batch_size, speech_segments, language)
             
             # 调整时间戳
             for segment in result['segments']:
@@ -646,7 +796,8 @@ class WhisperXTranscriber:
                 'speakers': []
             }
     
-    def _transcribe_with_fallback(self, audio, batch_size: int) -> dict:
+    def _transcribe_with_fallback(self, audio, batch_size: int, speech_segments: list = None,
+                                  language: str = None) -> dict:
         """带回退机制的转写"""
         device = self._get_device()
         
@@ -656,7 +807,8 @@ class WhisperXTranscriber:
             result = self.model.transcribe(
                 audio, 
                 batch_size=batch_size,
-                language=self.config.WHISPER_LANGUAGE if self.config.WHISPER_LANGUAGE != 'auto' else None
+                language=language,
+                speech_segments=speech_segments
             )
             return result
             
@@ -674,7 +826,8 @@ class WhisperXTranscriber:
                         result = self.model.transcribe(
                             audio, 
                             batch_size=new_batch_size,
-                            language=self.config.WHISPER_LANGUAGE if self.config.WHISPER_LANGUAGE != 'auto' else None
+                            language=language,
+                            speech_segments=speech_segments
                         )
                         return result
                     except RuntimeError as e2:
@@ -686,7 +839,7 @@ class WhisperXTranscriber:
                 # 如果是GPU，尝试切换到CPU
                 if device == 'cuda':
                     logger.warning("GPU内存不足，尝试切换到CPU处理")
-                    return self._fallback_to_cpu(audio)
+                    return self._fallback_to_cpu(audio, speech_segments, language)
                 else:
                     raise e
             else:
@@ -695,7 +848,7 @@ class WhisperXTranscriber:
             logger.error(f"转写过程中出现未知错误: {e}")
             raise e
     
-    def _fallback_to_cpu(self, audio) -> dict:
+    def _fallback_to_cpu(self, audio, speech_segments: list = None, language: str = None) -> dict:
         """回退到CPU处理"""
         try:
             logger.info("正在切换到CPU模式...")
@@ -706,7 +859,7 @@ class WhisperXTranscriber:
                 self.config.WHISPER_MODEL,
                 device="cpu",
                 compute_type="float32",
-                language=self.config.WHISPER_LANGUAGE if self.config.WHISPER_LANGUAGE != 'auto' else None
+                language=language
             )
             
             # 使用较小的批处理大小
@@ -716,7 +869,8 @@ class WhisperXTranscriber:
             result = cpu_model.transcribe(
                 audio,
                 batch_size=cpu_batch_size,
-                language=self.config.WHISPER_LANGUAGE if self.config.WHISPER_LANGUAGE != 'auto' else None
+                language=language,
+                speech_segments=speech_segments
             )
             
             logger.info("CPU模式转写完成")
@@ -726,30 +880,6 @@ class WhisperXTranscriber:
             logger.error(f"CPU回退处理失败: {e}")
             raise e
     
-    def _get_audio_info(self, audio_path: str) -> dict:
-        """获取音频文件基本信息"""
-        try:
-            # 使用librosa获取音频信息
-            import librosa
-            y, sr = librosa.load(audio_path, sr=None)
-            duration = len(y) / sr
-            file_size = os.path.getsize(audio_path)
-            
-            return {
-                'file_path': audio_path,
-                'file_name': os.path.basename(audio_path),
-                'file_size': file_size,
-                'file_size_mb': round(file_size / (1024 * 1024), 2),
-                'duration': duration,
-                'sample_rate': sr,
-                'channels': 1 if len(y.shape) == 1 else y.shape[0],
-                'samples': len(y)
-            }
-            
-        except Exception as e:
-            logger.error(f"获取音频信息失败: {e}")
-            raise
-    
     def get_model_info(self) -> dict:
         """获取模型信息"""
         return {
@@ -758,9 +888,10 @@ class WhisperXTranscriber:
             'device': self._get_device(),
             'batch_size': self.config.WHISPER_BATCH_SIZE,
             'compute_type': self.config.WHISPER_COMPUTE_TYPE,
-            'alignment_enabled': bool(self.align_model),
+            'alignment_enabled': bool(self.align_cache),
             'diarization_enabled': bool(self.diarize_model),
-            'alignment_model': self.config.ALIGNMENT_MODEL if self.align_model else None,
+            'alignment_model': self.config.ALIGNMENT_MODEL if self.align_cache else None,
+            'alignment_cache': self.align_cache.stats() if self.align_cache else None,
             'diarization_model': self.config.DIARIZATION_MODEL if self.diarize_model else None
         }
     
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+对齐模型缓存测试脚本
+用模拟的加载函数（返回指定大小的torch模块并等待一段时间）检查：命中与未命中统计、LRU按内存预算和模型数淘汰、
+预加载与请求同时发生时只加载一次、加载失败不缓存
+"""
+
+import os
+import sys
+import threading
+import time
+
+import torch
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from align_model_cache import AlignModelCache, model_memory_mb
+
+# 各语种模拟模型的参数量：float32，1MB = 262144个参数
+MODEL_MB = {'en': 4, 'zh': 8, 'ja': 8, 'de': 2}
+
+
+class FakeLoader:
+    """记录调用次数的模拟加载函数"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, language: str):
+        with self._lock:
+            self.calls.append(language)
+        time.sleep(self.delay)
+        if language not in MODEL_MB:
+            raise ValueError(f"No default align-model for language: {language}")
+        model = torch.nn.Linear(MODEL_MB[language] * 262144, 1, bias=False)
+        return model, {'language': language, 'dictionary': {}, 'type': 'torchaudio'}
+
+
+def test_hits_and_misses():
+    """测试首次请求未命中并加载，之后命中，不同语种的模型互不替换"""
+    loader = FakeLoader()
+    cache = AlignModelCache(loader)
+    en_model, en_metadata = cache.get('en')
+    assert en_metadata['language'] == 'en' and abs(model_memory_mb(en_model) - 4) < 1e-6
+    for language in ('zh', 'en', 'zh', 'en'):
+        model, metadata = cache.get(language)
+        assert metadata['language'] == language
+    assert cache.get('en')[0] is en_model
+    assert loader.calls == ['en', 'zh']
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['loads']) == (4, 2, 2), stats
+    assert stats['languages'] == ['zh', 'en'] and stats['memory_mb'] == 12.0
+
+
+def test_lru_budget():
+    """测试超出内存预算或模型数时淘汰最久未使用的模型，单个模型超出预算时仍保留"""
+    loader = FakeLoader()
+    cache = AlignModelCache(loader, memory_budget_mb=16)
+    cache.get('en')           # 4MB
+    cache.get('de')           # 6MB
+    cache.get('en')           # en 变为最近使用
+    cache.get('zh')           # 14MB，不超预算
+    cache.get('ja')           # 22MB -> 依次淘汰最久未使用的 de、en，降到16MB
+    stats = cache.stats()
+    assert stats['languages'] == ['zh', 'ja'] and stats['evictions'] == 2, stats
+    cache.get('en')           # 被淘汰的语种再次请求时重新加载，淘汰 zh
+    assert loader.calls == ['en', 'de', 'zh', 'ja', 'en']
+    assert cache.stats()['languages'] == ['ja', 'en']
+
+    cache = AlignModelCache(FakeLoader(), max_models=2)
+    for language in ('en', 'de', 'zh'):
+        cache.get(language)
+    assert cache.stats()['languages'] == ['de', 'zh']
+
+    cache = AlignModelCache(FakeLoader(), memory_budget_mb=1)
+    cache.get('zh')
+    assert cache.stats()['languages'] == ['zh']
+
+
+def test_prefetch_single_load():
+    """测试预加载进行中请求同一语种时等待该次加载，不重复加载；重复预加载和已缓存语种的预加载不做任何事"""
+    loader = FakeLoader(delay=0.3)
+    cache = AlignModelCache(loader)
+    start = time.time()
+    cache.prefetch('zh')
+    cache.prefetch('zh')
+    assert time.time() - start < 0.2  # 预加载不阻塞调用方
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('zh'))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.calls == ['zh'] and len({id(model) for model, _ in results}) == 1
+    cache.prefetch('zh')
+    time.sleep(0.05)
+    stats = cache.stats()
+    assert loader.calls == ['zh'] and stats['prefetches'] == 1 and stats['waits'] == 3, stats
+
+    # 预加载完成后请求为命中
+    cache.prefetch('ja')
+    time.sleep(0.5)
+    cache.get('ja')
+    assert cache.stats()['hits'] == 1
+
+
+def test_load_failure():
+    """测试加载失败时抛出异常且不缓存，下次请求重新尝试；预加载失败不影响后续请求"""
+    loader = FakeLoader()
+    cache = AlignModelCache(loader)
+    for _ in range(2):
+        try:
+            cache.get('xx')
+            assert False, "应抛出异常"
+        except ValueError:
+            pass
+    cache.prefetch('yy')
+    time.sleep(0.05)
+    stats = cache.stats()
+    assert loader.calls == ['xx', 'xx', 'yy'] and stats['load_failures'] == 3 and stats['languages'] == []
+    assert cache.get('en')[1]['language'] == 'en'
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("命中与未命中", test_hits_and_misses),
+        ("LRU淘汰", test_lru_budget),
+        ("预加载只加载一次", test_prefetch_single_load),
+        ("加载失败", test_load_failure),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
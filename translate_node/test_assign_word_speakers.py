@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+说话人分配测试脚本
+对比 whisperx.diarize.assign_word_speakers（按开始时间排序的区间索引）与原先逐词扫描整个DataFrame的pandas实现：
+随机的会议式说话人分离结果上两者为每个段落和词分配的说话人一致（含 fill_nearest），并输出耗时
+"""
+
+import copy
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 添加whisperX路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'whisperX'))
+
+from whisperx.diarize import assign_word_speakers
+
+
+def reference_assign_word_speakers(diarize_df, transcript_result, fill_nearest=False):
+    """原实现：每个段落和词都对整个DataFrame计算交集并groupby"""
+    for seg in transcript_result["segments"]:
+        diarize_df['intersection'] = np.minimum(diarize_df['end'], seg['end']) - np.maximum(diarize_df['start'], seg['start'])
+        dia_tmp = diarize_df if fill_nearest else diarize_df[diarize_df['intersection'] > 0]
+        if len(dia_tmp) > 0:
+            seg["speaker"] = dia_tmp.groupby("speaker")["intersection"].sum().sort_values(ascending=False).index[0]
+        for word in seg.get('words', []):
+            if 'start' in word:
+                diarize_df['intersection'] = np.minimum(diarize_df['end'], word['end']) - np.maximum(diarize_df['start'], word['start'])
+                dia_tmp = diarize_df if fill_nearest else diarize_df[diarize_df['intersection'] > 0]
+                if len(dia_tmp) > 0:
+                    word["speaker"] = dia_tmp.groupby("speaker")["intersection"].sum().sort_values(ascending=False).index[0]
+    return transcript_result
+
+
+def make_meeting(duration: float, speakers: int, seed: int = 0) -> tuple:
+    """随机生成说话人轮次（含重叠说话和长轮次）及带词时间戳的转写结果"""
+    rng = np.random.default_rng(seed)
+    turns, t = [], 0.0
+    while t < duration:
+        length = rng.exponential(8.0) + 0.2
+        turns.append((f"SPEAKER_{rng.integers(speakers):02d}", t, min(t + length, duration)))
+        # 轮次之间有间隙，也有与下一轮次重叠的抢话
+        t += length + rng.uniform(-1.0, 2.0)
+    turns.append(("SPEAKER_00", duration * 0.3, duration * 0.3 + 120.0))  # 很长的背景轮次
+    rng.shuffle(turns)
+    diarize_df = pd.DataFrame(turns, columns=['speaker', 'start', 'end'])
+
+    segments, t = [], 0.0
+    while t < duration - 1.0:
+        words, w = [], t
+        for _ in range(rng.integers(3, 15)):
+            length = rng.uniform(0.1, 0.8)
+            words.append({'word': 'w', 'start': round(w, 3), 'end': round(w + length, 3)})
+            w += length + rng.uniform(0.0, 0.4)
+        segments.append({'start': words[0]['start'], 'end': words[-1]['end'], 'words': words})
+        words.insert(rng.integers(1, len(words) + 1), {'word': '42'})  # 没有时间戳的词
+        t = w + rng.uniform(0.0, 3.0)
+    return diarize_df, {'segments': segments}
+
+
+def _labels(result: dict) -> list:
+    return [(seg.get('speaker'), [word.get('speaker') for word in seg['words']]) for seg in result['segments']]
+
+
+def test_matches_reference():
+    """测试与原实现分配结果一致（包括没有交集的段落和没有时间戳的词）"""
+    for seed in range(3):
+        diarize_df, transcript = make_meeting(900.0, speakers=4, seed=seed)
+        expected = reference_assign_word_speakers(diarize_df.copy(), copy.deepcopy(transcript))
+        actual = assign_word_speakers(diarize_df.copy(), copy.deepcopy(transcript))
+        assert _labels(actual) == _labels(expected), seed
+
+
+def test_fill_nearest():
+    """测试 fill_nearest：没有交集时仍按所有轮次交集（可为负）之和选择说话人，与原实现一致"""
+    diarize_df, transcript = make_meeting(600.0, speakers=3, seed=7)
+    expected = reference_assign_word_speakers(diarize_df.copy(), copy.deepcopy(transcript), fill_nearest=True)
+    actual = assign_word_speakers(diarize_df.copy(), copy.deepcopy(transcript), fill_nearest=True)
+    assert _labels(actual) == _labels(expected)
+    assert all(word.get('speaker') for seg in actual['segments'] for word in seg['words'] if 'start' in word)
+
+
+def test_ties_and_empty():
+    """测试交集相同时取标签排序最前的说话人，没有说话人分离结果时不分配"""
+    diarize_df = pd.DataFrame({'speaker': ['SPEAKER_01', 'SPEAKER_00'], 'start': [0.0, 2.0], 'end': [2.0, 4.0]})
+    transcript = {'segments': [{'start': 1.0, 'end': 3.0, 'words': [{'word': 'a', 'start': 1.5, 'end': 2.5}]}]}
+    result = assign_word_speakers(diarize_df, copy.deepcopy(transcript))
+    expected = reference_assign_word_speakers(diarize_df.copy(), copy.deepcopy(transcript))
+    assert result['segments'][0]['speaker'] == expected['segments'][0]['speaker'] == 'SPEAKER_00'
+    assert _labels(result) == _labels(expected)
+
+    empty = pd.DataFrame({'speaker': [], 'start': [], 'end': []})
+    assert 'speaker' not in assign_word_speakers(empty, copy.deepcopy(transcript))['segments'][0]
+
+
+def test_speed():
+    """测试1小时会议的耗时（原实现只跑前200个段落后按比例估算）"""
+    diarize_df, transcript = make_meeting(3600.0, speakers=6, seed=11)
+    words = sum(len(seg['words']) for seg in transcript['segments'])
+
+    start = time.time()
+    assign_word_speakers(diarize_df.copy(), copy.deepcopy(transcript))
+    fast = time.time() - start
+
+    sample = {'segments': copy.deepcopy(transcript['segments'][:200])}
+    start = time.time()
+    reference_assign_word_speakers(diarize_df.copy(), sample)
+    slow = (time.time() - start) * len(transcript['segments']) / 200
+
+    print(f"  {len(diarize_df)} 个轮次, {len(transcript['segments'])} 个段落, {words} 个词: "
+          f"区间索引 {fast:.2f}秒, 原实现约 {slow:.1f}秒")
+    assert fast < slow
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("与原实现一致", test_matches_reference),
+        ("fill_nearest", test_fill_nearest),
+        ("并列和空结果", test_ties_and_empty),
+        ("耗时对比", test_speed),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量对齐测试脚本
+用随机初始化的小型wav2vec2模型（layer_norm特征提取，与 WAV2VEC2_ASR_LARGE_LV60K_960H 结构相同）检查：
+按长度分批、补零并用lengths屏蔽后，每个段落截取的发射矩阵与逐段推理一致，
+whisperx.align 批量与逐段（batch_size=1，即原流程）的词时间戳一致，并输出耗时
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+# 添加whisperX路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'whisperX'))
+
+from torchaudio.models import wav2vec2_model
+from whisperx.alignment import align, get_batch_emissions
+
+SAMPLE_RATE = 16000
+LABELS = ['-', '|'] + list("etaoinshrdlucmfwypvbgkjqxz'")
+
+
+def make_model() -> torch.nn.Module:
+    """结构与wav2vec2 large相同（卷积层、layer_norm）但层数和维度缩小的随机模型"""
+    torch.manual_seed(0)
+    model = wav2vec2_model(
+        extractor_mode="layer_norm", extractor_conv_layer_config=None, extractor_conv_bias=True,
+        encoder_embed_dim=64, encoder_projection_dropout=0.0, encoder_pos_conv_kernel=16,
+        encoder_pos_conv_groups=4, encoder_num_layers=2, encoder_num_heads=4, encoder_attention_dropout=0.0,
+        encoder_ff_interm_features=128, encoder_ff_interm_dropout=0.0, encoder_dropout=0.0,
+        encoder_layer_norm_first=True, encoder_layer_drop=0.0, aux_num_out=len(LABELS)
+    )
+    return model.eval()
+
+
+def make_transcript(duration: float, seed: int = 0) -> tuple:
+    """随机音频和长度各异的段落（含极短段落、无法对齐的段落和超出音频的段落）"""
+    rng = np.random.default_rng(seed)
+    audio = rng.normal(0, 0.1, int(duration * SAMPLE_RATE)).astype(np.float32)
+    words = ['the', 'meeting', 'will', 'now', 'begin', 'please', 'take', 'your', 'seats', 'thanks']
+    segments, t = [], 0.3
+    while t < duration - 1.0:
+        length = float(rng.uniform(1.0, 12.0))
+        text = ' ' + ' '.join(rng.choice(words, size=max(1, int(length * 2)))) + '. ok'
+        segments.append({'start': round(t, 3), 'end': round(min(t + length, duration), 3), 'text': text})
+        t += length + float(rng.uniform(0.1, 1.5))
+    segments.insert(2, {'start': segments[1]['end'], 'end': segments[1]['end'] + 0.01, 'text': 'ok'})  # 不足400个采样点
+    segments.insert(4, {'start': segments[3]['end'], 'end': segments[3]['end'] + 0.5, 'text': '123'})  # 没有可对齐字符
+    segments.append({'start': duration + 1.0, 'end': duration + 2.0, 'text': 'late'})  # 超出音频
+    return audio, segments
+
+
+def test_batch_emissions():
+    """测试批量推理截取后的发射矩阵与逐段推理一致（帧数相同，数值误差在浮点范围内）"""
+    model = make_model()
+    rng = np.random.default_rng(1)
+    waveforms = [torch.from_numpy(rng.normal(0, 0.1, n).astype(np.float32)) for n in (200, 400, 16000, 41234, 160000)]
+    batched = get_batch_emissions(model, "torchaudio", waveforms, "cpu")
+    for waveform, emission in zip(waveforms, batched):
+        single = get_batch_emissions(model, "torchaudio", [waveform], "cpu")[0]
+        assert emission.shape == single.shape, (emission.shape, single.shape)
+        assert torch.allclose(emission, single, atol=1e-4), (emission - single).abs().max()
+
+
+def test_align_matches_unbatched():
+    """测试批量对齐与逐段对齐的段落、词和时间戳一致，无法对齐的段落保持原样且顺序不变"""
+    model = make_model()
+    metadata = {"language": "en", "dictionary": {c: i for i, c in enumerate(LABELS)}, "type": "torchaudio"}
+    audio, segments = make_transcript(60.0)
+
+    single = align(segments, model, metadata, audio, "cpu", batch_size=1)
+    batched = align(segments, model, metadata, audio, "cpu", batch_size=8)
+    assert batched == single
+    # batch_size<=0（如 ALIGN_BATCH_SIZE=0）按逐段处理
+    assert align(segments, model, metadata, audio, "cpu", batch_size=0) == single
+    texts = [segment['text'] for segment in batched['segments']]
+    assert '123' in texts and 'late' in texts and texts.index('123') < texts.index('late')
+    assert len(batched['word_segments']) > 100
+
+
+def test_speed():
+    """测试10分钟音频批量与逐段模型推理的耗时（只在GPU上对比，CPU上批量推理没有收益）"""
+    if not torch.cuda.is_available():
+        print("  未检测到GPU，跳过耗时对比")
+        return
+    model = make_model().to("cuda")
+    audio, segments = make_transcript(600.0, seed=2)
+    # 只对比模型推理部分：trellis/backtrack 两种方式相同
+    waveforms = [torch.from_numpy(audio[int(s['start'] * SAMPLE_RATE):int(s['end'] * SAMPLE_RATE)])
+                 for s in segments if s['start'] < 600.0]
+
+    start = time.time()
+    for waveform in waveforms:
+        get_batch_emissions(model, "torchaudio", [waveform], "cuda")
+    torch.cuda.synchronize()
+    single = time.time() - start
+
+    ordered = sorted(waveforms, key=len)
+    start = time.time()
+    for i in range(0, len(ordered), 16):
+        get_batch_emissions(model, "torchaudio", ordered[i:i + 16], "cuda")
+    torch.cuda.synchronize()
+    batched = time.time() - start
+    print(f"  {len(waveforms)} 个段落模型推理: 逐段 {single:.2f}秒, 批量(16) {batched:.2f}秒")
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("批量发射矩阵", test_batch_emissions),
+        ("批量对齐结果一致", test_align_matches_unbatched),
+        ("耗时对比", test_speed),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+回调紧凑结果测试脚本
+检查转写段落/词的列式编码可还原为旧格式、对比编码前后的大小，以及超过内联上限时上传为文件
+"""
+
+import json
+import os
+import random
+import sys
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from api_client import APIClient
+from result_codec import (
+    ENCODING_GZIP_JSON, ENCODING_MSGPACK, SCHEMA_TRANSCRIPT_SEGMENTS, build_envelope, encode_columns,
+    read_envelope, resolve_encoding, transcript_segments_from_columns, transcript_segments_to_columns
+)
+
+
+class _RecordingAPIClient(APIClient):
+    """记录回调和上传内容、不访问网络的API客户端"""
+
+    def __init__(self, upload_url=None):
+        super().__init__()
+        self.upload_url = upload_url
+        self.uploads = []
+        self.callbacks = []
+
+    def send_callback(self, task_id, task_type, status, data=None):
+        self.callbacks.append(data)
+        return {'code': 200}
+
+    def upload_file(self, file_path, task_type=4):
+        with open(file_path, 'rb') as f:
+            self.uploads.append(f.read())
+        if self.upload_url is None:
+            return {'code': 500, 'msg': '上传失败'}
+        return {'code': 200, 'data': {'file_info': {'url': self.upload_url}}}
+
+
+def _transcribe_result(segment_count: int) -> dict:
+    """构造whisperX格式的转写结果（时间和分数保留3位小数）"""
+    rng = random.Random(0)
+    segments = []
+    t = 0.0
+    for i in range(segment_count):
+        words = []
+        start = t
+        for _ in range(rng.randint(0, 12)):
+            word_end = round(t + rng.uniform(0.1, 0.6), 3)
+            words.append({'word': rng.choice(['你好', '转写', 'hello', 'world', '测试']),
+                          'start': round(t, 3), 'end': word_end, 'score': round(rng.uniform(0.3, 1.0), 3)})
+            t = word_end
+        t = round(t + rng.uniform(0.2, 1.5), 3)
+        segment = {'text': ' '.join(w['word'] for w in words), 'start': round(start, 3), 'end': t, 'words': words}
+        if i % 5:
+            segment['speaker'] = f"SPEAKER_0{i % 3}"
+        segments.append(segment)
+    return {
+        'text': ' '.join(s['text'] for s in segments),
+        'segments': segments,
+        'speakers': ['SPEAKER_00', 'SPEAKER_01'],
+        'language': 'zh',
+        'total_voice': t,
+        'effective_voice': t
+    }
+
+
+def _legacy_segments(client: APIClient, transcribe_result: dict) -> list:
+    """旧格式回调中清理后的段落列表"""
+    client.config.CALLBACK_RESULT_FORMAT = 'legacy'
+    client.send_success_callback(1, transcribe_result)
+    return client.callbacks[-1]['transcribe_details']['segments']
+
+
+def test_roundtrip_and_size():
+    """测试列式编码还原出与旧格式相同的段落和词，并输出大小对比"""
+    transcribe_result = _transcribe_result(1200)
+    segments = _legacy_segments(_RecordingAPIClient(), transcribe_result)
+    legacy_size = len(json.dumps(segments, ensure_ascii=False).encode('utf-8'))
+
+    for encoding in (ENCODING_GZIP_JSON, resolve_encoding(ENCODING_MSGPACK)):
+        columns = transcript_segments_to_columns(segments, transcribe_result['speakers'])
+        payload = encode_columns(columns, encoding)
+        envelope = build_envelope(SCHEMA_TRANSCRIPT_SEGMENTS, len(segments), payload, encoding)
+        restored = transcript_segments_from_columns(read_envelope(json.loads(json.dumps(envelope))))
+
+        assert restored == segments, f"{encoding} 还原结果与原始段落不一致"
+        assert columns['speakers'][:2] == transcribe_result['speakers'], "说话人表应保留原有顺序"
+        print(f"{len(segments)}个段落/{len(columns['word'])}个词: 旧格式JSON {legacy_size / 1024:.1f}KB, "
+              f"{encoding} {len(payload) / 1024:.1f}KB, 信封JSON {len(json.dumps(envelope)) / 1024:.1f}KB")
+
+
+def test_callback_formats():
+    """测试三种回调格式的字段，text_info 与 transcribe_details 保持一致"""
+    transcribe_result = _transcribe_result(30)
+    client = _RecordingAPIClient()
+    segments = _legacy_segments(client, transcribe_result)
+
+    for result_format, has_legacy, has_compact in (('legacy', True, False), ('compact', False, True), ('both', True, True)):
+        client.config.CALLBACK_RESULT_FORMAT = result_format
+        client.send_success_callback(1, transcribe_result)
+        callback = client.callbacks[-1]
+        details = callback['transcribe_details']
+        assert callback['text_info'] == details
+        assert ('segments' in details) == has_legacy, result_format
+        assert ('segments_compact' in details) == has_compact, result_format
+        assert details['segments_count'] == 30
+        if has_compact:
+            envelope = details['segments_compact']
+            assert envelope['count'] == 30 and 'data' in envelope
+            assert transcript_segments_from_columns(read_envelope(envelope)) == segments
+    assert not client.uploads
+
+
+def test_large_payload_uploaded():
+    """测试超过内联上限的紧凑结果上传为文件，上传失败时改为内联"""
+    transcribe_result = _transcribe_result(300)
+    segments = _legacy_segments(_RecordingAPIClient(), transcribe_result)
+    for upload_url in ('http://example.com/segments.json.gz', None):
+        client = _RecordingAPIClient(upload_url)
+        client.config.CALLBACK_RESULT_FORMAT = 'compact'
+        client.config.CALLBACK_COMPACT_ENCODING = ENCODING_GZIP_JSON
+        client.config.CALLBACK_INLINE_MAX_BYTES = 1024
+        client.send_success_callback(1, transcribe_result)
+
+        envelope = client.callbacks[-1]['transcribe_details']['segments_compact']
+        assert len(client.uploads) == 1 and envelope['size'] == len(client.uploads[0])
+        if upload_url:
+            assert envelope['url'] == upload_url and 'data' not in envelope
+            columns = read_envelope(envelope, client.uploads[0])
+        else:
+            assert 'url' not in envelope
+            columns = read_envelope(envelope)
+        assert transcript_segments_from_columns(columns) == segments
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("列式编码还原", test_roundtrip_and_size),
+        ("回调格式字段", test_callback_formats),
+        ("大结果上传为文件", test_large_payload_uploaded),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
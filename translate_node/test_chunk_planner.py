@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+长音频分块规划测试脚本
+检查切分点落在VAD静音中、块范围按16kHz采样点首尾相接，以及强制切分处重叠转写的词合并后不重复不丢失
+"""
+
+import copy
+import os
+import sys
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from chunk_planner import find_silences, keep_owned_segments, plan_chunks
+
+SAMPLE_RATE = 16000
+
+
+def _speech_every(period: float, speech: float, total: float) -> list:
+    """每 period 秒开始一段 speech 秒的语音"""
+    segments, start = [], 0.5
+    while start < total:
+        segments.append([start, min(start + speech, total)])
+        start += period
+    return segments
+
+
+def test_silences():
+    """测试静音区间：重叠和相接的语音段之间没有静音，包括开头和结尾"""
+    silences = find_silences([[1.0, 3.0], [2.5, 4.0], [4.0, 6.0], [8.0, 9.5]], 10.0)
+    assert silences.tolist() == [[0.0, 1.0], [6.0, 8.0], [9.5, 10.0]]
+    assert find_silences([], 5.0).tolist() == [[0.0, 5.0]]
+
+
+def test_cuts_inside_silences():
+    """测试切分点都是搜索范围内最长静音的中点，块范围首尾相接、按采样点对齐"""
+    total = 3600.0
+    segments = _speech_every(period=7.0, speech=6.2, total=total)
+    # 在 590 秒附近放一段较长的静音，应被选为第2个切分点
+    segments = [seg for seg in segments if not (586.0 < seg[0] < 594.0)]
+    chunks = plan_chunks(segments, total, target_duration=300, search_window=60, overlap=2.0)
+
+    assert chunks[0]['start_sample'] == 0 and chunks[-1]['end_sample'] == int(total * SAMPLE_RATE)
+    silences = find_silences(segments, total)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert not previous['forced_cut']
+        assert previous['end_sample'] == chunk['start_sample']
+        assert previous['keep_end'] == chunk['keep_start'] == chunk['start_sample'] / SAMPLE_RATE
+        cut = chunk['keep_start']
+        assert any(start < cut < end for start, end in silences), cut
+        assert not any(start < cut < end for start, end in segments), cut
+    assert all(240 <= c['keep_end'] - c['keep_start'] <= 360 for c in chunks[:-1])
+    assert 585.0 < chunks[1]['keep_end'] < 595.0, chunks[1]['keep_end']
+
+    # 切分点与16kHz数组一致：秒 * 16000 恰好是整数采样点
+    for chunk in chunks:
+        assert chunk['start'] * SAMPLE_RATE == chunk['start_sample']
+        assert chunk['end'] * SAMPLE_RATE == chunk['end_sample']
+
+
+def test_forced_cut_overlap():
+    """测试没有静音时强制切分，两侧块各多转写overlap秒"""
+    chunks = plan_chunks([[0.0, 900.0]], 900.0, target_duration=300, search_window=60, overlap=2.0)
+    assert [c['keep_start'] for c in chunks] == [0.0, 300.0, 600.0]
+    assert chunks[0]['forced_cut'] and chunks[1]['forced_cut'] and not chunks[2]['forced_cut']
+    assert (chunks[0]['start'], chunks[0]['end']) == (0.0, 302.0)
+    assert (chunks[1]['start'], chunks[1]['end']) == (298.0, 602.0)
+    assert (chunks[2]['start'], chunks[2]['end']) == (598.0, 900.0)
+
+    # 短音频只有一块
+    single = plan_chunks([[1.0, 2.0]], 200.0, target_duration=300, search_window=60, overlap=2.0)
+    assert len(single) == 1 and single[0]['end_sample'] == 200 * SAMPLE_RATE
+
+
+def test_merge_boundary_words():
+    """测试强制切分处两块都转写到的词只保留一份，跨越切分点的词归属中点所在的块"""
+    cut = 300.0
+    # 两块在 [298, 302] 重叠转写，两块识别到相同的词（时间略有差异）
+    left = [{
+        'start': 295.0, 'end': 302.0, 'text': 'we will now begin the',
+        'words': [
+            {'word': 'we', 'start': 295.0, 'end': 295.4}, {'word': 'will', 'start': 295.5, 'end': 296.0},
+            {'word': 'now', 'start': 297.0, 'end': 297.6}, {'word': 'begin', 'start': 299.7, 'end': 300.5},
+            {'word': 'the', 'start': 301.0, 'end': 301.9},
+        ]
+    }]
+    right = [{
+        'start': 298.0, 'end': 304.0, 'text': 'now begin the meeting',
+        'words': [
+            {'word': 'now', 'start': 298.0, 'end': 298.6}, {'word': 'begin', 'start': 299.8, 'end': 300.4},
+            {'word': 'the', 'start': 301.0, 'end': 301.8}, {'word': '2024'},
+            {'word': 'meeting', 'start': 302.5, 'end': 303.4},
+        ]
+    }, {'start': 298.5, 'end': 299.5, 'text': 'um'}]  # 没有词时间戳的段落按段落中点归属
+
+    kept_left = keep_owned_segments(copy.deepcopy(left), 0.0, cut)
+    kept_right = keep_owned_segments(copy.deepcopy(right), cut, 600.0)
+    words = [w['word'] for seg in kept_left + kept_right for w in seg.get('words', [])]
+    assert words == ['we', 'will', 'now', 'begin', 'the', '2024', 'meeting'], words
+    assert kept_left[0]['text'] == 'we will now' and kept_left[0]['end'] == 297.6
+    assert kept_right[0]['text'] == 'begin the 2024 meeting' and kept_right[0]['start'] == 299.8
+    assert len(kept_right) == 1  # 'um' 段落中点在切分点之前，归左侧块
+
+    # 中文按字重建文本不加空格；全部在负责范围内的段落原样保留
+    zh = [{'start': 298.0, 'end': 301.0, 'text': '大家好',
+           'words': [{'word': '大', 'start': 298.0, 'end': 299.0}, {'word': '家', 'start': 299.0, 'end': 300.2},
+                     {'word': '好', 'start': 300.2, 'end': 301.0}]}]
+    assert keep_owned_segments(copy.deepcopy(zh), cut, 600.0, word_separator='')[0]['text'] == '好'
+    assert keep_owned_segments(copy.deepcopy(zh), 0.0, 600.0) == zh
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("静音区间", test_silences),
+        ("在静音中切分", test_cuts_inside_silences),
+        ("强制切分重叠", test_forced_cut_overlap),
+        ("切分处的词合并", test_merge_boundary_words),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+压缩音频时间轴测试脚本
+检查转写压缩音频后段落和逐词时间戳（包括跨越片段拼接处的词）按偏移表还原到原始音频时间，
+以及只在转写原始音频（voice_url）时使用压缩音频，转写降噪音频（clear_url）时不使用
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from api_client import APIClient
+from compacted_timeline import OffsetMap
+from config import Config
+from queue_consumer import QueueConsumer
+
+# 原始音频60秒，语音片段 [5, 10) [20, 23) [40, 50)，片段之间插入0.3秒静音：
+# 压缩时间 [0, 5) -> 原始 [5, 10)，[5.3, 8.3) -> [20, 23)，[8.6, 18.6) -> [40, 50)
+PIECES = [[0, 5000, 5000], [5300, 20000, 3000], [8600, 40000, 10000]]
+
+
+class _FakeAPIClient(APIClient):
+    """按URL返回本地内容的API客户端，记录下载的URL和回调结果"""
+
+    def __init__(self, files: dict):
+        super().__init__()
+        self.files = files
+        self.downloads = []
+        self.results = {}
+
+    def download_file(self, url: str, local_path: str) -> bool:
+        self.downloads.append(url)
+        if url not in self.files:
+            return False
+        with open(local_path, 'wb') as f:
+            f.write(self.files[url])
+        return True
+
+    def send_processing_callback(self, task_id):
+        pass
+
+    def send_success_callback(self, task_id, result):
+        self.results[task_id] = result
+
+    def send_failed_callback(self, task_id, error_message):
+        self.results[task_id] = error_message
+
+
+class _FakeTranscriber:
+    """返回固定结果（压缩音频时间 [5.3, 8.3)）并记录转写的文件内容"""
+
+    def __init__(self):
+        self.audio = []
+
+    def prefetch_align_model(self, language):
+        pass
+
+    def transcribe_audio(self, audio_path, timeout=None, speech_segments=None, language=None):
+        with open(audio_path, 'rb') as f:
+            self.audio.append(f.read())
+        return {'total_voice': 18.6, 'segments': [{'start': 5.3, 'end': 8.3, 'text': 'a', 'words': []}]}
+
+
+class _FakeChannel:
+    def basic_ack(self, delivery_tag):
+        pass
+
+
+class _Method:
+    delivery_tag = 1
+
+
+def _offset_map() -> OffsetMap:
+    return OffsetMap.from_dict({
+        'format': 'json-offset-map', 'version': 1, 'original_duration_ms': 60000, 'padding_ms': 300,
+        'pieces': PIECES
+    })
+
+
+def test_points_inside_pieces():
+    """测试片段内的时间按片段平移，与开始/结束类型无关"""
+    offset_map = _offset_map()
+    compact = np.array([0.0, 2.5, 4.999, 5.3, 7.0, 8.6, 18.6])
+    original = np.array([5.0, 7.5, 9.999, 20.0, 21.7, 40.0, 50.0])
+    assert np.allclose(offset_map.to_original(compact[:-1], 'start'), original[:-1])
+    assert np.allclose(offset_map.to_original([2.5, 4.999, 5.0, 7.0, 8.3, 18.6], 'end'), [7.5, 9.999, 10.0, 21.7, 23.0, 50.0])
+    assert np.allclose(offset_map.to_compact(original[:-1], 'start'), compact[:-1])
+    assert offset_map.compacted_duration == 18.6 and offset_map.original_duration == 60.0
+
+
+def test_gap_clamping():
+    """测试落在片段间静音中的时间：开始 -> 下一片段开始，结束 -> 上一片段结束；超出末尾时取最后片段的结束"""
+    offset_map = _offset_map()
+    assert np.allclose(offset_map.to_original([5.0, 5.1, 8.5], 'start'), [20.0, 20.0, 40.0])
+    assert np.allclose(offset_map.to_original([5.1, 5.3, 8.5, 8.6], 'end'), [10.0, 10.0, 23.0, 23.0])
+    assert np.allclose(offset_map.to_original([19.0], 'start'), [50.0])
+    assert np.allclose(offset_map.to_original([19.0], 'end'), [50.0])
+
+    # 原始音频中被去除的静音 -> 压缩音频中相邻片段的边界
+    assert np.allclose(offset_map.to_compact([15.0, 0.0], 'start'), [5.3, 0.0])
+    assert np.allclose(offset_map.to_compact([15.0, 30.0], 'end'), [5.0, 8.3])
+    assert offset_map.compact_segments([[4.0, 9.0], [12.0, 14.0], [21.0, 45.0]]) == [[0.0, 4.0], [6.3, 13.6]]
+
+
+def test_words_crossing_joins():
+    """测试跨越拼接处的词和段落还原后覆盖两侧的原始语音，片段内的词只平移"""
+    offset_map = _offset_map()
+    result = {
+        'total_voice': 18.6,
+        'segments': [
+            {
+                'start': 3.0, 'end': 7.0, 'text': 'a b c d',
+                'words': [
+                    {'word': 'a', 'start': 3.0, 'end': 4.2, 'score': 0.9},
+                    {'word': 'b', 'start': 4.8, 'end': 5.5, 'score': 0.8},   # 跨越第1个拼接处
+                    {'word': 'c', 'start': 5.15, 'end': 5.25, 'score': 0.1},  # 完全落在静音中
+                    {'word': 'd', 'start': 6.0, 'end': 7.0, 'score': 0.9},
+                    {'word': '1'},                                            # 对齐失败没有时间戳
+                ]
+            },
+            {
+                'start': 8.4, 'end': 9.6, 'text': 'e',
+                'words': [{'word': 'e', 'start': 8.45, 'end': 9.6, 'score': 0.7}]  # 从静音中开始
+            }
+        ]
+    }
+    offset_map.remap_transcript(result)
+    first, second = result['segments']
+    assert (first['start'], first['end']) == (8.0, 21.7)
+    words = {w['word']: w for w in first['words']}
+    assert (words['a']['start'], words['a']['end']) == (8.0, 9.2)
+    assert (words['b']['start'], words['b']['end']) == (9.8, 20.2)
+    assert (words['c']['start'], words['c']['end']) == (20.0, 20.0)
+    assert (words['d']['start'], words['d']['end']) == (20.7, 21.7)
+    assert 'start' not in words['1'] and words['a']['score'] == 0.9
+    assert (second['start'], second['end']) == (40.0, 41.0)
+    assert (second['words'][0]['start'], second['words'][0]['end']) == (40.0, 41.0)
+    assert result['total_voice'] == 60.0 and result['compacted_voice'] == 18.6
+
+    # 还原后词的时间戳单调、不落在原始音频被去除的静音中
+    starts = [w['start'] for w in first['words'] if 'start' in w]
+    assert starts == sorted(starts)
+    for w in first['words'] + second['words']:
+        if 'start' in w:
+            assert any(o / 1000 <= w['start'] <= (o + d) / 1000 for _, o, d in PIECES)
+            assert any(o / 1000 <= w['end'] <= (o + d) / 1000 for _, o, d in PIECES)
+
+
+def test_load_offset_map_file():
+    """测试从quick_node上传的JSON文件加载偏移表，拒绝未知格式"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'offset_map.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'format': 'json-offset-map', 'version': 1, 'original_duration_ms': 60000,
+                       'compacted_duration_ms': 18600, 'padding_ms': 300, 'pieces': PIECES}, f)
+        offset_map = OffsetMap.load(path)
+        assert np.allclose(offset_map.to_original([6.0], 'start'), [20.7])
+
+    try:
+        OffsetMap.from_dict({'format': 'json-offset-map', 'version': 2, 'pieces': PIECES})
+        raise AssertionError("未知版本应当报错")
+    except ValueError:
+        pass
+
+
+def test_compacted_audio_only_for_voice_url():
+    """测试转写原始音频时使用压缩音频并还原时间戳，已降噪（is_clear=1）时转写clear_url且不使用压缩音频"""
+    offset_map = json.dumps({'format': 'json-offset-map', 'version': 1, 'original_duration_ms': 60000,
+                             'compacted_duration_ms': 18600, 'padding_ms': 300, 'pieces': PIECES})
+    files = {
+        'http://files/voice.wav': b'voice', 'http://files/clear.wav': b'clear',
+        'http://files/compacted.wav': b'compacted', 'http://files/offset_map.json': offset_map.encode('utf-8')
+    }
+    task_base = {
+        'voice_url': 'http://files/voice.wav', 'clear_url': 'http://files/clear.wav',
+        'compacted_audio_url': 'http://files/compacted.wav',
+        'compacted_offset_map_url': 'http://files/offset_map.json'
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        consumer = QueueConsumer.__new__(QueueConsumer)
+        consumer.config = Config()
+        consumer.config.TEMP_DIR = temp_dir
+        consumer.config.USE_COMPACTED_AUDIO = True
+        consumer.config.USE_PRECOMPUTED_VAD = False
+        consumer.api_client = _FakeAPIClient(files)
+        consumer.transcriber = _FakeTranscriber()
+
+        for task_id, is_clear in ((1, 0), (2, 1)):
+            body = json.dumps({'task_info': dict(task_base, id=task_id, is_clear=is_clear)}).encode('utf-8')
+            consumer.process_message(_FakeChannel(), _Method(), None, body)
+
+    voice_result, clear_result = consumer.api_client.results[1], consumer.api_client.results[2]
+    assert consumer.transcriber.audio == [b'compacted', b'clear']
+    assert 'http://files/offset_map.json' not in consumer.api_client.downloads[2:], consumer.api_client.downloads
+    assert (voice_result['segments'][0]['start'], voice_result['segments'][0]['end']) == (20.0, 23.0)
+    assert (clear_result['segments'][0]['start'], clear_result['segments'][0]['end']) == (5.3, 8.3)
+    assert 'compacted_voice' not in clear_result
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("片段内时间映射", test_points_inside_pieces),
+        ("静音中的时间映射", test_gap_clamping),
+        ("跨越拼接处的词时间戳", test_words_crossing_joins),
+        ("加载偏移表文件", test_load_offset_map_file),
+        ("降噪音频不使用压缩音频", test_compacted_audio_only_for_voice_url),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CTC对齐（trellis / backtrack）测试脚本
+对比 whisperx.alignment 的 get_trellis、backtrack_beam 与原先逐帧计算的实现：
+随机发射矩阵（含通配符、单个字符、字符多于帧数等情况）上trellis逐位相同，路径和每帧概率完全相同，并输出耗时
+"""
+
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import List
+
+import torch
+
+# 添加whisperX路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'whisperX'))
+
+from whisperx.alignment import Point, backtrack_beam, get_trellis, get_wildcard_emission
+
+
+def reference_get_trellis(emission, tokens, blank_id=0):
+    """原实现：逐帧更新，每帧重新计算通配符得分"""
+    num_frame = emission.size(0)
+    num_tokens = len(tokens)
+
+    trellis = torch.zeros((num_frame, num_tokens))
+    trellis[1:, 0] = torch.cumsum(emission[1:, blank_id], 0)
+    trellis[0, 1:] = -float("inf")
+    trellis[-num_tokens + 1:, 0] = float("inf")
+
+    for t in range(num_frame - 1):
+        trellis[t + 1, 1:] = torch.maximum(
+            trellis[t, 1:] + emission[t, blank_id],
+            trellis[t, :-1] + get_wildcard_emission(emission[t], tokens[1:], blank_id),
+        )
+    return trellis
+
+
+@dataclass
+class BeamState:
+    token_index: int
+    time_index: int
+    score: float
+    path: List[Point]
+
+
+def reference_backtrack_beam(trellis, emission, tokens, blank_id=0, beam_width=5):
+    """原实现：每个beam保存完整路径的副本"""
+    T, J = trellis.size(0) - 1, trellis.size(1) - 1
+    beams = [BeamState(J, T, trellis[T, J], [Point(J, T, emission[T, blank_id].exp().item())])]
+
+    while beams and beams[0].token_index > 0:
+        next_beams = []
+        for beam in beams:
+            t, j = beam.time_index, beam.token_index
+            if t <= 0:
+                continue
+            p_stay = emission[t - 1, blank_id]
+            p_change = get_wildcard_emission(emission[t - 1], [tokens[j]], blank_id)[0]
+            stay_score = trellis[t - 1, j]
+            change_score = trellis[t - 1, j - 1] if j > 0 else float('-inf')
+            if not math.isinf(stay_score):
+                next_beams.append(BeamState(j, t - 1, stay_score,
+                                            beam.path + [Point(j, t - 1, p_stay.exp().item())]))
+            if j > 0 and not math.isinf(change_score):
+                next_beams.append(BeamState(j - 1, t - 1, change_score,
+                                            beam.path + [Point(j - 1, t - 1, p_change.exp().item())]))
+        beams = sorted(next_beams, key=lambda x: x.score, reverse=True)[:beam_width]
+        if not beams:
+            break
+
+    if not beams:
+        return None
+    best_beam = beams[0]
+    t, j = best_beam.time_index, best_beam.token_index
+    while t > 0:
+        best_beam.path.append(Point(j, t - 1, emission[t - 1, blank_id].exp().item()))
+        t -= 1
+    return best_beam.path[::-1]
+
+
+def make_case(num_frames: int, num_tokens: int, vocab: int = 32, wildcards: float = 0.1, peaky: bool = False,
+              seed: int = 0) -> tuple:
+    """随机的log_softmax发射矩阵和字符序列（-1为通配符）"""
+    generator = torch.Generator().manual_seed(seed)
+    logits = torch.randn(num_frames, vocab, generator=generator) * (8.0 if peaky else 1.0)
+    with torch.inference_mode():
+        emission = torch.log_softmax(logits, dim=-1)
+    tokens = torch.randint(1, vocab, (num_tokens,), generator=generator)
+    tokens[torch.rand(num_tokens, generator=generator) < wildcards] = -1
+    return emission, tokens.tolist()
+
+
+CASES = [
+    dict(num_frames=200, num_tokens=40),
+    dict(num_frames=750, num_tokens=180, wildcards=0.3, seed=1),
+    dict(num_frames=1500, num_tokens=400, peaky=True, seed=2),
+    dict(num_frames=1500, num_tokens=300, wildcards=0.0, seed=3),
+    dict(num_frames=60, num_tokens=59, seed=4),
+    dict(num_frames=20, num_tokens=40, seed=6),  # 字符多于帧数，backtrack失败
+]
+
+
+def test_trellis_bitwise():
+    """测试trellis与原实现逐位相同（包括inf/-inf位置）"""
+    for case in CASES:
+        emission, tokens = make_case(**case)
+        for blank_id in (0, 5):
+            expected = reference_get_trellis(emission, tokens, blank_id)
+            actual = get_trellis(emission, tokens, blank_id)
+            assert torch.equal(actual, expected), case
+
+    # 只有一个字符时原实现在空的 tokens[1:] 上建出float张量而报IndexError，当前实现正常返回
+    emission, tokens = make_case(num_frames=30, num_tokens=1, seed=5)
+    try:
+        reference_get_trellis(emission, tokens)
+        assert False, "原实现应报错"
+    except IndexError:
+        pass
+    assert get_trellis(emission, tokens).shape == (30, 1)
+
+
+def test_backtrack_identical():
+    """测试路径（字符位置、帧、每帧概率）与原实现完全相同，失败的情况同样返回None"""
+    failures = 0
+    for case in CASES:
+        emission, tokens = make_case(**case)
+        trellis = reference_get_trellis(emission, tokens, 0)
+        for beam_width in (1, 2, 5):
+            expected = reference_backtrack_beam(trellis, emission, tokens, 0, beam_width=beam_width)
+            actual = backtrack_beam(trellis, emission, tokens, 0, beam_width=beam_width)
+            assert actual == expected, (case, beam_width)
+            failures += expected is None
+    assert failures == 3  # 字符多于帧数的情况，3种beam宽度
+
+
+def test_speed():
+    """测试30秒段落（1500帧、400个字符）的耗时"""
+    emission, tokens = make_case(num_frames=1500, num_tokens=400, wildcards=0.05, seed=7)
+
+    start = time.time()
+    trellis = reference_get_trellis(emission, tokens)
+    reference_backtrack_beam(trellis, emission, tokens, beam_width=2)
+    slow = time.time() - start
+
+    start = time.time()
+    trellis = get_trellis(emission, tokens)
+    backtrack_beam(trellis, emission, tokens, beam_width=2)
+    fast = time.time() - start
+
+    print(f"  trellis + backtrack_beam: 原实现 {slow * 1000:.0f}ms, 当前实现 {fast * 1000:.0f}ms")
+    assert fast < slow
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("trellis逐位相同", test_trellis_bitwise),
+        ("backtrack路径相同", test_backtrack_identical),
+        ("耗时对比", test_speed),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
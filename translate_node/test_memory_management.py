@@ -9,12 +9,17 @@
 import os
 import sys
 import time
+import shutil
 import tempfile
+import tracemalloc
 import numpy as np
 
 # 添加项目路径
 sys.path.append(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'whisperX'))
 from src.transcriber import WhisperXTranscriber
+from decoded_audio import DecodedAudio
 from logger import logger
 
 def create_test_audio(duration_seconds: int, sample_rate: int = 16000) -> str:
@@ -238,6 +243,66 @@ def test_memory_fallback():
         if test_audio_path and os.path.exists(test_audio_path):
             os.unlink(test_audio_path)
 
+def _measure(func) -> tuple:
+    """返回 (耗时秒, Python/numpy分配的峰值内存MB)"""
+    tracemalloc.start()
+    start_time = time.time()
+    try:
+        func()
+        elapsed = time.time() - start_time
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+def test_single_decode():
+    """对比每个任务只解码一次（DecodedAudio）与原先多次解码的耗时和峰值内存"""
+    print("\n" + "=" * 60)
+    print("7. 测试音频单次解码（DecodedAudio）")
+    print("=" * 60)
+    
+    test_audio_path = None
+    try:
+        # 创建10分钟44.1kHz测试音频（需要重采样，接近实际上传的音频）
+        test_audio_path = create_test_audio(600, sample_rate=44100)
+        
+        def legacy_decode():
+            # 原流程：transcribe_audio、_do_transcribe、_transcribe_whole_audio 各用librosa按原始采样率完整解码一次
+            # 获取时长，_transcribe_whole_audio 再用 whisperx.load_audio（ffmpeg）解码一次16kHz音频供转写使用
+            # （每次只取时长，数组随即释放；16kHz数组保留到转写结束）
+            import librosa
+            for _ in range(3):
+                y, sr = librosa.load(test_audio_path, sr=None)
+                del y
+            if shutil.which('ffmpeg'):
+                from whisperx.audio import load_audio
+                return load_audio(test_audio_path)
+            return librosa.load(test_audio_path, sr=16000, mono=True, res_type='soxr_hq')[0]
+        
+        def single_decode():
+            decoded = DecodedAudio.load(test_audio_path)
+            return decoded.audio, decoded.file_info
+        
+        single_decode()  # 预热：首次导入librosa/soxr的开销不计入对比
+        legacy_time, legacy_peak = _measure(legacy_decode)
+        single_time, single_peak = _measure(single_decode)
+        
+        decoded = DecodedAudio.load(test_audio_path)
+        assert decoded.sample_rate == 16000 and decoded.source_sample_rate == 44100
+        assert abs(decoded.duration - 600) < 0.01 and decoded.audio.dtype == np.float32
+        
+        print(f"原流程（4次解码）: 耗时 {legacy_time:.2f}秒, 峰值内存 {legacy_peak:.0f}MB")
+        print(f"DecodedAudio（1次解码）: 耗时 {single_time:.2f}秒, 峰值内存 {single_peak:.0f}MB")
+        return True
+        
+    except Exception as e:
+        print(f"单次解码测试失败: {e}")
+        return False
+        
+    finally:
+        if test_audio_path and os.path.exists(test_audio_path):
+            os.unlink(test_audio_path)
+
 def main():
     """主函数"""
     print("内存管理和音频拆分测试工具")
@@ -251,6 +316,7 @@ def main():
         ("小音频转写", test_small_audio_transcription),
         ("大音频转写", test_large_audio_transcription),
         ("内存回退", test_memory_fallback),
+        ("单次解码", test_single_decode),
     ]
     
     results = {}
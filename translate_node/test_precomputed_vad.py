@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+预计算VAD语音段测试脚本
+检查quick_node语音段（int32 [N, 2]毫秒 .npy 或内联列表）的读取、超长语音段切分后合并为ASR块、
+分块转写时按块边界截取语音段，以及上游未检测到语音时不再执行转写
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# 添加src和whisperX路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+sys.path.insert(0, os.path.join(current_dir, 'whisperX'))
+
+from api_client import APIClient
+from config import Config
+from transcriber import WhisperXTranscriber
+from whisperx.asr import merge_precomputed_segments
+
+CHUNK_SIZE = 30
+
+
+class _LocalAPIClient(APIClient):
+    """从本地路径“下载”文件的API客户端"""
+
+    def download_file(self, url: str, local_path: str) -> bool:
+        if not os.path.exists(url):
+            return False
+        shutil.copyfile(url, local_path)
+        return True
+
+
+class _UnusedModel:
+    """被调用即失败的转写模型"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"不应调用转写模型: {name}")
+
+
+def _save_segments(path: str, segments_ms: list):
+    """按quick_node的格式保存语音段"""
+    with open(path, 'wb') as f:
+        np.save(f, np.asarray(segments_ms, dtype=np.int32).reshape(-1, 2), allow_pickle=False)
+
+
+def test_fetch_vad_segments():
+    """测试 .npy 往返、内联列表/字典，空结果返回空列表，缺失或损坏时返回None"""
+    client = _LocalAPIClient()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_path = os.path.join(temp_dir, 'downloaded.npy')
+        artifact = os.path.join(temp_dir, 'segments.npy')
+
+        _save_segments(artifact, [[0, 1500], [2250, 61000], [3600000, 3600480]])
+        segments = client.fetch_vad_segments({'vad_segments_url': artifact}, local_path)
+        assert segments == [[0.0, 1.5], [2.25, 61.0], [3600.0, 3600.48]], segments
+        assert not os.path.exists(local_path), "下载的语音段文件应删除"
+
+        _save_segments(artifact, [])
+        assert client.fetch_vad_segments({'vad_segments_url': artifact}, local_path) == []
+        assert client.fetch_vad_segments({'vad_segments': []}, local_path) == []
+
+        inline = [{'start_ms': 100, 'end_ms': 900, 'start_time': 0.1}, {'start_ms': 1000, 'end_ms': 2000}]
+        assert client.fetch_vad_segments({'vad_segments': inline}, local_path) == [[0.1, 0.9], [1.0, 2.0]]
+        assert client.fetch_vad_segments({'vad_segments': [[100, 900, 0.8]]}, local_path) == [[0.1, 0.9]]
+
+        assert client.fetch_vad_segments({}, local_path) is None
+        assert client.fetch_vad_segments({'vad_segments_url': os.path.join(temp_dir, 'missing.npy')}, local_path) is None
+        with open(artifact, 'wb') as f:
+            f.write(b'not a npy file')
+        assert client.fetch_vad_segments({'vad_segments_url': artifact}, local_path) is None
+
+
+def test_merge_splits_long_segments():
+    """测试超过chunk_size的语音段先切开，合并后的每个ASR块都不超过chunk_size且覆盖全部语音"""
+    speech = [[100.0, 175.5], [0.5, 3.0], [3.2, 10.0], [12.0, 12.0], [40.0, 39.0], [200.0, 229.9]]
+    chunks = merge_precomputed_segments(speech, CHUNK_SIZE, onset=0.5, offset=None)
+
+    assert chunks, "应有ASR块"
+    assert all(chunk['end'] - chunk['start'] <= CHUNK_SIZE + 1e-9 for chunk in chunks), chunks
+    starts = [chunk['start'] for chunk in chunks]
+    assert starts == sorted(starts)
+    # 有效语音全部落在ASR块内，无效语音段（长度为0或结束早于开始）被忽略
+    covered = [seg for chunk in chunks for seg in chunk['segments']]
+    speech_total = sum(end - start for start, end in speech if end > start)
+    assert abs(sum(end - start for start, end in covered) - speech_total) < 1e-6
+    long_parts = [seg for seg in covered if 100.0 <= seg[0] < 175.5]
+    assert [round(end - start, 3) for start, end in long_parts] == [30.0, 30.0, 15.5]
+
+    assert merge_precomputed_segments([], CHUNK_SIZE, onset=0.5, offset=None) == []
+    assert merge_precomputed_segments([[5.0, 5.0]], CHUNK_SIZE, onset=0.5, offset=None) == []
+
+
+def test_clip_at_chunk_edges():
+    """测试分块转写时语音段按块边界截取并换算为块内时间，跨边界的语音段两侧都保留"""
+    transcriber = WhisperXTranscriber.__new__(WhisperXTranscriber)
+    speech = [[1.0, 4.0], [8.0, 12.0], [15.0, 15.5], [19.5, 25.0], [30.0, 31.0]]
+
+    assert transcriber._clip_speech_segments(speech, 0.0, 10.0) == [[1.0, 4.0], [8.0, 10.0]]
+    assert transcriber._clip_speech_segments(speech, 10.0, 20.0) == [[0.0, 2.0], [5.0, 5.5], [9.5, 10.0]]
+    assert transcriber._clip_speech_segments(speech, 20.0, 30.0) == [[0.0, 5.0]]  # 恰好在块终点开始的语音段不属于本块
+    assert transcriber._clip_speech_segments(speech, 40.0, 50.0) == []
+
+
+def test_empty_segments_skip_transcription():
+    """测试上游未检测到语音（空列表）时直接返回空结果，不调用转写模型；块内没有语音段时同样跳过"""
+    transcriber = WhisperXTranscriber.__new__(WhisperXTranscriber)
+    transcriber.config = Config()
+    transcriber.model = _UnusedModel()
+    transcriber.align_cache = None
+    transcriber.diarize_model = None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_path = os.path.join(temp_dir, 'silence.wav')
+        sf.write(audio_path, np.zeros(16000 * 3, dtype=np.float32), 16000)
+        result = transcriber.transcribe_audio(audio_path, speech_segments=[], language='zh')
+
+    assert result['segments'] == [] and result['text'] == '' and result['segments_count'] == 0
+    assert result['precomputed_vad'] is True and abs(result['total_voice'] - 3.0) < 1e-6
+    assert result['effective_voice'] == 0
+
+    chunk_result = transcriber._transcribe_chunk(np.zeros(16000), 60.0, None, speech_segments=[], language='en')
+    assert chunk_result['segments'] == [] and chunk_result['language'] == 'en'
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("读取预计算语音段", test_fetch_vad_segments),
+        ("超长语音段切分与合并", test_merge_splits_long_segments),
+        ("按块边界截取", test_clip_at_chunk_edges),
+        ("无语音时跳过转写", test_empty_segments_skip_transcription),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+说话人全局聚类测试脚本
+用合成的说话人嵌入检查：各块标签顺序不同时同一人得到相同的全局标签、同一块内的说话人不合并、
+说话人数上限，以及没有有效嵌入的说话人
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 添加src路径
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, current_dir)
+sys.path.insert(0, os.path.join(current_dir, 'src'))
+
+from speaker_clustering import cluster_chunk_speakers, summarize_chunk_speakers
+
+DIM = 256
+
+
+def _voices(count: int, seed: int = 0) -> np.ndarray:
+    """count 个互相接近正交的说话人声纹"""
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, DIM))
+
+
+def _observe(voice: np.ndarray, rng, noise: float = 0.3) -> list:
+    """同一说话人在某个块中的质心嵌入（加噪声）"""
+    return (voice + rng.normal(scale=noise * np.linalg.norm(voice) / np.sqrt(DIM), size=DIM)).tolist()
+
+
+def test_consistent_labels():
+    """测试3个说话人分布在5个块中，各块的块内标签顺序不同，全局标签一致且按首次出现编号"""
+    voices = _voices(3)
+    rng = np.random.default_rng(1)
+    # 每块出现的说话人（按块内标签 SPEAKER_00, SPEAKER_01, ... 的顺序）
+    layout = [[2, 0], [0, 1, 2], [1], [1, 0], [2, 1, 0]]
+    chunk_speakers = []
+    for k, people in enumerate(layout):
+        chunk_speakers.append({
+            f"SPEAKER_{j:02d}": {
+                'embedding': _observe(voices[person], rng),
+                'duration': 20.0 + person,
+                'first_start': k * 300.0 + (10.0 * j if k else {2: 0.0, 0: 5.0}[person])
+            }
+            for j, person in enumerate(people)
+        })
+
+    mappings = cluster_chunk_speakers(chunk_speakers, distance_threshold=0.5, max_speakers=10)
+    # 说话人2最先出现（块0的SPEAKER_00），其次是说话人0、说话人1
+    expected_labels = {2: 'SPEAKER_00', 0: 'SPEAKER_01', 1: 'SPEAKER_02'}
+    for people, mapping in zip(layout, mappings):
+        assert mapping == {f"SPEAKER_{j:02d}": expected_labels[p] for j, p in enumerate(people)}, mapping
+
+
+def test_cannot_link_within_chunk():
+    """测试同一块内的两个说话人声纹再相似也不合并，跨块的才合并"""
+    voice = _voices(1)[0]
+    rng = np.random.default_rng(2)
+    chunk_speakers = [
+        {'SPEAKER_00': {'embedding': _observe(voice, rng), 'duration': 30.0, 'first_start': 0.0},
+         'SPEAKER_01': {'embedding': _observe(voice, rng), 'duration': 10.0, 'first_start': 4.0}},
+        {'SPEAKER_00': {'embedding': _observe(voice, rng), 'duration': 25.0, 'first_start': 300.0}},
+    ]
+    mappings = cluster_chunk_speakers(chunk_speakers, distance_threshold=0.5)
+    assert mappings[0]['SPEAKER_00'] != mappings[0]['SPEAKER_01']
+    # 块1的说话人并入时长更长的那一类之一，全局只有2个说话人
+    assert mappings[1]['SPEAKER_00'] in mappings[0].values()
+    assert len({label for mapping in mappings for label in mapping.values()}) == 2
+
+
+def test_speaker_limits():
+    """测试超过 max_speakers 时继续合并最接近的类；不超过时阈值以上的类不合并；min_speakers 时停止合并"""
+    voices = _voices(4, seed=3)
+    rng = np.random.default_rng(4)
+    chunk_speakers = [
+        {'SPEAKER_00': {'embedding': _observe(voices[k], rng), 'duration': 10.0, 'first_start': k * 300.0}}
+        for k in range(4)
+    ]
+    assert len({m['SPEAKER_00'] for m in cluster_chunk_speakers(chunk_speakers, 0.5)}) == 4
+    assert len({m['SPEAKER_00'] for m in cluster_chunk_speakers(chunk_speakers, 0.5, max_speakers=2)}) == 2
+    # 阈值很大时全部合并，但不少于 min_speakers
+    assert len({m['SPEAKER_00'] for m in cluster_chunk_speakers(chunk_speakers, 2.0)}) == 1
+    assert len({m['SPEAKER_00'] for m in cluster_chunk_speakers(chunk_speakers, 2.0, min_speakers=3)}) == 3
+
+
+def test_missing_embeddings():
+    """测试NaN或全零（pyannote对无法提取嵌入的说话人的输出）嵌入单独成类，空输入不报错"""
+    voice = _voices(1, seed=5)[0]
+    rng = np.random.default_rng(6)
+    chunk_speakers = [
+        {'SPEAKER_00': {'embedding': _observe(voice, rng), 'duration': 30.0, 'first_start': 0.0},
+         'SPEAKER_01': {'embedding': [np.nan] * DIM, 'duration': 0.4, 'first_start': 50.0}},
+        {'SPEAKER_00': {'embedding': _observe(voice, rng), 'duration': 30.0, 'first_start': 300.0},
+         'SPEAKER_01': {'embedding': [0.0] * DIM, 'duration': 0.3, 'first_start': 320.0}},
+    ]
+    mappings = cluster_chunk_speakers(chunk_speakers, distance_threshold=0.5)
+    assert mappings[0]['SPEAKER_00'] == mappings[1]['SPEAKER_00'] == 'SPEAKER_00'
+    assert (mappings[0]['SPEAKER_01'], mappings[1]['SPEAKER_01']) == ('SPEAKER_01', 'SPEAKER_02')
+    assert cluster_chunk_speakers([{}, {}], 0.5) == [{}, {}]
+
+
+def test_summarize_chunk():
+    """测试由说话人分离结果统计每个说话人的总时长和首次出现时间，缺少嵌入的记为NaN"""
+    diarize_df = pd.DataFrame({
+        'speaker': ['SPEAKER_01', 'SPEAKER_00', 'SPEAKER_01'],
+        'start': [300.0, 302.5, 310.0],
+        'end': [302.0, 309.0, 311.5],
+    })
+    speakers = summarize_chunk_speakers(diarize_df, {'SPEAKER_00': [0.1, 0.2]})
+    assert speakers['SPEAKER_01']['duration'] == 3.5 and speakers['SPEAKER_01']['first_start'] == 300.0
+    assert speakers['SPEAKER_00']['embedding'] == [0.1, 0.2] and speakers['SPEAKER_00']['duration'] == 6.5
+    assert np.isnan(speakers['SPEAKER_01']['embedding']).all()
+    assert summarize_chunk_speakers(diarize_df.iloc[:0], {}) == {}
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        ("跨块标签一致", test_consistent_labels),
+        ("同一块内不合并", test_cannot_link_within_chunk),
+        ("说话人数限制", test_speaker_limits),
+        ("缺失嵌入", test_missing_embeddings),
+        ("块内说话人统计", test_summarize_chunk),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✓ {test_name}")
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+
+    print(f"\n总计: {passed}/{len(tests)} 个测试通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -120,9 +120,13 @@ def align(
     return_char_alignments: bool = False,
     print_progress: bool = False,
     combined_progress: bool = False,
+    batch_size: int = 1,
 ) -> AlignedTranscriptionResult:
     """
     Align phoneme recognition predictions to known transcription.
+
+    Segments are sorted by length and run through the alignment model batch_size at a time;
+    the trellis/backtrack step then runs per segment on its own slice of the batch emissions.
     """
     
     if not torch.is_tensor(audio):
@@ -200,19 +204,24 @@ def align(
             "sentence_spans": sentence_spans
         }
             
-    aligned_segments: List[SingleAlignedSegment] = []
-    
+    blank_id = 0
+    for char, code in model_dictionary.items():
+        if char == '[pad]' or char == '<pad>':
+            blank_id = code
+
     # 2. Get prediction matrix from alignment model & align
+    # Segments that cannot be aligned keep their original timing
+    aligned_by_segment: dict[int, List[SingleAlignedSegment]] = {}
+    alignable = []
     for sdx, segment in enumerate(transcript):
         
         t1 = segment["start"]
         t2 = segment["end"]
-        text = segment["text"]
 
         aligned_seg: SingleAlignedSegment = {
             "start": t1,
             "end": t2,
-            "text": text,
+            "text": segment["text"],
             "words": [],
             "chars": None,
         }
@@ -220,157 +229,150 @@ def align(
         if return_char_alignments:
             aligned_seg["chars"] = []
 
+        aligned_by_segment[sdx] = [aligned_seg]
+
         # check we can align
         if len(segment_data[sdx]["clean_char"]) == 0:
             print(f'Failed to align segment ("{segment["text"]}"): no characters in this segment found in model dictionary, resorting to original...')
-            aligned_segments.append(aligned_seg)
             continue
 
         if t1 >= MAX_DURATION:
             print(f'Failed to align segment ("{segment["text"]}"): original start time longer than audio duration, skipping...')
-            aligned_segments.append(aligned_seg)
             continue
 
-        text_clean = "".join(segment_data[sdx]["clean_char"])
-        tokens = [model_dictionary.get(c, -1) for c in text_clean]
+        alignable.append(sdx)
 
-        f1 = int(t1 * SAMPLE_RATE)
-        f2 = int(t2 * SAMPLE_RATE)
+    # Batch segments of similar length together so little of each forward pass is padding
+    waveforms = {
+        sdx: audio[0, int(transcript[sdx]["start"] * SAMPLE_RATE):int(transcript[sdx]["end"] * SAMPLE_RATE)]
+        for sdx in alignable
+    }
+    alignable.sort(key=lambda sdx: waveforms[sdx].shape[-1])
 
-        # TODO: Probably can get some speedup gain with batched inference here
-        waveform_segment = audio[:, f1:f2]
-        # Handle the minimum input length for wav2vec2 models
-        if waveform_segment.shape[-1] < 400:
-            lengths = torch.as_tensor([waveform_segment.shape[-1]]).to(device)
-            waveform_segment = torch.nn.functional.pad(
-                waveform_segment, (0, 400 - waveform_segment.shape[-1])
-            )
-        else:
-            lengths = None
-            
-        with torch.inference_mode():
-            if model_type == "torchaudio":
-                emissions, _ = model(waveform_segment.to(device), lengths=lengths)
-            elif model_type == "huggingface":
-                emissions = model(waveform_segment.to(device)).logits
-            else:
-                raise NotImplementedError(f"Align model of type {model_type} not supported.")
-            emissions = torch.log_softmax(emissions, dim=-1)
-
-        emission = emissions[0].cpu().detach()
+    step = max(batch_size, 1)
+    for batch_start in range(0, len(alignable), step):
+        batch = alignable[batch_start:batch_start + step]
+        emissions = get_batch_emissions(model, model_type, [waveforms[sdx] for sdx in batch], device)
 
-        blank_id = 0
-        for char, code in model_dictionary.items():
-            if char == '[pad]' or char == '<pad>':
-                blank_id = code
-
-        trellis = get_trellis(emission, tokens, blank_id)
-        # path = backtrack(trellis, emission, tokens, blank_id)
-        path = backtrack_beam(trellis, emission, tokens, blank_id, beam_width=2)
-
-        if path is None:
-            print(f'Failed to align segment ("{segment["text"]}"): backtrack failed, resorting to original...')
-            aligned_segments.append(aligned_seg)
-            continue
+        for sdx, emission in zip(batch, emissions):
+            segment = transcript[sdx]
+            t1 = segment["start"]
+            t2 = segment["end"]
+            text = segment["text"]
 
-        char_segments = merge_repeats(path, text_clean)
+            text_clean = "".join(segment_data[sdx]["clean_char"])
+            tokens = [model_dictionary.get(c, -1) for c in text_clean]
 
-        duration = t2 - t1
-        ratio = duration * waveform_segment.size(0) / (trellis.size(0) - 1)
+            trellis = get_trellis(emission, tokens, blank_id)
+            # path = backtrack(trellis, emission, tokens, blank_id)
+            path = backtrack_beam(trellis, emission, tokens, blank_id, beam_width=2)
 
-        # assign timestamps to aligned characters
-        char_segments_arr = []
-        word_idx = 0
-        for cdx, char in enumerate(text):
-            start, end, score = None, None, None
-            if cdx in segment_data[sdx]["clean_cdx"]:
-                char_seg = char_segments[segment_data[sdx]["clean_cdx"].index(cdx)]
-                start = round(char_seg.start * ratio + t1, 3)
-                end = round(char_seg.end * ratio + t1, 3)
-                score = round(char_seg.score, 3)
-
-            char_segments_arr.append(
-                {
-                    "char": char,
-                    "start": start,
-                    "end": end,
-                    "score": score,
-                    "word-idx": word_idx,
-                }
-            )
+            if path is None:
+                print(f'Failed to align segment ("{segment["text"]}"): backtrack failed, resorting to original...')
+                continue
 
-            # increment word_idx, nltk word tokenization would probably be more robust here, but us space for now...
-            if model_lang in LANGUAGES_WITHOUT_SPACES:
-                word_idx += 1
-            elif cdx == len(text) - 1 or text[cdx+1] == " ":
-                word_idx += 1
+            char_segments = merge_repeats(path, text_clean)
+
+            duration = t2 - t1
+            ratio = duration / (trellis.size(0) - 1)
+
+            # assign timestamps to aligned characters
+            char_segments_arr = []
+            word_idx = 0
+            for cdx, char in enumerate(text):
+                start, end, score = None, None, None
+                if cdx in segment_data[sdx]["clean_cdx"]:
+                    char_seg = char_segments[segment_data[sdx]["clean_cdx"].index(cdx)]
+                    start = round(char_seg.start * ratio + t1, 3)
+                    end = round(char_seg.end * ratio + t1, 3)
+                    score = round(char_seg.score, 3)
+
+                char_segments_arr.append(
+                    {
+                        "char": char,
+                        "start": start,
+                        "end": end,
+                        "score": score,
+                        "word-idx": word_idx,
+                    }
+                )
+
+                # increment word_idx, nltk word tokenization would probably be more robust here, but us space for now...
+                if model_lang in LANGUAGES_WITHOUT_SPACES:
+                    word_idx += 1
+                elif cdx == len(text) - 1 or text[cdx+1] == " ":
+                    word_idx += 1
             
-        char_segments_arr = pd.DataFrame(char_segments_arr)
-
-        aligned_subsegments = []
-        # assign sentence_idx to each character index
-        char_segments_arr["sentence-idx"] = None
-        for sdx2, (sstart, send) in enumerate(segment_data[sdx]["sentence_spans"]):
-            curr_chars = char_segments_arr.loc[(char_segments_arr.index >= sstart) & (char_segments_arr.index <= send)]
-            char_segments_arr.loc[(char_segments_arr.index >= sstart) & (char_segments_arr.index <= send), "sentence-idx"] = sdx2
-
-            sentence_text = text[sstart:send]
-            sentence_start = curr_chars["start"].min()
-            end_chars = curr_chars[curr_chars["char"] != ' ']
-            sentence_end = end_chars["end"].max()
-            sentence_words = []
-
-            for word_idx in curr_chars["word-idx"].unique():
-                word_chars = curr_chars.loc[curr_chars["word-idx"] == word_idx]
-                word_text = "".join(word_chars["char"].tolist()).strip()
-                if len(word_text) == 0:
-                    continue
-
-                # dont use space character for alignment
-                word_chars = word_chars[word_chars["char"] != " "]
-
-                word_start = word_chars["start"].min()
-                word_end = word_chars["end"].max()
-                word_score = round(word_chars["score"].mean(), 3)
-
-                # -1 indicates unalignable 
-                word_segment = {"word": word_text}
-
-                if not np.isnan(word_start):
-                    word_segment["start"] = word_start
-                if not np.isnan(word_end):
-                    word_segment["end"] = word_end
-                if not np.isnan(word_score):
-                    word_segment["score"] = word_score
-
-                sentence_words.append(word_segment)
+            char_segments_arr = pd.DataFrame(char_segments_arr)
+
+            aligned_subsegments = []
+            # assign sentence_idx to each character index
+            char_segments_arr["sentence-idx"] = None
+            for sdx2, (sstart, send) in enumerate(segment_data[sdx]["sentence_spans"]):
+                curr_chars = char_segments_arr.loc[(char_segments_arr.index >= sstart) & (char_segments_arr.index <= send)]
+                char_segments_arr.loc[(char_segments_arr.index >= sstart) & (char_segments_arr.index <= send), "sentence-idx"] = sdx2
+
+                sentence_text = text[sstart:send]
+                sentence_start = curr_chars["start"].min()
+                end_chars = curr_chars[curr_chars["char"] != ' ']
+                sentence_end = end_chars["end"].max()
+                sentence_words = []
+
+                for word_idx in curr_chars["word-idx"].unique():
+                    word_chars = curr_chars.loc[curr_chars["word-idx"] == word_idx]
+                    word_text = "".join(word_chars["char"].tolist()).strip()
+                    if len(word_text) == 0:
+                        continue
+
+                    # dont use space character for alignment
+                    word_chars = word_chars[word_chars["char"] != " "]
+
+                    word_start = word_chars["start"].min()
+                    word_end = word_chars["end"].max()
+                    word_score = round(word_chars["score"].mean(), 3)
+
+                    # -1 indicates unalignable 
+                    word_segment = {"word": word_text}
+
+                    if not np.isnan(word_start):
+                        word_segment["start"] = word_start
+                    if not np.isnan(word_end):
+                        word_segment["end"] = word_end
+                    if not np.isnan(word_score):
+                        word_segment["score"] = word_score
+
+                    sentence_words.append(word_segment)
             
-            aligned_subsegments.append({
-                "text": sentence_text,
-                "start": sentence_start,
-                "end": sentence_end,
-                "words": sentence_words,
-            })
-
+                aligned_subsegments.append({
+                    "text": sentence_text,
+                    "start": sentence_start,
+                    "end": sentence_end,
+                    "words": sentence_words,
+                })
+
+                if return_char_alignments:
+                    curr_chars = curr_chars[["char", "start", "end", "score"]]
+                    curr_chars.fillna(-1, inplace=True)
+                    curr_chars = curr_chars.to_dict("records")
+                    curr_chars = [{key: val for key, val in char.items() if val != -1} for char in curr_chars]
+                    aligned_subsegments[-1]["chars"] = curr_chars
+
+            aligned_subsegments = pd.DataFrame(aligned_subsegments)
+            aligned_subsegments["start"] = interpolate_nans(aligned_subsegments["start"], method=interpolate_method)
+            aligned_subsegments["end"] = interpolate_nans(aligned_subsegments["end"], method=interpolate_method)
+            # concatenate sentences with same timestamps
+            agg_dict = {"text": " ".join, "words": "sum"}
+            if model_lang in LANGUAGES_WITHOUT_SPACES:
+                agg_dict["text"] = "".join
             if return_char_alignments:
-                curr_chars = curr_chars[["char", "start", "end", "score"]]
-                curr_chars.fillna(-1, inplace=True)
-                curr_chars = curr_chars.to_dict("records")
-                curr_chars = [{key: val for key, val in char.items() if val != -1} for char in curr_chars]
-                aligned_subsegments[-1]["chars"] = curr_chars
-
-        aligned_subsegments = pd.DataFrame(aligned_subsegments)
-        aligned_subsegments["start"] = interpolate_nans(aligned_subsegments["start"], method=interpolate_method)
-        aligned_subsegments["end"] = interpolate_nans(aligned_subsegments["end"], method=interpolate_method)
-        # concatenate sentences with same timestamps
-        agg_dict = {"text": " ".join, "words": "sum"}
-        if model_lang in LANGUAGES_WITHOUT_SPACES:
-            agg_dict["text"] = "".join
-        if return_char_alignments:
-            agg_dict["chars"] = "sum"
-        aligned_subsegments= aligned_subsegments.groupby(["start", "end"], as_index=False).agg(agg_dict)
-        aligned_subsegments = aligned_subsegments.to_dict('records')
-        aligned_segments += aligned_subsegments
+                agg_dict["chars"] = "sum"
+            aligned_subsegments= aligned_subsegments.groupby(["start", "end"], as_index=False).agg(agg_dict)
+            aligned_subsegments = aligned_subsegments.to_dict('records')
+            aligned_by_segment[sdx] = aligned_subsegments
+
+    aligned_segments: List[SingleAlignedSegment] = [
+        aligned for sdx in range(len(transcript)) for aligned in aligned_by_segment[sdx]
+    ]
 
     # create word_segments list
     word_segments: List[SingleWordSegment] = []
@@ -379,6 +381,65 @@ def align(
 
     return {"segments": aligned_segments, "word_segments": word_segments}
 
+
+def _emission_lengths(model: torch.nn.Module, model_type: str, num_samples: List[int]) -> List[int]:
+    """Number of emission frames the wav2vec2 feature extractor produces for each input length."""
+    if model_type == "torchaudio":
+        conv_layers = [(layer.kernel_size, layer.stride) for layer in model.feature_extractor.conv_layers]
+    else:
+        conv_layers = list(zip(model.config.conv_kernel, model.config.conv_stride))
+    lengths = []
+    for length in num_samples:
+        for kernel_size, stride in conv_layers:
+            length = (length - kernel_size) // stride + 1
+        lengths.append(length)
+    return lengths
+
+
+def get_batch_emissions(
+    model: torch.nn.Module,
+    model_type: str,
+    waveforms: List[torch.Tensor],
+    device: str,
+) -> List[torch.Tensor]:
+    """
+    Log-softmax emissions for several 1-D waveforms with a single forward pass.
+
+    Waveforms are zero-padded to the longest one (and to the 400-sample minimum input of
+    wav2vec2 models). Padding is masked with lengths (torchaudio) or an attention mask
+    (huggingface models with layer-norm feature extractors; group-norm models such as
+    wav2vec2-base are meant to be run on zero-padded input without one). Each returned
+    emission is trimmed to the frames of its own waveform; a batch of one is computed
+    exactly as a single segment was before batching.
+    """
+    num_samples = [waveform.shape[-1] for waveform in waveforms]
+    # Handle the minimum input length for wav2vec2 models
+    padded_samples = [max(length, 400) for length in num_samples]
+    batch = torch.zeros((len(waveforms), max(padded_samples)), dtype=waveforms[0].dtype)
+    for i, waveform in enumerate(waveforms):
+        batch[i, :num_samples[i]] = waveform
+    padded = any(length < batch.shape[-1] for length in num_samples)
+
+    with torch.inference_mode():
+        if model_type == "torchaudio":
+            lengths = torch.as_tensor(num_samples).to(device) if padded else None
+            emissions, _ = model(batch.to(device), lengths=lengths)
+        elif model_type == "huggingface":
+            if padded and getattr(model.config, "feat_extract_norm", "group") == "layer":
+                attention_mask = torch.zeros(batch.shape, dtype=torch.long)
+                for i, length in enumerate(padded_samples):
+                    attention_mask[i, :length] = 1
+                emissions = model(batch.to(device), attention_mask=attention_mask.to(device)).logits
+            else:
+                emissions = model(batch.to(device)).logits
+        else:
+            raise NotImplementedError(f"Align model of type {model_type} not supported.")
+        emissions = torch.log_softmax(emissions, dim=-1)
+
+    emissions = emissions.cpu().detach()
+    frames = _emission_lengths(model, model_type, padded_samples)
+    return [emissions[i, :min(frames[i], emissions.shape[1])] for i in range(len(waveforms))]
+
 """
 source: https://pytorch.org/tutorials/intermediate/forced_alignment_with_torchaudio_tutorial.html
 """
@@ -393,17 +454,42 @@ def get_trellis(emission, tokens, blank_id=0):
     trellis[0, 1:] = -float("inf")
     trellis[-num_tokens + 1:, 0] = float("inf")
 
+    # Same float32 additions and maxima as a per-frame torch update, without the per-frame
+    # tensor overhead: token scores (with wildcards resolved) are gathered for all frames up front
+    # and each frame's update runs in place on a numpy view of the trellis.
+    scores = trellis.numpy()
+    blank = emission[:, blank_id].numpy()
+    change = get_wildcard_emissions(emission, tokens[1:], blank_id).numpy()
+    stay = np.empty(num_tokens - 1, dtype=scores.dtype)
     for t in range(num_frame - 1):
-        trellis[t + 1, 1:] = torch.maximum(
-            # Score for staying at the same token
-            trellis[t, 1:] + emission[t, blank_id],
-            # Score for changing to the next token
-            # trellis[t, :-1] + emission[t, tokens[1:]],
-            trellis[t, :-1] + get_wildcard_emission(emission[t], tokens[1:], blank_id),
-        )
+        # Score for staying at the same token
+        np.add(scores[t, 1:], blank[t], out=stay)
+        # Score for changing to the next token
+        np.add(scores[t, :-1], change[t], out=scores[t + 1, 1:])
+        np.maximum(stay, scores[t + 1, 1:], out=scores[t + 1, 1:])
     return trellis
 
 
+def get_wildcard_emissions(emission, tokens, blank_id):
+    """Token emission scores for every frame at once, with wildcards (-1) taking the best non-blank score.
+
+    Args:
+        emission: Emission matrix of shape (T, C)
+        tokens: List of token indices
+
+    Returns:
+        tensor: Scores of shape (T, len(tokens)), equal row by row to get_wildcard_emission
+    """
+    tokens = torch.as_tensor(tokens, dtype=torch.long)
+    scores = emission[:, tokens.clamp(min=0)]
+    wildcard_mask = tokens == -1
+    if wildcard_mask.any():
+        non_blank = emission.clone()
+        non_blank[:, blank_id] = float('-inf')
+        scores[:, wildcard_mask] = non_blank.max(dim=1, keepdim=True).values
+    return scores
+
+
 def get_wildcard_emission(frame_emission, tokens, blank_id):
     """Processing token emission scores containing wildcards (vectorized version)
 
@@ -500,6 +586,9 @@ class BeamState:
 def backtrack_beam(trellis, emission, tokens, blank_id=0, beam_width=5):
     """Standard CTC beam search backtracking implementation.
 
+    Beams keep a pointer to their previous step instead of a copy of the whole path, and scores
+    are read from numpy views; only the points of the best path are materialized at the end.
+
     Args:
         trellis (torch.Tensor): The trellis (or lattice) of shape (T, N), where T is the number of time steps
                                 and N is the number of tokens (including the blank token).
@@ -512,55 +601,36 @@ def backtrack_beam(trellis, emission, tokens, blank_id=0, beam_width=5):
         List[Point]: the best path
     """
     T, J = trellis.size(0) - 1, trellis.size(1) - 1
+    scores = trellis.numpy()
+    change_emission = get_wildcard_emissions(emission, tokens, blank_id)
 
-    init_state = BeamState(
-        token_index=J,
-        time_index=T,
-        score=trellis[T, J],
-        path=[Point(J, T, emission[T, blank_id].exp().item())]
-    )
-
-    beams = [init_state]
+    # Path steps: (previous step, token_index, time_index, token changed at this step or None for blank)
+    steps = [(-1, J, T, None)]
+    # Beams: (token_index, time_index, score, last step)
+    beams = [(J, T, scores[T, J], 0)]
 
-    while beams and beams[0].token_index > 0:
+    while beams and beams[0][0] > 0:
         next_beams = []
 
-        for beam in beams:
-            t, j = beam.time_index, beam.token_index
-
+        for j, t, _, step in beams:
             if t <= 0:
                 continue
 
-            p_stay = emission[t - 1, blank_id]
-            p_change = get_wildcard_emission(emission[t - 1], [tokens[j]], blank_id)[0]
-
-            stay_score = trellis[t - 1, j]
-            change_score = trellis[t - 1, j - 1] if j > 0 else float('-inf')
+            stay_score = scores[t - 1, j]
+            change_score = scores[t - 1, j - 1] if j > 0 else float('-inf')
 
             # Stay
             if not math.isinf(stay_score):
-                new_path = beam.path.copy()
-                new_path.append(Point(j, t - 1, p_stay.exp().item()))
-                next_beams.append(BeamState(
-                    token_index=j,
-                    time_index=t - 1,
-                    score=stay_score,
-                    path=new_path
-                ))
+                steps.append((step, j, t - 1, None))
+                next_beams.append((j, t - 1, stay_score, len(steps) - 1))
 
             # Change
             if j > 0 and not math.isinf(change_score):
-                new_path = beam.path.copy()
-                new_path.append(Point(j - 1, t - 1, p_change.exp().item()))
-                next_beams.append(BeamState(
-                    token_index=j - 1,
-                    time_index=t - 1,
-                    score=change_score,
-                    path=new_path
-                ))
+                steps.append((step, j - 1, t - 1, j))
+                next_beams.append((j - 1, t - 1, change_score, len(steps) - 1))
 
         # sort by score
-        beams = sorted(next_beams, key=lambda x: x.score, reverse=True)[:beam_width]
+        beams = sorted(next_beams, key=lambda x: x[2], reverse=True)[:beam_width]
 
         if not beams:
             break
@@ -568,15 +638,16 @@ def backtrack_beam(trellis, emission, tokens, blank_id=0, beam_width=5):
     if not beams:
         return None
 
-    best_beam = beams[0]
-    t = best_beam.time_index
-    j = best_beam.token_index
-    while t > 0:
-        prob = emission[t - 1, blank_id].exp().item()
-        best_beam.path.append(Point(j, t - 1, prob))
-        t -= 1
-
-    return best_beam.path[::-1]
+    # Fill up the frames before the best beam with blanks; following the beam back from its last step
+    # visits its points in increasing time
+    j, t, _, step = beams[0]
+    path = [Point(j, k, emission[k, blank_id].exp().item()) for k in range(t)]
+    beam_path = []
+    while step >= 0:
+        step, j, t, changed = steps[step]
+        score = emission[t, blank_id] if changed is None else change_emission[t, changed]
+        beam_path.append(Point(j, t, score.exp().item()))
+    return path + beam_path
 
 
 # Merge the labels
@@ -12,6 +12,7 @@ from transformers import Pipeline
 from transformers.pipelines.pt_utils import PipelineIterator
 
 from whisperx.audio import N_SAMPLES, SAMPLE_RATE, load_audio, log_mel_spectrogram
+from whisperx.diarize import Segment as SegmentX
 from whisperx.types import SingleSegment, TranscriptionResult
 from whisperx.vads import Vad, Silero, Pyannote
 
@@ -25,6 +26,28 @@ def find_numeral_symbol_tokens(tokenizer):
             numeral_symbol_tokens.append(i)
     return numeral_symbol_tokens
 
+def merge_precomputed_segments(speech_segments, chunk_size, onset: float, offset: Optional[float]):
+    """
+    Merge precomputed (start, end) speech regions in seconds into ASR chunks.
+
+    Regions longer than chunk_size are split first, mirroring the max_duration
+    of pyannote's Binarize, so every merged chunk fits the model input window.
+    """
+    segments_list = []
+    for start, end in sorted((float(s), float(e)) for s, e in speech_segments):
+        if end <= start:
+            continue
+        while end - start > chunk_size:
+            segments_list.append(SegmentX(start, start + chunk_size, "UNKNOWN"))
+            start += chunk_size
+        segments_list.append(SegmentX(start, end, "UNKNOWN"))
+
+    if len(segments_list) == 0:
+        print("No active speech found in audio")
+        return []
+    return Vad.merge_chunks(segments_list, chunk_size, onset, offset)
+
+
 class WhisperModel(faster_whisper.WhisperModel):
     '''
     FasterWhisperModel provides batched inference for faster-whisper.
@@ -186,6 +209,33 @@ class FasterWhisperPipeline(Pipeline):
         final_iterator = PipelineIterator(model_iterator, self.postprocess, postprocess_params)
         return final_iterator
 
+    def _vad_chunks(self, audio: np.ndarray, chunk_size) -> List[dict]:
+        # Pre-process audio and merge chunks as defined by the respective VAD child class 
+        # In case vad_model is manually assigned (see 'load_model') follow the functionality of pyannote toolkit
+        if issubclass(type(self.vad_model), Vad):
+            waveform = self.vad_model.preprocess_audio(audio)
+            merge_chunks =  self.vad_model.merge_chunks
+        else:
+            waveform = Pyannote.preprocess_audio(audio)
+            merge_chunks = Pyannote.merge_chunks
+
+        vad_segments = self.vad_model({"waveform": waveform, "sample_rate": SAMPLE_RATE})
+        return merge_chunks(
+            vad_segments,
+            chunk_size,
+            onset=self._vad_params["vad_onset"],
+            offset=self._vad_params["vad_offset"],
+        )
+
+    def detect_speech(self, audio: Union[str, np.ndarray], chunk_size=30) -> List[tuple]:
+        """
+        Run the VAD model once over the audio and return the detected speech regions
+        as (start, end) pairs in seconds, e.g. to plan long-audio chunking in silences.
+        """
+        if isinstance(audio, str):
+            audio = load_audio(audio)
+        return [region for chunk in self._vad_chunks(audio, chunk_size) for region in chunk["segments"]]
+
     def transcribe(
         self,
         audio: Union[str, np.ndarray],
@@ -197,7 +247,13 @@ class FasterWhisperPipeline(Pipeline):
         print_progress=False,
         combined_progress=False,
         verbose=False,
+        speech_segments: Optional[List[tuple]] = None,
     ) -> TranscriptionResult:
+        """
+        speech_segments: optional precomputed speech regions as (start, end) pairs in seconds,
+            e.g. from an upstream VAD pass. When given, the VAD model is not run and the
+            regions are fed to merge_chunks directly.
+        """
         if isinstance(audio, str):
             audio = load_audio(audio)
 
@@ -208,22 +264,15 @@ class FasterWhisperPipeline(Pipeline):
                 # print(f2-f1)
                 yield {'inputs': audio[f1:f2]}
 
-        # Pre-process audio and merge chunks as defined by the respective VAD child class 
-        # In case vad_model is manually assigned (see 'load_model') follow the functionality of pyannote toolkit
-        if issubclass(type(self.vad_model), Vad):
-            waveform = self.vad_model.preprocess_audio(audio)
-            merge_chunks =  self.vad_model.merge_chunks
+        if speech_segments is not None:
+            vad_segments = merge_precomputed_segments(
+                speech_segments,
+                chunk_size,
+                onset=self._vad_params["vad_onset"],
+                offset=self._vad_params["vad_offset"],
+            )
         else:
-            waveform = Pyannote.preprocess_audio(audio)
-            merge_chunks = Pyannote.merge_chunks
-
-        vad_segments = self.vad_model({"waveform": waveform, "sample_rate": SAMPLE_RATE})
-        vad_segments = merge_chunks(
-            vad_segments,
-            chunk_size,
-            onset=self._vad_params["vad_onset"],
-            offset=self._vad_params["vad_offset"],
-        )
+            vad_segments = self._vad_chunks(audio, chunk_size)
         if self.tokenizer is None:
             language = language or self.detect_language(audio)
             task = task or "transcribe"
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from pyannote.audio import Pipeline
 from typing import Optional, Union
 import torch
 
@@ -17,6 +16,8 @@ class DiarizationPipeline:
     ):
         if isinstance(device, str):
             device = torch.device(device)
+        from pyannote.audio import Pipeline
+
         model_config = model_name or "pyannote/speaker-diarization-3.1"
         self.model = Pipeline.from_pretrained(model_config, use_auth_token=use_auth_token).to(device)
 
@@ -26,57 +27,124 @@ class DiarizationPipeline:
         num_speakers: Optional[int] = None,
         min_speakers: Optional[int] = None,
         max_speakers: Optional[int] = None,
+        return_embeddings: bool = False,
     ):
+        """
+        If return_embeddings is True, also return a dict mapping each speaker label to its
+        centroid embedding (a list of floats, NaN when pyannote could not embed that speaker),
+        so speakers from separately diarized chunks can be clustered globally.
+        """
         if isinstance(audio, str):
             audio = load_audio(audio)
         audio_data = {
             'waveform': torch.from_numpy(audio[None, :]),
             'sample_rate': SAMPLE_RATE
         }
-        segments = self.model(audio_data, num_speakers = num_speakers, min_speakers=min_speakers, max_speakers=max_speakers)
+        if return_embeddings:
+            segments, embeddings = self.model(
+                audio_data, num_speakers=num_speakers, min_speakers=min_speakers, max_speakers=max_speakers,
+                return_embeddings=True
+            )
+        else:
+            segments = self.model(audio_data, num_speakers = num_speakers, min_speakers=min_speakers, max_speakers=max_speakers)
         diarize_df = pd.DataFrame(segments.itertracks(yield_label=True), columns=['segment', 'label', 'speaker'])
         diarize_df['start'] = diarize_df['segment'].apply(lambda x: x.start)
         diarize_df['end'] = diarize_df['segment'].apply(lambda x: x.end)
+        if return_embeddings:
+            # pyannote returns centroids in the order of segments.labels()
+            speaker_embeddings = {
+                speaker: np.asarray(embeddings[s]).tolist() for s, speaker in enumerate(segments.labels())
+            }
+            return diarize_df, speaker_embeddings
         return diarize_df
 
 
+class _SpeakerTurns:
+    """
+    Diarization turns indexed for overlap queries.
+
+    Turns are sorted by start with a running maximum of their ends, so the turns that can
+    overlap [start, end) are found with two binary searches instead of scanning the whole
+    DataFrame. For fill_nearest, per-speaker sorted starts/ends with prefix sums give the
+    summed (possibly negative) intersection with every turn of each speaker in O(log n).
+    """
+
+    def __init__(self, diarize_df: pd.DataFrame):
+        codes, self.speakers = pd.factorize(diarize_df['speaker'], sort=True)
+        keep = codes >= 0
+        self.codes = codes[keep]
+        self.starts = diarize_df['start'].to_numpy(dtype=np.float64)[keep]
+        self.ends = diarize_df['end'].to_numpy(dtype=np.float64)[keep]
+        self.order = np.argsort(self.starts, kind='stable')
+        self.sorted_starts = self.starts[self.order]
+        self.max_ends = np.maximum.accumulate(self.ends[self.order]) if len(self.order) else self.ends
+        self._prefix = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def best_speaker(self, start: float, end: float, fill_nearest: bool = False):
+        """Speaker with the largest summed intersection with [start, end); ties go to the first label."""
+        if not len(self):
+            return None
+        if fill_nearest:
+            totals = self._summed_intersections(start, end)
+        else:
+            # turns before lo end at or before start; turns from hi on start at or after end
+            lo = np.searchsorted(self.max_ends, start, side='right')
+            hi = np.searchsorted(self.sorted_starts, end, side='left')
+            # original row order, so the sums accumulate exactly as a groupby over the DataFrame would
+            rows = np.sort(self.order[lo:hi])
+            intersection = np.minimum(self.ends[rows], end) - np.maximum(self.starts[rows], start)
+            hit = intersection > 0
+            if not hit.any():
+                return None
+            totals = np.bincount(self.codes[rows][hit], weights=intersection[hit], minlength=len(self.speakers))
+        return self.speakers[int(np.argmax(totals))]
+
+    def _summed_intersections(self, start: float, end: float) -> np.ndarray:
+        # sum_i min(end_i, end) - max(start_i, start) over each speaker's turns
+        if self._prefix is None:
+            self._prefix = []
+            for code in range(len(self.speakers)):
+                ends = np.sort(self.ends[self.codes == code])
+                starts = np.sort(self.starts[self.codes == code])
+                self._prefix.append((
+                    ends, np.concatenate([[0.0], np.cumsum(ends)]),
+                    starts, np.concatenate([[0.0], np.cumsum(starts)])
+                ))
+        totals = np.empty(len(self.speakers))
+        for code, (ends, end_sums, starts, start_sums) in enumerate(self._prefix):
+            k = np.searchsorted(ends, end, side='left')
+            summed_min = end_sums[k] + end * (len(ends) - k)
+            k = np.searchsorted(starts, start, side='right')
+            summed_max = start * k + (start_sums[-1] - start_sums[k])
+            totals[code] = summed_min - summed_max
+        return totals
+
+
 def assign_word_speakers(
     diarize_df: pd.DataFrame,
     transcript_result: Union[AlignedTranscriptionResult, TranscriptionResult],
     fill_nearest=False,
 ) -> dict:
+    turns = _SpeakerTurns(diarize_df)
     transcript_segments = transcript_result["segments"]
     for seg in transcript_segments:
         # assign speaker to segment (if any)
-        diarize_df['intersection'] = np.minimum(diarize_df['end'], seg['end']) - np.maximum(diarize_df['start'], seg['start'])
-        diarize_df['union'] = np.maximum(diarize_df['end'], seg['end']) - np.minimum(diarize_df['start'], seg['start'])
-        # remove no hit, otherwise we look for closest (even negative intersection...)
-        if not fill_nearest:
-            dia_tmp = diarize_df[diarize_df['intersection'] > 0]
-        else:
-            dia_tmp = diarize_df
-        if len(dia_tmp) > 0:
-            # sum over speakers
-            speaker = dia_tmp.groupby("speaker")["intersection"].sum().sort_values(ascending=False).index[0]
+        speaker = turns.best_speaker(seg['start'], seg['end'], fill_nearest)
+        if speaker is not None:
             seg["speaker"] = speaker
-        
+
         # assign speaker to words
         if 'words' in seg:
             for word in seg['words']:
                 if 'start' in word:
-                    diarize_df['intersection'] = np.minimum(diarize_df['end'], word['end']) - np.maximum(diarize_df['start'], word['start'])
-                    diarize_df['union'] = np.maximum(diarize_df['end'], word['end']) - np.minimum(diarize_df['start'], word['start'])
-                    # remove no hit
-                    if not fill_nearest:
-                        dia_tmp = diarize_df[diarize_df['intersection'] > 0]
-                    else:
-                        dia_tmp = diarize_df
-                    if len(dia_tmp) > 0:
-                        # sum over speakers
-                        speaker = dia_tmp.groupby("speaker")["intersection"].sum().sort_values(ascending=False).index[0]
+                    speaker = turns.best_speaker(word['start'], word['end'], fill_nearest)
+                    if speaker is not None:
                         word["speaker"] = speaker
-        
-    return transcript_result            
+
+    return transcript_result
 
 
 class Segment: